@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+
+from src.api.http_errors import to_http_exception
+from src.config import settings
+from src.models import AIModel, BulkJob, MessageThread
+from src.services import bulk_service
+
+router = APIRouter(prefix="/bulk", tags=["bulk"])
+
+
+class BulkJobRequest(BaseModel):
+    """Request model for submitting a bulk job."""
+
+    model: AIModel
+    message_threads: list[MessageThread] = Field(
+        ..., min_length=1, max_length=settings.BULK_MAX_THREADS
+    )
+
+
+@router.post(path="/", response_model=BulkJob, status_code=202)
+async def submit_bulk_job(bulk_request: BulkJobRequest) -> BulkJob:
+    """Submit threads to be answered by the provider's batch API.
+
+    Bulk jobs cost less than interactive requests but may take up to a day;
+    poll `GET /bulk/{provider_name}/{job_id}` for their status and results.
+    """
+    try:
+        return await bulk_service.asubmit_bulk_job(
+            bulk_request.model, bulk_request.message_threads
+        )
+    except Exception as e:
+        raise to_http_exception(e, "processing a bulk job") from e
+
+
+@router.get(path="/{provider_name}/{job_id}", response_model=BulkJob)
+async def get_bulk_job(provider_name: str, job_id: str) -> BulkJob:
+    """Get the status of a bulk job, with per-thread results once finished."""
+    try:
+        return await bulk_service.aget_bulk_job(provider_name, job_id)
+    except Exception as e:
+        raise to_http_exception(e, "processing a bulk job") from e
@@ -1,9 +1,26 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import json
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Annotated
 
-from src.models import AIModel, Message, MessageThread
-from src.services import converse_service
-from src.utils import setup_logger
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, SerializeAsAny
+
+from src.api.http_errors import to_http_exception
+from src.config import settings
+from src.models import (
+    AgentMessageDelta,
+    AIModel,
+    Message,
+    MessageThread,
+    RetrievalOptions,
+    ToolOptions,
+    UserMessage,
+)
+from src.services import conversation_service, converse_service
+from src.services.response_cache import CacheMode
+from src.utils import setup_logger, tracer
+from src.utils.tracing import Span
 
 logger = setup_logger(__name__)
 router = APIRouter(prefix="/converse", tags=["converse"])
@@ -14,36 +31,200 @@ class ConverseRequest(BaseModel):
 
     model: AIModel
     message_thread: MessageThread
+    retrieval: RetrievalOptions | None = None
+    tools: ToolOptions | None = None
+
+
+class BatchConverseJob(BaseModel):
+    """A single conversation of a batch request."""
+
+    model: AIModel
+    message_thread: MessageThread
+    id: str | None = None
+
+
+class BatchConverseRequest(BaseModel):
+    """Request model for the batch converse endpoint."""
+
+    jobs: list[BatchConverseJob] = Field(
+        ..., min_length=1, max_length=settings.BATCH_MAX_JOBS
+    )
+
+
+class BatchConverseResult(BaseModel):
+    """The outcome of one job of a batch, streamed as an NDJSON line."""
+
+    index: int
+    id: str | None = None
+    status_code: int = 200
+    message: SerializeAsAny[Message] | None = None
+    error: str | None = None
+
+
+class ConverseTurnRequest(BaseModel):
+    """Request model for continuing a stored thread."""
+
+    model: AIModel
+    message: UserMessage
+    retrieval: RetrievalOptions | None = None
+    tools: ToolOptions | None = None
+
+
+def _trace_parsed() -> None:
+    """Record the time spent receiving and validating the request as a span.
+
+    FastAPI parses the body before the handler runs, so the stage is recorded
+    from the start of the request's span until the handler is entered.
+    """
+    request_span: Span | None = tracer.current_span()
+    if request_span is not None:
+        tracer.record("request.parse", request_span.start_ns)
 
 
 @router.post(path="/")
-async def converse(converse_request: ConverseRequest) -> Message:
-    """Send a message to the AI model and get a response."""
+async def converse(
+    converse_request: ConverseRequest,
+    cache_control: Annotated[str | None, Header()] = None,
+) -> Message:
+    """Send a message to the AI model and get a response.
+
+    Set `retrieval` to inject snippets of stored messages and uploaded
+    documents relevant to the latest message into the prompt.
+
+    Set `tools` to offer registered tools to the model: the tools it calls
+    run on the server, and their results are sent back to it until it
+    answers. Only the final answer is returned.
+
+    When the response cache is enabled, identical requests are answered from
+    it; send `Cache-Control: no-cache` to force a fresh reply (which is then
+    cached) or `Cache-Control: no-store` to bypass the cache entirely.
+    """
+    _trace_parsed()
+    cache_mode: CacheMode = CacheMode.from_cache_control(cache_control)
     try:
-        return converse_service.converse(
-            converse_request.model, converse_request.message_thread
+        if converse_request.tools is not None:
+            steps: list[Message] = await converse_service.aconverse_with_tools(
+                converse_request.model,
+                converse_request.message_thread,
+                converse_request.tools,
+                cache_mode,
+                retrieval=converse_request.retrieval,
+            )
+            return converse_service.last_reply(steps)
+        return await converse_service.aconverse(
+            converse_request.model,
+            converse_request.message_thread,
+            cache_mode,
+            retrieval=converse_request.retrieval,
         )
-    except TypeError as e:
+    except Exception as e:
+        raise to_http_exception(e, "processing a conversation") from e
+
+
+async def _to_sse_events(
+    deltas: AsyncIterator[AgentMessageDelta],
+) -> AsyncGenerator[str]:
+    """Format message deltas as Server-Sent Events.
+
+    Errors raised after the stream has started are reported as an `error`
+    event, since the response status has already been sent.
+    """
+    try:
+        async for delta in deltas:
+            yield f"data: {delta.model_dump_json()}\n\n"
+    except Exception as e:
         logger.error(
-            "Invalid model type for conversation",
+            "Error streaming conversation",
             exc_info=True,
             extra={"error": str(e)},
         )
-        raise HTTPException(status_code=422, detail=str(e)) from e
-    except ValueError as e:
-        logger.error(
-            "Validation error in conversation",
-            exc_info=True,
-            extra={"error": str(e)},
+        yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        return
+    yield "data: [DONE]\n\n"
+
+
+@router.post(path="/stream")
+async def converse_stream(converse_request: ConverseRequest) -> StreamingResponse:
+    """Send a message to the AI model and stream the response as it is generated.
+
+    Each Server-Sent Event carries an `AgentMessageDelta` as JSON; the stream
+    ends with a `[DONE]` event. Tools are not run when streaming.
+    """
+    _trace_parsed()
+    try:
+        if converse_request.tools is not None:
+            raise ValueError("Tools cannot be run when streaming a conversation.")
+        deltas: AsyncIterator[AgentMessageDelta] = converse_service.converse_stream(
+            converse_request.model,
+            converse_request.message_thread,
+            converse_request.retrieval,
         )
-        # Use 404 for not found, 400 for other validation errors
-        if "not found" in str(e):
-            raise HTTPException(status_code=404, detail=str(e)) from e
-        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
-        logger.error(
-            "Error processing conversation",
-            exc_info=True,
-            extra={"error": str(e)},
+        raise to_http_exception(e, "processing a conversation") from e
+
+    return StreamingResponse(
+        _to_sse_events(deltas),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _to_ndjson_lines(
+    batch_request: BatchConverseRequest,
+) -> AsyncGenerator[str]:
+    """Run a batch and format each job's outcome as an NDJSON line."""
+    jobs: list[BatchConverseJob] = batch_request.jobs
+    async for index, outcome in converse_service.aconverse_batch(
+        [(job.model, job.message_thread) for job in jobs]
+    ):
+        if isinstance(outcome, Exception):
+            error: HTTPException = to_http_exception(
+                outcome, "processing a conversation"
+            )
+            result = BatchConverseResult(
+                index=index,
+                id=jobs[index].id,
+                status_code=error.status_code,
+                error=str(error.detail),
+            )
+        else:
+            result = BatchConverseResult(
+                index=index, id=jobs[index].id, message=outcome
+            )
+        yield result.model_dump_json() + "\n"
+
+
+@router.post(path="/batch")
+async def converse_batch(batch_request: BatchConverseRequest) -> StreamingResponse:
+    """Run many independent conversations in one request.
+
+    Jobs run concurrently with bounded per-provider concurrency. Results are
+    streamed as NDJSON, one `BatchConverseResult` per line in completion
+    order; a failing job reports its status code and error on its own line
+    without failing the batch.
+    """
+    return StreamingResponse(
+        _to_ndjson_lines(batch_request), media_type="application/x-ndjson"
+    )
+
+
+@router.post(path="/{thread_id}")
+async def converse_turn(thread_id: str, turn_request: ConverseTurnRequest) -> Message:
+    """Add a message to a stored thread and get the AI model's response.
+
+    Only the new message is sent; the history is loaded from the conversation
+    store, and the message and the response are appended to it. With
+    `tools`, the tool calls and results leading to the response are
+    appended as well.
+    """
+    _trace_parsed()
+    try:
+        return await conversation_service.aconverse_turn(
+            thread_id,
+            turn_request.model,
+            turn_request.message,
+            turn_request.retrieval,
+            turn_request.tools,
         )
-        raise HTTPException(status_code=500, detail=str(e)) from e
+    except Exception as e:
+        raise to_http_exception(e, "processing a conversation") from e
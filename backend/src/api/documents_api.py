@@ -0,0 +1,30 @@
+from fastapi import APIRouter, status
+
+from src.api.http_errors import to_http_exception
+from src.models import Document, DocumentInfo
+from src.services import retrieval_service
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+@router.post(path="/", response_model=DocumentInfo, status_code=status.HTTP_201_CREATED)
+async def add_document(document: Document) -> DocumentInfo:
+    """Upload a document as knowledge for retrieval-augmented conversations.
+
+    The document is split into chunks, which are embedded and indexed;
+    conversations requesting `retrieval` get its most relevant chunks
+    injected into their prompt instead of the whole document.
+    """
+    try:
+        return await retrieval_service.aadd_document(document)
+    except Exception as e:
+        raise to_http_exception(e, "handling a document") from e
+
+
+@router.delete(path="/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_document(document_id: str) -> None:
+    """Delete an uploaded document and remove it from retrieval."""
+    try:
+        await retrieval_service.adelete_document(document_id)
+    except Exception as e:
+        raise to_http_exception(e, "handling a document") from e
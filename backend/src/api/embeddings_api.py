@@ -0,0 +1,73 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Header
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+from src.api.http_errors import to_http_exception
+from src.config import settings
+from src.models import AIModel, EmbeddingEncoding, EmbeddingResponse
+from src.services import embedding_service
+from src.utils.vectors import pack_vector, pack_vector_base64
+
+router = APIRouter(tags=["embeddings"])
+
+# Accept header value requesting the vectors as raw float32 bytes
+BINARY_MEDIA_TYPE: str = "application/octet-stream"
+
+
+class EmbedRequest(BaseModel):
+    """Request model for the embed endpoint."""
+
+    model: AIModel
+    input: str | Annotated[list[str], Field(max_length=settings.EMBEDDING_MAX_TEXTS)]
+    encoding: EmbeddingEncoding = EmbeddingEncoding.FLOAT
+
+    @property
+    def texts(self) -> list[str]:
+        """The texts to embed."""
+        return [self.input] if isinstance(self.input, str) else self.input
+
+
+@router.post(path="/embed", response_model=EmbeddingResponse)
+async def embed(
+    embed_request: EmbedRequest,
+    accept: Annotated[str | None, Header()] = None,
+) -> EmbeddingResponse | Response:
+    """Embed one or more texts with an embedding model.
+
+    Vectors are returned as JSON arrays, or as base64 of their little-endian
+    float32 bytes with `"encoding": "base64"`. Send
+    `Accept: application/octet-stream` to get every vector as one raw
+    float32 matrix instead, readable with `numpy.frombuffer(body, "<f4")`
+    and shaped by the `X-Embedding-Count` and `X-Embedding-Dimensions`
+    headers. Concurrent requests are batched together upstream, and
+    unchanged texts are served from the embedding cache.
+    """
+    try:
+        vectors: list[list[float]] = await embedding_service.aembed(
+            embed_request.model, embed_request.texts
+        )
+    except Exception as e:
+        raise to_http_exception(e, "embedding texts") from e
+
+    dimensions: int = len(vectors[0])
+    if BINARY_MEDIA_TYPE in (accept or ""):
+        return Response(
+            content=b"".join(pack_vector(vector) for vector in vectors),
+            media_type=BINARY_MEDIA_TYPE,
+            headers={
+                "X-Embedding-Count": str(len(vectors)),
+                "X-Embedding-Dimensions": str(dimensions),
+                "X-Embedding-Dtype": "<f4",
+            },
+        )
+    return EmbeddingResponse(
+        model=embed_request.model.id,
+        provider=embed_request.model.provider,
+        dimensions=dimensions,
+        encoding=embed_request.encoding,
+        embeddings=[pack_vector_base64(vector) for vector in vectors]
+        if embed_request.encoding is EmbeddingEncoding.BASE64
+        else vectors,
+    )
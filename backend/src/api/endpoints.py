@@ -1,7 +1,17 @@
 from fastapi import APIRouter
 
+from src.api.bulk_api import router as bulk_router
 from src.api.converse_api import router as converse_router
+from src.api.documents_api import router as documents_router
+from src.api.embeddings_api import router as embeddings_router
+from src.api.metrics_api import router as metrics_router
 from src.api.providers_api import router as provider_router
+from src.api.search_api import router as search_router
+from src.api.threads_api import router as threads_router
+from src.api.tools_api import router as tools_router
+from src.config import settings
+from src.models import ProviderHealth
+from src.services.health_monitor import health_monitor
 
 router = APIRouter()
 
@@ -12,6 +22,26 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@router.get("/health/providers", response_model=list[ProviderHealth])
+async def provider_health(refresh: bool = False) -> list[ProviderHealth]:
+    """Get the health of each provider, as tracked by the background monitor.
+
+    Pass `refresh=true` to probe every provider now instead of reporting the
+    latest background probes.
+    """
+    if refresh:
+        return await health_monitor.aprobe_all()
+    return health_monitor.report()
+
+
 # Include model routes
 router.include_router(provider_router)
 router.include_router(converse_router)
+router.include_router(threads_router)
+router.include_router(bulk_router)
+router.include_router(embeddings_router)
+router.include_router(search_router)
+router.include_router(documents_router)
+router.include_router(tools_router)
+if settings.METRICS_ENABLED:
+    router.include_router(metrics_router)
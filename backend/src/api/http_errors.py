@@ -0,0 +1,57 @@
+from math import ceil
+
+from fastapi import HTTPException
+
+from src.models import AlreadyExistsError, NotFoundError
+from src.services.scheduler import QueueFullError
+from src.utils import CircuitOpenError, RateLimitExceededError, setup_logger
+from src.utils.metrics import errors
+
+logger = setup_logger(__name__)
+
+
+def to_http_exception(e: Exception, action: str) -> HTTPException:
+    """Map an error raised while handling a request to an HTTP error.
+
+    Providers that are unavailable or saturated map to 503 and exhausted
+    rate limits to 429, both with a `Retry-After` header; a `TypeError`
+    (an unsupported model type) maps to 422, a `NotFoundError` to 404, an
+    `AlreadyExistsError` to 409 and any other `ValueError` to 400.
+    Anything else is a 500.
+
+    Args:
+        e: The error to map.
+        action: What was being done when it was raised, for the logs,
+            e.g. "processing a conversation".
+
+    Returns:
+        The HTTP error to raise in its place.
+    """
+    errors.inc(component="api", error=type(e).__name__)
+    if isinstance(e, CircuitOpenError | QueueFullError):
+        logger.error(f"Provider unavailable while {action}", extra={"error": str(e)})
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(ceil(e.retry_after))},
+        )
+    if isinstance(e, RateLimitExceededError):
+        logger.error(f"Rate limit reached while {action}", extra={"error": str(e)})
+        return HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(ceil(e.retry_after))},
+        )
+    if isinstance(e, TypeError):
+        logger.error(f"Invalid model type while {action}", extra={"error": str(e)})
+        return HTTPException(status_code=422, detail=str(e))
+    if isinstance(e, ValueError):
+        logger.error(f"Validation error while {action}", extra={"error": str(e)})
+        status_code: int = 400
+        if isinstance(e, NotFoundError):
+            status_code = 404
+        elif isinstance(e, AlreadyExistsError):
+            status_code = 409
+        return HTTPException(status_code=status_code, detail=str(e))
+    logger.error(f"Error while {action}", exc_info=True, extra={"error": str(e)})
+    return HTTPException(status_code=500, detail=str(e))
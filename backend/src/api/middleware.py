@@ -0,0 +1,164 @@
+from time import perf_counter
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.logger import bind_log_context
+from src.utils.metrics import http_request_seconds
+from src.utils.tracing import SpanContext, tracer
+
+
+def _route_template(scope: Scope) -> str:
+    """The template of the route a request matched, e.g. `/threads/{thread_id}`.
+
+    The template is rebuilt from the request path and its path parameters,
+    so it includes the prefixes of every router the route was included in.
+    Parameters are matched against whole path segments, last one first, so
+    a value that also appears in a prefix (e.g. a thread id `v1`) is not
+    mistaken for it.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    segments: list[str] = scope["path"].split("/")
+    end: int = len(segments)
+    for name, value in reversed(scope.get("path_params", {}).items()):
+        parts: list[str] = str(value).split("/")  # `:path` values span segments
+        for start in range(end - len(parts), -1, -1):
+            if segments[start : start + len(parts)] == parts:
+                segments[start : start + len(parts)] = [f"{{{name}}}"]
+                end = start
+                break
+    return "/".join(segments)
+
+
+# Header carrying the request id, read from the caller and echoed back
+REQUEST_ID_HEADER: str = "x-request-id"
+# Longest caller-supplied request id accepted; longer ones are replaced
+MAX_REQUEST_ID_LENGTH: int = 128
+
+
+class RequestContextMiddleware:
+    """Tags every HTTP request with a request id, bound to the records it logs.
+
+    The caller's `X-Request-ID` header is used if it is present and
+    reasonably short; otherwise a random id is generated. Either way the id
+    is echoed in the response's `X-Request-ID` header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application."""
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request with its id bound to the log context."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id: str = (
+            next(
+                (
+                    value.decode("latin-1")
+                    for name, value in scope["headers"]
+                    if name.decode("latin-1").lower() == REQUEST_ID_HEADER
+                    and 0 < len(value) <= MAX_REQUEST_ID_LENGTH
+                ),
+                "",
+            )
+            or uuid4().hex
+        )
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (REQUEST_ID_HEADER.encode("latin-1"), request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        with bind_log_context(request_id=request_id):
+            await self.app(scope, receive, send_with_request_id)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request, labelled by route template and status code.
+
+    Routes are labelled by their template (e.g. `/api/v1/threads/{thread_id}`)
+    rather than the raw path, so the number of series stays bounded; requests
+    matching no route are labelled `unmatched`. A pure ASGI middleware is used
+    so streamed responses pass through untouched, and are timed to their end.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application."""
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, timing it if it is an HTTP request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status: int = 500  # Unless the application starts a response
+
+        async def send_and_record_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start: float = perf_counter()
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            http_request_seconds.observe(
+                perf_counter() - start,
+                method=scope["method"],
+                route=_route_template(scope),
+                status=str(status),
+            )
+
+
+class TracingMiddleware:
+    """Records a root span for every HTTP request, continuing the caller's trace.
+
+    A valid `traceparent` header makes the request's span a child of the
+    caller's, and the response carries the request span's own `traceparent`
+    so clients can find the trace. Requests pass through untouched while
+    tracing is disabled.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application."""
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request inside its span, if it is an HTTP request."""
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        parent: SpanContext | None = tracer.extract(
+            {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in scope["headers"]
+            }
+        )
+        method: str = scope["method"]
+        with tracer.span(f"HTTP {method}", parent, **{"http.method": method}) as span:
+
+            async def send_with_trace_context(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"traceparent", span.context.traceparent.encode("latin-1")),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_context)
+            finally:
+                route: str = _route_template(scope)
+                span.name = f"HTTP {method} {route}"
+                span.set_attribute("http.route", route)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 
-from src.models import AIModel, AIModelType
+from src.api.http_errors import to_http_exception
+from src.models import AIModel, AIModelType, LaneStats, ModelCatalog, RouteStats
 from src.services import provider_service
-from src.utils import setup_logger
+from src.services.router import model_router
+from src.services.scheduler import provider_scheduler
 
-logger = setup_logger(__name__)
 router = APIRouter(prefix="/providers", tags=["providers"])
 
 
@@ -14,10 +15,16 @@ async def get_providers() -> list[str]:
     try:
         return list(provider_service.get_available_providers())
     except Exception as e:
-        logger.error(
-            "Error retrieving providers", exc_info=True, extra={"error": str(e)}
-        )
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise to_http_exception(e, "retrieving providers") from e
+
+
+@router.post(path="/reload", response_model=list[str])
+async def reload_providers() -> list[str]:
+    """Rebuild every provider, e.g. after a configuration change."""
+    try:
+        return list(await provider_service.areload_providers())
+    except Exception as e:
+        raise to_http_exception(e, "reloading providers") from e
 
 
 @router.get(path="/{provider_name}/models", response_model=list[AIModel])
@@ -26,21 +33,33 @@ async def get_provider_models(
 ) -> list[AIModel]:
     """Get a list of AI models from a specific provider."""
     try:
-        return provider_service.get_provider_models(provider_name, limit, type_filter)
-    except ValueError as ve:
-        logger.error(
-            f"Provider '{provider_name}' not found",
-            exc_info=True,
-            extra={"error": str(ve)},
+        return await provider_service.aget_provider_models(
+            provider_name, limit, type_filter
         )
-        raise HTTPException(status_code=404, detail=str(ve)) from ve
     except Exception as e:
-        logger.error(
-            f"Error retrieving models from provider {provider_name}",
-            exc_info=True,
-            extra={"error": str(e)},
-        )
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise to_http_exception(
+            e, f"retrieving models from provider '{provider_name}'"
+        ) from e
+
+
+@router.get(path="/{provider_name}/models/{model_id:path}", response_model=AIModel)
+async def get_provider_model(provider_name: str, model_id: str) -> AIModel:
+    """Get a single AI model from a specific provider."""
+    try:
+        return await provider_service.aget_model(provider_name, model_id)
+    except Exception as e:
+        raise to_http_exception(
+            e, f"retrieving model '{model_id}' from provider '{provider_name}'"
+        ) from e
+
+
+@router.delete(path="/models/cache", response_model=list[str])
+async def invalidate_model_cache(provider_name: str | None = None) -> list[str]:
+    """Drop cached model catalogs (all, or one provider's) so they are refetched."""
+    try:
+        return list(provider_service.invalidate_model_cache(provider_name))
+    except Exception as e:
+        raise to_http_exception(e, "invalidating the model cache") from e
 
 
 @router.get(path="/models", response_model=list[AIModel])
@@ -49,7 +68,29 @@ async def get_all_models(
 ) -> list[AIModel]:
     """Get a list of available AI models."""
     try:
-        return provider_service.get_available_models(limit, type_filter)
+        return await provider_service.aget_available_models(limit, type_filter)
     except Exception as e:
-        logger.error("Error retrieving models", exc_info=True, extra={"error": str(e)})
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise to_http_exception(e, "retrieving models") from e
+
+
+@router.get(path="/catalog", response_model=ModelCatalog)
+async def get_model_catalog(
+    limit: int | None = None, type_filter: AIModelType | None = None
+) -> ModelCatalog:
+    """Get the available AI models along with the status of each provider."""
+    try:
+        return await provider_service.aget_model_catalog(limit, type_filter)
+    except Exception as e:
+        raise to_http_exception(e, "retrieving the model catalog") from e
+
+
+@router.get(path="/scheduler", response_model=list[LaneStats])
+async def get_scheduler_stats() -> list[LaneStats]:
+    """Get the load and queue times of each provider's request scheduler lane."""
+    return provider_scheduler.stats()
+
+
+@router.get(path="/routes", response_model=list[RouteStats])
+async def get_route_stats() -> list[RouteStats]:
+    """Get the observed latency and error rate of each model routing target."""
+    return model_router.stats()
@@ -0,0 +1,27 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from src.api.http_errors import to_http_exception
+from src.config import settings
+from src.models import SearchHit
+from src.services import conversation_service
+
+router = APIRouter(tags=["search"])
+
+
+@router.get(path="/search", response_model=list[SearchHit])
+async def search(
+    q: Annotated[str, Query(min_length=1)],
+    k: Annotated[int, Query(ge=1, le=settings.SEARCH_MAX_RESULTS)] = 10,
+) -> list[SearchHit]:
+    """Find the stored messages most similar in meaning to a query.
+
+    Messages are indexed as threads are stored and continued, when
+    `SEARCH_INDEX_MESSAGES` is enabled; matches are ranked by the cosine
+    similarity of their embedding to the query's.
+    """
+    try:
+        return await conversation_service.asearch_messages(q, k)
+    except Exception as e:
+        raise to_http_exception(e, "searching messages") from e
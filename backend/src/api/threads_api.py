@@ -0,0 +1,36 @@
+from fastapi import APIRouter, status
+
+from src.api.http_errors import to_http_exception
+from src.models import MessageThread
+from src.services import conversation_service
+
+router = APIRouter(prefix="/threads", tags=["threads"])
+
+
+@router.post(
+    path="/", response_model=MessageThread, status_code=status.HTTP_201_CREATED
+)
+async def create_thread(thread: MessageThread) -> MessageThread:
+    """Store a new message thread; continue it with `POST /converse/{thread_id}`."""
+    try:
+        return await conversation_service.acreate_thread(thread)
+    except Exception as e:
+        raise to_http_exception(e, "creating a thread") from e
+
+
+@router.get(path="/{thread_id}", response_model=MessageThread)
+async def get_thread(thread_id: str) -> MessageThread:
+    """Get a stored message thread with its full history."""
+    try:
+        return await conversation_service.aget_thread(thread_id)
+    except Exception as e:
+        raise to_http_exception(e, f"retrieving thread '{thread_id}'") from e
+
+
+@router.delete(path="/{thread_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_thread(thread_id: str) -> None:
+    """Delete a stored message thread."""
+    try:
+        await conversation_service.adelete_thread(thread_id)
+    except Exception as e:
+        raise to_http_exception(e, f"deleting thread '{thread_id}'") from e
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from src.models import ToolDefinition
+from src.services.tool_registry import tool_registry
+
+router = APIRouter(prefix="/tools", tags=["tools"])
+
+
+@router.get(path="/")
+async def list_tools() -> list[ToolDefinition]:
+    """List the tools registered on the server, which conversations may offer."""
+    return tool_registry.definitions()
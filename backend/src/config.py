@@ -19,6 +19,139 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_FILE: str = "logs/app.log"
+    LOG_JSON: bool = True  # Write records as JSON lines rather than LOG_FORMAT
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered for the writer; more are dropped
+    LOG_ROTATION: str = "size"  # Rotate the log file by "size" or by "time"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024  # File size triggering a "size" rotation
+    LOG_ROTATE_WHEN: str = "midnight"  # When a "time" rotation happens
+    LOG_BACKUP_COUNT: int = 5  # Rotated files kept
+    LOG_SAMPLE_RATES: dict[str, float] = {  # Share of INFO lines kept, by prefix
+        "Retrieving models from provider": 0.1,
+        "Retrieved ": 0.1,
+    }
+
+    # Metrics settings
+    METRICS_ENABLED: bool = True  # Serve /metrics and time every HTTP request
+
+    # Tracing settings
+    TRACING_ENABLED: bool = False  # Record spans across the request path
+    TRACING_EXPORTERS: list[str] = ["file"]  # Any of "console" and "file"
+    TRACING_FILE: str = "logs/traces.jsonl"  # JSON lines written by "file"
+
+    # HTTP client settings
+    HTTP_CONNECT_TIMEOUT: float = 5.0  # Seconds to establish a connection
+    HTTP_READ_TIMEOUT: float = 120.0  # Seconds to wait between bytes received
+    HTTP_POOL_SIZE: int = 16  # Maximum pooled connections per host
+    HTTP_POOL_HOSTS: int = 8  # Number of per-host pools to keep
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0  # Seconds an idle connection is kept
+
+    # Provider settings
+    PROVIDER_TIMEOUT: float = 10.0  # Per-provider deadline (seconds) for listings
+
+    # Resilience settings
+    RETRY_MAX_ATTEMPTS: int = 3  # Attempts per provider call, including the first
+    RETRY_BASE_DELAY: float = 0.5  # Seconds; doubled on every retry
+    RETRY_MAX_DELAY: float = 8.0  # Longest backoff (or Retry-After) we will wait
+    RETRY_BUDGET_RATIO: float = 0.2  # Retries allowed per call, on average
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures opening a circuit
+    CIRCUIT_RESET_TIMEOUT: float = 30.0  # Seconds before a half-open probe
+
+    # Routing settings
+    MODEL_ROUTES: dict[str, dict[str, float]] = {}  # Alias: {"provider/id": weight}
+    ROUTING_STRATEGY: str = "latency"  # "ordered" (as configured) or "latency"
+
+    # Hedging settings (interactive async requests only)
+    HEDGE_ENABLED: bool = False  # Duplicate slow calls to a secondary target
+    HEDGE_PERCENTILE: float = 0.95  # Latency percentile after which to hedge
+    HEDGE_DEFAULT_DELAY: float = 2.0  # Seconds, until enough latencies are seen
+    HEDGE_MIN_SAMPLES: int = 20  # Latencies needed to use the percentile
+    HEDGE_LATENCY_WINDOW: int = 200  # Latencies kept per model
+    HEDGE_BUDGET_RATIO: float = 0.05  # Hedges allowed per call, per model
+
+    # Health monitor settings
+    HEALTH_CHECK_INTERVAL: float = 30.0  # Seconds between provider probes
+    HEALTH_CHECK_TIMEOUT: float = 5.0  # Seconds before a probe counts as failed
+    HEALTH_FAILURE_THRESHOLD: int = 2  # Consecutive failed probes marking it down
+    HEALTH_LATENCY_WINDOW: int = 100  # Probe latencies kept for percentiles
+
+    # Scheduler settings
+    SCHEDULER_DEFAULT_LIMIT: int = 16  # Concurrent requests per provider
+    SCHEDULER_PROVIDER_LIMITS: dict[str, int] = {"LM Studio": 2}  # By provider
+    SCHEDULER_MODEL_LIMITS: dict[str, int] = {}  # By "provider/model id"
+    SCHEDULER_MAX_QUEUE: int = 32  # Requests waiting per lane before 503s
+
+    # Rate limit settings (refined per model by x-ratelimit-* headers)
+    RATE_LIMIT_DEFAULT_RPM: int = 500  # Requests per minute per model
+    RATE_LIMIT_DEFAULT_TPM: int = 200_000  # Tokens per minute per model
+    RATE_LIMIT_MAX_WAIT: float = 30.0  # Longest (seconds) a call is paced
+    RATE_LIMIT_COMPLETION_TOKENS: int = 1024  # Estimated reply size per call
+
+    # Model catalog cache settings
+    MODEL_CACHE_TTL: float = 300.0  # Seconds a catalog is served as fresh
+    MODEL_CACHE_STALE_TTL: float = 3600.0  # Seconds a stale catalog is served
+
+    # Context window settings
+    CONTEXT_STRATEGY: str = "sliding_window"  # sliding_window|keep_first|summarize
+    CONTEXT_DEFAULT_LIMIT: int = 8192  # Tokens, for models of unknown size
+    CONTEXT_LIMITS: dict[str, int] = {  # Tokens, by model id prefix
+        "gpt-4.1": 1_047_576,
+        "gpt-4o": 128_000,
+        "gpt-4-turbo": 128_000,
+        "gpt-4": 8_192,
+        "gpt-3.5-turbo": 16_385,
+        "o1": 200_000,
+        "o3": 200_000,
+        "o4": 200_000,
+    }
+    CONTEXT_RESPONSE_RESERVE: int = 1024  # Tokens kept free for the reply
+    CONTEXT_SUMMARY_TOKENS: int = 512  # Tokens set aside for a summary
+
+    # Response cache settings
+    RESPONSE_CACHE_ENABLED: bool = False  # Opt in to reusing identical replies
+    RESPONSE_CACHE_TTL: float = 86400.0  # Seconds a cached reply is served
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512  # Replies kept in memory
+    RESPONSE_CACHE_DIR: str = "database/response_cache"  # Empty: memory only
+    RESPONSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # Disk tier size bound
+    COALESCE_GENERATIONS: bool = False  # Share identical in-flight generations
+
+    # Embedding settings
+    EMBEDDING_BATCH_SIZE: int = 64  # Texts sent in one upstream embedding call
+    EMBEDDING_BATCH_WAIT: float = 0.005  # Seconds a text waits for others to join
+    EMBEDDING_MAX_TEXTS: int = 2048  # Texts accepted in one embed request
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 50_000  # Vectors kept in memory
+    EMBEDDING_CACHE_PATH: str = "database/embeddings.db"  # Empty: memory only
+
+    # Vector index and search settings
+    VECTOR_INDEX_TYPE: str = "flat"  # "flat" (exact) or "ivf" (approximate)
+    VECTOR_INDEX_DIR: str = "database/vector_index"  # Empty: memory only
+    VECTOR_INDEX_LISTS: int = 1024  # Clusters of the "ivf" index
+    VECTOR_INDEX_PROBES: int = 16  # Clusters scanned per "ivf" search
+    SEARCH_INDEX_MESSAGES: bool = False  # Opt in to embedding stored messages
+    SEARCH_EMBEDDING_MODEL: str = "OpenAI/text-embedding-3-small"  # provider/model
+    SEARCH_MAX_RESULTS: int = 100  # Matches returned by one search at most
+
+    # Retrieval-augmented generation settings
+    RAG_TOP_K: int = 5  # Snippets retrieved per source at most
+    RAG_MAX_TOKENS: int = 1024  # Token budget of the context injected in a prompt
+    RAG_MIN_SCORE: float = 0.3  # Cosine similarity a snippet needs to be injected
+    RAG_CHUNK_TOKENS: int = 256  # Target size of document chunks
+    RAG_CHUNK_OVERLAP: int = 32  # Tokens repeated between consecutive chunks
+    RAG_DOCUMENT_DB_PATH: str = "database/documents.db"
+    RAG_DOCUMENT_INDEX_DIR: str = "database/document_index"  # Empty: memory only
+
+    # Server-side tool loop settings
+    TOOL_MAX_STEPS: int = 8  # Model calls made for one request at most
+    TOOL_TIMEOUT: float = 30.0  # Seconds a tool call may run, unless set per tool
+    TOOL_MAX_PARALLEL: int = 8  # Tool calls of a turn run at once
+
+    # Batch settings
+    BATCH_MAX_JOBS: int = 1000  # Jobs accepted in one batch request
+    BATCH_PROVIDER_CONCURRENCY: int = 8  # Jobs run at once per provider
+    BULK_MAX_THREADS: int = 50_000  # Threads accepted in one bulk job
+    BULK_FINISHED_JOBS: int = 64  # Finished bulk jobs kept with their results
+
+    # Conversation store settings
+    CONVERSATION_DB_PATH: str = "database/conversations.db"
 
 
 settings = Settings()
@@ -1,10 +1,46 @@
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.endpoints import router
+from src.api.middleware import (
+    MetricsMiddleware,
+    RequestContextMiddleware,
+    TracingMiddleware,
+)
 from src.config import settings
+from src.services.embedding_cache import embedding_cache
+from src.services.health_monitor import health_monitor
+from src.services.provider_registry import provider_registry
+from src.services.retrieval_service import document_index, document_store
+from src.services.search_service import vector_index
+from src.services.thread_store import conversation_store
+from src.utils import http_client, log_pipeline
+from src.utils.tracing import tracer
+
 
-app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG)
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator[None]:
+    """Build long-lived resources on startup and release them on shutdown."""
+    log_pipeline.start()  # Again, if an earlier shutdown stopped it
+    provider_registry.load()
+    health_monitor.start()
+    yield
+    await health_monitor.astop()
+    await provider_registry.aclose()
+    await http_client.aclose()
+    conversation_store.close()
+    embedding_cache.close()
+    vector_index.close()
+    document_store.close()
+    document_index.close()
+    tracer.shutdown()
+    log_pipeline.stop()
+
+
+app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -15,6 +51,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time every request, when metrics are enabled, and trace it
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+# Tag every request with an id, bound to the records it logs; added last,
+# so it is the outermost middleware and the ones inside log with the id
+app.add_middleware(RequestContextMiddleware)
+
 # Include routers
 app.include_router(router, prefix="/api/v1")
 
@@ -1,24 +1,70 @@
 from src.models.ai_models import AIModel, AIModelType
+from src.models.bulk import BulkJob, BulkJobResult, BulkJobState
+from src.models.catalog import ModelCatalog, ProviderState, ProviderStatus
+from src.models.conversation_store import ConversationStore
+from src.models.document_store import DocumentStore
+from src.models.documents import Document, DocumentInfo
+from src.models.embeddings import EmbeddingEncoding, EmbeddingResponse
+from src.models.errors import AlreadyExistsError, NotFoundError
+from src.models.health import HealthState, ProviderHealth
 from src.models.messages import (
     AgentMessage,
+    AgentMessageDelta,
     Message,
     MessageRole,
     MessageThread,
+    ToolDefinition,
     ToolRequest,
+    ToolRequestDelta,
     ToolResponse,
     UserMessage,
 )
-from src.models.provider import Provider
+from src.models.provider import BatchProvider, Provider
+from src.models.retrieval import RetrievalOptions, RetrievalSource, Snippet
+from src.models.routing import RouteStats
+from src.models.scheduling import LaneStats, Priority
+from src.models.search import SearchHit
+from src.models.tools import ToolOptions
+from src.models.vector_index import VectorIndex
 
 __all__ = [
     "AIModel",
     "AIModelType",
     "AgentMessage",
+    "AgentMessageDelta",
+    "AlreadyExistsError",
+    "BatchProvider",
+    "BulkJob",
+    "BulkJobResult",
+    "BulkJobState",
+    "ConversationStore",
+    "Document",
+    "DocumentInfo",
+    "DocumentStore",
+    "EmbeddingEncoding",
+    "EmbeddingResponse",
+    "HealthState",
+    "LaneStats",
     "Message",
     "MessageRole",
     "MessageThread",
+    "ModelCatalog",
+    "NotFoundError",
+    "Priority",
     "Provider",
+    "ProviderHealth",
+    "ProviderState",
+    "ProviderStatus",
+    "RetrievalOptions",
+    "RetrievalSource",
+    "RouteStats",
+    "SearchHit",
+    "Snippet",
+    "ToolDefinition",
+    "ToolOptions",
     "ToolRequest",
+    "ToolRequestDelta",
     "ToolResponse",
     "UserMessage",
+    "VectorIndex",
 ]
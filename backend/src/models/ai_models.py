@@ -26,6 +26,10 @@ class AIModel(BaseModel):
         default=None,
         description="Optional alias for the AI model.",
     )
+    context_length: int | None = Field(
+        default=None,
+        description="Maximum number of tokens the model can attend to, if known.",
+    )
 
 
 class InferenceParameters(BaseModel):
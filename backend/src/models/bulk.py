@@ -0,0 +1,65 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from src.models.messages import AgentMessage
+
+
+class BulkJobState(str, Enum):
+    """Enum for the lifecycle of a bulk job, mirroring provider batch states."""
+
+    VALIDATING = "validating"
+    IN_PROGRESS = "in_progress"
+    FINALIZING = "finalizing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"
+    CANCELLING = "cancelling"
+    CANCELLED = "cancelled"
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has reached a final state."""
+        return self in {
+            BulkJobState.COMPLETED,
+            BulkJobState.FAILED,
+            BulkJobState.EXPIRED,
+            BulkJobState.CANCELLED,
+        }
+
+
+class BulkJobResult(BaseModel):
+    """The outcome of one thread of a bulk job."""
+
+    thread_id: str = Field(..., description="The id of the thread answered.")
+    message: AgentMessage | None = Field(
+        default=None,
+        description="The agent's reply, if the request succeeded.",
+    )
+    error: str | None = Field(
+        default=None,
+        description="Error message if the request failed.",
+    )
+
+
+class BulkJob(BaseModel):
+    """A bulk, non-interactive converse job run by a provider's batch API."""
+
+    id: str = Field(..., description="The provider's identifier for the job.")
+    provider: str = Field(..., description="The provider running the job.")
+    state: BulkJobState = Field(..., description="The job's lifecycle state.")
+    total: int = Field(default=0, description="Number of requests in the job.")
+    completed: int = Field(default=0, description="Requests completed so far.")
+    failed: int = Field(default=0, description="Requests failed so far.")
+    output_file_id: str | None = Field(
+        default=None,
+        description="The provider file holding successful results, once ready.",
+    )
+    error_file_id: str | None = Field(
+        default=None,
+        description="The provider file holding failed requests, once ready.",
+    )
+    results: list[BulkJobResult] = Field(
+        default_factory=list[BulkJobResult],
+        description="Per-thread results, once the job has finished.",
+    )
@@ -0,0 +1,46 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from src.models.ai_models import AIModel
+
+
+class ProviderState(str, Enum):
+    """Enum for the outcome of querying a provider."""
+
+    OK = "ok"
+    TIMED_OUT = "timed_out"
+    ERROR = "error"
+    DOWN = "down"  # Skipped, as the health monitor reports it down
+
+
+class ProviderStatus(BaseModel):
+    """The outcome of querying a single provider for its models."""
+
+    name: str = Field(..., description="Name of the provider.")
+    state: ProviderState = Field(..., description="Outcome of the provider query.")
+    model_count: int = Field(
+        default=0,
+        description="Number of models returned by the provider.",
+    )
+    elapsed_ms: float = Field(
+        default=0.0,
+        description="Time spent querying the provider, in milliseconds.",
+    )
+    error: str | None = Field(
+        default=None,
+        description="Error message if the provider query failed.",
+    )
+
+
+class ModelCatalog(BaseModel):
+    """Models gathered from every provider, with a per-provider status block."""
+
+    models: list[AIModel] = Field(
+        default_factory=list[AIModel],
+        description="The models returned by the providers that responded.",
+    )
+    providers: list[ProviderStatus] = Field(
+        default_factory=list[ProviderStatus],
+        description="The outcome of querying each provider.",
+    )
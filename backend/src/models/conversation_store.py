@@ -0,0 +1,134 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from src.models.errors import NotFoundError
+from src.models.messages import Message, MessageThread
+
+
+class ConversationStore(ABC):
+    """Abstract base class for persistent message thread storage.
+
+    Threads are append-only: once stored, messages are never rewritten, so a
+    new turn only costs the messages it adds.
+    """
+
+    def close(self) -> None:  # noqa: B027
+        """Release any resources (connections, file handles) held by the store.
+
+        Subclasses holding long-lived resources should override this method.
+        """
+
+    @abstractmethod
+    def create(self, thread: MessageThread) -> MessageThread:
+        """Store a new message thread.
+
+        Args:
+            thread (MessageThread): The thread to store, with any initial messages.
+
+        Returns:
+            MessageThread: The stored thread.
+
+        Raises:
+            AlreadyExistsError: If a thread with the same id already exists.
+        """
+
+    @abstractmethod
+    def get(self, thread_id: str) -> MessageThread:
+        """Retrieve a message thread with its full history.
+
+        Args:
+            thread_id (str): The id of the thread to retrieve.
+
+        Returns:
+            MessageThread: The stored thread.
+
+        Raises:
+            NotFoundError: If the thread is not found.
+        """
+
+    @abstractmethod
+    def append(self, thread_id: str, messages: Sequence[Message]) -> int:
+        """Append messages to the end of a message thread.
+
+        The messages are appended atomically: either all of them are stored or
+        none are.
+
+        Args:
+            thread_id (str): The id of the thread to append to.
+            messages (Sequence[Message]): The messages to append, in order.
+
+        Returns:
+            int: The position of the first appended message in the thread,
+                as of the append; concurrent appends get distinct positions.
+
+        Raises:
+            NotFoundError: If the thread is not found.
+        """
+
+    @abstractmethod
+    def delete(self, thread_id: str) -> None:
+        """Delete a message thread and its history.
+
+        Args:
+            thread_id (str): The id of the thread to delete.
+
+        Raises:
+            NotFoundError: If the thread is not found.
+        """
+
+    def get_message(self, thread_id: str, index: int) -> Message:
+        """Retrieve a single message of a thread by its position.
+
+        Defaults to loading the whole thread; stores able to read a single
+        message should override it.
+
+        Args:
+            thread_id (str): The id of the thread.
+            index (int): The position of the message in the thread.
+
+        Returns:
+            Message: The stored message.
+
+        Raises:
+            NotFoundError: If the thread or the message is not found.
+        """
+        messages: list[Message] = self.get(thread_id).messages
+        if not 0 <= index < len(messages):
+            raise NotFoundError(f"Message {index} of thread '{thread_id}' not found.")
+        return messages[index]
+
+    async def acreate(self, thread: MessageThread) -> MessageThread:
+        """Asynchronously store a new message thread.
+
+        Defaults to running `create` in a worker thread.
+        """
+        return await asyncio.to_thread(self.create, thread)
+
+    async def aget(self, thread_id: str) -> MessageThread:
+        """Asynchronously retrieve a message thread with its full history.
+
+        Defaults to running `get` in a worker thread.
+        """
+        return await asyncio.to_thread(self.get, thread_id)
+
+    async def aget_message(self, thread_id: str, index: int) -> Message:
+        """Asynchronously retrieve a single message of a thread by its position.
+
+        Defaults to running `get_message` in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_message, thread_id, index)
+
+    async def aappend(self, thread_id: str, messages: Sequence[Message]) -> int:
+        """Asynchronously append messages to the end of a message thread.
+
+        Defaults to running `append` in a worker thread.
+        """
+        return await asyncio.to_thread(self.append, thread_id, messages)
+
+    async def adelete(self, thread_id: str) -> None:
+        """Asynchronously delete a message thread and its history.
+
+        Defaults to running `delete` in a worker thread.
+        """
+        await asyncio.to_thread(self.delete, thread_id)
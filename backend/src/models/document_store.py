@@ -0,0 +1,82 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from src.models.documents import Document, DocumentInfo
+
+
+class DocumentStore(ABC):
+    """Abstract base class for the storage of chunked documents.
+
+    Documents are stored as the chunks they were split into, so retrieval
+    reads back only the chunks that matched a query.
+    """
+
+    def close(self) -> None:  # noqa: B027
+        """Release any resources (connections, file handles) held by the store.
+
+        Subclasses holding long-lived resources should override this method.
+        """
+
+    @abstractmethod
+    def create(self, document: Document, chunks: Sequence[str]) -> DocumentInfo:
+        """Store a new document as its chunks.
+
+        Args:
+            document (Document): The document to store.
+            chunks (Sequence[str]): The chunks of its text, in order.
+
+        Returns:
+            DocumentInfo: The stored document.
+
+        Raises:
+            AlreadyExistsError: If a document with the same id already exists.
+        """
+
+    @abstractmethod
+    def get_chunks(self, keys: Sequence[tuple[str, int]]) -> dict[tuple[str, int], str]:
+        """Retrieve chunks of documents by their positions.
+
+        Args:
+            keys (Sequence[tuple[str, int]]): Document ids and chunk positions.
+
+        Returns:
+            dict[tuple[str, int], str]: The chunks found, by key.
+        """
+
+    @abstractmethod
+    def delete(self, document_id: str) -> int:
+        """Delete a document and its chunks.
+
+        Args:
+            document_id (str): The id of the document to delete.
+
+        Returns:
+            int: The number of chunks the document had.
+
+        Raises:
+            NotFoundError: If the document is not found.
+        """
+
+    async def acreate(self, document: Document, chunks: Sequence[str]) -> DocumentInfo:
+        """Asynchronously store a new document as its chunks.
+
+        Defaults to running `create` in a worker thread.
+        """
+        return await asyncio.to_thread(self.create, document, chunks)
+
+    async def aget_chunks(
+        self, keys: Sequence[tuple[str, int]]
+    ) -> dict[tuple[str, int], str]:
+        """Asynchronously retrieve chunks of documents by their positions.
+
+        Defaults to running `get_chunks` in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_chunks, keys)
+
+    async def adelete(self, document_id: str) -> int:
+        """Asynchronously delete a document and its chunks.
+
+        Defaults to running `delete` in a worker thread.
+        """
+        return await asyncio.to_thread(self.delete, document_id)
@@ -0,0 +1,28 @@
+from datetime import datetime
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+
+class Document(BaseModel):
+    """A document uploaded as knowledge for retrieval-augmented generation."""
+
+    id: str = Field(
+        default_factory=lambda: uuid4().hex,
+        description="The unique identifier for the document.",
+        frozen=True,
+    )
+    title: str = Field(default="Untitled", description="The title of the document.")
+    text: str = Field(..., min_length=1, description="The content of the document.")
+
+
+class DocumentInfo(BaseModel):
+    """A stored document, without its content."""
+
+    id: str = Field(..., description="The unique identifier for the document.")
+    title: str = Field(..., description="The title of the document.")
+    chunks: int = Field(..., description="The number of chunks it was split into.")
+    created_at: str = Field(
+        default_factory=lambda: datetime.now().isoformat(),
+        description="The timestamp of when the document was stored.",
+    )
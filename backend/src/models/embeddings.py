@@ -0,0 +1,30 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class EmbeddingEncoding(str, Enum):
+    """How embedding vectors are encoded in a JSON response.
+
+    - FLOAT: As arrays of numbers.
+    - BASE64: As base64 of their little-endian float32 bytes, i.e.
+        `numpy.frombuffer(base64.b64decode(vector), dtype="<f4")`.
+    """
+
+    FLOAT = "float"
+    BASE64 = "base64"
+
+
+class EmbeddingResponse(BaseModel):
+    """The embeddings of a batch of texts."""
+
+    model: str = Field(..., description="The embedding model used.")
+    provider: str = Field(..., description="The provider of the model.")
+    dimensions: int = Field(..., description="The length of each vector.")
+    encoding: EmbeddingEncoding = Field(
+        default=EmbeddingEncoding.FLOAT,
+        description="How the vectors are encoded.",
+    )
+    embeddings: list[list[float]] | list[str] = Field(
+        ..., description="One vector per input text, in order."
+    )
@@ -0,0 +1,6 @@
+class NotFoundError(ValueError):
+    """Raised when a requested thread, document, model or tool does not exist."""
+
+
+class AlreadyExistsError(ValueError):
+    """Raised when creating a thread, document or tool whose id is taken."""
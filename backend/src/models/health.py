@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class HealthState(str, Enum):
+    """Enum for the health of a provider, as seen by the health monitor."""
+
+    UNKNOWN = "unknown"
+    UP = "up"
+    DOWN = "down"
+
+
+class ProviderHealth(BaseModel):
+    """Probe results and latency percentiles of a single provider."""
+
+    name: str = Field(..., description="Name of the provider.")
+    state: HealthState = Field(
+        default=HealthState.UNKNOWN, description="Up or down, once probed."
+    )
+    checked_at: datetime | None = Field(
+        default=None, description="When the provider was last probed."
+    )
+    consecutive_failures: int = Field(
+        default=0, description="Failed probes since the last success."
+    )
+    samples: int = Field(default=0, description="Probe latencies in the window.")
+    latency_p50_ms: float | None = Field(
+        default=None, description="Median probe latency, in milliseconds."
+    )
+    latency_p95_ms: float | None = Field(
+        default=None, description="95th percentile probe latency, in milliseconds."
+    )
+    latency_p99_ms: float | None = Field(
+        default=None, description="99th percentile probe latency, in milliseconds."
+    )
+    error: str | None = Field(
+        default=None, description="Error of the last failed probe, if any."
+    )
@@ -2,6 +2,7 @@ import json
 from collections.abc import Mapping
 from datetime import datetime
 from enum import Enum
+from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
@@ -22,6 +23,31 @@ class MessageRole(str, Enum):
     AGENT = "assistant"
 
 
+class ToolDefinition(BaseModel):
+    """A tool a model may call, described so the model knows how to call it.
+
+    Attributes:
+        name (str): The name the model calls the tool by.
+        description (str): What the tool does and when to use it.
+        parameters (dict[str, SERIALIZABLE]): A JSON Schema of the tool's
+            arguments object.
+    """
+
+    name: str = Field(
+        ...,
+        pattern=r"^[a-zA-Z0-9_-]{1,64}$",
+        description="The name the model calls the tool by.",
+    )
+    description: str = Field(
+        default="",
+        description="What the tool does and when to use it.",
+    )
+    parameters: dict[str, SERIALIZABLE] = Field(
+        default_factory=lambda: {"type": "object", "properties": {}},
+        description="A JSON Schema of the tool's arguments object.",
+    )
+
+
 class ToolRequest(BaseModel):
     """A request to use a tool.
 
@@ -181,9 +207,78 @@ class AgentMessage(Message):
     )
 
 
+class ToolRequestDelta(BaseModel):
+    """An incremental fragment of a tool request streamed by the agent.
+
+    Fragments sharing the same index belong to the same tool request; the
+    identifier and name arrive once, while the arguments arrive as pieces of a
+    JSON string that must be concatenated before decoding.
+
+    Attributes:
+        index (int): The position of the tool request within the message.
+        id (str | None): The unique identifier for the tool request, if present.
+        name (str | None): The name of the tool to be used, if present.
+        arguments (str | None): A fragment of the JSON-encoded arguments.
+    """
+
+    index: int = Field(
+        default=0,
+        description="The position of the tool request within the message.",
+    )
+    id: str | None = Field(
+        default=None,
+        description="The unique identifier for the tool request, if present.",
+    )
+    name: str | None = Field(
+        default=None,
+        description="The name of the tool to be used, if present.",
+    )
+    arguments: str | None = Field(
+        default=None,
+        description="A fragment of the JSON-encoded arguments.",
+    )
+
+
+class AgentMessageDelta(BaseModel):
+    """An incremental fragment of an agent message.
+
+    Streaming providers emit a sequence of deltas whose fields, concatenated in
+    order, make up the final agent message. The last delta carries the reason
+    the generation finished.
+
+    Attributes:
+        content (str | None): A fragment of the message content.
+        reasoning_content (str | None): A fragment of the reasoning content.
+        tool_requests (list[ToolRequestDelta]): Fragments of tool requests.
+        finish_reason (str | None): Why the generation finished, on the last delta.
+    """
+
+    content: str | None = Field(
+        default=None,
+        description="A fragment of the message content.",
+    )
+    reasoning_content: str | None = Field(
+        default=None,
+        description="A fragment of the reasoning content.",
+    )
+    tool_requests: list[ToolRequestDelta] = Field(
+        default_factory=list[ToolRequestDelta],
+        description="Fragments of tool requests.",
+    )
+    finish_reason: str | None = Field(
+        default=None,
+        description="Why the generation finished, set on the last delta.",
+    )
+
+
 class MessageThread(BaseModel):
     """A thread of messages in a conversation."""
 
+    id: str = Field(
+        default_factory=lambda: uuid4().hex,
+        description="The unique identifier for the message thread.",
+        frozen=True,
+    )
     title: str = Field(
         default="New Thread",
         description="The title of the message thread.",
@@ -196,3 +291,7 @@ class MessageThread(BaseModel):
         default_factory=lambda: datetime.now().isoformat(),
         description="The timestamp of when the thread was last modified.",
     )
+    tools: list[ToolDefinition] = Field(
+        default_factory=list[ToolDefinition],
+        description="The tools the model may call; not stored with the thread.",
+    )
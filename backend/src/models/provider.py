@@ -1,6 +1,18 @@
+import asyncio
+import json
 from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, Sequence
 
-from src.models import AgentMessage, AIModel, AIModelType, MessageThread
+from src.models import (
+    AgentMessage,
+    AgentMessageDelta,
+    AIModel,
+    AIModelType,
+    BulkJob,
+    BulkJobResult,
+    MessageThread,
+    ToolRequestDelta,
+)
 
 
 class Provider(ABC):
@@ -18,8 +30,36 @@ class Provider(ABC):
     @property
     def connected(self) -> bool:
         """Status of the connection to the provider."""
-        models: list[AIModel] = self.get_models(limit=1)
-        return len(models) > 0
+        try:
+            self.ping()
+        except Exception:
+            return False
+        return True
+
+    def ping(self) -> None:
+        """Check that the provider is reachable, as cheaply as it allows.
+
+        Defaults to listing the models; providers with a cheaper request
+        should override it.
+
+        Raises:
+            Exception: If the provider cannot be reached or reports an error.
+        """
+        if not self.get_models(limit=1):
+            raise ConnectionError(f"Provider '{self._name}' reported no models.")
+
+    def close(self) -> None:  # noqa: B027
+        """Release any resources (clients, connection pools) held by the provider.
+
+        Subclasses holding long-lived resources should override this method.
+        """
+
+    async def aclose(self) -> None:
+        """Asynchronously release the resources held by the provider.
+
+        Defaults to `close`; providers holding async clients should override it.
+        """
+        self.close()
 
     @abstractmethod
     def get_models(
@@ -67,3 +107,179 @@ class Provider(ABC):
         raise NotImplementedError(
             "This method should be implemented by subclasses of Provider."
         )
+
+    def embed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        """Embed texts with an embedding model.
+
+        Providers serving embedding models should override this method.
+
+        Args:
+            model (AIModel): The embedding model to use.
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: One vector per text, in order.
+
+        Raises:
+            ValueError: If the provider does not support embeddings.
+        """
+        raise ValueError(f"Provider '{self._name}' does not support embeddings.")
+
+    async def aget_models(
+        self, limit: int | None = None, type_filter: AIModelType | None = None
+    ) -> list[AIModel]:
+        """Asynchronously retrieve a list of available AI models from the provider.
+
+        Defaults to running `get_models` in a worker thread so the event loop is
+        never blocked; providers with a native async client should override it.
+
+        Args:
+            limit (int): The maximum number of models to return.
+            type_filter (AIModelType): The type of models to retrieve.
+
+        Returns:
+            list[AIModel]: A list of AIModel instances
+                representing the available models.
+        """
+        return await asyncio.to_thread(self.get_models, limit, type_filter)
+
+    async def aping(self) -> None:
+        """Asynchronously check that the provider is reachable.
+
+        Defaults to running `ping` in a worker thread.
+
+        Raises:
+            Exception: If the provider cannot be reached or reports an error.
+        """
+        await asyncio.to_thread(self.ping)
+
+    async def aget_model(self, model_id: str) -> AIModel:
+        """Asynchronously retrieve an AIModel instance by its unique identifier.
+
+        Defaults to running `get_model` in a worker thread.
+
+        Args:
+            model_id (str): The unique identifier of the AI model to retrieve.
+
+        Returns:
+            AIModel: The AI model instance corresponding to the provided model_id.
+        """
+        return await asyncio.to_thread(self.get_model, model_id)
+
+    async def aconverse(
+        self, model: AIModel, message_thread: MessageThread
+    ) -> AgentMessage:
+        """Asynchronously send a message to the AI model and receive a response.
+
+        Defaults to running `converse` in a worker thread.
+
+        Args:
+            model (AIModel): The AI model to use for the conversation.
+            message_thread (MessageThread): The thread of messages to send.
+
+        Returns:
+            AgentMessage: The response message from the AI model.
+        """
+        return await asyncio.to_thread(self.converse, model, message_thread)
+
+    async def aembed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        """Asynchronously embed texts with an embedding model.
+
+        Defaults to running `embed` in a worker thread.
+
+        Args:
+            model (AIModel): The embedding model to use.
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: One vector per text, in order.
+        """
+        return await asyncio.to_thread(self.embed, model, texts)
+
+    async def converse_stream(
+        self, model: AIModel, message_thread: MessageThread
+    ) -> AsyncGenerator[AgentMessageDelta]:
+        """Stream the AI model's response as incremental deltas.
+
+        Defaults to awaiting `aconverse` and yielding the whole response as a
+        single delta; providers able to stream tokens should override it.
+
+        Args:
+            model (AIModel): The AI model to use for the conversation.
+            message_thread (MessageThread): The thread of messages to send.
+
+        Yields:
+            AgentMessageDelta: The response, fragment by fragment.
+        """
+        message: AgentMessage = await self.aconverse(model, message_thread)
+        yield AgentMessageDelta(
+            content=message.content,
+            reasoning_content=message.reasoning_content,
+            tool_requests=[
+                ToolRequestDelta(
+                    index=index,
+                    id=tool_request.id,
+                    name=tool_request.name,
+                    arguments=json.dumps(tool_request.arguments),
+                )
+                for index, tool_request in enumerate(message.tool_requests)
+            ],
+            finish_reason="tool_calls" if message.tool_requests else "stop",
+        )
+
+
+class BatchProvider(ABC):
+    """Capability of providers offering an asynchronous, bulk inference API.
+
+    Bulk jobs trade latency (results may take hours) for cost and throughput,
+    which suits evaluations and other offline work.
+    """
+
+    @abstractmethod
+    async def asubmit_batch(
+        self, model: AIModel, message_threads: Sequence[MessageThread]
+    ) -> BulkJob:
+        """Submit threads to be answered as a single bulk job.
+
+        Args:
+            model (AIModel): The AI model to answer the threads with.
+            message_threads (Sequence[MessageThread]): The threads to answer;
+                their ids identify the results.
+
+        Returns:
+            BulkJob: The submitted job.
+        """
+        raise NotImplementedError(
+            "This method should be implemented by subclasses of BatchProvider."
+        )
+
+    @abstractmethod
+    async def aget_batch(self, job_id: str) -> BulkJob:
+        """Retrieve the current state of a bulk job.
+
+        Args:
+            job_id (str): The provider's identifier for the job.
+
+        Returns:
+            BulkJob: The job, without results.
+
+        Raises:
+            NotFoundError: If the job is not found.
+        """
+        raise NotImplementedError(
+            "This method should be implemented by subclasses of BatchProvider."
+        )
+
+    @abstractmethod
+    async def afetch_batch_results(self, job: BulkJob) -> list[BulkJobResult]:
+        """Download and parse the results of a finished bulk job.
+
+        Args:
+            job (BulkJob): The finished job.
+
+        Returns:
+            list[BulkJobResult]: One result per answered (or failed) thread.
+        """
+        raise NotImplementedError(
+            "This method should be implemented by subclasses of BatchProvider."
+        )
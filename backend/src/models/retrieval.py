@@ -0,0 +1,50 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class RetrievalSource(str, Enum):
+    """Where snippets are retrieved from to augment a prompt.
+
+    - MESSAGES: Messages of stored threads, as indexed for search.
+    - DOCUMENTS: Chunks of uploaded documents.
+    """
+
+    MESSAGES = "messages"
+    DOCUMENTS = "documents"
+
+
+class RetrievalOptions(BaseModel):
+    """Per-request settings of retrieval-augmented generation.
+
+    Unset fields fall back to the `RAG_*` settings.
+    """
+
+    top_k: int | None = Field(
+        default=None, ge=1, description="Snippets retrieved per source at most."
+    )
+    max_tokens: int | None = Field(
+        default=None, ge=1, description="Token budget of the injected context."
+    )
+    min_score: float | None = Field(
+        default=None,
+        ge=-1.0,
+        le=1.0,
+        description="Cosine similarity a snippet needs to be injected.",
+    )
+    sources: list[RetrievalSource] = Field(
+        default_factory=lambda: list(RetrievalSource),
+        min_length=1,
+        description="The sources to retrieve snippets from.",
+    )
+
+
+class Snippet(BaseModel):
+    """A piece of text retrieved as context for a prompt."""
+
+    source: RetrievalSource = Field(..., description="Where the text comes from.")
+    id: str = Field(..., description="The text's id in its source's vector index.")
+    text: str = Field(..., description="The retrieved text.")
+    score: float = Field(
+        ..., description="Cosine similarity between the text and the query."
+    )
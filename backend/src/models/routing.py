@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+
+class RouteStats(BaseModel):
+    """Observed performance of one (provider, model) routing target."""
+
+    provider: str = Field(..., description="The provider serving the target.")
+    model: str = Field(..., description="The model id at the provider.")
+    successes: int = Field(default=0, description="Calls that succeeded.")
+    failures: int = Field(default=0, description="Calls that failed.")
+    latency_ms: float | None = Field(
+        default=None, description="Moving average latency of successful calls."
+    )
+    error_rate: float = Field(
+        default=0.0, description="Moving average share of failed calls."
+    )
@@ -0,0 +1,32 @@
+from enum import IntEnum
+
+from pydantic import BaseModel, Field
+
+
+class Priority(IntEnum):
+    """Enum for the scheduling class of a provider request.
+
+    Lower values are served first when requests queue for a provider.
+    - INTERACTIVE: A user is waiting on the response.
+    - BATCH: Offline work that can wait.
+    """
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class LaneStats(BaseModel):
+    """Load and queueing metrics of one scheduler lane (a provider or model)."""
+
+    name: str = Field(..., description="The provider, or provider/model, served.")
+    limit: int = Field(..., description="Requests allowed to run at once.")
+    active: int = Field(default=0, description="Requests running now.")
+    queued: int = Field(default=0, description="Requests waiting for a slot.")
+    admitted: int = Field(default=0, description="Requests admitted so far.")
+    rejected: int = Field(default=0, description="Requests rejected on overflow.")
+    avg_queue_ms: float = Field(
+        default=0.0, description="Mean time admitted requests spent queued."
+    )
+    max_queue_ms: float = Field(
+        default=0.0, description="Longest time a request spent queued."
+    )
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field, SerializeAsAny
+
+from src.models.messages import Message
+
+
+class SearchHit(BaseModel):
+    """A stored message matching a semantic search."""
+
+    thread_id: str = Field(..., description="The id of the message's thread.")
+    index: int = Field(..., description="The position of the message in its thread.")
+    score: float = Field(
+        ..., description="Cosine similarity between the message and the query."
+    )
+    message: SerializeAsAny[Message] | None = Field(
+        default=None,
+        description="The message, unless it was deleted since it was indexed.",
+    )
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class ToolOptions(BaseModel):
+    """Per-request settings of the server-side tool loop.
+
+    Unset fields fall back to the `TOOL_*` settings.
+    """
+
+    names: list[str] = Field(
+        ..., min_length=1, description="The registered tools the model may call."
+    )
+    max_steps: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Model calls made for the request at most; capped by TOOL_MAX_STEPS."
+        ),
+    )
@@ -0,0 +1,90 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+
+class VectorIndex(ABC):
+    """Abstract base class for indexes of embedding vectors, searched by cosine.
+
+    Vectors are identified by string ids; upserting an existing id replaces
+    its vector. Every vector of an index has the same number of dimensions,
+    set by the first upsert.
+    """
+
+    def close(self) -> None:  # noqa: B027
+        """Persist the index, if it is persistent, and release its resources.
+
+        Subclasses holding files or other resources should override this method.
+        """
+
+    @property
+    @abstractmethod
+    def dimensions(self) -> int | None:
+        """The number of dimensions of the indexed vectors, if any were added."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """The number of indexed vectors."""
+
+    @abstractmethod
+    def upsert(self, ids: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Add vectors to the index, replacing those of existing ids.
+
+        Args:
+            ids (Sequence[str]): The ids of the vectors.
+            vectors (Sequence[Sequence[float]]): One vector per id.
+
+        Raises:
+            ValueError: If the ids and vectors differ in number, or a vector's
+                dimensions differ from the index's.
+        """
+
+    @abstractmethod
+    def delete(self, ids: Sequence[str]) -> int:
+        """Remove vectors from the index; unknown ids are ignored.
+
+        Args:
+            ids (Sequence[str]): The ids of the vectors to remove.
+
+        Returns:
+            int: The number of vectors removed.
+        """
+
+    @abstractmethod
+    def search(self, query: Sequence[float], k: int) -> list[tuple[str, float]]:
+        """Find the vectors most similar to a query.
+
+        Args:
+            query (Sequence[float]): The query vector.
+            k (int): The number of matches to return at most.
+
+        Returns:
+            list[tuple[str, float]]: The ids of the best matches with their
+                cosine similarity to the query, best first.
+
+        Raises:
+            ValueError: If the query's dimensions differ from the index's.
+        """
+
+    async def aupsert(
+        self, ids: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        """Asynchronously add vectors to the index.
+
+        Defaults to running `upsert` in a worker thread.
+        """
+        await asyncio.to_thread(self.upsert, ids, vectors)
+
+    async def adelete(self, ids: Sequence[str]) -> int:
+        """Asynchronously remove vectors from the index.
+
+        Defaults to running `delete` in a worker thread.
+        """
+        return await asyncio.to_thread(self.delete, ids)
+
+    async def asearch(self, query: Sequence[float], k: int) -> list[tuple[str, float]]:
+        """Asynchronously find the vectors most similar to a query.
+
+        Defaults to running `search` in a worker thread.
+        """
+        return await asyncio.to_thread(self.search, query, k)
@@ -1,3 +1,5 @@
+import json
+from collections.abc import AsyncGenerator, Sequence
 from dataclasses import dataclass
 from typing import Any
 
@@ -5,12 +7,70 @@ from requests import Response
 
 from src.models import (
     AgentMessage,
+    AgentMessageDelta,
     AIModel,
     AIModelType,
+    Message,
     MessageThread,
+    NotFoundError,
     Provider,
+    ToolRequest,
+    ToolRequestDelta,
+    UserMessage,
 )
-from src.utils import http_request, load_env_var
+from src.utils import (
+    async_http_probe,
+    async_http_request,
+    async_sse_request,
+    http_request,
+    load_env_var,
+    tracer,
+)
+from src.utils.metrics import record_tokens, track_provider_call
+
+
+@dataclass
+class ChatDeltaData:
+    """Data class to hold a streamed chat response chunk."""
+
+    content: str | None
+    reasoning_content: str | None
+    tool_calls: list[dict[str, Any]]
+    finish_reason: str | None
+
+    @classmethod
+    def from_chunk(cls, chunk: dict[str, Any]) -> "ChatDeltaData":
+        """Create a ChatDeltaData instance from a streamed chunk dictionary."""
+        choices: list[dict[str, Any]] = chunk.get("choices", [])
+        if not choices:
+            return ChatDeltaData(None, None, [], None)
+        delta: dict[str, Any] = choices[0].get("delta") or {}
+        return ChatDeltaData(
+            content=delta.get("content"),
+            reasoning_content=delta.get("reasoning_content"),
+            tool_calls=delta.get("tool_calls") or [],
+            finish_reason=choices[0].get("finish_reason"),
+        )
+
+    def to_delta(self) -> AgentMessageDelta:
+        """Convert the chunk into an AgentMessageDelta."""
+        tool_requests: list[ToolRequestDelta] = []
+        for tool_call in self.tool_calls:
+            function: dict[str, Any] = tool_call.get("function") or {}
+            tool_requests.append(
+                ToolRequestDelta(
+                    index=tool_call.get("index", 0),
+                    id=tool_call.get("id"),
+                    name=function.get("name"),
+                    arguments=function.get("arguments"),
+                )
+            )
+        return AgentMessageDelta(
+            content=self.content,
+            reasoning_content=self.reasoning_content,
+            tool_requests=tool_requests,
+            finish_reason=self.finish_reason,
+        )
 
 
 @dataclass
@@ -19,6 +79,7 @@ class ChatData:
 
     content: str
     finish_reason: str
+    tool_calls: list[dict[str, Any]]
 
     @classmethod
     def from_response(cls, response: dict[str, Any]) -> "ChatData":
@@ -30,14 +91,30 @@ class ChatData:
         return ChatData(
             content=chat_data["message"]["content"],
             finish_reason=chat_data.get("finish_reason", "unknown"),
+            tool_calls=chat_data["message"].get("tool_calls") or [],
         )
 
+    def to_tool_requests(self) -> list[ToolRequest]:
+        """Convert the response's tool calls into ToolRequests."""
+        tool_requests: list[ToolRequest] = []
+        for tool_call in self.tool_calls:
+            function: dict[str, Any] = tool_call.get("function") or {}
+            tool_requests.append(
+                ToolRequest(
+                    id=tool_call["id"],
+                    name=function["name"],
+                    arguments=json.loads(function.get("arguments") or "{}"),
+                )
+            )
+        return tool_requests
+
 
 class LMStudio(Provider):
     """Provider implementation for LM Studio."""
 
     MODELS_ENDPOINT: str = "/v1/models"
     CONVERSE_ENDPOINT: str = "/v1/chat/completions"
+    EMBEDDINGS_ENDPOINT: str = "/v1/embeddings"
 
     def __init__(self):
         """Initialize a provider instance for LM Studio."""
@@ -60,29 +137,25 @@ class LMStudio(Provider):
         """
         return f"http://{self._base_url}{endpoint}"
 
-    def get_models(
-        self, limit: int | None = None, type_filter: AIModelType | None = None
+    def _parse_models(
+        self,
+        response_data: dict[str, Any],
+        limit: int | None = None,
+        type_filter: AIModelType | None = None,
     ) -> list[AIModel]:
-        """Retrieve a list of available AI models from LM Studio.
+        """Convert a models listing response into AIModel instances.
 
         Args:
+            response_data (dict[str, Any]): The decoded models listing response.
             limit (int | None): Optional limit on the number of models to return.
-                If None, all available models will be returned.
             type_filter (AIModelType | None):
                 Optional filter for the type of models to return.
 
         Returns:
             List of AIModel instances representing the available models.
         """
-        # Make the request
-        response: Response = http_request(
-            method="GET",
-            url=self._resolve_url(self.MODELS_ENDPOINT),
-        )
-
-        # Parse the response
         try:
-            model_list: list[dict[str, str]] = response.json()["data"]
+            model_list: list[dict[str, str]] = response_data["data"]
         except KeyError as e:
             raise ValueError(
                 "Invalid response format from LM Studio. Expected 'data' key."
@@ -104,6 +177,60 @@ class LMStudio(Provider):
         # Return the models, limited by the specified limit if provided
         return return_list[:limit] if limit is not None else return_list
 
+    def ping(self) -> None:
+        """Check that LM Studio is reachable by requesting the models listing.
+
+        The listing is not parsed, which keeps the probe cheap.
+        """
+        http_request(method="GET", url=self._resolve_url(self.MODELS_ENDPOINT))
+
+    async def aping(self) -> None:
+        """Asynchronously check that LM Studio is reachable.
+
+        Only the status of the models listing is checked; its body is not read.
+        """
+        await async_http_probe(url=self._resolve_url(self.MODELS_ENDPOINT))
+
+    def get_models(
+        self, limit: int | None = None, type_filter: AIModelType | None = None
+    ) -> list[AIModel]:
+        """Retrieve a list of available AI models from LM Studio.
+
+        Args:
+            limit (int | None): Optional limit on the number of models to return.
+                If None, all available models will be returned.
+            type_filter (AIModelType | None):
+                Optional filter for the type of models to return.
+
+        Returns:
+            List of AIModel instances representing the available models.
+        """
+        response: Response = http_request(
+            method="GET",
+            url=self._resolve_url(self.MODELS_ENDPOINT),
+        )
+        return self._parse_models(response.json(), limit, type_filter)
+
+    async def aget_models(
+        self, limit: int | None = None, type_filter: AIModelType | None = None
+    ) -> list[AIModel]:
+        """Asynchronously retrieve a list of available AI models from LM Studio.
+
+        Args:
+            limit (int | None): Optional limit on the number of models to return.
+                If None, all available models will be returned.
+            type_filter (AIModelType | None):
+                Optional filter for the type of models to return.
+
+        Returns:
+            List of AIModel instances representing the available models.
+        """
+        response_data: dict[str, Any] = await async_http_request(
+            method="GET",
+            url=self._resolve_url(self.MODELS_ENDPOINT),
+        )
+        return self._parse_models(response_data, limit, type_filter)
+
     def get_model(self, model_id: str) -> AIModel:
         """Retrieve an AIModel instance by its unique identifier.
 
@@ -117,42 +244,109 @@ class LMStudio(Provider):
         for model in models:
             if model.id == model_id:
                 return model
-        raise ValueError(f"Model with ID '{model_id}' not found.")
+        raise NotFoundError(f"Model with ID '{model_id}' not found.")
 
-    def converse(self, model: AIModel, message_thread: MessageThread) -> AgentMessage:
-        """Send a message to the AI model and receive a response.
+    async def aget_model(self, model_id: str) -> AIModel:
+        """Asynchronously retrieve an AIModel instance by its unique identifier.
+
+        Args:
+            model_id (str): The unique identifier of the AI model to retrieve.
+
+        Returns:
+            AIModel: The AI model instance corresponding to the provided model_id.
+        """
+        models = await self.aget_models()
+        for model in models:
+            if model.id == model_id:
+                return model
+        raise NotFoundError(f"Model with ID '{model_id}' not found.")
+
+    def _build_payload(
+        self, model: AIModel, message_thread: MessageThread, stream: bool = False
+    ) -> dict[str, Any]:
+        """Build the chat completions request payload.
 
         Args:
             model (AIModel): The AI model to use for the conversation.
-            message_thread (list[str]): The thread of messages to send.
+            message_thread (MessageThread): The thread of messages to send.
+            stream (bool): Whether to request a streamed (SSE) response.
 
         Returns:
-            str: The response message from the AI model.
+            dict[str, Any]: The request payload.
+
+        Raises:
+            ValueError: If the message thread is empty.
         """
         # Raise ValueError if message thread is empty
         if not message_thread.messages:
             raise ValueError("Message thread is empty.")
 
-        # Prepare the request payload
-        payload: dict[str, str | list[dict[str, str]] | bool] = {
+        payload: dict[str, Any] = {
             "model": model.id,
             "messages": [
-                {"role": msg.role.value, "content": msg.content}
+                self._convert_message(msg)
                 for msg in message_thread.messages
-                if isinstance(msg.content, str)  # Ensure content is not "empty"
+                # Skip "empty" messages, unless they carry tool calls or results
+                if isinstance(msg.content, str)
+                or (isinstance(msg, UserMessage) and msg.tool_response)
+                or (isinstance(msg, AgentMessage) and msg.tool_requests)
             ],
-            "stream": False,
+            "stream": stream,
         }
+        if message_thread.tools:
+            payload["tools"] = [
+                {"type": "function", "function": tool.model_dump()}
+                for tool in message_thread.tools
+            ]
+        return payload
 
-        # Make the request
-        response: Response = http_request(
-            method="POST",
-            url=self._resolve_url(self.CONVERSE_ENDPOINT),
-            json=payload,
-        )
+    def _convert_message(self, message: Message) -> dict[str, Any]:
+        """Convert a message to the chat completions format.
+
+        Args:
+            message (Message): The message to convert.
 
-        # Parse the response
-        response_data: dict[str, Any] = response.json()
+        Returns:
+            dict[str, Any]: The message, with its tool calls or tool result.
+        """
+        if isinstance(message, UserMessage) and message.tool_response:
+            tool_response = message.tool_response
+            return {
+                "role": "tool",
+                "content": (
+                    tool_response.content
+                    if isinstance(tool_response.content, str)
+                    else tool_response.to_json_string()
+                ),
+                "tool_call_id": tool_response.id,
+            }
+        converted: dict[str, Any] = {
+            "role": message.role.value,
+            "content": message.content,
+        }
+        if isinstance(message, AgentMessage) and message.tool_requests:
+            converted["tool_calls"] = [
+                {
+                    "id": tool_request.id,
+                    "type": "function",
+                    "function": {
+                        "name": tool_request.name,
+                        "arguments": json.dumps(dict(tool_request.arguments)),
+                    },
+                }
+                for tool_request in message.tool_requests
+            ]
+        return converted
+
+    def _parse_chat_response(self, response_data: dict[str, Any]) -> AgentMessage:
+        """Convert a chat completions response into an AgentMessage.
+
+        Args:
+            response_data (dict[str, Any]): The decoded chat completions response.
+
+        Returns:
+            AgentMessage: The response message from the AI model.
+        """
         chat_data: ChatData = ChatData.from_response(response_data)
 
         # Determine the next step based on the finish reason
@@ -166,8 +360,171 @@ class LMStudio(Provider):
                     content=chat_data.content
                     + "\n\n[[The response was truncated due to length limits.]]",
                 )
+            case "tool_calls":
+                return AgentMessage(
+                    content=chat_data.content,
+                    tool_requests=chat_data.to_tool_requests(),
+                )
             case _:
                 raise ValueError(
                     f"Unexpected finish reason: {chat_data.finish_reason}. "
                     "Please check the model and the request."
                 )
+
+    def _record_usage(self, model: AIModel, response_data: dict[str, Any]) -> None:
+        """Count the tokens reported in a response's `usage`, if any.
+
+        Args:
+            model (AIModel): The AI model that answered.
+            response_data (dict[str, Any]): A decoded response or stream chunk.
+        """
+        usage: dict[str, Any] | None = response_data.get("usage")
+        if usage:
+            record_tokens(
+                self._name,
+                model.id,
+                int(usage.get("prompt_tokens") or 0),
+                int(usage.get("completion_tokens") or 0),
+            )
+
+    def converse(self, model: AIModel, message_thread: MessageThread) -> AgentMessage:
+        """Send a message to the AI model and receive a response.
+
+        Args:
+            model (AIModel): The AI model to use for the conversation.
+            message_thread (list[str]): The thread of messages to send.
+
+        Returns:
+            str: The response message from the AI model.
+        """
+        with tracer.span("provider.payload"):
+            payload: dict[str, Any] = self._build_payload(model, message_thread)
+        with (
+            track_provider_call(self._name, model.id, "converse"),
+            tracer.span("provider.call", provider=self._name, model=model.id),
+        ):
+            response: Response = http_request(
+                method="POST",
+                url=self._resolve_url(self.CONVERSE_ENDPOINT),
+                json=payload,
+            )
+        with tracer.span("provider.parse"):
+            response_data: dict[str, Any] = response.json()
+            self._record_usage(model, response_data)
+            return self._parse_chat_response(response_data)
+
+    async def aconverse(
+        self, model: AIModel, message_thread: MessageThread
+    ) -> AgentMessage:
+        """Asynchronously send a message to the AI model and receive a response.
+
+        Args:
+            model (AIModel): The AI model to use for the conversation.
+            message_thread (MessageThread): The thread of messages to send.
+
+        Returns:
+            AgentMessage: The response message from the AI model.
+        """
+        with tracer.span("provider.payload"):
+            payload: dict[str, Any] = self._build_payload(model, message_thread)
+        with (
+            track_provider_call(self._name, model.id, "converse"),
+            tracer.span("provider.call", provider=self._name, model=model.id),
+        ):
+            response_data: dict[str, Any] = await async_http_request(
+                method="POST",
+                url=self._resolve_url(self.CONVERSE_ENDPOINT),
+                json=payload,
+            )
+        with tracer.span("provider.parse"):
+            self._record_usage(model, response_data)
+            return self._parse_chat_response(response_data)
+
+    async def converse_stream(
+        self, model: AIModel, message_thread: MessageThread
+    ) -> AsyncGenerator[AgentMessageDelta]:
+        """Stream the AI model's response as incremental deltas.
+
+        Args:
+            model (AIModel): The AI model to use for the conversation.
+            message_thread (MessageThread): The thread of messages to send.
+
+        Yields:
+            AgentMessageDelta: The response, fragment by fragment.
+        """
+        with tracer.span("provider.payload"):
+            payload: dict[str, Any] = self._build_payload(
+                model, message_thread, stream=True
+            )
+        with (
+            track_provider_call(self._name, model.id, "stream"),
+            tracer.span("provider.call", provider=self._name, model=model.id),
+        ):
+            async for data in async_sse_request(
+                method="POST",
+                url=self._resolve_url(self.CONVERSE_ENDPOINT),
+                json=payload,
+            ):
+                chunk: dict[str, Any] = json.loads(data)
+                self._record_usage(model, chunk)
+                yield ChatDeltaData.from_chunk(chunk).to_delta()
+
+    def _parse_embeddings(
+        self, model: AIModel, response_data: dict[str, Any]
+    ) -> list[list[float]]:
+        """Extract the vectors of an embeddings response, in input order.
+
+        Args:
+            model (AIModel): The embedding model used.
+            response_data (dict[str, Any]): The decoded embeddings response.
+
+        Returns:
+            list[list[float]]: One vector per input text.
+        """
+        self._record_usage(model, response_data)
+        data: list[dict[str, Any]] = sorted(
+            response_data["data"], key=lambda item: item["index"]
+        )
+        return [[float(value) for value in item["embedding"]] for item in data]
+
+    def embed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        """Embed texts with an embedding model, in a single request.
+
+        Args:
+            model (AIModel): The embedding model to use.
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: One vector per text, in order.
+        """
+        with (
+            track_provider_call(self._name, model.id, "embed"),
+            tracer.span("provider.call", provider=self._name, model=model.id),
+        ):
+            response: Response = http_request(
+                method="POST",
+                url=self._resolve_url(self.EMBEDDINGS_ENDPOINT),
+                json={"model": model.id, "input": list(texts)},
+            )
+        return self._parse_embeddings(model, response.json())
+
+    async def aembed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        """Asynchronously embed texts with an embedding model.
+
+        Args:
+            model (AIModel): The embedding model to use.
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: One vector per text, in order.
+        """
+        with (
+            track_provider_call(self._name, model.id, "embed"),
+            tracer.span("provider.call", provider=self._name, model=model.id),
+        ):
+            response_data: dict[str, Any] = await async_http_request(
+                method="POST",
+                url=self._resolve_url(self.EMBEDDINGS_ENDPOINT),
+                json={"model": model.id, "input": list(texts)},
+            )
+        return self._parse_embeddings(model, response_data)
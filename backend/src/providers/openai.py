@@ -1,35 +1,138 @@
 import json
+from collections.abc import AsyncGenerator, Iterable, Sequence
 from typing import Any
 
+import httpx
+from openai import AsyncOpenAI as AsyncOpenAIClient
+from openai import (
+    AsyncStream,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    Omit,
+    omit,
+)
+from openai import NotFoundError as OpenAINotFoundError
 from openai import OpenAI as OpenAIClient
+from openai.types.batch import Batch
+from openai.types.chat import (
+    ChatCompletionAssistantMessageParam,
+    ChatCompletionMessageParam,
+    ChatCompletionToolMessageParam,
+    ChatCompletionToolParam,
+    ChatCompletionUserMessageParam,
+)
 from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
+from openai.types.completion_usage import CompletionUsage
+from openai.types.create_embedding_response import CreateEmbeddingResponse
 from openai.types.model import Model as OpenAIModel
 
+from src.config import settings
 from src.models import (
     AgentMessage,
+    AgentMessageDelta,
     AIModel,
     AIModelType,
+    BatchProvider,
+    BulkJob,
+    BulkJobResult,
+    BulkJobState,
     MessageRole,
     MessageThread,
+    NotFoundError,
     Provider,
     ToolRequest,
+    ToolRequestDelta,
     ToolResponse,
     UserMessage,
 )
-from src.utils import load_env_var
+from src.utils import RateLimiter, estimate_tokens, load_env_var, tracer
+from src.utils.metrics import record_tokens, track_provider_call
 
+PROVIDER_NAME: str = "OpenAI"
 ALLOWED_MODELS: tuple[str, ...] = ("gpt-4o-mini", "gpt-4o", "gpt-4.1", "gpt-4.1-mini")
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+def _record_rate_limits(response: httpx.Response) -> None:
+    """Feed the quotas reported on a chat completion response to the rate limiter.
+
+    Runs as an HTTP client response hook, so quotas are read from every
+    response, including 429s and streams, without unwrapping raw responses.
+    """
+    if not response.request.url.path.endswith("/chat/completions"):
+        return
+    try:
+        model_id: Any = json.loads(response.request.content).get("model")
+    except (ValueError, AttributeError):
+        return
+    if isinstance(model_id, str):
+        rate_limiter.update(model_id, response.headers)
+
+
+async def _arecord_rate_limits(response: httpx.Response) -> None:
+    """Async variant of `_record_rate_limits`, for the async client."""
+    _record_rate_limits(response)
+
+
+def _inject_trace_context(request: httpx.Request) -> None:
+    """Propagate the current trace context to OpenAI in a request hook."""
+    tracer.inject(request.headers)
+
+
+async def _ainject_trace_context(request: httpx.Request) -> None:
+    """Async variant of `_inject_trace_context`, for the async client."""
+    _inject_trace_context(request)
 
 
-class OpenAI(Provider):
+class OpenAI(Provider, BatchProvider):
     """Provider implementation for OpenAI."""
 
     def __init__(self) -> None:
         """Initialize a provider instance for OpenAI."""
+        api_key: str = load_env_var("OPENAI_API_KEY")
+        # Retries are handled by the service layer's resilience policy;
+        # request hooks propagate the trace context, and response hooks keep
+        # the rate limiter in line with the account's quotas
         self._client: OpenAIClient = OpenAIClient(
-            api_key=load_env_var("OPENAI_API_KEY")
+            api_key=api_key,
+            max_retries=0,
+            http_client=DefaultHttpxClient(
+                event_hooks={
+                    "request": [_inject_trace_context],
+                    "response": [_record_rate_limits],
+                }
+            ),
+        )
+        self._async_client: AsyncOpenAIClient = AsyncOpenAIClient(
+            api_key=api_key,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                event_hooks={
+                    "request": [_ainject_trace_context],
+                    "response": [_arecord_rate_limits],
+                }
+            ),
         )
-        super().__init__(name="OpenAI")
+        super().__init__(name=PROVIDER_NAME)
+
+    def close(self) -> None:
+        """Close the underlying OpenAI client and its connection pool."""
+        self._client.close()
+
+    async def aclose(self) -> None:
+        """Close both the sync and async OpenAI clients."""
+        self._client.close()
+        await self._async_client.close()
+
+    def ping(self) -> None:
+        """Check that OpenAI is reachable by retrieving a single known model."""
+        self._client.models.retrieve(ALLOWED_MODELS[0])
+
+    async def aping(self) -> None:
+        """Asynchronously check that OpenAI is reachable."""
+        await self._async_client.models.retrieve(ALLOWED_MODELS[0])
 
     def _convert_to_ai_model(self, model: OpenAIModel) -> AIModel:
         """Convert an OpenAI model to an AIModel instance.
@@ -68,6 +171,42 @@ class OpenAI(Provider):
         # Retrieve models from OpenAI
         openai_models = self._client.models.list()
 
+        return self._filter_models(openai_models, limit, type_filter)
+
+    async def aget_models(
+        self, limit: int | None = None, type_filter: str | None = None
+    ) -> list[AIModel]:
+        """Asynchronously retrieve a list of available AI models from OpenAI.
+
+        Args:
+            limit (int | None): The maximum number of models to return.
+            type_filter (str | None): The type of models to retrieve.
+
+        Returns:
+            list[AIModel]: A list of available models.
+        """
+        openai_models: list[OpenAIModel] = [
+            model async for model in self._async_client.models.list()
+        ]
+
+        return self._filter_models(openai_models, limit, type_filter)
+
+    def _filter_models(
+        self,
+        openai_models: Iterable[OpenAIModel],
+        limit: int | None = None,
+        type_filter: str | None = None,
+    ) -> list[AIModel]:
+        """Convert OpenAI models and keep the allowed ones.
+
+        Args:
+            openai_models (Iterable[OpenAIModel]): The models listed by OpenAI.
+            limit (int | None): The maximum number of models to return.
+            type_filter (str | None): The type of models to retrieve.
+
+        Returns:
+            list[AIModel]: The allowed models.
+        """
         # Convert to AIModel instances
         generalized_models: list[AIModel] = [
             self._convert_to_ai_model(model) for model in openai_models
@@ -109,14 +248,36 @@ class OpenAI(Provider):
 
         return self._convert_to_ai_model(openai_model)
 
-    def _create_tool_message_dict(self, tool_response: ToolResponse) -> dict[str, Any]:
+    async def aget_model(self, model_id: str) -> AIModel:
+        """Asynchronously retrieve an AI model by its identifier.
+
+        Args:
+            model_id (str): The unique identifier of the model to retrieve.
+
+        Returns:
+            AIModel: An instance of AIModel representing the retrieved model.
+        """
+        openai_model = await self._async_client.models.retrieve(model_id)
+
+        return self._convert_to_ai_model(openai_model)
+
+    def _create_tool_message_dict(
+        self, tool_response: ToolResponse
+    ) -> ChatCompletionToolMessageParam:
         return {
             "role": "tool",
-            "content": tool_response.content,
+            # the API only takes text, so structured results are sent as JSON
+            "content": (
+                tool_response.content
+                if isinstance(tool_response.content, str)
+                else tool_response.to_json_string()
+            ),
             "tool_call_id": tool_response.id,
         }
 
-    def _create_user_message_dict(self, message: UserMessage) -> dict[str, Any]:
+    def _create_user_message_dict(
+        self, message: UserMessage
+    ) -> ChatCompletionUserMessageParam | ChatCompletionToolMessageParam:
         # If the message has a tool response, create a tool message dict
         if message.tool_response:
             return self._create_tool_message_dict(message.tool_response)
@@ -124,11 +285,13 @@ class OpenAI(Provider):
         # Otherwise, create a standard user message dict
         if message.content is None:
             raise ValueError("User message content cannot be `None`.")
-        return {"role": MessageRole.USER.value, "content": message.content}
+        return {"role": "user", "content": message.content}
 
-    def _create_agent_message_dict(self, message: AgentMessage) -> dict[str, Any]:
+    def _create_agent_message_dict(
+        self, message: AgentMessage
+    ) -> ChatCompletionAssistantMessageParam:
         return {
-            "role": MessageRole.AGENT.value,
+            "role": "assistant",
             "content": message.content,
             "tool_calls": [
                 {
@@ -136,7 +299,7 @@ class OpenAI(Provider):
                     "type": "function",
                     "function": {
                         "name": tool_request.name,
-                        "arguments": tool_request.arguments,
+                        "arguments": json.dumps(dict(tool_request.arguments)),
                     },
                 }
                 for tool_request in message.tool_requests
@@ -145,16 +308,16 @@ class OpenAI(Provider):
 
     def _convert_to_message_list(
         self, message_thread: MessageThread
-    ) -> list[dict[str, Any]]:
+    ) -> list[ChatCompletionMessageParam]:
         """Convert a MessageThread to a list of dictionaries for OpenAI API.
 
         Args:
             message_thread (MessageThread): The thread of messages to convert.
 
         Returns:
-            list[dict]: A list of dictionaries representing the messages.
+            list[ChatCompletionMessageParam]: The messages, as OpenAI takes them.
         """
-        message_list: list[dict[str, Any]] = []
+        message_list: list[ChatCompletionMessageParam] = []
 
         for message in message_thread.messages:
             if isinstance(message, UserMessage):
@@ -166,6 +329,46 @@ class OpenAI(Provider):
 
         return message_list
 
+    def _tool_options(
+        self, message_thread: MessageThread
+    ) -> list[ChatCompletionToolParam] | Omit:
+        """Build the tools offered to the model with a thread.
+
+        Args:
+            message_thread (MessageThread): The thread being sent.
+
+        Returns:
+            list[ChatCompletionToolParam] | Omit: The thread's tools, or
+                `omit` if it has none.
+        """
+        if not message_thread.tools:
+            return omit
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": dict(tool.parameters),
+                },
+            }
+            for tool in message_thread.tools
+        ]
+
+    def _estimate_tokens(self, messages: list[ChatCompletionMessageParam]) -> int:
+        """Estimate the tokens a completion request counts against the quota.
+
+        Args:
+            messages (list[ChatCompletionMessageParam]): The messages sent to
+                the API.
+
+        Returns:
+            int: The estimated prompt tokens plus the expected reply size.
+        """
+        return estimate_tokens(json.dumps(messages)) + (
+            settings.RATE_LIMIT_COMPLETION_TOKENS
+        )
+
     def converse(self, model: AIModel, message_thread: MessageThread) -> AgentMessage:
         """Sends a messages to the specified AI model and returns the agent's response.
 
@@ -178,13 +381,160 @@ class OpenAI(Provider):
             AgentMessage: The agent's response, including content and any tool requests.
 
         Raises:
+            RateLimitExceededError: If the model's quota would be exceeded for
+                longer than the maximum pacing delay.
             Any exceptions raised by the underlying client or JSON parsing.
         """
-        # Send a message to the AI model and receive a response.
-        completion: ChatCompletion = self._client.chat.completions.create(
-            model=model.id,
-            messages=self._convert_to_message_list(message_thread),
+        with tracer.span("provider.payload"):
+            messages: list[ChatCompletionMessageParam] = self._convert_to_message_list(
+                message_thread
+            )
+
+        # Pace the call to stay within the model's quotas; the wait is not
+        # part of the call's latency
+        with tracer.span("provider.pace"):
+            rate_limiter.acquire(model.id, self._estimate_tokens(messages))
+        with (
+            track_provider_call(PROVIDER_NAME, model.id, "converse"),
+            tracer.span("provider.call", provider=PROVIDER_NAME, model=model.id),
+        ):
+            # Send a message to the AI model and receive a response.
+            completion: ChatCompletion = self._client.chat.completions.create(
+                model=model.id,
+                messages=messages,
+                tools=self._tool_options(message_thread),
+            )
+        with tracer.span("provider.parse"):
+            self._record_usage(model, completion.usage)
+            return self._parse_completion(completion)
+
+    async def aconverse(
+        self, model: AIModel, message_thread: MessageThread
+    ) -> AgentMessage:
+        """Asynchronously send messages to the AI model and return its response.
+
+        Args:
+            model (AIModel): The AI model to interact with.
+            message_thread (MessageThread):
+                The sequence of messages to send to the model.
+
+        Returns:
+            AgentMessage: The agent's response, including content and any tool requests.
+
+        Raises:
+            RateLimitExceededError: If the model's quota would be exceeded for
+                longer than the maximum pacing delay.
+        """
+        with tracer.span("provider.payload"):
+            messages: list[ChatCompletionMessageParam] = self._convert_to_message_list(
+                message_thread
+            )
+        with tracer.span("provider.pace"):
+            await rate_limiter.aacquire(model.id, self._estimate_tokens(messages))
+        with (
+            track_provider_call(PROVIDER_NAME, model.id, "converse"),
+            tracer.span("provider.call", provider=PROVIDER_NAME, model=model.id),
+        ):
+            completion: ChatCompletion = (
+                await self._async_client.chat.completions.create(
+                    model=model.id,
+                    messages=messages,
+                    tools=self._tool_options(message_thread),
+                )
+            )
+        with tracer.span("provider.parse"):
+            self._record_usage(model, completion.usage)
+            return self._parse_completion(completion)
+
+    async def converse_stream(
+        self, model: AIModel, message_thread: MessageThread
+    ) -> AsyncGenerator[AgentMessageDelta]:
+        """Stream the agent's response as incremental deltas.
+
+        Args:
+            model (AIModel): The AI model to interact with.
+            message_thread (MessageThread):
+                The sequence of messages to send to the model.
+
+        Yields:
+            AgentMessageDelta: The response, fragment by fragment.
+
+        Raises:
+            RateLimitExceededError: If the model's quota would be exceeded for
+                longer than the maximum pacing delay.
+        """
+        with tracer.span("provider.payload"):
+            messages: list[ChatCompletionMessageParam] = self._convert_to_message_list(
+                message_thread
+            )
+        with tracer.span("provider.pace"):
+            await rate_limiter.aacquire(model.id, self._estimate_tokens(messages))
+        with (
+            track_provider_call(PROVIDER_NAME, model.id, "stream"),
+            tracer.span("provider.call", provider=PROVIDER_NAME, model=model.id),
+        ):
+            stream: AsyncStream[
+                ChatCompletionChunk
+            ] = await self._async_client.chat.completions.create(
+                model=model.id,
+                messages=messages,
+                tools=self._tool_options(message_thread),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    # the trailing chunk carries the usage of the whole stream
+                    self._record_usage(model, chunk.usage)
+                    continue
+                yield self._parse_chunk_choice(chunk.choices[0])
+
+    def _record_usage(self, model: AIModel, usage: CompletionUsage | None) -> None:
+        """Count the tokens of a completion, if OpenAI reported its usage.
+
+        Args:
+            model (AIModel): The AI model that answered.
+            usage (CompletionUsage | None): The completion's token usage.
+        """
+        if isinstance(usage, CompletionUsage):
+            record_tokens(
+                PROVIDER_NAME, model.id, usage.prompt_tokens, usage.completion_tokens
+            )
+
+    def _parse_chunk_choice(self, choice: ChunkChoice) -> AgentMessageDelta:
+        """Convert a streamed completion choice into an AgentMessageDelta.
+
+        Args:
+            choice (ChunkChoice): The first choice of a streamed chunk.
+
+        Returns:
+            AgentMessageDelta: The fragment carried by the chunk.
+        """
+        return AgentMessageDelta(
+            content=choice.delta.content,
+            tool_requests=[
+                ToolRequestDelta(
+                    index=tool_call.index,
+                    id=tool_call.id,
+                    name=tool_call.function.name if tool_call.function else None,
+                    arguments=(
+                        tool_call.function.arguments if tool_call.function else None
+                    ),
+                )
+                for tool_call in choice.delta.tool_calls or []
+            ],
+            finish_reason=choice.finish_reason,
         )
+
+    def _parse_completion(self, completion: ChatCompletion) -> AgentMessage:
+        """Convert a chat completion into an AgentMessage.
+
+        Args:
+            completion (ChatCompletion): The completion returned by OpenAI.
+
+        Returns:
+            AgentMessage: The agent's response, including content and any tool requests.
+        """
         response: Choice = completion.choices[0]
 
         # Check for tool calls in the response
@@ -205,3 +555,200 @@ class OpenAI(Provider):
             content=response.message.content,
             tool_requests=tool_requests,
         )
+
+    def embed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        """Embed texts with an OpenAI embedding model, in a single request.
+
+        Args:
+            model (AIModel): The embedding model to use.
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: One vector per text, in order.
+        """
+        with (
+            track_provider_call(PROVIDER_NAME, model.id, "embed"),
+            tracer.span("provider.call", provider=PROVIDER_NAME, model=model.id),
+        ):
+            response: CreateEmbeddingResponse = self._client.embeddings.create(
+                model=model.id, input=list(texts), encoding_format="float"
+            )
+        return self._parse_embeddings(model, response)
+
+    async def aembed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        """Asynchronously embed texts with an OpenAI embedding model.
+
+        Args:
+            model (AIModel): The embedding model to use.
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: One vector per text, in order.
+        """
+        with (
+            track_provider_call(PROVIDER_NAME, model.id, "embed"),
+            tracer.span("provider.call", provider=PROVIDER_NAME, model=model.id),
+        ):
+            response: CreateEmbeddingResponse = (
+                await self._async_client.embeddings.create(
+                    model=model.id, input=list(texts), encoding_format="float"
+                )
+            )
+        return self._parse_embeddings(model, response)
+
+    def _parse_embeddings(
+        self, model: AIModel, response: CreateEmbeddingResponse
+    ) -> list[list[float]]:
+        """Extract the vectors of an embedding response, in input order.
+
+        Args:
+            model (AIModel): The embedding model used.
+            response (CreateEmbeddingResponse): The response returned by OpenAI.
+
+        Returns:
+            list[list[float]]: One vector per input text.
+        """
+        record_tokens(PROVIDER_NAME, model.id, response.usage.prompt_tokens, 0)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    def _to_bulk_job(self, batch: Batch) -> BulkJob:
+        """Convert an OpenAI batch into a BulkJob (without results).
+
+        Args:
+            batch (Batch): The batch returned by OpenAI.
+
+        Returns:
+            BulkJob: The corresponding bulk job.
+        """
+        counts = batch.request_counts
+        return BulkJob(
+            id=batch.id,
+            provider=self.name,
+            state=BulkJobState(batch.status),
+            total=counts.total if counts else 0,
+            completed=counts.completed if counts else 0,
+            failed=counts.failed if counts else 0,
+            output_file_id=batch.output_file_id,
+            error_file_id=batch.error_file_id,
+        )
+
+    def _to_batch_request(
+        self, model: AIModel, message_thread: MessageThread
+    ) -> dict[str, Any]:
+        """Build the batch input line answering a thread.
+
+        Args:
+            model (AIModel): The model to answer with.
+            message_thread (MessageThread): The thread to answer.
+
+        Returns:
+            dict[str, Any]: The request, identified by the thread's id.
+        """
+        body: dict[str, Any] = {
+            "model": model.id,
+            "messages": self._convert_to_message_list(message_thread),
+        }
+        tools: list[ChatCompletionToolParam] | Omit = self._tool_options(message_thread)
+        if not isinstance(tools, Omit):
+            body["tools"] = tools
+        return {
+            "custom_id": message_thread.id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body,
+        }
+
+    async def asubmit_batch(
+        self, model: AIModel, message_threads: Sequence[MessageThread]
+    ) -> BulkJob:
+        """Upload the threads as a JSONL batch file and start a batch.
+
+        Args:
+            model (AIModel): The AI model to answer the threads with.
+            message_threads (Sequence[MessageThread]): The threads to answer;
+                each thread's id is used as the request's `custom_id`.
+
+        Returns:
+            BulkJob: The submitted job.
+        """
+        lines: str = "\n".join(
+            json.dumps(self._to_batch_request(model, message_thread))
+            for message_thread in message_threads
+        )
+        batch_file = await self._async_client.files.create(
+            file=("batch.jsonl", lines.encode("utf-8")), purpose="batch"
+        )
+        batch: Batch = await self._async_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return self._to_bulk_job(batch)
+
+    async def aget_batch(self, job_id: str) -> BulkJob:
+        """Retrieve the current state of a batch.
+
+        Args:
+            job_id (str): The OpenAI batch id.
+
+        Returns:
+            BulkJob: The job, without results.
+
+        Raises:
+            NotFoundError: If the batch is not found.
+        """
+        try:
+            batch: Batch = await self._async_client.batches.retrieve(job_id)
+        except OpenAINotFoundError as e:
+            raise NotFoundError(f"Bulk job '{job_id}' not found.") from e
+        return self._to_bulk_job(batch)
+
+    async def afetch_batch_results(self, job: BulkJob) -> list[BulkJobResult]:
+        """Download the output and error files of a finished batch.
+
+        Args:
+            job (BulkJob): The finished job.
+
+        Returns:
+            list[BulkJobResult]: One result per answered (or failed) thread.
+        """
+        results: list[BulkJobResult] = []
+        for file_id in (job.output_file_id, job.error_file_id):
+            if file_id is None:
+                continue
+            content = await self._async_client.files.content(file_id)
+            results.extend(
+                self._parse_batch_line(json.loads(line))
+                for line in content.text.splitlines()
+                if line.strip()
+            )
+        return results
+
+    def _parse_batch_line(self, line: dict[str, Any]) -> BulkJobResult:
+        """Convert one line of a batch output or error file into a result.
+
+        Args:
+            line (dict[str, Any]): The decoded line.
+
+        Returns:
+            BulkJobResult: The reply, or the error, for the line's thread.
+        """
+        thread_id: str = line["custom_id"]
+        response: dict[str, Any] | None = line.get("response")
+        if response is not None and response.get("status_code") == 200:  # noqa: PLR2004
+            completion = ChatCompletion.model_validate(response["body"])
+            return BulkJobResult(
+                thread_id=thread_id, message=self._parse_completion(completion)
+            )
+
+        error: dict[str, Any] | None = line.get("error")
+        if error is None and response is not None:
+            error = response.get("body", {}).get("error")
+        return BulkJobResult(
+            thread_id=thread_id,
+            error=(error or {}).get("message", "The request failed."),
+        )
+
+
+# Quotas are per account and model, so every OpenAI client shares one limiter
+rate_limiter: RateLimiter = RateLimiter(PROVIDER_NAME)
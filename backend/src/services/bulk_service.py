@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from src.config import settings
+from src.models import (
+    AIModel,
+    AIModelType,
+    BatchProvider,
+    BulkJob,
+    BulkJobResult,
+    MessageThread,
+    Provider,
+)
+from src.services.context_window import context_window
+from src.services.provider_service import get_provider
+from src.utils import provider_resilience, setup_logger
+
+logger = setup_logger(__name__)
+
+# Finished jobs never change, so their results are downloaded only once;
+# the least recently polled are evicted past `settings.BULK_FINISHED_JOBS`
+finished_jobs: OrderedDict[tuple[str, str], BulkJob] = OrderedDict()
+
+
+def __retrieve_batch_provider(provider_name: str) -> BatchProvider:
+    """Retrieve a provider able to run bulk jobs.
+
+    Args:
+        provider_name (str): The name of the provider.
+
+    Returns:
+        BatchProvider: The provider.
+
+    Raises:
+        ValueError: If the provider is not found or does not run bulk jobs.
+    """
+    provider: Provider = get_provider(provider_name)
+    if not isinstance(provider, BatchProvider):
+        raise ValueError(f"Provider '{provider_name}' does not support bulk jobs.")
+    return provider
+
+
+def __validate_threads(message_threads: Sequence[MessageThread]) -> None:
+    """Validate the threads of a bulk job.
+
+    Raises:
+        ValueError: If there are no threads, a thread is empty,
+            or two threads share an id.
+    """
+    if not message_threads:
+        raise ValueError("A bulk job must contain at least one thread.")
+    if any(not message_thread.messages for message_thread in message_threads):
+        raise ValueError("Message thread must contain at least one message.")
+    if len({message_thread.id for message_thread in message_threads}) < len(
+        message_threads
+    ):
+        raise ValueError("Thread ids must be unique within a bulk job.")
+
+
+async def asubmit_bulk_job(
+    model: AIModel, message_threads: Sequence[MessageThread]
+) -> BulkJob:
+    """Submit threads to be answered by a provider's batch API.
+
+    Each thread is fitted to the model's context window before submission;
+    results are identified by the threads' ids.
+
+    Args:
+        model (AIModel): The AI model to answer the threads with.
+        message_threads (Sequence[MessageThread]): The threads to answer.
+
+    Returns:
+        BulkJob: The submitted job.
+
+    Raises:
+        TypeError: If the model is not a chat model.
+        ValueError: If the threads are invalid, or the provider is not found
+            or does not run bulk jobs.
+    """
+    if model.type is not AIModelType.CHAT:
+        raise TypeError(f"Model '{model.id}' is not a chat model.")
+    __validate_threads(message_threads)
+    provider: BatchProvider = __retrieve_batch_provider(model.provider)
+
+    fitted: list[MessageThread] = [
+        context_window.fit(model, message_thread).thread
+        for message_thread in message_threads
+    ]
+    # not retried: a submission that timed out may have created a paid batch
+    job: BulkJob = await provider_resilience.acall(
+        model.provider, lambda: provider.asubmit_batch(model, fitted), retry=False
+    )
+    logger.info(
+        f"Submitted bulk job {job.id} of {len(fitted)} threads "
+        f"to provider {model.provider}"
+    )
+    return job
+
+
+async def aget_bulk_job(provider_name: str, job_id: str) -> BulkJob:
+    """Poll a bulk job, downloading its results once it has finished.
+
+    Args:
+        provider_name (str): The provider running the job.
+        job_id (str): The provider's identifier for the job.
+
+    Returns:
+        BulkJob: The job, with its results if it has finished.
+
+    Raises:
+        NotFoundError: If the provider or the job is not found.
+    """
+    key: tuple[str, str] = (provider_name, job_id)
+    finished: BulkJob | None = finished_jobs.get(key)
+    if finished is not None:
+        finished_jobs.move_to_end(key)
+        return finished
+
+    provider: BatchProvider = __retrieve_batch_provider(provider_name)
+    job: BulkJob = await provider_resilience.acall(
+        provider_name, lambda: provider.aget_batch(job_id)
+    )
+    if not job.state.finished:
+        return job
+
+    results: list[BulkJobResult] = await provider_resilience.acall(
+        provider_name, lambda: provider.afetch_batch_results(job)
+    )
+    job = job.model_copy(update={"results": results})
+    finished_jobs[key] = job
+    while len(finished_jobs) > settings.BULK_FINISHED_JOBS:
+        finished_jobs.popitem(last=False)
+    logger.info(f"Bulk job {job_id} finished as {job.state.value}")
+    return job
@@ -0,0 +1,323 @@
+import json
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import Enum
+
+from src.config import settings
+from src.models import AgentMessage, AIModel, Message, MessageThread, UserMessage
+from src.utils import clip_tokens, estimate_tokens, setup_logger
+
+logger = setup_logger(__name__)
+
+# Role and separator tokens every chat format adds around a message,
+# and the tokens priming the reply.
+MESSAGE_OVERHEAD_TOKENS: int = 4
+REPLY_PRIMING_TOKENS: int = 3
+
+SUMMARY_PREFIX: str = "Summary of the earlier conversation:\n"
+SUMMARY_CACHE_SIZE: int = 256  # Summaries kept, so retries do not redo them
+
+type Selector = Callable[[list[int], int], list[int]]
+type Summarizer = Callable[[list[Message]], Awaitable[str]]
+
+
+class ContextStrategy(str, Enum):
+    """How a thread too long for the model's context window is shortened.
+
+    - SLIDING_WINDOW: Keep the most recent turns that fit.
+    - KEEP_FIRST: Keep the opening turn, which usually sets up the
+        conversation, plus the most recent turns that fit.
+    - SUMMARIZE: Keep the most recent turns that fit and replace the
+        older ones with a summary.
+    """
+
+    SLIDING_WINDOW = "sliding_window"
+    KEEP_FIRST = "keep_first"
+    SUMMARIZE = "summarize"
+
+
+def count_message_tokens(message: Message) -> int:
+    """Estimate the number of prompt tokens a message costs.
+
+    Args:
+        message (Message): The message to measure.
+
+    Returns:
+        int: The estimated token count, including per-message overhead.
+    """
+    tokens: int = MESSAGE_OVERHEAD_TOKENS
+    if message.content:
+        tokens += estimate_tokens(message.content)
+    if isinstance(message, AgentMessage):
+        for tool_request in message.tool_requests:
+            tokens += estimate_tokens(tool_request.name)
+            tokens += estimate_tokens(json.dumps(dict(tool_request.arguments)))
+    if isinstance(message, UserMessage) and message.tool_response is not None:
+        tokens += estimate_tokens(message.tool_response.to_json_string())
+    return tokens
+
+
+def _group_turns(messages: list[Message]) -> list[list[Message]]:
+    """Group messages into units that must be kept or dropped together.
+
+    Tool responses stay with the agent message that requested them, since
+    providers reject a tool response whose request is missing.
+    """
+    turns: list[list[Message]] = []
+    for message in messages:
+        if (
+            turns
+            and isinstance(message, UserMessage)
+            and message.tool_response is not None
+        ):
+            turns[-1].append(message)
+        else:
+            turns.append([message])
+    return turns
+
+
+def sliding_window(costs: list[int], budget: int) -> list[int]:
+    """Select the most recent turns that fit the budget.
+
+    Args:
+        costs (list[int]): The token cost of each turn, oldest first.
+        budget (int): The token budget.
+
+    Returns:
+        list[int]: The indices of the kept turns, in order.
+    """
+    kept: list[int] = []
+    total: int = 0
+    for index in reversed(range(len(costs))):
+        if total + costs[index] > budget:
+            break
+        total += costs[index]
+        kept.append(index)
+    return kept[::-1]
+
+
+def keep_first(costs: list[int], budget: int) -> list[int]:
+    """Select the opening turn plus the most recent turns that fit the budget.
+
+    Falls back to a sliding window when the opening turn does not fit
+    alongside the newest one.
+
+    Args:
+        costs (list[int]): The token cost of each turn, oldest first.
+        budget (int): The token budget.
+
+    Returns:
+        list[int]: The indices of the kept turns, in order.
+    """
+    if len(costs) <= 1 or costs[0] + costs[-1] > budget:
+        return sliding_window(costs, budget)
+    recent: list[int] = sliding_window(costs[1:], budget - costs[0])
+    return [0, *(index + 1 for index in recent)]
+
+
+SELECTORS: dict[ContextStrategy, Selector] = {
+    ContextStrategy.SLIDING_WINDOW: sliding_window,
+    ContextStrategy.KEEP_FIRST: keep_first,
+    ContextStrategy.SUMMARIZE: sliding_window,
+}
+
+
+@dataclass
+class ContextFit:
+    """A thread shortened to fit a model's context window."""
+
+    thread: MessageThread
+    tokens: int
+    dropped: list[Message] = field(default_factory=list[Message])
+
+
+class ContextWindow:
+    """Budgets prompts against each model's context window.
+
+    Threads that fit are passed through untouched. Longer threads are
+    shortened turn by turn, oldest first, according to the strategy; the
+    newest turn is always kept.
+    """
+
+    def __init__(
+        self,
+        strategy: ContextStrategy | str | None = None,
+        default_limit: int | None = None,
+        limits: dict[str, int] | None = None,
+        response_reserve: int | None = None,
+        summary_tokens: int | None = None,
+    ):
+        """Initialize the context window; defaults come from the settings.
+
+        Args:
+            strategy (ContextStrategy | str | None): How long threads are shortened.
+            default_limit (int | None): Context length of unknown models, in tokens.
+            limits (dict[str, int] | None): Context lengths by model id prefix.
+            response_reserve (int | None): Tokens kept free for the reply.
+            summary_tokens (int | None): Tokens set aside for a summary.
+        """
+        self._strategy: ContextStrategy = ContextStrategy(
+            settings.CONTEXT_STRATEGY if strategy is None else strategy
+        )
+        self._default_limit: int = (
+            settings.CONTEXT_DEFAULT_LIMIT if default_limit is None else default_limit
+        )
+        self._limits: dict[str, int] = (
+            settings.CONTEXT_LIMITS if limits is None else limits
+        )
+        self._response_reserve: int = (
+            settings.CONTEXT_RESPONSE_RESERVE
+            if response_reserve is None
+            else response_reserve
+        )
+        self._summary_tokens: int = (
+            settings.CONTEXT_SUMMARY_TOKENS
+            if summary_tokens is None
+            else summary_tokens
+        )
+        self._summaries: OrderedDict[tuple[str, str, int], str] = OrderedDict()
+
+    @property
+    def strategy(self) -> ContextStrategy:
+        """The strategy used to shorten long threads."""
+        return self._strategy
+
+    def limit(self, model: AIModel) -> int:
+        """Resolve a model's context length, in tokens.
+
+        The model's own `context_length` wins; otherwise the longest matching
+        id prefix in the configured limits is used, then the default.
+        """
+        if model.context_length:
+            return model.context_length
+        matches: list[str] = [
+            prefix for prefix in self._limits if model.id.startswith(prefix)
+        ]
+        if not matches:
+            return self._default_limit
+        return self._limits[max(matches, key=len)]
+
+    def budget(self, model: AIModel) -> int:
+        """The number of prompt tokens a request to the model may use."""
+        return self.limit(model) - self._response_reserve - REPLY_PRIMING_TOKENS
+
+    def fit(self, model: AIModel, thread: MessageThread) -> ContextFit:
+        """Shorten a thread to fit the model's context window.
+
+        Summaries are not generated here; with the summarize strategy, room
+        is left for one and the dropped messages are returned so that
+        `asummarize` can add it.
+
+        Args:
+            model (AIModel): The model the thread is sent to.
+            thread (MessageThread): The thread to fit.
+
+        Returns:
+            ContextFit: The thread to send, its estimated size and the
+                messages that were dropped.
+
+        Raises:
+            ValueError: If the newest turn alone exceeds the context window.
+        """
+        turns: list[list[Message]] = _group_turns(thread.messages)
+        costs: list[int] = [
+            sum(count_message_tokens(message) for message in turn) for turn in turns
+        ]
+        budget: int = self.budget(model)
+        total: int = sum(costs)
+        if total <= budget:
+            return ContextFit(thread=thread, tokens=total)
+
+        if self._strategy is ContextStrategy.SUMMARIZE:
+            budget -= self._summary_tokens
+        if not costs or costs[-1] > budget:
+            raise ValueError(
+                f"The latest message exceeds the context window of model "
+                f"'{model.id}' ({self.limit(model)} tokens)."
+            )
+
+        kept: set[int] = set(SELECTORS[self._strategy](costs, budget))
+        messages: list[Message] = []
+        dropped: list[Message] = []
+        for index, turn in enumerate(turns):
+            (messages if index in kept else dropped).extend(turn)
+        logger.info(
+            f"Dropped {len(dropped)} of {len(thread.messages)} messages "
+            f"to fit the context window of model '{model.id}'"
+        )
+        return ContextFit(
+            thread=thread.model_copy(update={"messages": messages}),
+            tokens=sum(costs[index] for index in kept),
+            dropped=dropped,
+        )
+
+    async def asummarize(
+        self, model: AIModel, fitted: ContextFit, summarizer: Summarizer
+    ) -> MessageThread:
+        """Prepend a summary of the dropped messages, for the summarize strategy.
+
+        Summaries are best effort: if the summarizer fails, the shortened
+        thread is returned as is.
+
+        Args:
+            model (AIModel): The model the thread is sent to.
+            fitted (ContextFit): The result of `fit`.
+            summarizer (Summarizer): Summarizes a list of messages.
+
+        Returns:
+            MessageThread: The thread to send.
+        """
+        if self._strategy is not ContextStrategy.SUMMARIZE or not fitted.dropped:
+            return fitted.thread
+
+        key: tuple[str, str, int] = (
+            model.provider,
+            model.id,
+            hash(tuple((message.role, message.content) for message in fitted.dropped)),
+        )
+        summary: str | None = self._summaries.get(key)
+        if summary is None:
+            try:
+                summary = await summarizer(fitted.dropped)
+            except Exception as e:
+                logger.error(
+                    f"Error summarizing the history for model '{model.id}'",
+                    exc_info=True,
+                    extra={"error": str(e)},
+                )
+                return fitted.thread
+            self._summaries[key] = summary
+            if len(self._summaries) > SUMMARY_CACHE_SIZE:
+                self._summaries.popitem(last=False)
+        else:
+            self._summaries.move_to_end(key)
+
+        content: str = clip_tokens(
+            SUMMARY_PREFIX + summary,
+            self._summary_tokens - MESSAGE_OVERHEAD_TOKENS,
+        )
+        return fitted.thread.model_copy(
+            update={"messages": [UserMessage(content=content), *fitted.thread.messages]}
+        )
+
+    async def afit(
+        self, model: AIModel, thread: MessageThread, summarizer: Summarizer
+    ) -> MessageThread:
+        """Shorten a thread to fit the model's context window, summarizing if set.
+
+        Args:
+            model (AIModel): The model the thread is sent to.
+            thread (MessageThread): The thread to fit.
+            summarizer (Summarizer): Summarizes dropped messages.
+
+        Returns:
+            MessageThread: The thread to send.
+
+        Raises:
+            ValueError: If the newest turn alone exceeds the context window.
+        """
+        return await self.asummarize(model, self.fit(model, thread), summarizer)
+
+
+context_window = ContextWindow()
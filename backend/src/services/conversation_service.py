@@ -0,0 +1,138 @@
+import asyncio
+from contextlib import suppress
+
+from src.config import settings
+from src.models import (
+    AIModel,
+    Message,
+    MessageThread,
+    RetrievalOptions,
+    SearchHit,
+    ToolOptions,
+    UserMessage,
+)
+from src.services import converse_service, search_service
+from src.services.thread_store import conversation_store
+
+
+async def acreate_thread(thread: MessageThread) -> MessageThread:
+    """Store a new message thread.
+
+    Args:
+        thread (MessageThread): The thread to store, with any initial messages.
+
+    Returns:
+        MessageThread: The stored thread, whose id identifies later turns.
+
+    Raises:
+        AlreadyExistsError: If a thread with the same id already exists.
+    """
+    stored: MessageThread = await conversation_store.acreate(thread)
+    search_service.schedule_indexing(stored.id, stored.messages)
+    return stored
+
+
+async def aget_thread(thread_id: str) -> MessageThread:
+    """Retrieve a stored message thread with its full history.
+
+    Args:
+        thread_id (str): The id of the thread to retrieve.
+
+    Returns:
+        MessageThread: The stored thread.
+
+    Raises:
+        NotFoundError: If the thread is not found.
+    """
+    return await conversation_store.aget(thread_id)
+
+
+async def adelete_thread(thread_id: str) -> None:
+    """Delete a stored message thread.
+
+    Args:
+        thread_id (str): The id of the thread to delete.
+
+    Raises:
+        NotFoundError: If the thread is not found.
+    """
+    message_count: int = 0
+    if settings.SEARCH_INDEX_MESSAGES or len(search_service.vector_index):
+        message_count = len((await conversation_store.aget(thread_id)).messages)
+    await conversation_store.adelete(thread_id)
+    # Messages still being indexed would be left behind once the thread is
+    # forgotten, and be attributed to a later thread reusing its id
+    await search_service.await_indexing(thread_id)
+    if message_count:
+        await search_service.aforget_thread(thread_id, message_count)
+
+
+async def aconverse_turn(
+    thread_id: str,
+    model: AIModel,
+    message: UserMessage,
+    retrieval: RetrievalOptions | None = None,
+    tools: ToolOptions | None = None,
+) -> Message:
+    """Add a user message to a stored thread and get the model's reply.
+
+    The history is loaded from the store, so clients only send the new
+    message. The user message and the reply are persisted together once the
+    model has answered; a failed turn leaves the thread untouched.
+
+    Args:
+        thread_id (str): The id of the thread to continue.
+        model (AIModel): The AI model to use for the conversation.
+        message (UserMessage): The new user message.
+        retrieval (RetrievalOptions | None): If set, context retrieved for
+            the message is injected into the prompt; it is not stored.
+        tools (ToolOptions | None): If set, the model may call these tools,
+            which run server-side; the calls and their results are stored
+            before the reply.
+
+    Returns:
+        Message: The response message from the AI model.
+
+    Raises:
+        ValueError: If the thread, a requested tool or the model's provider
+            is not found.
+        TypeError: If the model is not a chat model.
+    """
+    thread: MessageThread = await conversation_store.aget(thread_id)
+    thread.messages.append(message)
+
+    replies: list[Message]
+    if tools is None:
+        replies = [await converse_service.aconverse(model, thread, retrieval=retrieval)]
+    else:
+        replies = await converse_service.aconverse_with_tools(
+            model, thread, tools, retrieval=retrieval
+        )
+
+    start: int = await conversation_store.aappend(thread_id, [message, *replies])
+    search_service.schedule_indexing(thread_id, [message, *replies], start=start)
+    return converse_service.last_reply(replies)
+
+
+async def __aload_message(hit: SearchHit) -> SearchHit:
+    """Attach its stored message to a search hit, if the message still exists."""
+    with suppress(ValueError):  # The message was deleted since it was indexed
+        hit.message = await conversation_store.aget_message(hit.thread_id, hit.index)
+    return hit
+
+
+async def asearch_messages(query: str, k: int = 10) -> list[SearchHit]:
+    """Find the stored messages most similar in meaning to a query.
+
+    Args:
+        query (str): The text to search for.
+        k (int): The number of matches to return at most.
+
+    Returns:
+        list[SearchHit]: The best matches with their messages, best first.
+
+    Raises:
+        ValueError: If the query is empty or `k` is out of range.
+    """
+    hits: list[SearchHit] = await search_service.asearch(query, k)
+    return list(await asyncio.gather(*(__aload_message(hit) for hit in hits)))
@@ -1,6 +1,61 @@
-from src.models import Message, MessageThread, Provider
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from functools import partial
+from time import perf_counter
+
+from src.config import settings
+from src.models import (
+    AgentMessage,
+    AgentMessageDelta,
+    Message,
+    MessageRole,
+    MessageThread,
+    NotFoundError,
+    Priority,
+    Provider,
+    RetrievalOptions,
+    ToolOptions,
+    ToolResponse,
+    UserMessage,
+)
 from src.models.ai_models import AIModel, AIModelType
+from src.services import retrieval_service
+from src.services.context_window import ContextFit, Summarizer, context_window
+from src.services.hedging import hedge_policy
 from src.services.provider_service import get_provider
+from src.services.response_cache import (
+    CacheMode,
+    response_cache,
+    response_cache_key,
+)
+from src.services.router import is_failover_error, model_router
+from src.services.scheduler import QueueFullError, provider_scheduler
+from src.services.tool_registry import tool_registry
+from src.utils import (
+    CircuitOpenError,
+    SingleFlight,
+    bind_log_context,
+    clip_tokens,
+    measure_pacing,
+    provider_resilience,
+    setup_logger,
+    tracer,
+)
+from src.utils.metrics import (
+    cache_requests,
+    generations_in_flight,
+    time_to_first_token_seconds,
+)
+
+logger = setup_logger(__name__)
+
+# Identical concurrent generations share one provider call, when opted in
+generation_flights: SingleFlight[str, AgentMessage] = SingleFlight()
+
+SUMMARY_PROMPT: str = (
+    "Summarize the following conversation in a few sentences, keeping any "
+    "facts, decisions and open questions needed to continue it:\n\n"
+)
 
 
 def __retrieve_provider(model: AIModel) -> Provider:
@@ -13,33 +68,32 @@ def __retrieve_provider(model: AIModel) -> Provider:
         Provider: The provider instance associated with the AI model.
 
     Raises:
-        ValueError: If the provider for the model is not found.
+        NotFoundError: If the provider for the model is not found.
     """
     provider_name: str = model.provider
 
     # Attempt to retrieve the provider instance
     try:
-        provider: Provider = get_provider(provider_name)
-    except ValueError as e:
-        raise ValueError(
+        with tracer.span("provider.resolve", provider=provider_name):
+            provider: Provider = get_provider(provider_name)
+    except NotFoundError as e:
+        raise NotFoundError(
             f"Provider '{provider_name}' not found for model '{model.id}'."
         ) from e
 
     return provider
 
 
-def converse(model: AIModel, message_thread: MessageThread) -> Message:
-    """Send a message to the AI model and receive a response.
+def __validate_request(model: AIModel, message_thread: MessageThread) -> None:
+    """Validate a conversation request before it is dispatched.
 
     Args:
         model (AIModel): The AI model to use for the conversation.
         message_thread (MessageThread): The thread of messages to send.
 
-    Returns:
-        Message: The response message from the AI model.
-
     Raises:
-        ValueError: If the provider for the model is not found.
+        TypeError: If the model is not a chat model.
+        ValueError: If the message thread is empty.
     """
     # validate the model type
     if model.type is not AIModelType.CHAT:
@@ -49,8 +103,626 @@ def converse(model: AIModel, message_thread: MessageThread) -> Message:
     if not message_thread.messages or len(message_thread.messages) == 0:
         raise ValueError("Message thread must contain at least one message.")
 
-    # retrieve the AI model provider
-    provider: Provider = __retrieve_provider(model)
 
-    # call the provider's converse method
-    return provider.converse(model, message_thread)
+def __summarizer(
+    provider: Provider, model: AIModel, priority: Priority = Priority.INTERACTIVE
+) -> Summarizer:
+    """Build a summarizer asking the conversation's own model for a summary.
+
+    Args:
+        provider (Provider): The provider serving the model.
+        model (AIModel): The AI model used for the conversation.
+        priority (Priority): The scheduling class of the conversation.
+
+    Returns:
+        Summarizer: Summarizes the messages dropped from a thread.
+    """
+
+    async def summarize(messages: list[Message]) -> str:
+        transcript: str = "\n".join(
+            f"{message.role.value}: {message.content}"
+            for message in messages
+            if message.content
+        )
+        prompt = UserMessage(
+            content=clip_tokens(
+                SUMMARY_PROMPT + transcript, context_window.budget(model)
+            )
+        )
+        async with provider_scheduler.slot(provider.name, model.id, priority):
+            summary: Message = await provider_resilience.acall(
+                provider.name,
+                lambda: provider.aconverse(model, MessageThread(messages=[prompt])),
+            )
+        return summary.content or ""
+
+    return summarize
+
+
+def __cache_key(
+    model: AIModel, message_thread: MessageThread, cache_mode: CacheMode
+) -> str | None:
+    """Compute the response cache key of a request, if the cache applies.
+
+    Args:
+        model (AIModel): The AI model to use for the conversation.
+        message_thread (MessageThread): The thread of messages to send.
+        cache_mode (CacheMode): How the request interacts with the cache.
+
+    Returns:
+        str | None: The cache key, or None if the cache is disabled or bypassed.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED or cache_mode is CacheMode.BYPASS:
+        return None
+    return response_cache_key(model, message_thread)
+
+
+def converse(
+    model: AIModel,
+    message_thread: MessageThread,
+    cache_mode: CacheMode = CacheMode.USE,
+) -> Message:
+    """Send a message to the AI model and receive a response.
+
+    Args:
+        model (AIModel): The AI model to use for the conversation.
+        message_thread (MessageThread): The thread of messages to send.
+        cache_mode (CacheMode): How the request interacts with the response
+            cache, when it is enabled.
+
+    Returns:
+        Message: The response message from the AI model.
+
+    Raises:
+        ValueError: If the provider for the model is not found,
+            or the latest message exceeds the model's context window.
+    """
+    __validate_request(model, message_thread)
+
+    # serve identical requests from the response cache
+    cache_key: str | None = __cache_key(model, message_thread, cache_mode)
+    if cache_key is not None and cache_mode is CacheMode.USE:
+        cached: AgentMessage | None = response_cache.get(cache_key)
+        cache_requests.inc(
+            cache="responses", result="miss" if cached is None else "hit"
+        )
+        if cached is not None:
+            return cached
+
+    # try the model's routing targets in turn until one answers
+    last_error: Exception | None = None
+    for target in model_router.route(model):
+        # retrieve the AI model provider
+        provider: Provider = __retrieve_provider(target)
+
+        # fit the thread to the model's context window
+        # (summaries need an async round trip, so older turns are only dropped
+        # here; likewise, the scheduler only queues async requests)
+        fitted: MessageThread = context_window.fit(target, message_thread).thread
+
+        # call the provider's converse method, retrying transient failures
+        start: float = perf_counter()
+        try:
+            with (
+                bind_log_context(provider=provider.name, model=target.id),
+                generations_in_flight.track(provider=provider.name),
+                measure_pacing() as paced,
+            ):
+                reply: AgentMessage = provider_resilience.call(
+                    provider.name, provider.converse, target, fitted
+                )
+        except Exception as e:
+            model_router.record_failure(target)
+            if not is_failover_error(e):
+                raise
+            logger.error(f"Failing over from '{provider.name}/{target.id}': {e}")
+            last_error = e
+            continue
+        model_router.record_success(target, perf_counter() - start - paced())
+
+        if cache_key is not None:
+            response_cache.put(cache_key, reply)
+        return reply
+
+    assert last_error is not None
+    raise last_error
+
+
+async def __agenerate(
+    provider: Provider,
+    model: AIModel,
+    message_thread: MessageThread,
+    cache_key: str | None,
+    priority: Priority,
+) -> AgentMessage:
+    """Generate a reply with the provider and cache it if a key is given.
+
+    Args:
+        provider (Provider): The provider serving the model.
+        model (AIModel): The AI model to use for the conversation.
+        message_thread (MessageThread): The thread of messages to send.
+        cache_key (str | None): The response cache key, if the cache applies.
+        priority (Priority): The scheduling class of the request.
+
+    Returns:
+        AgentMessage: The response message from the AI model.
+
+    Raises:
+        QueueFullError: If the provider's queue is full.
+    """
+    # fit the thread to the model's context window
+    with tracer.span("context.fit"):
+        message_thread = await context_window.afit(
+            model, message_thread, __summarizer(provider, model, priority)
+        )
+
+    # wait for a slot with the provider, then call its native async converse
+    # method, retrying transient failures
+    async with provider_scheduler.slot(provider.name, model.id, priority):
+        with generations_in_flight.track(provider=provider.name):
+            reply: AgentMessage = await provider_resilience.acall(
+                provider.name, lambda: provider.aconverse(model, message_thread)
+            )
+    if cache_key is not None:
+        await response_cache.aput(cache_key, reply)
+    return reply
+
+
+async def __agenerate_on(
+    target: AIModel,
+    message_thread: MessageThread,
+    cache_key: str | None,
+    priority: Priority,
+) -> AgentMessage:
+    """Generate a reply on a routing target, reporting the outcome to the router.
+
+    Args:
+        target (AIModel): The model to generate with.
+        message_thread (MessageThread): The thread of messages to send.
+        cache_key (str | None): The response cache key, if the cache applies.
+        priority (Priority): The scheduling class of the request.
+
+    Returns:
+        AgentMessage: The response message from the AI model.
+
+    Raises:
+        ValueError: If the target's provider is not found.
+    """
+    provider: Provider = __retrieve_provider(target)
+    start: float = perf_counter()
+    try:
+        with (
+            tracer.span("converse.generate", provider=target.provider, model=target.id),
+            bind_log_context(provider=target.provider, model=target.id),
+            measure_pacing() as paced,
+        ):
+            reply: AgentMessage = await __agenerate(
+                provider, target, message_thread, cache_key, priority
+            )
+    except Exception:
+        model_router.record_failure(target)
+        raise
+    # A wait for this service's own rate limits says nothing of the target
+    model_router.record_success(target, perf_counter() - start - paced())
+    return reply
+
+
+async def __ahedge_on(
+    backup: AIModel,
+    tried: set[tuple[str, str]],
+    message_thread: MessageThread,
+    cache_key: str | None,
+    priority: Priority,
+) -> AgentMessage:
+    """Generate a hedged reply on a backup target, marking it as tried."""
+    tried.add((backup.provider, backup.id))
+    return await __agenerate_on(backup, message_thread, cache_key, priority)
+
+
+async def __aroute(
+    model: AIModel,
+    message_thread: MessageThread,
+    cache_key: str | None,
+    priority: Priority,
+) -> AgentMessage:
+    """Generate a reply on the model's routing targets, failing over in turn.
+
+    When hedging is enabled, a slow interactive call to a target is
+    duplicated to the next untried one, keeping whichever answers first; a
+    call is not hedged when every other target has been tried, and a target
+    that was hedged to is not tried again.
+
+    Args:
+        model (AIModel): The requested AI model, possibly an alias.
+        message_thread (MessageThread): The thread of messages to send.
+        cache_key (str | None): The response cache key, if the cache applies.
+        priority (Priority): The scheduling class of the request.
+
+    Returns:
+        AgentMessage: The response message from the first target to answer.
+
+    Raises:
+        ValueError: If a target's provider is not found.
+        Exception: The last target's error, if none of them answered.
+    """
+    targets: list[AIModel] = model_router.route(model)
+    tried: set[tuple[str, str]] = set()
+    last_error: Exception | None = None
+    for target in targets:
+        if (target.provider, target.id) in tried:
+            continue
+        tried.add((target.provider, target.id))
+        generate = partial(__agenerate_on, target, message_thread, cache_key, priority)
+        backup: AIModel | None = next(
+            (other for other in targets if (other.provider, other.id) not in tried),
+            None,
+        )
+        try:
+            if (
+                settings.HEDGE_ENABLED
+                and priority is Priority.INTERACTIVE
+                and backup is not None
+            ):
+                reply: AgentMessage = await hedge_policy.arun(
+                    f"{target.provider}/{target.id}",
+                    generate,
+                    partial(
+                        __ahedge_on, backup, tried, message_thread, cache_key, priority
+                    ),
+                )
+            else:
+                reply = await generate()
+        except Exception as e:
+            if not is_failover_error(e):
+                raise
+            logger.error(f"Failing over from '{target.provider}/{target.id}': {e}")
+            last_error = e
+            continue
+        return reply
+
+    assert last_error is not None
+    raise last_error
+
+
+async def aconverse(
+    model: AIModel,
+    message_thread: MessageThread,
+    cache_mode: CacheMode = CacheMode.USE,
+    priority: Priority = Priority.INTERACTIVE,
+    retrieval: RetrievalOptions | None = None,
+) -> Message:
+    """Asynchronously send a message to the AI model and receive a response.
+
+    Args:
+        model (AIModel): The AI model to use for the conversation.
+        message_thread (MessageThread): The thread of messages to send.
+        cache_mode (CacheMode): How the request interacts with the response
+            cache, when it is enabled.
+        priority (Priority): The scheduling class of the request, when it
+            has to queue for the provider.
+        retrieval (RetrievalOptions | None): If set, context retrieved for
+            the latest message is injected into the thread before it is sent.
+
+    Returns:
+        Message: The response message from the AI model.
+
+    Raises:
+        ValueError: If the provider for the model is not found,
+            or the latest message exceeds the model's context window.
+        QueueFullError: If the provider's queue is full.
+    """
+    __validate_request(model, message_thread)
+
+    # inject retrieved context, before the cache key covers the thread
+    if retrieval is not None:
+        with tracer.span("retrieval.augment"):
+            message_thread = await retrieval_service.aaugment(message_thread, retrieval)
+
+    # serve identical requests from the response cache
+    cache_key: str | None = __cache_key(model, message_thread, cache_mode)
+    if cache_key is not None and cache_mode is CacheMode.USE:
+        cached: AgentMessage | None = await response_cache.aget(cache_key)
+        cache_requests.inc(
+            cache="responses", result="miss" if cached is None else "hit"
+        )
+        if cached is not None:
+            return cached
+
+    # identical concurrent requests share a single generation, when opted in
+    if settings.COALESCE_GENERATIONS and cache_mode is CacheMode.USE:
+        flight_key: str = cache_key or response_cache_key(model, message_thread)
+        return await generation_flights.do(
+            flight_key,
+            lambda: __aroute(model, message_thread, cache_key, priority),
+        )
+    return await __aroute(model, message_thread, cache_key, priority)
+
+
+async def aconverse_with_tools(
+    model: AIModel,
+    message_thread: MessageThread,
+    tools: ToolOptions,
+    cache_mode: CacheMode = CacheMode.USE,
+    retrieval: RetrievalOptions | None = None,
+) -> list[Message]:
+    """Converse with the model, running the tools it calls server-side.
+
+    Each step sends the thread to the model; if the reply calls tools, the
+    calls of that turn run concurrently (each within its tool's timeout),
+    their results are appended and the model is called again, until it
+    answers without calling tools or the step limit is reached. A failed
+    or unknown tool is reported to the model as an error result.
+
+    Args:
+        model (AIModel): The AI model to use for the conversation.
+        message_thread (MessageThread): The thread of messages to send.
+        tools (ToolOptions): The registered tools offered to the model, and
+            the step limit, at most `settings.TOOL_MAX_STEPS`.
+        cache_mode (CacheMode): How each step interacts with the response
+            cache, when it is enabled.
+        retrieval (RetrievalOptions | None): If set, context retrieved for
+            the latest message is injected into the thread once, up front.
+
+    Returns:
+        list[Message]: The messages the loop added to the thread, in order:
+            the model's tool calls and their results, then its answer. If the
+            step limit is reached first, the calls of the last reply are
+            answered with error results instead of being run, so the thread
+            stays valid to continue; the reply is then the last agent message.
+
+    Raises:
+        ValueError: If a requested tool or the model's provider is not found,
+            or the latest message exceeds the model's context window.
+        TypeError: If the model is not a chat model.
+        QueueFullError: If the provider's queue is full.
+    """
+    __validate_request(model, message_thread)
+    # a request may lower the step limit, but not raise it past the setting
+    max_steps: int = min(
+        tools.max_steps or settings.TOOL_MAX_STEPS, settings.TOOL_MAX_STEPS
+    )
+    thread: MessageThread = message_thread.model_copy(
+        update={
+            "messages": list(message_thread.messages),
+            "tools": tool_registry.definitions(tools.names),
+        }
+    )
+    if retrieval is not None:
+        with tracer.span("retrieval.augment"):
+            thread = await retrieval_service.aaugment(thread, retrieval)
+
+    added: list[Message] = []
+    for step in range(1, max_steps + 1):
+        reply: Message = await aconverse(model, thread, cache_mode)
+        added.append(reply)
+        if not isinstance(reply, AgentMessage) or not reply.tool_requests:
+            return added
+        if step == max_steps:
+            added.extend(
+                UserMessage(
+                    tool_response=ToolResponse(
+                        id=request.id,
+                        name=request.name,
+                        content={"error": "The tool step limit was reached."},
+                    )
+                )
+                for request in reply.tool_requests
+            )
+            break
+
+        # the calls of a turn are independent, so they run concurrently
+        with tracer.span("tools.execute", step=step, calls=len(reply.tool_requests)):
+            results: list[ToolResponse] = await tool_registry.aexecute_all(
+                reply.tool_requests
+            )
+        tool_messages: list[UserMessage] = [
+            UserMessage(tool_response=result) for result in results
+        ]
+        added.extend(tool_messages)
+        thread.messages.extend([reply, *tool_messages])
+
+    logger.warning(
+        f"Stopped the tool loop of thread '{message_thread.id}' after {max_steps} steps"
+    )
+    return added
+
+
+def last_reply(messages: Sequence[Message]) -> Message:
+    """Find the model's last reply among the messages of a tool loop.
+
+    Args:
+        messages (Sequence[Message]): The messages `aconverse_with_tools` added.
+
+    Returns:
+        Message: The last agent message.
+
+    Raises:
+        ValueError: If there is no agent message.
+    """
+    for message in reversed(messages):
+        if message.role is MessageRole.AGENT:
+            return message
+    raise ValueError("The tool loop added no reply.")
+
+
+async def aconverse_batch(
+    jobs: Sequence[tuple[AIModel, MessageThread]],
+    concurrency: int | None = None,
+) -> AsyncGenerator[tuple[int, Message | Exception]]:
+    """Run many independent conversations, yielding replies as they complete.
+
+    Jobs run concurrently, at most `concurrency` at a time per provider, so
+    one slow provider does not hold back the others, and queue behind
+    interactive requests for the provider. A failing job yields its
+    exception instead of failing the batch.
+
+    Args:
+        jobs (Sequence[tuple[AIModel, MessageThread]]): The model and thread
+            of each conversation.
+        concurrency (int | None): Jobs run at once per provider.
+            Defaults to `settings.BATCH_PROVIDER_CONCURRENCY`.
+
+    Yields:
+        tuple[int, Message | Exception]: The index of a job and its reply
+            or error, in completion order.
+    """
+    limit: int = (
+        settings.BATCH_PROVIDER_CONCURRENCY if concurrency is None else concurrency
+    )
+    semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def run(
+        index: int, model: AIModel, message_thread: MessageThread
+    ) -> tuple[int, Message | Exception]:
+        semaphore = semaphores.setdefault(model.provider, asyncio.Semaphore(limit))
+        async with semaphore:
+            try:
+                return index, await aconverse(
+                    model, message_thread, priority=Priority.BATCH
+                )
+            except Exception as e:
+                return index, e
+
+    tasks: list[asyncio.Task[tuple[int, Message | Exception]]] = [
+        asyncio.create_task(run(index, model, message_thread))
+        for index, (model, message_thread) in enumerate(jobs)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # stop outstanding jobs if the consumer goes away (e.g. a disconnect)
+        for task in tasks:
+            task.cancel()
+
+
+async def __astream_target(
+    provider: Provider, model: AIModel, fitted: ContextFit
+) -> AsyncGenerator[AgentMessageDelta]:
+    """Stream a reply from a single routing target.
+
+    Args:
+        provider (Provider): The provider serving the model.
+        model (AIModel): The AI model to stream from.
+        fitted (ContextFit): The thread, fitted to the model's context window.
+
+    Yields:
+        AgentMessageDelta: The response, fragment by fragment.
+    """
+    thread: MessageThread = await context_window.asummarize(
+        model, fitted, __summarizer(provider, model)
+    )
+    # the slot is held until the stream ends; failures before the first
+    # delta are retried, later ones are not
+    async with provider_scheduler.slot(provider.name, model.id):
+        with generations_in_flight.track(provider=provider.name):
+            start: float = perf_counter()
+            first: bool = True
+            async for delta in provider_resilience.astream(
+                provider.name, lambda: provider.converse_stream(model, thread)
+            ):
+                if first:
+                    time_to_first_token_seconds.observe(
+                        perf_counter() - start, provider=provider.name, model=model.id
+                    )
+                    first = False
+                yield delta
+
+
+def __available_targets(model: AIModel) -> list[tuple[Provider, AIModel]]:
+    """Resolve the model's routing targets that can take a request right now.
+
+    Args:
+        model (AIModel): The requested AI model, possibly an alias.
+
+    Returns:
+        list[tuple[Provider, AIModel]]: The available targets and their
+            providers, best first.
+
+    Raises:
+        ValueError: If a target's provider is not found.
+        CircuitOpenError: If every target's provider circuit is open.
+        QueueFullError: If every target's provider queue is full.
+    """
+    candidates: list[tuple[Provider, AIModel]] = []
+    unavailable: Exception | None = None
+    for target in model_router.route(model):
+        provider: Provider = __retrieve_provider(target)
+        try:
+            provider_resilience.breaker(provider.name).check()
+            provider_scheduler.check(provider.name, target.id)
+        except (CircuitOpenError, QueueFullError) as e:
+            unavailable = unavailable or e
+            continue
+        candidates.append((provider, target))
+    if not candidates:
+        assert unavailable is not None
+        raise unavailable
+    return candidates
+
+
+def converse_stream(
+    model: AIModel,
+    message_thread: MessageThread,
+    retrieval: RetrievalOptions | None = None,
+) -> AsyncIterator[AgentMessageDelta]:
+    """Stream the AI model's response to a message thread.
+
+    The request is validated and the providers resolved eagerly, so errors
+    are raised here rather than once the stream has started. Routing targets
+    are failed over until one of them produces its first delta.
+
+    Args:
+        model (AIModel): The AI model to use for the conversation.
+        message_thread (MessageThread): The thread of messages to send.
+        retrieval (RetrievalOptions | None): If set, context retrieved for
+            the latest message is injected into the thread once the stream
+            is consumed.
+
+    Returns:
+        AsyncIterator[AgentMessageDelta]: The response, fragment by fragment.
+
+    Raises:
+        TypeError: If the model is not a chat model.
+        ValueError: If the thread is empty, exceeds the model's context window
+            or the provider is not found.
+        CircuitOpenError: If every target's provider circuit is open.
+        QueueFullError: If every target's provider queue is full.
+    """
+    __validate_request(model, message_thread)
+
+    # retrieve the providers, skipping those known to be down or overloaded
+    candidates: list[tuple[Provider, AIModel]] = __available_targets(model)
+
+    # fit the thread to the first target's context window; a summary, if any,
+    # is generated once the stream is consumed
+    first_fit: ContextFit = context_window.fit(candidates[0][1], message_thread)
+
+    async def stream() -> AsyncGenerator[AgentMessageDelta]:
+        thread: MessageThread = message_thread
+        if retrieval is not None:
+            with tracer.span("retrieval.augment"):
+                thread = await retrieval_service.aaugment(message_thread, retrieval)
+        for index, (provider, target) in enumerate(candidates):
+            fitted: ContextFit = (
+                first_fit
+                if index == 0 and thread is message_thread
+                else context_window.fit(target, thread)
+            )
+            started: bool = False
+            start: float = perf_counter()
+            try:
+                with measure_pacing() as paced:
+                    async for delta in __astream_target(provider, target, fitted):
+                        started = True
+                        yield delta
+            except Exception as e:
+                model_router.record_failure(target)
+                if started or index == len(candidates) - 1 or not is_failover_error(e):
+                    raise
+                logger.error(f"Failing over from '{provider.name}/{target.id}': {e}")
+                continue
+            model_router.record_success(target, perf_counter() - start - paced())
+            return
+
+    return stream()
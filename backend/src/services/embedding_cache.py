@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src.config import settings
+from src.models import AIModel
+from src.utils import setup_logger
+from src.utils.vectors import pack_vector, unpack_vector
+
+logger = setup_logger(__name__)
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    vector BLOB NOT NULL
+);
+"""
+
+
+def embedding_cache_key(model: AIModel, text: str) -> str:
+    """Build the cache key of a text's embedding.
+
+    Embeddings are deterministic, so the key only depends on the model and
+    a hash of the text's content: re-embedding an unchanged text hits the
+    cache, whichever request or document it comes from.
+
+    Args:
+        model (AIModel): The embedding model.
+        text (str): The embedded text.
+
+    Returns:
+        str: A hex SHA-256 digest identifying the embedding.
+    """
+    digest = hashlib.sha256()
+    for part in (model.provider, model.id, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory, then SQLite) cache of embedding vectors.
+
+    Vectors are stored as float32 bytes. The memory tier is an LRU bounded by
+    entry count; the SQLite tier keeps every vector across restarts, so
+    re-embedding a corpus only pays for the documents that changed. Vectors
+    never expire, since a model always embeds a text the same way.
+    """
+
+    def __init__(self, max_entries: int | None = None, path: str | None = None):
+        """Initialize the cache; defaults come from the settings.
+
+        Args:
+            max_entries (int | None): Vectors kept in memory.
+            path (str | None): The SQLite database file, ":memory:", or empty
+                for no disk tier. The database is opened on first use.
+        """
+        self._max_entries: int = (
+            settings.EMBEDDING_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self._path: str = settings.EMBEDDING_CACHE_PATH if path is None else path
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._connection: sqlite3.Connection | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the disk tier, if any. Caller holds the lock."""
+        if self._connection is None and self._path:
+            if self._path != ":memory:":
+                Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            logger.info(f"Opened embedding cache at {self._path}")
+        return self._connection
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """Insert a vector in the memory tier. Caller holds the lock."""
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Retrieve the cached vectors of some keys.
+
+        Args:
+            keys (list[str]): The embeddings' cache keys.
+
+        Returns:
+            dict[str, list[float]]: The vectors found, by key.
+        """
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for key in keys:
+                data: bytes | None = self._memory.get(key)
+                if data is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = data
+            missing: list[str] = [key for key in keys if key not in found]
+            connection: sqlite3.Connection | None = self._connect() if missing else None
+            if connection is not None:
+                try:
+                    rows: list[tuple[str, bytes]] = connection.execute(
+                        "SELECT key, vector FROM embeddings WHERE key IN "
+                        f"({', '.join('?' * len(missing))})",
+                        missing,
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not read the embedding cache: {e}")
+                    rows = []
+                for key, data in rows:
+                    self._remember(key, data)
+                    found[key] = data
+        return {key: unpack_vector(data) for key, data in found.items()}
+
+    def put_many(self, vectors: dict[str, list[float]]) -> None:
+        """Cache vectors in both tiers.
+
+        Args:
+            vectors (dict[str, list[float]]): The vectors to cache, by key.
+        """
+        packed: dict[str, bytes] = {
+            key: pack_vector(vector) for key, vector in vectors.items()
+        }
+        with self._lock:
+            for key, data in packed.items():
+                self._remember(key, data)
+            connection: sqlite3.Connection | None = self._connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        packed.items(),
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not write the embedding cache: {e}")
+
+    async def aget_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Asynchronously retrieve cached vectors; disk reads run in a thread."""
+        with self._lock:
+            if all(key in self._memory for key in keys):
+                for key in keys:
+                    self._memory.move_to_end(key)
+                return {key: unpack_vector(self._memory[key]) for key in keys}
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aput_many(self, vectors: dict[str, list[float]]) -> None:
+        """Asynchronously cache vectors; disk writes run in a thread."""
+        await asyncio.to_thread(self.put_many, vectors)
+
+    def clear(self) -> None:
+        """Drop every cached vector from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            connection: sqlite3.Connection | None = self._connect()
+            if connection is not None:
+                with connection:
+                    connection.execute("DELETE FROM embeddings")
+
+    def close(self) -> None:
+        """Close the disk tier's database."""
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+embedding_cache = EmbeddingCache()
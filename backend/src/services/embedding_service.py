@@ -0,0 +1,98 @@
+import asyncio
+from collections.abc import Sequence
+from functools import partial
+
+from src.config import settings
+from src.models import AIModel, AIModelType, Provider
+from src.services.embedding_cache import embedding_cache, embedding_cache_key
+from src.services.provider_service import get_provider
+from src.services.scheduler import provider_scheduler
+from src.utils import MicroBatcher, SingleFlight, provider_resilience, setup_logger
+from src.utils.metrics import cache_requests
+
+logger = setup_logger(__name__)
+
+
+async def __aembed_batch(
+    target: tuple[str, str], texts: list[str]
+) -> list[list[float]]:
+    """Embed a micro-batch of texts in a single provider call.
+
+    Args:
+        target (tuple[str, str]): The provider name and model id.
+        texts (list[str]): The texts of the batch.
+
+    Returns:
+        list[list[float]]: One vector per text, in order.
+    """
+    provider_name, model_id = target
+    provider: Provider = get_provider(provider_name)
+    model = AIModel(id=model_id, provider=provider_name, type=AIModelType.EMBEDDING)
+    logger.debug(f"Embedding {len(texts)} texts with '{provider_name}/{model_id}'")
+    async with provider_scheduler.slot(provider.name, model.id):
+        return await provider_resilience.acall(
+            provider.name, lambda: provider.aembed(model, texts)
+        )
+
+
+# Concurrent texts for the same model are sent upstream together
+embedding_batcher: MicroBatcher[tuple[str, str], str, list[float]] = MicroBatcher(
+    __aembed_batch,
+    max_batch=settings.EMBEDDING_BATCH_SIZE,
+    max_wait=settings.EMBEDDING_BATCH_WAIT,
+)
+
+# Identical texts being embedded concurrently share one upstream embedding
+embedding_flights: SingleFlight[str, list[float]] = SingleFlight()
+
+
+async def aembed(model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+    """Embed texts, serving unchanged texts from the embedding cache.
+
+    Texts missing from the cache are micro-batched with those of concurrent
+    requests for the same model, so many single-text requests cost a single
+    upstream call; new vectors are cached by the hash of their text.
+
+    Args:
+        model (AIModel): The embedding model to use.
+        texts (Sequence[str]): The texts to embed.
+
+    Returns:
+        list[list[float]]: One vector per text, in order.
+
+    Raises:
+        TypeError: If the model is not an embedding model.
+        ValueError: If there are no texts, or the provider is not found or
+            does not support embeddings.
+    """
+    if model.type is not AIModelType.EMBEDDING:
+        raise TypeError(f"Model '{model.id}' is not an embedding model.")
+    if not texts:
+        raise ValueError("At least one text is required.")
+    get_provider(model.provider)  # Fail fast if the provider is not found
+
+    keys: list[str] = [embedding_cache_key(model, text) for text in texts]
+    vectors: dict[str, list[float]] = await embedding_cache.aget_many(
+        list(dict.fromkeys(keys))
+    )
+    missing: dict[str, str] = {
+        key: text for key, text in zip(keys, texts, strict=True) if key not in vectors
+    }
+    cache_requests.inc(len(keys) - len(missing), cache="embeddings", result="hit")
+    cache_requests.inc(len(missing), cache="embeddings", result="miss")
+
+    if missing:
+        target: tuple[str, str] = (model.provider, model.id)
+        embedded: list[list[float]] = await asyncio.gather(
+            *(
+                embedding_flights.do(
+                    key, partial(embedding_batcher.submit, target, text)
+                )
+                for key, text in missing.items()
+            )
+        )
+        fresh: dict[str, list[float]] = dict(zip(missing, embedded, strict=True))
+        await embedding_cache.aput_many(fresh)
+        vectors.update(fresh)
+
+    return [vectors[key] for key in keys]
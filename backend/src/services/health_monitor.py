@@ -0,0 +1,194 @@
+import asyncio
+import math
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import perf_counter
+
+from src.config import settings
+from src.models import HealthState, Provider, ProviderHealth
+from src.services.provider_registry import provider_registry
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    rank: int = max(math.ceil(fraction * len(samples)), 1)
+    return samples[rank - 1]
+
+
+@dataclass
+class _ProbeRecord:
+    """Probe history of a single provider."""
+
+    window: int
+    state: HealthState = HealthState.UNKNOWN
+    checked_at: datetime | None = None
+    consecutive_failures: int = 0
+    error: str | None = None
+    latencies: deque[float] = field(default_factory=deque[float])
+
+    def __post_init__(self) -> None:
+        """Bound the latency window."""
+        self.latencies = deque(self.latencies, maxlen=self.window)
+
+    def to_health(self, name: str) -> ProviderHealth:
+        """Summarize the history, with latency percentiles in milliseconds."""
+        samples: list[float] = sorted(self.latencies)
+        return ProviderHealth(
+            name=name,
+            state=self.state,
+            checked_at=self.checked_at,
+            consecutive_failures=self.consecutive_failures,
+            samples=len(samples),
+            latency_p50_ms=_percentile(samples, 0.50) * 1000 if samples else None,
+            latency_p95_ms=_percentile(samples, 0.95) * 1000 if samples else None,
+            latency_p99_ms=_percentile(samples, 0.99) * 1000 if samples else None,
+            error=self.error,
+        )
+
+
+class HealthMonitor:
+    """Probes every provider on an interval and tracks its health.
+
+    A provider is marked down after `failure_threshold` consecutive failed
+    probes and up again after a single successful one. Providers that have
+    not been probed yet are unknown, and are never treated as down.
+    """
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        timeout: float | None = None,
+        failure_threshold: int | None = None,
+        window: int | None = None,
+        providers: Callable[[], dict[str, Provider]] = provider_registry.providers,
+    ):
+        """Initialize the monitor; defaults come from the settings.
+
+        Args:
+            interval (float | None): Seconds between probe rounds.
+            timeout (float | None): Seconds before a probe counts as failed.
+            failure_threshold (int | None): Consecutive failures marking a
+                provider down.
+            window (int | None): Probe latencies kept per provider.
+            providers (Callable[[], dict[str, Provider]]): Returns the
+                providers to probe, keyed by name.
+        """
+        self._interval: float = (
+            settings.HEALTH_CHECK_INTERVAL if interval is None else interval
+        )
+        self._timeout: float = (
+            settings.HEALTH_CHECK_TIMEOUT if timeout is None else timeout
+        )
+        self._failure_threshold: int = (
+            settings.HEALTH_FAILURE_THRESHOLD
+            if failure_threshold is None
+            else failure_threshold
+        )
+        self._window: int = settings.HEALTH_LATENCY_WINDOW if window is None else window
+        self._providers: Callable[[], dict[str, Provider]] = providers
+        self._records: dict[str, _ProbeRecord] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def _record(self, name: str) -> _ProbeRecord:
+        """Retrieve (creating on first use) the probe history of a provider."""
+        if name not in self._records:
+            self._records[name] = _ProbeRecord(window=self._window)
+        return self._records[name]
+
+    async def aprobe(self, provider: Provider) -> ProviderHealth:
+        """Probe a single provider and record the outcome.
+
+        Args:
+            provider (Provider): The provider to probe.
+
+        Returns:
+            ProviderHealth: The provider's health after the probe.
+        """
+        record: _ProbeRecord = self._record(provider.name)
+        start: float = perf_counter()
+        try:
+            await asyncio.wait_for(provider.aping(), timeout=self._timeout)
+        except Exception as e:
+            record.consecutive_failures += 1
+            record.error = str(e) or type(e).__name__
+            if record.consecutive_failures >= self._failure_threshold:
+                if record.state is not HealthState.DOWN:
+                    logger.error(
+                        f"Provider '{provider.name}' is down after "
+                        f"{record.consecutive_failures} failed probes: {record.error}"
+                    )
+                record.state = HealthState.DOWN
+        else:
+            record.latencies.append(perf_counter() - start)
+            if record.state is HealthState.DOWN:
+                logger.info(f"Provider '{provider.name}' is up again")
+            record.state = HealthState.UP
+            record.consecutive_failures = 0
+            record.error = None
+        record.checked_at = datetime.now()
+        return record.to_health(provider.name)
+
+    async def aprobe_all(self) -> list[ProviderHealth]:
+        """Probe every provider concurrently and record the outcomes.
+
+        Returns:
+            list[ProviderHealth]: The health of each provider.
+        """
+        providers: dict[str, Provider] = self._providers()
+        return list(
+            await asyncio.gather(
+                *(self.aprobe(provider) for provider in providers.values())
+            )
+        )
+
+    async def _run(self) -> None:
+        """Probe every provider, forever, on the interval."""
+        while True:
+            try:
+                await self.aprobe_all()
+            except Exception as e:
+                logger.error(
+                    "Error probing providers", exc_info=True, extra={"error": str(e)}
+                )
+            await asyncio.sleep(self._interval)
+
+    def start(self) -> None:
+        """Start probing in the background, if not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def astop(self) -> None:
+        """Stop probing in the background."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def is_down(self, provider_name: str) -> bool:
+        """Whether a provider is known to be down.
+
+        Args:
+            provider_name (str): The name of the provider.
+
+        Returns:
+            bool: True only if the latest probes failed; unknown providers
+                are assumed up.
+        """
+        record: _ProbeRecord | None = self._records.get(provider_name)
+        return record is not None and record.state is HealthState.DOWN
+
+    def report(self) -> list[ProviderHealth]:
+        """Summarize the health of every provider, probed or not.
+
+        Returns:
+            list[ProviderHealth]: The health of each provider.
+        """
+        return [self._record(name).to_health(name) for name in self._providers()]
+
+
+health_monitor = HealthMonitor()
@@ -0,0 +1,141 @@
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from src.config import settings
+from src.utils import measure_pacing, setup_logger
+from src.utils.resilience import RetryBudget
+
+logger = setup_logger(__name__)
+
+
+class HedgePolicy:
+    """Hedges slow calls with a duplicate, keeping whichever answers first.
+
+    A call that has not completed within the observed latency percentile
+    of its key (e.g. a model) gets a duplicate on a secondary target; the
+    first to succeed wins and the other is cancelled. Hedges are limited by
+    a per-key budget earning `budget_ratio` hedges per call, so at most that
+    share of traffic is duplicated.
+    """
+
+    def __init__(
+        self,
+        percentile: float | None = None,
+        default_delay: float | None = None,
+        min_samples: int | None = None,
+        budget_ratio: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the policy; defaults come from the settings.
+
+        Args:
+            percentile (float | None): Latency percentile, in (0, 1], after
+                which a call is hedged.
+            default_delay (float | None): Hedge delay in seconds until enough
+                latencies have been observed.
+            min_samples (int | None): Latencies needed to use the percentile.
+            budget_ratio (float | None): Hedges earned per call.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self._percentile: float = (
+            settings.HEDGE_PERCENTILE if percentile is None else percentile
+        )
+        self._default_delay: float = (
+            settings.HEDGE_DEFAULT_DELAY if default_delay is None else default_delay
+        )
+        self._min_samples: int = (
+            settings.HEDGE_MIN_SAMPLES if min_samples is None else min_samples
+        )
+        self._window: int = settings.HEDGE_LATENCY_WINDOW
+        self._budget_ratio: float = (
+            settings.HEDGE_BUDGET_RATIO if budget_ratio is None else budget_ratio
+        )
+        self._clock: Callable[[], float] = clock
+        self._latencies: dict[str, deque[float]] = {}
+        self._budgets: dict[str, RetryBudget] = {}
+
+    def delay(self, key: str) -> float:
+        """Seconds to wait for a call before hedging it.
+
+        Args:
+            key (str): The hedged key, e.g. "provider/model id".
+
+        Returns:
+            float: The key's latency percentile, or the default delay while
+                too few latencies have been observed.
+        """
+        samples: list[float] = sorted(self._latencies.get(key, ()))
+        if len(samples) < self._min_samples:
+            return self._default_delay
+        rank: int = max(math.ceil(self._percentile * len(samples)), 1)
+        return samples[rank - 1]
+
+    def _observe(self, key: str, elapsed: float) -> None:
+        """Record how long a call took to produce its result."""
+        self._latencies.setdefault(key, deque(maxlen=self._window)).append(elapsed)
+
+    def _budget(self, key: str) -> RetryBudget:
+        """Retrieve (creating on first use) the hedge budget of a key."""
+        if key not in self._budgets:
+            self._budgets[key] = RetryBudget(self._budget_ratio)
+        return self._budgets[key]
+
+    async def arun[T](
+        self,
+        key: str,
+        primary: Callable[[], Awaitable[T]],
+        secondary: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run a call, hedging it with a secondary call if it is slow.
+
+        Args:
+            key (str): The hedged key, e.g. "provider/model id".
+            primary (Callable[[], Awaitable[T]]): Starts the primary call.
+            secondary (Callable[[], Awaitable[T]]): Starts the hedge.
+
+        Returns:
+            T: The result of the first call to succeed.
+
+        Raises:
+            Exception: The primary call's error, if every call failed.
+        """
+        budget: RetryBudget = self._budget(key)
+        budget.deposit()
+        start: float = self._clock()
+        with measure_pacing() as paced:  # The primary's task adds to it
+            tasks: list[asyncio.Future[T]] = [asyncio.ensure_future(primary())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.delay(key))
+            if not done and budget.withdraw():
+                logger.info(
+                    f"Hedging a call to '{key}' after {self._clock() - start:.2f}s"
+                )
+                tasks.append(asyncio.ensure_future(secondary()))
+
+            pending: set[asyncio.Future[T]] = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        # When the hedge wins, the primary has taken at least
+                        # this long; dropping those slow samples would make
+                        # the delay drift down and hedge ever more calls.
+                        # Pacing is left out, and a primary still paced says
+                        # nothing of the target's latency
+                        latency: float = self._clock() - start - paced()
+                        if latency > 0:
+                            self._observe(key, latency)
+                        return task.result()
+            raise tasks[0].exception() or RuntimeError(f"Hedged call to '{key}' failed")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+hedge_policy = HedgePolicy()
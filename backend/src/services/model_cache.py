@@ -0,0 +1,192 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from time import monotonic
+
+from src.config import settings
+from src.models import AIModel, Provider
+from src.utils import provider_resilience, setup_logger
+from src.utils.metrics import cache_requests
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class CatalogEntry:
+    """A provider's cached model catalog."""
+
+    models: list[AIModel]
+    fetched_at: float
+    index: dict[str, AIModel] = field(default_factory=dict[str, AIModel])
+
+    def __post_init__(self) -> None:
+        """Index the models by id for constant-time lookups."""
+        if not self.index:
+            self.index = {model.id: model for model in self.models}
+
+
+class ModelCatalogCache:
+    """Per-provider cache of model catalogs with stale-while-revalidate.
+
+    A catalog younger than `ttl` is served as is. Up to `stale_ttl` seconds
+    past that, the stale catalog is still served while a single background
+    refresh fetches a new one. Older (or missing) catalogs are fetched inline.
+    Failed refreshes keep the previous catalog.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl (float | None): Seconds a catalog is considered fresh.
+                Defaults to `settings.MODEL_CACHE_TTL`.
+            stale_ttl (float | None): Seconds past `ttl` a stale catalog may be
+                served while it is refreshed.
+                Defaults to `settings.MODEL_CACHE_STALE_TTL`.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self._ttl: float = settings.MODEL_CACHE_TTL if ttl is None else ttl
+        self._stale_ttl: float = (
+            settings.MODEL_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        )
+        self._clock: Callable[[], float] = clock
+        self._entries: dict[str, CatalogEntry] = {}
+        self._refreshing: set[str] = set()
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _lookup(self, provider_name: str) -> tuple[CatalogEntry | None, bool]:
+        """Look up a usable entry and whether it needs a background refresh.
+
+        Returns:
+            tuple[CatalogEntry | None, bool]: The entry if it is fresh or within
+                the stale window (else None), and whether a refresh should be
+                started by the caller.
+        """
+        entry: CatalogEntry | None = self._entries.get(provider_name)
+        if entry is None:
+            cache_requests.inc(cache="models", result="miss")
+            return None, False
+
+        age: float = self._clock() - entry.fetched_at
+        if age < self._ttl:
+            cache_requests.inc(cache="models", result="hit")
+            return entry, False
+        if age >= self._ttl + self._stale_ttl:
+            cache_requests.inc(cache="models", result="miss")
+            return None, False
+
+        cache_requests.inc(cache="models", result="stale")
+
+        with self._lock:
+            if provider_name in self._refreshing:
+                return entry, False
+            self._refreshing.add(provider_name)
+        return entry, True
+
+    def _store(self, provider_name: str, models: list[AIModel]) -> CatalogEntry:
+        """Store a freshly fetched catalog."""
+        entry = CatalogEntry(models=models, fetched_at=self._clock())
+        self._entries[provider_name] = entry
+        return entry
+
+    def _refresh_failed(self, provider_name: str, e: Exception) -> None:
+        """Log a failed background refresh; the stale catalog is kept."""
+        logger.error(
+            f"Error refreshing model catalog for provider {provider_name}",
+            exc_info=True,
+            extra={"error": str(e)},
+        )
+
+    @staticmethod
+    async def _afetch(provider: Provider) -> list[AIModel]:
+        """Fetch a provider's full catalog, retrying transient failures."""
+        return await provider_resilience.acall(provider.name, provider.aget_models)
+
+    @staticmethod
+    def _fetch(provider: Provider) -> list[AIModel]:
+        """Fetch a provider's full catalog, retrying transient failures."""
+        return provider_resilience.call(provider.name, provider.get_models)
+
+    async def _arefresh(self, provider: Provider) -> None:
+        """Refresh a provider's catalog in the background."""
+        try:
+            self._store(provider.name, await self._afetch(provider))
+        except Exception as e:
+            self._refresh_failed(provider.name, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(provider.name)
+
+    def _refresh(self, provider: Provider) -> None:
+        """Refresh a provider's catalog from a background thread."""
+        try:
+            self._store(provider.name, self._fetch(provider))
+        except Exception as e:
+            self._refresh_failed(provider.name, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(provider.name)
+
+    async def aget_entry(self, provider: Provider) -> CatalogEntry:
+        """Retrieve a provider's catalog, fetching it if needed.
+
+        Args:
+            provider (Provider): The provider whose catalog to retrieve.
+
+        Returns:
+            CatalogEntry: The cached (or freshly fetched) catalog.
+        """
+        entry, refresh = self._lookup(provider.name)
+        if entry is None:
+            return self._store(provider.name, await self._afetch(provider))
+        if refresh:
+            task: asyncio.Task[None] = asyncio.create_task(self._arefresh(provider))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return entry
+
+    def get_entry(self, provider: Provider) -> CatalogEntry:
+        """Retrieve a provider's catalog, fetching it if needed.
+
+        Args:
+            provider (Provider): The provider whose catalog to retrieve.
+
+        Returns:
+            CatalogEntry: The cached (or freshly fetched) catalog.
+        """
+        entry, refresh = self._lookup(provider.name)
+        if entry is None:
+            return self._store(provider.name, self._fetch(provider))
+        if refresh:
+            threading.Thread(
+                target=self._refresh, args=(provider,), daemon=True
+            ).start()
+        return entry
+
+    def invalidate(self, provider_name: str | None = None) -> tuple[str, ...]:
+        """Drop cached catalogs so the next lookup fetches them again.
+
+        Args:
+            provider_name (str | None): The provider whose catalog to drop.
+                If None, every catalog is dropped.
+
+        Returns:
+            tuple[str, ...]: The names of the providers whose catalog was dropped.
+        """
+        if provider_name is None:
+            dropped: tuple[str, ...] = tuple(self._entries)
+            self._entries.clear()
+            return dropped
+        if self._entries.pop(provider_name, None) is None:
+            return ()
+        return (provider_name,)
+
+
+model_catalog_cache = ModelCatalogCache()
@@ -0,0 +1,186 @@
+from collections.abc import Callable, Sequence
+from threading import RLock
+
+from src.models import NotFoundError, Provider
+from src.providers import LMStudio, OpenAI
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+type ProviderFactory = Callable[[], Provider]
+
+DEFAULT_FACTORIES: tuple[ProviderFactory, ...] = (OpenAI, LMStudio)
+
+
+class ProviderRegistry:
+    """Process-wide registry of AI model inference providers.
+
+    Providers are built once (at application startup, or lazily on first use)
+    and reused across requests, so their HTTP clients and connection pools
+    survive between calls. Call `reload` to rebuild them after a configuration
+    change; the replaced providers are kept open until the next reload, so
+    requests still holding them can finish.
+    """
+
+    def __init__(self, factories: Sequence[ProviderFactory] = DEFAULT_FACTORIES):
+        """Initialize the registry with the factories used to build providers.
+
+        Args:
+            factories (Sequence[ProviderFactory]): Callables returning a
+                provider instance, invoked on every (re)load.
+        """
+        self._factories: tuple[ProviderFactory, ...] = tuple(factories)
+        self._providers: dict[str, Provider] | None = None
+        # Providers replaced by the latest reload, closed by the next one
+        self._retired: dict[str, Provider] = {}
+        self._lock: RLock = RLock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the providers have been built."""
+        return self._providers is not None
+
+    def _build(self) -> dict[str, Provider]:
+        """Build a fresh set of providers from the registered factories.
+
+        Providers that fail to initialize (e.g. due to missing configuration)
+        are logged and left out of the registry.
+
+        Returns:
+            dict[str, Provider]: The providers, keyed by name.
+        """
+        providers: dict[str, Provider] = {}
+        for factory in self._factories:
+            try:
+                provider: Provider = factory()
+            except Exception as e:
+                logger.error(
+                    f"Failed to initialize provider from {factory!r}",
+                    exc_info=True,
+                    extra={"error": str(e)},
+                )
+                continue
+            providers[provider.name] = provider
+        return providers
+
+    def _current(self) -> dict[str, Provider]:
+        """Return the loaded providers, building them on first use."""
+        providers = self._providers
+        if providers is None:
+            with self._lock:
+                if self._providers is None:
+                    self._providers = self._build()
+                providers = self._providers
+        return providers
+
+    def load(self) -> None:
+        """Build the providers if they have not been built yet."""
+        self._current()
+
+    def _swap(self, providers: dict[str, Provider] | None) -> list[Provider]:
+        """Replace the loaded providers, returning those that are safe to close.
+
+        On a reload, the previous providers are retired rather than closed:
+        requests started before the reload may still be using them. They are
+        released by the next reload instead, along with the providers it
+        retires in turn. Without new providers (i.e. on shutdown), every
+        provider is released at once.
+        """
+        with self._lock:
+            released: dict[str, Provider] = self._retired
+            previous: dict[str, Provider] = self._providers or {}
+            self._providers = providers
+            if providers is None:
+                self._retired = {}
+                return [*released.values(), *previous.values()]
+            self._retired = previous
+        return list(released.values())
+
+    def reload(self) -> tuple[str, ...]:
+        """Rebuild every provider, retiring the previous instances.
+
+        The providers retired by the previous reload are released.
+
+        Returns:
+            tuple[str, ...]: The names of the providers after the reload.
+        """
+        providers: dict[str, Provider] = self._build()
+        self._close_all(self._swap(providers))
+        logger.info(f"Reloaded providers: {', '.join(providers)}")
+        return tuple(providers)
+
+    async def areload(self) -> tuple[str, ...]:
+        """Rebuild every provider, retiring the previous instances.
+
+        The providers retired by the previous reload are released; unlike
+        `reload`, their async clients are closed too.
+
+        Returns:
+            tuple[str, ...]: The names of the providers after the reload.
+        """
+        providers: dict[str, Provider] = self._build()
+        await self._aclose_all(self._swap(providers))
+        logger.info(f"Reloaded providers: {', '.join(providers)}")
+        return tuple(providers)
+
+    def close(self) -> None:
+        """Release every provider, including retired ones, and reset the registry."""
+        self._close_all(self._swap(None))
+
+    async def aclose(self) -> None:
+        """Release every provider, including async clients, and reset the registry."""
+        await self._aclose_all(self._swap(None))
+
+    @staticmethod
+    def _close_all(providers: Sequence[Provider]) -> None:
+        """Close the given providers, logging (not raising) any failure."""
+        for provider in providers:
+            try:
+                provider.close()
+            except Exception as e:
+                logger.error(
+                    f"Error closing provider {provider.name}",
+                    exc_info=True,
+                    extra={"error": str(e)},
+                )
+
+    @staticmethod
+    async def _aclose_all(providers: Sequence[Provider]) -> None:
+        """Asynchronously close the given providers, logging any failure."""
+        for provider in providers:
+            try:
+                await provider.aclose()
+            except Exception as e:
+                logger.error(
+                    f"Error closing provider {provider.name}",
+                    exc_info=True,
+                    extra={"error": str(e)},
+                )
+
+    def get(self, provider_name: str) -> Provider:
+        """Retrieve a provider by name.
+
+        Args:
+            provider_name (str): The name of the provider to retrieve.
+
+        Returns:
+            Provider: The provider instance.
+
+        Raises:
+            NotFoundError: If the provider is not found.
+        """
+        providers: dict[str, Provider] = self._current()
+        if provider_name not in providers:
+            raise NotFoundError(f"Provider '{provider_name}' not found.")
+        return providers[provider_name]
+
+    def names(self) -> tuple[str, ...]:
+        """Retrieve the names of the registered providers."""
+        return tuple(self._current())
+
+    def providers(self) -> dict[str, Provider]:
+        """Retrieve a snapshot of the registered providers, keyed by name."""
+        return dict(self._current())
+
+
+provider_registry = ProviderRegistry()
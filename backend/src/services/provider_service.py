@@ -1,21 +1,26 @@
-from src.models import AIModel, AIModelType, Provider
+import asyncio
+from time import perf_counter
 
-# Inference providers
-from src.providers import LMStudio, OpenAI
-from src.utils import setup_logger
+from src.config import settings
+from src.models import (
+    AIModel,
+    AIModelType,
+    ModelCatalog,
+    NotFoundError,
+    Provider,
+    ProviderState,
+    ProviderStatus,
+)
+from src.services.health_monitor import health_monitor
+from src.services.model_cache import CatalogEntry, model_catalog_cache
+from src.services.provider_registry import provider_registry
+from src.utils import SingleFlight, bind_log_context, setup_logger
+from src.utils.metrics import catalog_query_seconds
 
 logger = setup_logger(__name__)
 
-
-def __retrieve_providers() -> dict[str, Provider]:
-    """Retrieve a dictionary of available AI model providers."""
-    openai_p: Provider = OpenAI()
-    lmstudio_p: Provider = LMStudio()
-
-    return {
-        openai_p.name: openai_p,
-        lmstudio_p.name: lmstudio_p,
-    }
+# Concurrent catalog lookups for the same provider share one upstream fetch
+catalog_flights: SingleFlight[str, CatalogEntry] = SingleFlight()
 
 
 def get_provider(provider_name: str) -> Provider:
@@ -28,12 +33,30 @@ def get_provider(provider_name: str) -> Provider:
         Provider: The provider instance.
 
     Raises:
-        ValueError: If the provider is not found.
+        NotFoundError: If the provider is not found.
+    """
+    return provider_registry.get(provider_name)
+
+
+def __filter_models(
+    models: list[AIModel],
+    limit: int | None = None,
+    type_filter: AIModelType | None = None,
+) -> list[AIModel]:
+    """Apply the type filter and limit to a cached model catalog.
+
+    Args:
+        models (list[AIModel]): The provider's full model catalog.
+        limit (int | None): Optional limit on the number of models to return.
+        type_filter (AIModelType | None):
+            Optional filter for the type of models to return.
+
+    Returns:
+        list[AIModel]: The matching models.
     """
-    providers: dict[str, Provider] = __retrieve_providers()
-    if provider_name not in providers:
-        raise ValueError(f"Provider '{provider_name}' not found.")
-    return providers[provider_name]
+    if type_filter:
+        models = [model for model in models if model.type == type_filter]
+    return models[:limit] if limit is not None else models
 
 
 def get_available_providers() -> tuple[str, ...]:
@@ -42,8 +65,7 @@ def get_available_providers() -> tuple[str, ...]:
     Returns:
         tuple[str, ...]: List of provider names.
     """
-    providers: dict[str, Provider] = __retrieve_providers()
-    return tuple(providers.keys())
+    return provider_registry.names()
 
 
 def get_available_models(
@@ -65,16 +87,22 @@ def get_available_models(
     """
     # Get provider names from get_available_providers
     provider_names = get_available_providers()
+    providers: dict[str, Provider] = provider_registry.providers()
     model_list: list[AIModel] = []
     for name in provider_names:
         # Retrieve provider instance
-        providers: dict[str, Provider] = __retrieve_providers()
         provider = providers.get(name)
         if provider is None:
             continue
+        if health_monitor.is_down(name):
+            logger.info(f"Skipping provider {name}, which is down")
+            continue
         try:
             logger.info(f"Retrieving models from provider: {name}")
-            models: list[AIModel] = provider.get_models(type_filter=type_filter)
+            models: list[AIModel] = __filter_models(
+                model_catalog_cache.get_entry(provider).models,
+                type_filter=type_filter,
+            )
         except Exception as e:
             logger.error(
                 f"Error retrieving models from provider {name}: {e}",
@@ -93,6 +121,171 @@ def get_available_models(
     return model_list
 
 
+async def __aget_catalog_entry(provider: Provider) -> CatalogEntry:
+    """Retrieve a provider's cached catalog, coalescing concurrent fetches.
+
+    Every filter and limit is applied to the full catalog, so all lookups
+    for a provider can share a single in-flight fetch.
+
+    Args:
+        provider (Provider): The provider whose catalog to retrieve.
+
+    Returns:
+        CatalogEntry: The provider's catalog.
+    """
+    return await catalog_flights.do(
+        provider.name, lambda: model_catalog_cache.aget_entry(provider)
+    )
+
+
+async def __query_provider(
+    provider: Provider, type_filter: AIModelType | None, timeout: float
+) -> tuple[list[AIModel], ProviderStatus]:
+    """Query a single provider for its models, bounded by a deadline.
+
+    Args:
+        provider (Provider): The provider to query.
+        type_filter (AIModelType | None):
+            Optional filter for the type of models to return.
+        timeout (float): The deadline for the provider to respond, in seconds.
+
+    Returns:
+        tuple[list[AIModel], ProviderStatus]: The models returned by the
+            provider (empty on failure) and the outcome of the query.
+    """
+    name: str = provider.name
+    with bind_log_context(provider=name):
+        start: float = perf_counter()
+        logger.info(f"Retrieving models from provider: {name}")
+        try:
+            entry: CatalogEntry = await asyncio.wait_for(
+                __aget_catalog_entry(provider), timeout=timeout
+            )
+            models: list[AIModel] = __filter_models(
+                entry.models, type_filter=type_filter
+            )
+        except TimeoutError:
+            logger.error(f"Timed out retrieving models from provider {name}")
+            return [], ProviderStatus(
+                name=name,
+                state=ProviderState.TIMED_OUT,
+                elapsed_ms=(perf_counter() - start) * 1000,
+                error=f"No response within {timeout} seconds.",
+            )
+        except Exception as e:
+            logger.error(
+                f"Error retrieving models from provider {name}: {e}",
+                exc_info=True,
+                extra={"error": str(e)},
+            )
+            return [], ProviderStatus(
+                name=name,
+                state=ProviderState.ERROR,
+                elapsed_ms=(perf_counter() - start) * 1000,
+                error=str(e),
+            )
+
+        logger.info(f"Retrieved {len(models)} models from provider: {name}")
+        return models, ProviderStatus(
+            name=name,
+            state=ProviderState.OK,
+            model_count=len(models),
+            elapsed_ms=(perf_counter() - start) * 1000,
+        )
+
+
+async def aget_model_catalog(
+    limit: int | None = None,
+    type_filter: AIModelType | None = None,
+    timeout: float | None = None,
+) -> ModelCatalog:
+    """Query every provider concurrently and gather their models.
+
+    Each provider is bounded by its own deadline, so a slow or dead backend
+    only removes its own models from the result instead of stalling it.
+    Providers the health monitor reports down are skipped without a query.
+
+    Args:
+        limit (int | None): Optional limit on the number of models to return.
+            If None, all available models will be returned.
+        type_filter (AIModelType | None):
+            Optional filter for the type of models to return.
+        timeout (float | None): Per-provider deadline in seconds.
+            Defaults to `settings.PROVIDER_TIMEOUT`.
+
+    Returns:
+        ModelCatalog: The gathered models and the outcome for each provider.
+    """
+    deadline: float = settings.PROVIDER_TIMEOUT if timeout is None else timeout
+    providers: dict[str, Provider] = provider_registry.providers()
+    queried: list[Provider] = []
+    skipped: list[ProviderStatus] = []
+    for name in get_available_providers():
+        if name not in providers:
+            continue
+        if health_monitor.is_down(name):
+            skipped.append(
+                ProviderStatus(
+                    name=name,
+                    state=ProviderState.DOWN,
+                    error="The provider failed its latest health checks.",
+                )
+            )
+            continue
+        queried.append(providers[name])
+    results: list[tuple[list[AIModel], ProviderStatus]] = await asyncio.gather(
+        *(__query_provider(provider, type_filter, deadline) for provider in queried)
+    )
+    for _, status in results:
+        catalog_query_seconds.observe(
+            status.elapsed_ms / 1000,
+            provider=status.name,
+            state=status.state.value,
+        )
+
+    model_list: list[AIModel] = [model for models, _ in results for model in models]
+
+    # limit the number of models if a limit is specified
+    if limit:
+        model_list = model_list[:limit]
+
+    return ModelCatalog(
+        models=model_list, providers=[status for _, status in results] + skipped
+    )
+
+
+async def aget_available_models(
+    limit: int | None = None, type_filter: AIModelType | None = None
+) -> list[AIModel]:
+    """Asynchronously retrieve a list of available AI models.
+
+    Providers are queried concurrently; those that fail or miss their deadline
+    are skipped (see `aget_model_catalog` for the per-provider outcome).
+
+    Args:
+        limit (int | None): Optional limit on the number of models to return.
+            If None, all available models will be returned.
+        type_filter (AIModelType | None):
+            Optional filter for the type of models to return.
+
+    Returns:
+        list[AIModel]: List of available AI models.
+    """
+    catalog: ModelCatalog = await aget_model_catalog(limit, type_filter)
+    return catalog.models
+
+
+async def areload_providers() -> tuple[str, ...]:
+    """Rebuild every provider, e.g. after a configuration change.
+
+    Returns:
+        tuple[str, ...]: The names of the providers after the reload.
+    """
+    names: tuple[str, ...] = await provider_registry.areload()
+    model_catalog_cache.invalidate()
+    return names
+
+
 def get_provider_models(
     provider_name: str, limit: int | None = None, type_filter: AIModelType | None = None
 ) -> list[AIModel]:
@@ -109,21 +302,16 @@ def get_provider_models(
         list[AIModel]: List of AI models from the specified provider.
 
     Raises:
-        ValueError: If the provider is not found.
+        NotFoundError: If the provider is not found.
         Exception: If there is an error retrieving models from the provider.
     """
-    # Validate provider name
-    providers: dict[str, Provider] = __retrieve_providers()
-    if provider_name not in providers:
-        raise ValueError(f"Provider '{provider_name}' not found.")
-
-    # Get the provider instance
-    provider: Provider = providers[provider_name]
+    # Get the provider instance (raises ValueError if not found)
+    provider: Provider = get_provider(provider_name)
 
     try:
         logger.info(f"Retrieving models from provider: {provider_name}")
-        models: list[AIModel] = provider.get_models(
-            limit=limit, type_filter=type_filter
+        models: list[AIModel] = __filter_models(
+            model_catalog_cache.get_entry(provider).models, limit, type_filter
         )
     except Exception as e:
         logger.error(
@@ -134,3 +322,81 @@ def get_provider_models(
         raise
 
     return models
+
+
+async def aget_provider_models(
+    provider_name: str, limit: int | None = None, type_filter: AIModelType | None = None
+) -> list[AIModel]:
+    """Asynchronously retrieve models from a specific provider.
+
+    Args:
+        provider_name (str): The name of the provider.
+        limit (int | None): Optional limit on the number of models to return.
+            If None, all available models will be returned.
+        type_filter (AIModelType | None):
+            Optional filter for the type of models to return.
+
+    Returns:
+        list[AIModel]: List of AI models from the specified provider.
+
+    Raises:
+        NotFoundError: If the provider is not found.
+        Exception: If there is an error retrieving models from the provider.
+    """
+    provider: Provider = get_provider(provider_name)
+
+    try:
+        logger.info(f"Retrieving models from provider: {provider_name}")
+        entry: CatalogEntry = await __aget_catalog_entry(provider)
+        models: list[AIModel] = __filter_models(entry.models, limit, type_filter)
+    except Exception as e:
+        logger.error(
+            f"Error retrieving models from provider {provider_name}: {e}",
+            exc_info=True,
+            extra={"error": str(e)},
+        )
+        raise
+
+    return models
+
+
+async def aget_model(provider_name: str, model_id: str) -> AIModel:
+    """Retrieve a model by id from a provider's cached catalog.
+
+    The lookup is a dictionary access on the cached catalog; the provider is
+    only contacted when its catalog is missing or expired.
+
+    Args:
+        provider_name (str): The name of the provider.
+        model_id (str): The unique identifier of the model.
+
+    Returns:
+        AIModel: The model.
+
+    Raises:
+        NotFoundError: If the provider or the model is not found.
+    """
+    provider: Provider = get_provider(provider_name)
+    entry: CatalogEntry = await __aget_catalog_entry(provider)
+    model: AIModel | None = entry.index.get(model_id)
+    if model is None:
+        raise NotFoundError(f"Model with ID '{model_id}' not found.")
+    return model
+
+
+def invalidate_model_cache(provider_name: str | None = None) -> tuple[str, ...]:
+    """Drop cached model catalogs so they are fetched again on next use.
+
+    Args:
+        provider_name (str | None): The provider whose catalog to drop.
+            If None, every catalog is dropped.
+
+    Returns:
+        tuple[str, ...]: The names of the providers whose catalog was dropped.
+
+    Raises:
+        NotFoundError: If the provider is not found.
+    """
+    if provider_name is not None:
+        get_provider(provider_name)  # Validate the provider name
+    return model_catalog_cache.invalidate(provider_name)
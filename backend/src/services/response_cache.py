@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from enum import Enum
+from pathlib import Path
+
+from src.config import settings
+from src.models import AgentMessage, AIModel, MessageThread
+from src.models.ai_models import InferenceParameters
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CacheMode(str, Enum):
+    """How a single request interacts with the response cache.
+
+    - USE: Serve a cached reply if there is one, and cache new replies.
+    - REFRESH: Skip the lookup but cache the new reply (`Cache-Control: no-cache`).
+    - BYPASS: Neither read nor write the cache (`Cache-Control: no-store`).
+    """
+
+    USE = "use"
+    REFRESH = "refresh"
+    BYPASS = "bypass"
+
+    @classmethod
+    def from_cache_control(cls, header: str | None) -> "CacheMode":
+        """Derive the cache mode from a `Cache-Control` request header."""
+        directives: set[str] = {
+            directive.strip().lower() for directive in (header or "").split(",")
+        }
+        if "no-store" in directives:
+            return cls.BYPASS
+        if "no-cache" in directives:
+            return cls.REFRESH
+        return cls.USE
+
+
+def response_cache_key(
+    model: AIModel,
+    message_thread: MessageThread,
+    parameters: InferenceParameters | None = None,
+) -> str:
+    """Build the canonical cache key of a converse request.
+
+    Only what reaches the provider is hashed: the thread's id, title and the
+    messages' timestamps are left out, so replaying a thread hits the cache.
+
+    Args:
+        model (AIModel): The AI model the request is sent to.
+        message_thread (MessageThread): The thread of messages to send.
+        parameters (InferenceParameters | None): The sampling parameters, if any.
+
+    Returns:
+        str: A hex SHA-256 digest identifying the request.
+    """
+    canonical: str = json.dumps(
+        {
+            "provider": model.provider,
+            "model": model.id,
+            "parameters": parameters.model_dump() if parameters else None,
+            "messages": [
+                message.model_dump(mode="json", exclude={"timestamp"})
+                for message in message_thread.messages
+            ],
+            # only set with tools, so keys of plain requests are unchanged
+            **(
+                {"tools": [tool.model_dump() for tool in message_thread.tools]}
+                if message_thread.tools
+                else {}
+            ),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory, then disk) cache of agent replies.
+
+    The memory tier is an LRU bounded by entry count; the disk tier stores
+    one JSON file per reply, bounded by total size, evicting the least
+    recently used files first. Both tiers expire entries after `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+        directory: str | None = None,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the cache; defaults come from the settings.
+
+        Args:
+            ttl (float | None): Seconds a cached reply is served.
+            max_entries (int | None): Replies kept in memory.
+            directory (str | None): Directory of the disk tier; empty for none.
+            max_bytes (int | None): Size bound of the disk tier, in bytes.
+            clock (Callable[[], float]): Wall clock, in seconds; disk entries
+                outlive the process, so a monotonic clock would not do.
+        """
+        self._ttl: float = settings.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self._max_entries: int = (
+            settings.RESPONSE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        directory = settings.RESPONSE_CACHE_DIR if directory is None else directory
+        self._directory: Path | None = Path(directory) if directory else None
+        self._max_bytes: int = (
+            settings.RESPONSE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        )
+        self._clock: Callable[[], float] = clock
+        self._memory: OrderedDict[str, tuple[float, AgentMessage]] = OrderedDict()
+        self._disk_bytes: int | None = None  # Measured on first write
+        self._lock: threading.Lock = threading.Lock()
+
+    def _path(self, directory: Path, key: str) -> Path:
+        """The disk tier file of a key, sharded by prefix."""
+        return directory / key[:2] / f"{key}.json"
+
+    def _expired(self, stored_at: float) -> bool:
+        """Check whether an entry stored at the given time has expired."""
+        return self._clock() - stored_at >= self._ttl
+
+    def _remember(self, key: str, stored_at: float, message: AgentMessage) -> None:
+        """Insert an entry in the memory tier, evicting the least recent."""
+        with self._lock:
+            self._memory[key] = (stored_at, message)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> AgentMessage | None:
+        """Look a key up in the disk tier, promoting hits to memory."""
+        if self._directory is None:
+            return None
+        path: Path = self._path(self._directory, key)
+        try:
+            entry = json.loads(path.read_text("utf-8"))
+            stored_at: float = float(entry["stored_at"])
+            message = AgentMessage.model_validate(entry["message"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Discarding unreadable response cache entry {path}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if self._expired(stored_at):
+            path.unlink(missing_ok=True)
+            return None
+        path.touch()  # Mark as recently used for eviction
+        self._remember(key, stored_at, message)
+        return message
+
+    def _write_disk(self, key: str, stored_at: float, message: AgentMessage) -> None:
+        """Store an entry in the disk tier and enforce its size bound."""
+        if self._directory is None:
+            return
+        path: Path = self._path(self._directory, key)
+        data: str = json.dumps(
+            {"stored_at": stored_at, "message": message.model_dump(mode="json")}
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous: int = path.stat().st_size if path.exists() else 0
+            path.write_text(data, "utf-8")
+        except OSError:
+            logger.warning(f"Could not write response cache entry {path}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(
+                    file.stat().st_size for file in self._directory.rglob("*.json")
+                )
+            else:
+                self._disk_bytes += len(data.encode("utf-8")) - previous
+            over_budget: bool = self._disk_bytes > self._max_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently used files until the disk tier fits."""
+        assert self._directory is not None
+        files: list[tuple[float, int, Path]] = []
+        for file in self._directory.rglob("*.json"):
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+        files.sort()
+
+        total: int = sum(size for _, size, _ in files)
+        target: int = int(self._max_bytes * 0.9)  # Leave headroom for new entries
+        for _, size, file in files:
+            if total <= target:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+    def get(self, key: str) -> AgentMessage | None:
+        """Retrieve a cached reply.
+
+        Args:
+            key (str): The request's cache key.
+
+        Returns:
+            AgentMessage | None: The cached reply, or None on a miss.
+        """
+        with self._lock:
+            entry: tuple[float, AgentMessage] | None = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+        return self._read_disk(key)
+
+    def put(self, key: str, message: AgentMessage) -> None:
+        """Cache a reply in both tiers.
+
+        Args:
+            key (str): The request's cache key.
+            message (AgentMessage): The reply to cache.
+        """
+        stored_at: float = self._clock()
+        self._remember(key, stored_at, message)
+        self._write_disk(key, stored_at, message)
+
+    async def aget(self, key: str) -> AgentMessage | None:
+        """Asynchronously retrieve a cached reply; disk reads run in a thread."""
+        with self._lock:
+            entry: tuple[float, AgentMessage] | None = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                return entry[1]
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, message: AgentMessage) -> None:
+        """Asynchronously cache a reply; disk writes run in a thread."""
+        await asyncio.to_thread(self.put, key, message)
+
+    def clear(self) -> None:
+        """Drop every cached reply from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = None
+        if self._directory is not None:
+            for file in self._directory.rglob("*.json"):
+                file.unlink(missing_ok=True)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,365 @@
+import asyncio
+import re
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+
+from src.config import settings
+from src.models import (
+    Document,
+    DocumentInfo,
+    DocumentStore,
+    Message,
+    MessageRole,
+    MessageThread,
+    RetrievalOptions,
+    RetrievalSource,
+    Snippet,
+    UserMessage,
+    VectorIndex,
+)
+from src.services import embedding_service, search_service
+from src.services.thread_store import conversation_store
+from src.stores import SQLiteDocumentStore, create_vector_index
+from src.utils import estimate_tokens, setup_logger
+
+logger = setup_logger(__name__)
+
+type Retriever = Callable[[list[float], int], Awaitable[list[Snippet]]]
+
+# Sentence ends and paragraph breaks, where chunks are preferably split
+SENTENCE_BOUNDARY: re.Pattern[str] = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+
+# Numbering and separator tokens added around each injected snippet
+SNIPPET_OVERHEAD_TOKENS: int = 4
+
+CONTEXT_PREFIX: str = (
+    "The following excerpts were retrieved as context for the next message; "
+    "use them if they are relevant:\n\n"
+)
+
+document_store: DocumentStore = SQLiteDocumentStore()
+document_index: VectorIndex = create_vector_index(
+    directory=settings.RAG_DOCUMENT_INDEX_DIR
+)
+
+
+def __split_words(text: str, tokens: int) -> list[str]:
+    """Split a text longer than a chunk at word boundaries."""
+    pieces: list[str] = []
+    current: list[str] = []
+    size: int = 0
+    for word in text.split():
+        cost: int = estimate_tokens(word) + 1
+        if current and size + cost > tokens:
+            pieces.append(" ".join(current))
+            current, size = [], 0
+        current.append(word)
+        size += cost
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def __overlap(sentences: list[str], tokens: int) -> tuple[list[str], int]:
+    """The last sentences of a chunk fitting in `tokens`, and their size."""
+    kept: list[str] = []
+    kept_tokens: int = 0
+    for sentence in reversed(sentences):
+        cost: int = estimate_tokens(sentence) + 1
+        if kept_tokens + cost > tokens:
+            break
+        kept.insert(0, sentence)
+        kept_tokens += cost
+    return kept, kept_tokens
+
+
+def chunk_text(
+    text: str, chunk_tokens: int | None = None, overlap_tokens: int | None = None
+) -> list[str]:
+    """Split a text into chunks of about `chunk_tokens` tokens for embedding.
+
+    Chunks are built from whole sentences where possible, and consecutive
+    chunks repeat up to `overlap_tokens` tokens of sentences, so a passage
+    straddling a boundary is still retrievable from either chunk.
+
+    Args:
+        text (str): The text to split.
+        chunk_tokens (int | None): The target size of a chunk.
+            Defaults to `settings.RAG_CHUNK_TOKENS`.
+        overlap_tokens (int | None): Tokens repeated between consecutive
+            chunks, at most half a chunk. Defaults to `settings.RAG_CHUNK_OVERLAP`.
+
+    Returns:
+        list[str]: The chunks, in order; none if the text is blank.
+    """
+    size: int = max(
+        settings.RAG_CHUNK_TOKENS if chunk_tokens is None else chunk_tokens, 1
+    )
+    overlap: int = min(
+        settings.RAG_CHUNK_OVERLAP if overlap_tokens is None else overlap_tokens,
+        size // 2,
+    )
+    sentences: list[str] = [
+        sentence
+        for piece in SENTENCE_BOUNDARY.split(text)
+        for sentence in __split_words(piece, size)
+    ]
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens: int = 0
+    fresh: bool = False  # Whether the current chunk has new sentences
+    for sentence in sentences:
+        cost: int = estimate_tokens(sentence) + 1
+        if fresh and current_tokens + cost > size:
+            chunks.append(" ".join(current))
+            # carry the last sentences over, if they leave room for this one
+            current, current_tokens = __overlap(current, min(overlap, size - cost))
+        current.append(sentence)
+        current_tokens += cost
+        fresh = True
+    if fresh:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def chunk_id(document_id: str, position: int) -> str:
+    """Build the index id of a document's chunk.
+
+    Args:
+        document_id (str): The id of the document.
+        position (int): The position of the chunk in the document.
+
+    Returns:
+        str: The chunk's id in the document index.
+    """
+    return f"{document_id}:{position}"
+
+
+def __parse_chunk_id(id_: str) -> tuple[str, int]:
+    """Split a chunk's index id into its document id and position."""
+    document_id, _, position = id_.rpartition(":")
+    return document_id, int(position)
+
+
+async def aadd_document(document: Document) -> DocumentInfo:
+    """Chunk, embed and index a document, so prompts can retrieve from it.
+
+    Args:
+        document (Document): The document to add.
+
+    Returns:
+        DocumentInfo: The stored document.
+
+    Raises:
+        ValueError: If the document has no text, a document with the same id
+            exists, or the embedding model's provider is not found.
+        TypeError: If the search embedding model is not an embedding model.
+    """
+    chunks: list[str] = chunk_text(document.text)
+    if not chunks:
+        raise ValueError("The document has no text.")
+    vectors: list[list[float]] = await embedding_service.aembed(
+        search_service.search_model(), chunks
+    )
+    info: DocumentInfo = await document_store.acreate(document, chunks)
+    try:
+        await document_index.aupsert(
+            [chunk_id(document.id, position) for position in range(len(chunks))],
+            vectors,
+        )
+    except Exception:
+        await document_store.adelete(document.id)
+        raise
+    logger.info(f"Indexed document '{document.id}' as {len(chunks)} chunks")
+    return info
+
+
+async def adelete_document(document_id: str) -> None:
+    """Delete a document and remove its chunks from the index.
+
+    Args:
+        document_id (str): The id of the document to delete.
+
+    Raises:
+        NotFoundError: If the document is not found.
+    """
+    chunks: int = await document_store.adelete(document_id)
+    await document_index.adelete(
+        [chunk_id(document_id, position) for position in range(chunks)]
+    )
+
+
+async def __aretrieve_documents(vector: list[float], k: int) -> list[Snippet]:
+    """Retrieve the document chunks most similar to a query vector."""
+    matches: list[tuple[str, float]] = await document_index.asearch(vector, k)
+    keys: list[tuple[str, int]] = [__parse_chunk_id(id_) for id_, _ in matches]
+    texts: dict[tuple[str, int], str] = await document_store.aget_chunks(keys)
+    return [
+        Snippet(source=RetrievalSource.DOCUMENTS, id=id_, text=texts[key], score=score)
+        for (id_, score), key in zip(matches, keys, strict=True)
+        if key in texts
+    ]
+
+
+async def __aretrieve_messages(vector: list[float], k: int) -> list[Snippet]:
+    """Retrieve the stored messages most similar to a query vector."""
+    matches: list[tuple[str, float]] = await search_service.vector_index.asearch(
+        vector, k
+    )
+
+    async def load(id_: str) -> Message | None:
+        with suppress(ValueError):  # The message was deleted since it was indexed
+            return await conversation_store.aget_message(
+                *search_service.parse_message_id(id_)
+            )
+        return None
+
+    messages: list[Message | None] = await asyncio.gather(
+        *(load(id_) for id_, _ in matches)
+    )
+    return [
+        Snippet(
+            source=RetrievalSource.MESSAGES, id=id_, text=message.content, score=score
+        )
+        for (id_, score), message in zip(matches, messages, strict=True)
+        if message is not None and message.content
+    ]
+
+
+RETRIEVERS: dict[RetrievalSource, Retriever] = {
+    RetrievalSource.MESSAGES: __aretrieve_messages,
+    RetrievalSource.DOCUMENTS: __aretrieve_documents,
+}
+
+
+async def aretrieve(query: str, options: RetrievalOptions) -> list[Snippet]:
+    """Retrieve the snippets most similar in meaning to a query.
+
+    The query is embedded once and every source is searched concurrently.
+
+    Args:
+        query (str): The text to retrieve context for.
+        options (RetrievalOptions): The sources, number of snippets and
+            minimum score to retrieve with.
+
+    Returns:
+        list[Snippet]: The snippets scoring at least the minimum, best first.
+
+    Raises:
+        ValueError: If the embedding model's provider is not found, or the
+            indexes hold vectors of another model.
+        TypeError: If the search embedding model is not an embedding model.
+    """
+    top_k: int = options.top_k or settings.RAG_TOP_K
+    min_score: float = (
+        settings.RAG_MIN_SCORE if options.min_score is None else options.min_score
+    )
+    (vector,) = await embedding_service.aembed(search_service.search_model(), [query])
+    results: list[list[Snippet]] = await asyncio.gather(
+        *(
+            RETRIEVERS[source](vector, top_k)
+            for source in dict.fromkeys(options.sources)
+        )
+    )
+    snippets: list[Snippet] = [
+        snippet for found in results for snippet in found if snippet.score >= min_score
+    ]
+    return sorted(snippets, key=lambda snippet: snippet.score, reverse=True)
+
+
+def __normalize(text: str) -> str:
+    """Collapse case and whitespace, so trivially different texts compare equal."""
+    return " ".join(text.casefold().split())
+
+
+def assemble_context(
+    snippets: Iterable[Snippet], max_tokens: int, exclude: Iterable[str] = ()
+) -> list[Snippet]:
+    """Select the snippets to inject, best first, under a token budget.
+
+    Snippets repeating a selected snippet or one of the excluded texts
+    (typically the messages already in the prompt), or contained in one,
+    are skipped; so are snippets too large for the remaining budget.
+
+    Args:
+        snippets (Iterable[Snippet]): Candidate snippets, best first.
+        max_tokens (int): The token budget of the selected snippets.
+        exclude (Iterable[str]): Texts the prompt already contains.
+
+    Returns:
+        list[Snippet]: The selected snippets, best first.
+    """
+    seen: list[str] = [__normalize(text) for text in exclude]
+    selected: list[Snippet] = []
+    used: int = 0
+    for snippet in snippets:
+        text: str = __normalize(snippet.text)
+        if not text or any(text in other for other in seen):
+            continue
+        cost: int = estimate_tokens(snippet.text) + SNIPPET_OVERHEAD_TOKENS
+        if used + cost > max_tokens:
+            continue
+        seen.append(text)
+        selected.append(snippet)
+        used += cost
+    return selected
+
+
+def format_context(snippets: Iterable[Snippet]) -> str:
+    """Format selected snippets as the content of a context message.
+
+    Args:
+        snippets (Iterable[Snippet]): The snippets to inject.
+
+    Returns:
+        str: The numbered snippets, after an instruction to use them.
+    """
+    return CONTEXT_PREFIX + "\n\n".join(
+        f"[{number}] {snippet.text.strip()}"
+        for number, snippet in enumerate(snippets, start=1)
+    )
+
+
+async def aaugment(thread: MessageThread, options: RetrievalOptions) -> MessageThread:
+    """Inject context retrieved for the latest user message into a thread.
+
+    The context is added as a user message just before the latest one, so
+    it is kept when the thread is fitted to a context window. Retrieval is
+    best effort: if it fails, the thread is returned as is.
+
+    Args:
+        thread (MessageThread): The thread about to be sent to a model.
+        options (RetrievalOptions): How context is retrieved and budgeted.
+
+    Returns:
+        MessageThread: The thread to send.
+    """
+    latest: Message | None = thread.messages[-1] if thread.messages else None
+    if latest is None or latest.role is not MessageRole.USER or not latest.content:
+        return thread
+
+    try:
+        snippets: list[Snippet] = await aretrieve(latest.content, options)
+    except Exception as e:
+        logger.error(
+            f"Error retrieving context for thread '{thread.id}'",
+            exc_info=True,
+            extra={"error": str(e)},
+        )
+        return thread
+    selected: list[Snippet] = assemble_context(
+        snippets,
+        options.max_tokens or settings.RAG_MAX_TOKENS,
+        (message.content for message in thread.messages if message.content),
+    )
+    if not selected:
+        return thread
+
+    logger.info(
+        f"Injected {len(selected)} retrieved snippets into thread '{thread.id}'"
+    )
+    context = UserMessage(content=format_context(selected))
+    return thread.model_copy(
+        update={"messages": [*thread.messages[:-1], context, latest]}
+    )
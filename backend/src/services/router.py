@@ -0,0 +1,198 @@
+import math
+import threading
+from dataclasses import dataclass
+from enum import Enum
+
+from src.config import settings
+from src.models import AIModel, RouteStats
+from src.services.health_monitor import health_monitor
+from src.services.scheduler import QueueFullError
+from src.utils import CircuitOpenError, RateLimitExceededError, setup_logger
+from src.utils.resilience import is_retryable
+
+logger = setup_logger(__name__)
+
+# Smoothing factor of the latency and error rate moving averages
+STATS_ALPHA: float = 0.2
+# How much a target's error rate inflates its latency score
+ERROR_PENALTY: float = 10.0
+
+
+class RoutingStrategy(str, Enum):
+    """How the targets of a model alias are ranked.
+
+    - ORDERED: In the configured order.
+    - LATENCY: By observed latency, inflated by the error rate and divided
+        by the target's weight; untried targets are tried first.
+
+    Either way, targets whose provider is known to be down go last.
+    """
+
+    ORDERED = "ordered"
+    LATENCY = "latency"
+
+
+def is_failover_error(e: BaseException) -> bool:
+    """Whether a failed call should be retried on another target.
+
+    Transient failures (connection errors, 429s and 5xx) and targets that
+    are unavailable (open circuit, full queue, exhausted quota) fail over;
+    errors about the request itself do not.
+    """
+    return isinstance(
+        e, CircuitOpenError | QueueFullError | RateLimitExceededError
+    ) or is_retryable(e)
+
+
+@dataclass
+class _TargetStats:
+    """Moving averages of a target's latency and error rate."""
+
+    successes: int = 0
+    failures: int = 0
+    latency: float | None = None
+    error_rate: float = 0.0
+
+
+class ModelRouter:
+    """Routes model aliases to (provider, model) targets.
+
+    Each alias maps to targets with weights, in order of preference. A
+    request for an alias is tried on each target in ranked order until one
+    succeeds; models that are not aliases route to themselves.
+    """
+
+    def __init__(
+        self,
+        routes: dict[str, dict[str, float]] | None = None,
+        strategy: RoutingStrategy | str | None = None,
+    ):
+        """Initialize the router; defaults come from the settings.
+
+        Args:
+            routes (dict[str, dict[str, float]] | None): Targets by alias, as
+                {"provider/model id": weight}, in order of preference.
+            strategy (RoutingStrategy | str | None): How targets are ranked.
+
+        Raises:
+            ValueError: If a target is not of the form "provider/model id",
+                or its weight is not positive.
+        """
+        self._strategy: RoutingStrategy = RoutingStrategy(
+            settings.ROUTING_STRATEGY if strategy is None else strategy
+        )
+        self._routes: dict[str, list[tuple[str, str, float]]] = {}
+        for alias, targets in (
+            settings.MODEL_ROUTES if routes is None else routes
+        ).items():
+            parsed: list[tuple[str, str, float]] = []
+            for target, weight in targets.items():
+                provider, _, model_id = target.partition("/")
+                if not provider or not model_id or weight <= 0:
+                    raise ValueError(
+                        f"Invalid route target '{target}' (weight {weight}) "
+                        f"for alias '{alias}'."
+                    )
+                parsed.append((provider, model_id, weight))
+            self._routes[alias] = parsed
+        self._stats: dict[tuple[str, str], _TargetStats] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def aliases(self) -> tuple[str, ...]:
+        """The configured model aliases."""
+        return tuple(self._routes)
+
+    def _score(self, provider: str, model_id: str, weight: float) -> float:
+        """Latency score of a target; lower is better."""
+        stats: _TargetStats | None = self._stats.get((provider, model_id))
+        if stats is None:
+            return 0.0  # Untried targets are explored first
+        if stats.latency is None:
+            return math.inf if stats.failures else 0.0
+        return stats.latency * (1 + ERROR_PENALTY * stats.error_rate) / weight
+
+    def route(self, model: AIModel) -> list[AIModel]:
+        """Rank the targets a request for a model may be sent to.
+
+        Args:
+            model (AIModel): The requested model; its id may be an alias.
+
+        Returns:
+            list[AIModel]: The models to try, best first. A model that is not
+                an alias is its own single target.
+        """
+        targets: list[tuple[str, str, float]] | None = self._routes.get(model.id)
+        if targets is None:
+            return [model]
+
+        with self._lock:
+            ranked: list[tuple[str, str, float]] = sorted(
+                targets,
+                key=lambda target: (
+                    health_monitor.is_down(target[0]),
+                    self._score(*target)
+                    if self._strategy is RoutingStrategy.LATENCY
+                    else 0.0,
+                ),
+            )
+        return [
+            AIModel(id=model_id, provider=provider, type=model.type, alias=model.id)
+            for provider, model_id, _ in ranked
+        ]
+
+    def record_success(self, target: AIModel, elapsed: float) -> None:
+        """Record a successful call to a target.
+
+        Args:
+            target (AIModel): The model the call was sent to.
+            elapsed (float): The call's duration, in seconds.
+        """
+        with self._lock:
+            stats: _TargetStats = self._stats.setdefault(
+                (target.provider, target.id), _TargetStats()
+            )
+            stats.successes += 1
+            stats.latency = (
+                elapsed
+                if stats.latency is None
+                else stats.latency + STATS_ALPHA * (elapsed - stats.latency)
+            )
+            stats.error_rate -= STATS_ALPHA * stats.error_rate
+
+    def record_failure(self, target: AIModel) -> None:
+        """Record a failed call to a target.
+
+        Args:
+            target (AIModel): The model the call was sent to.
+        """
+        with self._lock:
+            stats: _TargetStats = self._stats.setdefault(
+                (target.provider, target.id), _TargetStats()
+            )
+            stats.failures += 1
+            stats.error_rate += STATS_ALPHA * (1 - stats.error_rate)
+
+    def stats(self) -> list[RouteStats]:
+        """Snapshot the observed performance of every target called so far.
+
+        Returns:
+            list[RouteStats]: The latency and error rate of each target.
+        """
+        with self._lock:
+            return [
+                RouteStats(
+                    provider=provider,
+                    model=model_id,
+                    successes=stats.successes,
+                    failures=stats.failures,
+                    latency_ms=stats.latency * 1000
+                    if stats.latency is not None
+                    else None,
+                    error_rate=stats.error_rate,
+                )
+                for (provider, model_id), stats in sorted(self._stats.items())
+            ]
+
+
+model_router = ModelRouter()
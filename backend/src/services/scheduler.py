@@ -0,0 +1,246 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from src.config import settings
+from src.models import LaneStats, Priority
+from src.utils import setup_logger
+from src.utils.metrics import scheduler_queue_depth
+
+logger = setup_logger(__name__)
+
+# Smoothing factor of the service time average used to estimate Retry-After
+SERVICE_TIME_ALPHA: float = 0.2
+DEFAULT_SERVICE_TIME: float = 1.0  # Seconds, assumed until a request completes
+
+
+class QueueFullError(Exception):
+    """Raised when a request is rejected because a provider's queue is full."""
+
+    def __init__(self, name: str, retry_after: float):
+        """Initialize the error.
+
+        Args:
+            name (str): The lane (provider or provider/model) that is overloaded.
+            retry_after (float): Estimated seconds until the queue has room.
+        """
+        self.name: str = name
+        self.retry_after: float = retry_after
+        super().__init__(
+            f"'{name}' is overloaded (queue full); retry in {retry_after:.0f}s."
+        )
+
+
+type Waiter = tuple[int, int, asyncio.Future[None]]
+
+
+@dataclass
+class _Lane:
+    """Concurrency slots and waiting requests of a provider or model."""
+
+    name: str
+    limit: int
+    active: int = 0
+    waiters: list[Waiter] = field(default_factory=list[Waiter])
+    admitted: int = 0
+    rejected: int = 0
+    queue_time: float = 0.0
+    max_queue_time: float = 0.0
+    service_time: float = DEFAULT_SERVICE_TIME
+
+    def retry_after(self) -> float:
+        """Estimate the seconds until the queue drains by one limit's worth."""
+        rounds: int = len(self.waiters) // self.limit + 1
+        return max(self.service_time * rounds, 1.0)
+
+    def observe_queue(self) -> None:
+        """Publish the lane's queue depth."""
+        scheduler_queue_depth.set(len(self.waiters), lane=self.name)
+
+    def stats(self) -> LaneStats:
+        """Snapshot the lane's metrics."""
+        return LaneStats(
+            name=self.name,
+            limit=self.limit,
+            active=self.active,
+            queued=len(self.waiters),
+            admitted=self.admitted,
+            rejected=self.rejected,
+            avg_queue_ms=self.queue_time / self.admitted * 1000
+            if self.admitted
+            else 0.0,
+            max_queue_ms=self.max_queue_time * 1000,
+        )
+
+
+class ProviderScheduler:
+    """Bounds the requests in flight to each provider, queueing the rest.
+
+    Every provider has a lane with a concurrency limit; models listed in the
+    model limits get a lane of their own as well, and a request must hold a
+    slot in both. Requests beyond the limit wait in a bounded queue, served
+    by priority and then in arrival order; once the queue is full, requests
+    are rejected with a `QueueFullError` instead of piling up. Lanes are
+    only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        default_limit: int | None = None,
+        provider_limits: dict[str, int] | None = None,
+        model_limits: dict[str, int] | None = None,
+        max_queue: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the scheduler; defaults come from the settings.
+
+        Args:
+            default_limit (int | None): Concurrent requests per unlisted provider.
+            provider_limits (dict[str, int] | None): Limits by provider name.
+            model_limits (dict[str, int] | None): Limits by "provider/model id".
+            max_queue (int | None): Requests allowed to wait per lane.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self._default_limit: int = (
+            settings.SCHEDULER_DEFAULT_LIMIT if default_limit is None else default_limit
+        )
+        self._provider_limits: dict[str, int] = (
+            settings.SCHEDULER_PROVIDER_LIMITS
+            if provider_limits is None
+            else provider_limits
+        )
+        self._model_limits: dict[str, int] = (
+            settings.SCHEDULER_MODEL_LIMITS if model_limits is None else model_limits
+        )
+        self._max_queue: int = (
+            settings.SCHEDULER_MAX_QUEUE if max_queue is None else max_queue
+        )
+        self._clock: Callable[[], float] = clock
+        self._lanes: dict[str, _Lane] = {}
+        self._sequence: itertools.count[int] = itertools.count()
+
+    def _lane(self, name: str, limit: int) -> _Lane:
+        """Retrieve (creating on first use) the lane of a provider or model."""
+        if name not in self._lanes:
+            self._lanes[name] = _Lane(name=name, limit=max(limit, 1))
+        return self._lanes[name]
+
+    def _lanes_for(self, provider: str, model_id: str | None) -> list[_Lane]:
+        """The lanes a request must hold a slot in, model lane first."""
+        lanes: list[_Lane] = []
+        model_key: str = f"{provider}/{model_id}"
+        if model_id is not None and model_key in self._model_limits:
+            lanes.append(self._lane(model_key, self._model_limits[model_key]))
+        lanes.append(
+            self._lane(
+                provider, self._provider_limits.get(provider, self._default_limit)
+            )
+        )
+        return lanes
+
+    def _reject_if_full(self, lane: _Lane) -> None:
+        """Reject a request that would have to wait in a full queue."""
+        if lane.active >= lane.limit and len(lane.waiters) >= self._max_queue:
+            lane.rejected += 1
+            logger.error(
+                f"Rejected a request to '{lane.name}': "
+                f"{lane.active} running, {len(lane.waiters)} queued"
+            )
+            raise QueueFullError(lane.name, lane.retry_after())
+
+    async def _acquire(self, lane: _Lane, priority: Priority) -> None:
+        """Take a slot in a lane, waiting in its queue if every slot is busy."""
+        started: float = self._clock()
+        if lane.active < lane.limit and not lane.waiters:
+            lane.active += 1
+        else:
+            self._reject_if_full(lane)
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            waiter: Waiter = (priority, next(self._sequence), future)
+            heapq.heappush(lane.waiters, waiter)
+            lane.observe_queue()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release(lane)  # The slot was handed over as we left
+                elif waiter in lane.waiters:  # Unless a release already skipped it
+                    lane.waiters.remove(waiter)
+                    heapq.heapify(lane.waiters)
+                    lane.observe_queue()
+                raise
+
+        waited: float = self._clock() - started
+        lane.admitted += 1
+        lane.queue_time += waited
+        lane.max_queue_time = max(lane.max_queue_time, waited)
+
+    def _release(self, lane: _Lane) -> None:
+        """Hand a slot to the next waiting request, or free it."""
+        while lane.waiters:
+            _, _, future = heapq.heappop(lane.waiters)
+            if not future.done():
+                future.set_result(None)  # The slot passes on without freeing
+                lane.observe_queue()
+                return
+        lane.observe_queue()
+        lane.active -= 1
+
+    def check(self, provider: str, model_id: str | None = None) -> None:
+        """Fail fast if a request would be rejected, without taking a slot.
+
+        Args:
+            provider (str): The name of the provider.
+            model_id (str | None): The id of the model, if any.
+
+        Raises:
+            QueueFullError: If the provider's or model's queue is full.
+        """
+        for lane in self._lanes_for(provider, model_id):
+            self._reject_if_full(lane)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        model_id: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncGenerator[None]:
+        """Hold a concurrency slot for a provider (and model) while in the block.
+
+        Args:
+            provider (str): The name of the provider.
+            model_id (str | None): The id of the model, if any.
+            priority (Priority): The scheduling class of the request.
+
+        Raises:
+            QueueFullError: If the provider's or model's queue is full.
+        """
+        held: list[_Lane] = []
+        try:
+            for lane in self._lanes_for(provider, model_id):
+                await self._acquire(lane, priority)
+                held.append(lane)
+            started: float = self._clock()
+            yield
+            elapsed: float = self._clock() - started
+            for lane in held:
+                lane.service_time += SERVICE_TIME_ALPHA * (elapsed - lane.service_time)
+        finally:
+            for lane in reversed(held):
+                self._release(lane)
+
+    def stats(self) -> list[LaneStats]:
+        """Snapshot the metrics of every lane used so far.
+
+        Returns:
+            list[LaneStats]: The load and queue times of each lane, by name.
+        """
+        return [self._lanes[name].stats() for name in sorted(self._lanes)]
+
+
+provider_scheduler = ProviderScheduler()
@@ -0,0 +1,182 @@
+import asyncio
+from collections.abc import Sequence
+from time import perf_counter
+
+from src.config import settings
+from src.models import AIModel, AIModelType, Message, SearchHit, VectorIndex
+from src.services import embedding_service
+from src.stores import create_vector_index
+from src.utils import setup_logger
+from src.utils.metrics import vector_search_seconds
+
+logger = setup_logger(__name__)
+
+vector_index: VectorIndex = create_vector_index()
+
+# Background indexing tasks by thread id, kept referenced until they finish
+_indexing: dict[str, set[asyncio.Task[None]]] = {}
+
+
+def message_id(thread_id: str, index: int) -> str:
+    """Build the index id of a stored message.
+
+    Threads are append-only, so a message's position identifies it for good.
+
+    Args:
+        thread_id (str): The id of the message's thread.
+        index (int): The position of the message in the thread.
+
+    Returns:
+        str: The message's id in the vector index.
+    """
+    return f"{thread_id}:{index}"
+
+
+def parse_message_id(id_: str) -> tuple[str, int]:
+    """Split a message's index id into its thread id and position.
+
+    Args:
+        id_ (str): The message's id in the vector index.
+
+    Returns:
+        tuple[str, int]: The id of the message's thread and its position.
+    """
+    thread_id, _, index = id_.rpartition(":")
+    return thread_id, int(index)
+
+
+def search_model() -> AIModel:
+    """Resolve the embedding model indexed texts and queries are embedded with.
+
+    Returns:
+        AIModel: The model set in `settings.SEARCH_EMBEDDING_MODEL`.
+    """
+    provider, _, model_id = settings.SEARCH_EMBEDDING_MODEL.partition("/")
+    return AIModel(id=model_id, provider=provider, type=AIModelType.EMBEDDING)
+
+
+async def aindex_messages(
+    thread_id: str, messages: Sequence[Message], start: int = 0
+) -> int:
+    """Embed messages of a thread and add them to the vector index.
+
+    Args:
+        thread_id (str): The id of the messages' thread.
+        messages (Sequence[Message]): Consecutive messages of the thread.
+        start (int): The position of the first message in the thread.
+
+    Returns:
+        int: The number of messages indexed; those without text are skipped.
+    """
+    entries: list[tuple[str, str]] = [
+        (message_id(thread_id, start + offset), message.content)
+        for offset, message in enumerate(messages)
+        if message.content and message.content.strip()
+    ]
+    if not entries:
+        return 0
+    vectors: list[list[float]] = await embedding_service.aembed(
+        search_model(), [text for _, text in entries]
+    )
+    await vector_index.aupsert([id_ for id_, _ in entries], vectors)
+    return len(entries)
+
+
+def schedule_indexing(
+    thread_id: str, messages: Sequence[Message], start: int = 0
+) -> None:
+    """Index messages in the background, if message indexing is enabled.
+
+    Indexing never delays the request that stored the messages; failures
+    are logged, and the messages are simply not searchable.
+
+    Args:
+        thread_id (str): The id of the messages' thread.
+        messages (Sequence[Message]): Consecutive messages of the thread.
+        start (int): The position of the first message in the thread.
+    """
+    if not settings.SEARCH_INDEX_MESSAGES or not messages:
+        return
+
+    async def index() -> None:
+        try:
+            await aindex_messages(thread_id, messages, start)
+        except Exception as e:
+            logger.error(
+                f"Error indexing messages of thread '{thread_id}'",
+                exc_info=True,
+                extra={"error": str(e)},
+            )
+
+    task: asyncio.Task[None] = asyncio.create_task(index())
+    _indexing.setdefault(thread_id, set()).add(task)
+    task.add_done_callback(lambda done: __untrack(thread_id, done))
+
+
+def __untrack(thread_id: str, task: asyncio.Task[None]) -> None:
+    """Drop a finished indexing task, and its thread's entry once it has none."""
+    tasks: set[asyncio.Task[None]] = _indexing.get(thread_id, set())
+    tasks.discard(task)
+    if not tasks:
+        _indexing.pop(thread_id, None)
+
+
+async def await_indexing(thread_id: str) -> None:
+    """Wait for the background indexing of a thread's messages to finish.
+
+    Args:
+        thread_id (str): The id of the thread.
+    """
+    tasks: set[asyncio.Task[None]] | None = _indexing.get(thread_id)
+    if tasks:
+        await asyncio.wait(set(tasks))
+
+
+async def aforget_thread(thread_id: str, message_count: int) -> int:
+    """Remove the messages of a thread from the vector index.
+
+    Args:
+        thread_id (str): The id of the thread.
+        message_count (int): The number of messages in the thread.
+
+    Returns:
+        int: The number of messages removed from the index.
+    """
+    return await vector_index.adelete(
+        [message_id(thread_id, index) for index in range(message_count)]
+    )
+
+
+async def asearch(query: str, k: int = 10) -> list[SearchHit]:
+    """Find the indexed messages most similar in meaning to a query.
+
+    Args:
+        query (str): The text to search for.
+        k (int): The number of matches to return at most.
+
+    Returns:
+        list[SearchHit]: The best matches, best first, without their messages.
+
+    Raises:
+        ValueError: If the query is empty or `k` is out of range.
+    """
+    if not query.strip():
+        raise ValueError("The search query is empty.")
+    if not 1 <= k <= settings.SEARCH_MAX_RESULTS:
+        raise ValueError(
+            f"The number of results must be between 1 and "
+            f"{settings.SEARCH_MAX_RESULTS}."
+        )
+    (vector,) = await embedding_service.aembed(search_model(), [query])
+
+    start: float = perf_counter()
+    matches: list[tuple[str, float]] = await vector_index.asearch(vector, k)
+    vector_search_seconds.observe(
+        perf_counter() - start, index=type(vector_index).__name__
+    )
+
+    hits: list[SearchHit] = []
+    for id_, score in matches:
+        thread_id, index = parse_message_id(id_)
+        hits.append(SearchHit(thread_id=thread_id, index=index, score=score))
+    return hits
@@ -0,0 +1,5 @@
+from src.models import ConversationStore
+from src.stores import SQLiteConversationStore
+
+# Shared by the services that read stored threads, so they use one connection
+conversation_store: ConversationStore = SQLiteConversationStore()
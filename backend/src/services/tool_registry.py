@@ -0,0 +1,224 @@
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from threading import RLock
+from time import perf_counter
+
+from src.config import settings
+from src.models import (
+    AlreadyExistsError,
+    NotFoundError,
+    ToolDefinition,
+    ToolRequest,
+    ToolResponse,
+)
+from src.models.messages import SERIALIZABLE
+from src.utils import setup_logger, tracer
+from src.utils.metrics import tool_call_seconds
+
+logger = setup_logger(__name__)
+
+type ToolHandler = Callable[
+    [Mapping[str, SERIALIZABLE]], Awaitable[SERIALIZABLE] | SERIALIZABLE
+]
+
+
+@dataclass(frozen=True)
+class RegisteredTool:
+    """A tool the server can run, with the definition offered to models."""
+
+    definition: ToolDefinition
+    handler: ToolHandler
+    timeout: float | None = None
+
+
+class ToolRegistry:
+    """Process-wide registry of the tools models may call server-side.
+
+    Handlers take the arguments the model passed and return a JSON-serializable
+    result. Coroutine handlers run on the event loop; plain functions run in
+    a worker thread, so a blocking tool does not stall other requests (a
+    thread that times out is abandoned, since threads cannot be interrupted).
+    """
+
+    def __init__(self, timeout: float | None = None, max_parallel: int | None = None):
+        """Initialize an empty registry; defaults come from the settings.
+
+        Args:
+            timeout (float | None): Seconds a tool call may run, unless set
+                when the tool is registered.
+            max_parallel (int | None): Tool calls of a turn run at once.
+        """
+        self._timeout: float = settings.TOOL_TIMEOUT if timeout is None else timeout
+        self._max_parallel: int = max(
+            settings.TOOL_MAX_PARALLEL if max_parallel is None else max_parallel, 1
+        )
+        self._tools: dict[str, RegisteredTool] = {}
+        self._lock: RLock = RLock()
+
+    def register(
+        self,
+        definition: ToolDefinition,
+        handler: ToolHandler,
+        timeout: float | None = None,
+    ) -> None:
+        """Register a tool.
+
+        Args:
+            definition (ToolDefinition): How the tool is described to models.
+            handler (ToolHandler): Runs the tool with the model's arguments.
+            timeout (float | None): Seconds a call may run; defaults to the
+                registry's timeout.
+
+        Raises:
+            ValueError: If a tool with the same name is already registered.
+        """
+        with self._lock:
+            if definition.name in self._tools:
+                raise AlreadyExistsError(f"Tool '{definition.name}' already exists.")
+            self._tools[definition.name] = RegisteredTool(definition, handler, timeout)
+        logger.info(f"Registered tool '{definition.name}'")
+
+    def tool(
+        self,
+        name: str | None = None,
+        description: str | None = None,
+        parameters: dict[str, SERIALIZABLE] | None = None,
+        timeout: float | None = None,
+    ) -> Callable[[ToolHandler], ToolHandler]:
+        """Register the decorated function as a tool.
+
+        Args:
+            name (str | None): The tool's name; defaults to the function's.
+            description (str | None): What the tool does; defaults to the
+                function's docstring.
+            parameters (dict[str, SERIALIZABLE] | None): A JSON Schema of the
+                tool's arguments; defaults to an object without properties.
+            timeout (float | None): Seconds a call may run.
+
+        Returns:
+            Callable[[ToolHandler], ToolHandler]: The decorator, which returns
+                the function unchanged.
+        """
+
+        def decorator(handler: ToolHandler) -> ToolHandler:
+            definition = ToolDefinition(
+                name=name or getattr(handler, "__name__", ""),
+                description=description or inspect.getdoc(handler) or "",
+                **({"parameters": parameters} if parameters is not None else {}),
+            )
+            self.register(definition, handler, timeout)
+            return handler
+
+        return decorator
+
+    def unregister(self, name: str) -> None:
+        """Remove a tool.
+
+        Args:
+            name (str): The name of the tool.
+
+        Raises:
+            NotFoundError: If the tool is not found.
+        """
+        with self._lock:
+            if self._tools.pop(name, None) is None:
+                raise NotFoundError(f"Tool '{name}' not found.")
+
+    def definitions(self, names: Sequence[str] | None = None) -> list[ToolDefinition]:
+        """Retrieve the definitions of registered tools.
+
+        Args:
+            names (Sequence[str] | None): The tools to describe; all if None.
+
+        Returns:
+            list[ToolDefinition]: The definitions, in the order requested.
+
+        Raises:
+            NotFoundError: If a requested tool is not found.
+        """
+        with self._lock:
+            tools: dict[str, RegisteredTool] = dict(self._tools)
+        if names is None:
+            return [tool.definition for tool in tools.values()]
+        missing: list[str] = [name for name in names if name not in tools]
+        if missing:
+            raise NotFoundError(f"Tool '{missing[0]}' not found.")
+        return [tools[name].definition for name in dict.fromkeys(names)]
+
+    async def _acall(self, tool: RegisteredTool, request: ToolRequest) -> SERIALIZABLE:
+        """Run a tool's handler, off the event loop unless it is a coroutine."""
+        if inspect.iscoroutinefunction(tool.handler):
+            return await tool.handler(request.arguments)
+        result = await asyncio.to_thread(tool.handler, request.arguments)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    async def aexecute(self, request: ToolRequest) -> ToolResponse:
+        """Run a tool call and capture its outcome as a ToolResponse.
+
+        Failures are reported to the model rather than raised, so it can
+        recover (e.g. retry with other arguments or answer without the tool).
+
+        Args:
+            request (ToolRequest): The model's tool call.
+
+        Returns:
+            ToolResponse: The tool's result, or an `{"error": ...}` object if
+                the tool is unknown, failed or timed out.
+        """
+        with self._lock:
+            tool: RegisteredTool | None = self._tools.get(request.name)
+        if tool is None:
+            return ToolResponse(
+                id=request.id,
+                name=request.name,
+                content={"error": f"Tool '{request.name}' not found."},
+            )
+
+        timeout: float = self._timeout if tool.timeout is None else tool.timeout
+        outcome: str = "ok"
+        start: float = perf_counter()
+        content: SERIALIZABLE
+        with tracer.span("tool.call", tool=request.name):
+            try:
+                content = await asyncio.wait_for(self._acall(tool, request), timeout)
+            except TimeoutError:
+                outcome = "timeout"
+                content = {
+                    "error": f"Tool '{request.name}' timed out after {timeout}s."
+                }
+            except Exception as e:
+                outcome = "error"
+                logger.error(
+                    f"Error running tool '{request.name}'",
+                    exc_info=True,
+                    extra={"error": str(e)},
+                )
+                content = {"error": str(e) or type(e).__name__}
+        tool_call_seconds.observe(
+            perf_counter() - start, tool=request.name, outcome=outcome
+        )
+        return ToolResponse(id=request.id, name=request.name, content=content)
+
+    async def aexecute_all(self, requests: Sequence[ToolRequest]) -> list[ToolResponse]:
+        """Run the independent tool calls of a turn concurrently.
+
+        Args:
+            requests (Sequence[ToolRequest]): The model's tool calls.
+
+        Returns:
+            list[ToolResponse]: One response per call, in the calls' order.
+        """
+        semaphore = asyncio.Semaphore(self._max_parallel)
+
+        async def execute(request: ToolRequest) -> ToolResponse:
+            async with semaphore:
+                return await self.aexecute(request)
+
+        return list(await asyncio.gather(*(execute(request) for request in requests)))
+
+
+tool_registry = ToolRegistry()
@@ -0,0 +1,14 @@
+from src.stores.sqlite import SQLiteConversationStore, SQLiteDocumentStore
+from src.stores.vector_index import (
+    FlatVectorIndex,
+    IVFVectorIndex,
+    create_vector_index,
+)
+
+__all__ = [
+    "FlatVectorIndex",
+    "IVFVectorIndex",
+    "SQLiteConversationStore",
+    "SQLiteDocumentStore",
+    "create_vector_index",
+]
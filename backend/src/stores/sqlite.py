@@ -0,0 +1,367 @@
+import sqlite3
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+
+from src.config import settings
+from src.models import (
+    AgentMessage,
+    AlreadyExistsError,
+    ConversationStore,
+    Document,
+    DocumentInfo,
+    DocumentStore,
+    Message,
+    MessageThread,
+    NotFoundError,
+    UserMessage,
+)
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Messages are stored as JSON alongside their concrete type,
+# so agent and user specific fields survive a round trip.
+MESSAGE_TYPES: dict[str, type[Message]] = {
+    cls.__name__: cls for cls in (Message, UserMessage, AgentMessage)
+}
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS threads (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    modified_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    thread_id TEXT NOT NULL REFERENCES threads (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_thread ON messages (thread_id, seq);
+"""
+
+DOCUMENT_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    document_id TEXT NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (document_id, position)
+);
+"""
+
+# Chunks looked up per query, below SQLite's limit on query parameters
+CHUNK_LOOKUP_SIZE: int = 400
+
+
+def _open(path: str, schema: str) -> sqlite3.Connection:
+    """Open a database shared between threads and create its schema."""
+    if path != ":memory:":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.executescript(schema)
+    return connection
+
+
+class SQLiteConversationStore(ConversationStore):
+    """Conversation store backed by a single SQLite database file.
+
+    Each message is a row, so appending a turn inserts only the new messages
+    instead of rewriting the thread. The connection is opened lazily and
+    shared between threads behind a lock.
+    """
+
+    def __init__(self, path: str | None = None):
+        """Initialize the store; the database is opened on first use.
+
+        Args:
+            path (str | None): The database file, or ":memory:".
+                Defaults to `settings.CONVERSATION_DB_PATH`.
+        """
+        self._path: str = settings.CONVERSATION_DB_PATH if path is None else path
+        self._connection: sqlite3.Connection | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema. Caller holds the lock."""
+        if self._connection is None:
+            self._connection = _open(self._path, SCHEMA)
+            logger.info(f"Opened conversation store at {self._path}")
+        return self._connection
+
+    @staticmethod
+    def _exists(connection: sqlite3.Connection, thread_id: str) -> bool:
+        """Check whether a thread is stored."""
+        row = connection.execute(
+            "SELECT 1 FROM threads WHERE id = ?", (thread_id,)
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _insert_messages(
+        connection: sqlite3.Connection, thread_id: str, messages: Sequence[Message]
+    ) -> None:
+        """Insert messages at the end of a thread."""
+        connection.executemany(
+            "INSERT INTO messages (thread_id, kind, payload) VALUES (?, ?, ?)",
+            [
+                (thread_id, type(message).__name__, message.model_dump_json())
+                for message in messages
+            ],
+        )
+
+    def create(self, thread: MessageThread) -> MessageThread:
+        """Store a new message thread.
+
+        Args:
+            thread (MessageThread): The thread to store, with any initial messages.
+
+        Returns:
+            MessageThread: The stored thread.
+
+        Raises:
+            AlreadyExistsError: If a thread with the same id already exists.
+        """
+        with self._lock, self._connect() as connection:
+            if self._exists(connection, thread.id):
+                raise AlreadyExistsError(f"Thread '{thread.id}' already exists.")
+            connection.execute(
+                "INSERT INTO threads (id, title, modified_at) VALUES (?, ?, ?)",
+                (thread.id, thread.title, thread.modified_at),
+            )
+            self._insert_messages(connection, thread.id, thread.messages)
+        return thread
+
+    def get(self, thread_id: str) -> MessageThread:
+        """Retrieve a message thread with its full history.
+
+        Args:
+            thread_id (str): The id of the thread to retrieve.
+
+        Returns:
+            MessageThread: The stored thread.
+
+        Raises:
+            NotFoundError: If the thread is not found.
+        """
+        with self._lock:
+            connection = self._connect()
+            thread_row = connection.execute(
+                "SELECT title, modified_at FROM threads WHERE id = ?", (thread_id,)
+            ).fetchone()
+            if thread_row is None:
+                raise NotFoundError(f"Thread '{thread_id}' not found.")
+            message_rows = connection.execute(
+                "SELECT kind, payload FROM messages WHERE thread_id = ? ORDER BY seq",
+                (thread_id,),
+            ).fetchall()
+
+        return MessageThread(
+            id=thread_id,
+            title=thread_row[0],
+            modified_at=thread_row[1],
+            messages=[
+                MESSAGE_TYPES.get(kind, Message).model_validate_json(payload)
+                for kind, payload in message_rows
+            ],
+        )
+
+    def get_message(self, thread_id: str, index: int) -> Message:
+        """Retrieve a single message of a thread by its position.
+
+        Args:
+            thread_id (str): The id of the thread.
+            index (int): The position of the message in the thread.
+
+        Returns:
+            Message: The stored message.
+
+        Raises:
+            NotFoundError: If the thread or the message is not found.
+        """
+        row = None
+        if index >= 0:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute(
+                        "SELECT kind, payload FROM messages WHERE thread_id = ? "
+                        "ORDER BY seq LIMIT 1 OFFSET ?",
+                        (thread_id, index),
+                    )
+                    .fetchone()
+                )
+        if row is None:
+            raise NotFoundError(f"Message {index} of thread '{thread_id}' not found.")
+        return MESSAGE_TYPES.get(row[0], Message).model_validate_json(row[1])
+
+    def append(self, thread_id: str, messages: Sequence[Message]) -> int:
+        """Append messages to the end of a message thread.
+
+        Args:
+            thread_id (str): The id of the thread to append to.
+            messages (Sequence[Message]): The messages to append, in order.
+
+        Returns:
+            int: The position of the first appended message in the thread.
+
+        Raises:
+            NotFoundError: If the thread is not found.
+        """
+        with self._lock, self._connect() as connection:
+            updated = connection.execute(
+                "UPDATE threads SET modified_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), thread_id),
+            )
+            if updated.rowcount == 0:
+                raise NotFoundError(f"Thread '{thread_id}' not found.")
+            # Counted in the same transaction as the insert, so it is the
+            # position the first message is actually stored at
+            (start,) = connection.execute(
+                "SELECT COUNT(*) FROM messages WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+            self._insert_messages(connection, thread_id, messages)
+        return start
+
+    def delete(self, thread_id: str) -> None:
+        """Delete a message thread and its history.
+
+        Args:
+            thread_id (str): The id of the thread to delete.
+
+        Raises:
+            NotFoundError: If the thread is not found.
+        """
+        with self._lock, self._connect() as connection:
+            deleted = connection.execute(
+                "DELETE FROM threads WHERE id = ?", (thread_id,)
+            )
+            if deleted.rowcount == 0:
+                raise NotFoundError(f"Thread '{thread_id}' not found.")
+
+    def close(self) -> None:
+        """Close the database connection; it is reopened on next use."""
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+class SQLiteDocumentStore(DocumentStore):
+    """Document store backed by a single SQLite database file.
+
+    Each chunk is a row keyed by its document and position, so retrieval
+    reads the matching chunks without loading whole documents.
+    """
+
+    def __init__(self, path: str | None = None):
+        """Initialize the store; the database is opened on first use.
+
+        Args:
+            path (str | None): The database file, or ":memory:".
+                Defaults to `settings.RAG_DOCUMENT_DB_PATH`.
+        """
+        self._path: str = settings.RAG_DOCUMENT_DB_PATH if path is None else path
+        self._connection: sqlite3.Connection | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema. Caller holds the lock."""
+        if self._connection is None:
+            self._connection = _open(self._path, DOCUMENT_SCHEMA)
+            logger.info(f"Opened document store at {self._path}")
+        return self._connection
+
+    def create(self, document: Document, chunks: Sequence[str]) -> DocumentInfo:
+        """Store a new document as its chunks.
+
+        Args:
+            document (Document): The document to store.
+            chunks (Sequence[str]): The chunks of its text, in order.
+
+        Returns:
+            DocumentInfo: The stored document.
+
+        Raises:
+            AlreadyExistsError: If a document with the same id already exists.
+        """
+        info = DocumentInfo(id=document.id, title=document.title, chunks=len(chunks))
+        with self._lock, self._connect() as connection:
+            try:
+                connection.execute(
+                    "INSERT INTO documents (id, title, created_at) VALUES (?, ?, ?)",
+                    (info.id, info.title, info.created_at),
+                )
+            except sqlite3.IntegrityError as e:
+                raise AlreadyExistsError(
+                    f"Document '{document.id}' already exists."
+                ) from e
+            connection.executemany(
+                "INSERT INTO chunks (document_id, position, text) VALUES (?, ?, ?)",
+                [(document.id, position, text) for position, text in enumerate(chunks)],
+            )
+        return info
+
+    def get_chunks(self, keys: Sequence[tuple[str, int]]) -> dict[tuple[str, int], str]:
+        """Retrieve chunks of documents by their positions.
+
+        Args:
+            keys (Sequence[tuple[str, int]]): Document ids and chunk positions.
+
+        Returns:
+            dict[tuple[str, int], str]: The chunks found, by key.
+        """
+        found: dict[tuple[str, int], str] = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(keys), CHUNK_LOOKUP_SIZE):
+                batch: Sequence[tuple[str, int]] = keys[
+                    start : start + CHUNK_LOOKUP_SIZE
+                ]
+                rows = connection.execute(
+                    "SELECT document_id, position, text FROM chunks "
+                    "WHERE (document_id, position) IN "
+                    f"(VALUES {', '.join(['(?, ?)'] * len(batch))})",
+                    [value for key in batch for value in key],
+                ).fetchall()
+                for document_id, position, text in rows:
+                    found[(document_id, position)] = text
+        return found
+
+    def delete(self, document_id: str) -> int:
+        """Delete a document and its chunks.
+
+        Args:
+            document_id (str): The id of the document to delete.
+
+        Returns:
+            int: The number of chunks the document had.
+
+        Raises:
+            NotFoundError: If the document is not found.
+        """
+        with self._lock, self._connect() as connection:
+            (chunks,) = connection.execute(
+                "SELECT COUNT(*) FROM chunks WHERE document_id = ?", (document_id,)
+            ).fetchone()
+            deleted = connection.execute(
+                "DELETE FROM documents WHERE id = ?", (document_id,)
+            )
+            if deleted.rowcount == 0:
+                raise NotFoundError(f"Document '{document_id}' not found.")
+        return chunks
+
+    def close(self) -> None:
+        """Close the database connection; it is reopened on next use."""
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
@@ -0,0 +1,428 @@
+import json
+import os
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.config import settings
+from src.models import VectorIndex
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+type Matrix = NDArray[np.float32]
+type Positions = NDArray[np.intp]
+
+# Rows allocated when an index receives its first vectors
+INITIAL_CAPACITY: int = 1024
+# Rows scored at once when assigning vectors to clusters, to bound memory
+ASSIGN_CHUNK: int = 65_536
+# Vectors per cluster needed before an approximate index is trained
+TRAIN_RATIO: int = 16
+# Vectors per cluster sampled to train the clusters
+SAMPLE_RATIO: int = 64
+# Rounds of k-means run to train the clusters
+TRAIN_ITERATIONS: int = 10
+
+
+def _normalize(vectors: Matrix) -> Matrix:
+    """Scale rows to unit length, so dot products are cosine similarities."""
+    norms: Matrix = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def _top_k(scores: Matrix, k: int) -> Positions:
+    """The positions of the `k` highest scores, highest first."""
+    if k < len(scores):
+        candidates: Positions = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _save_array(path: Path, array: NDArray[np.generic]) -> None:
+    """Write a `.npy` file atomically, so readers never see a partial file."""
+    temporary: Path = path.with_name(f"{path.name}.tmp")
+    with temporary.open("wb") as file:
+        np.save(file, array)
+    os.replace(temporary, path)
+
+
+class FlatVectorIndex(VectorIndex):
+    """Exact vector index: a dense float32 matrix scanned in full by each search.
+
+    Vectors are normalized when added, so a search is a single matrix-vector
+    product followed by a partial sort. Rows stay packed (a deletion moves the
+    last row into the gap) and the matrix grows by doubling. A persistent
+    index is saved as a `.npy` matrix next to its ids, and opened
+    memory-mapped (copy-on-write), so loading is instant whatever its size.
+    """
+
+    def __init__(self, directory: str | None = None):
+        """Initialize the index, loading it from its directory if saved there.
+
+        Args:
+            directory (str | None): Where the index is saved; None keeps it in
+                memory only.
+        """
+        self._directory: Path | None = Path(directory) if directory else None
+        self._vectors: Matrix | None = None
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._dirty: bool = False
+        self._lock: threading.RLock = threading.RLock()
+        self._load()
+
+    @property
+    def dimensions(self) -> int | None:
+        """The number of dimensions of the indexed vectors, if any were added."""
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    def __len__(self) -> int:
+        """The number of indexed vectors."""
+        return len(self._ids)
+
+    def _load(self) -> None:
+        """Open the saved index, if there is one."""
+        if self._directory is None:
+            return
+        vectors_path: Path = self._directory / "vectors.npy"
+        ids_path: Path = self._directory / "ids.json"
+        if not vectors_path.exists() or not ids_path.exists():
+            return
+        try:
+            vectors: Matrix = np.load(vectors_path, mmap_mode="c")
+            ids: list[str] = json.loads(ids_path.read_text("utf-8"))
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load the vector index at {self._directory}: {e}")
+            return
+        if len(vectors) != len(ids):
+            logger.error(f"Discarding inconsistent vector index at {self._directory}")
+            return
+        if ids:
+            self._vectors = vectors
+            self._ids = ids
+            self._positions = {id_: position for position, id_ in enumerate(ids)}
+            self._load_clusters(self._directory)
+        logger.info(f"Loaded {len(ids)} vectors from {self._directory}")
+
+    def _load_clusters(self, directory: Path) -> None:
+        """Load any structure built over the vectors; none for a flat index."""
+
+    def _cluster_arrays(self) -> dict[str, NDArray[np.generic]]:
+        """Arrays saved alongside the vectors; none for a flat index."""
+        return {}
+
+    def _added(self, positions: Positions) -> None:
+        """Hook called once vectors have been written at some positions."""
+
+    def _moved(self, source: int, target: int) -> None:
+        """Hook called once the vector at `source` has been moved to `target`."""
+
+    def _candidates(self, query: Matrix) -> Positions | None:
+        """The positions to score for a query; None scores every vector."""
+        return None
+
+    def _reserve(self, size: int, dimensions: int) -> Matrix:
+        """Make room for `size` vectors, growing the matrix by doubling."""
+        if self._vectors is None:
+            self._vectors = np.empty(
+                (max(size, INITIAL_CAPACITY), dimensions), dtype=np.float32
+            )
+        elif size > len(self._vectors):
+            grown: Matrix = np.empty(
+                (max(size, 2 * len(self._vectors)), dimensions), dtype=np.float32
+            )
+            grown[: len(self._vectors)] = self._vectors
+            self._vectors = grown
+        return self._vectors
+
+    def _check_dimensions(self, dimensions: int) -> None:
+        """Raise a ValueError if vectors do not fit the index."""
+        if self.dimensions is not None and dimensions != self.dimensions:
+            raise ValueError(
+                f"Expected vectors of {self.dimensions} dimensions, got {dimensions}."
+            )
+
+    def upsert(self, ids: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Add vectors to the index, replacing those of existing ids.
+
+        Args:
+            ids (Sequence[str]): The ids of the vectors.
+            vectors (Sequence[Sequence[float]]): One vector per id.
+
+        Raises:
+            ValueError: If the ids and vectors differ in number, or a vector's
+                dimensions differ from the index's.
+        """
+        if not ids:
+            return
+        matrix: Matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(ids):  # noqa: PLR2004
+            raise ValueError("Expected one vector per id.")
+        matrix = _normalize(matrix)
+
+        with self._lock:
+            self._check_dimensions(matrix.shape[1])
+            positions: list[int] = []
+            for id_ in ids:
+                position: int | None = self._positions.get(id_)
+                if position is None:
+                    position = len(self._ids)
+                    self._ids.append(id_)
+                    self._positions[id_] = position
+                positions.append(position)
+            stored: Matrix = self._reserve(len(self._ids), matrix.shape[1])
+            written: Positions = np.asarray(positions, dtype=np.intp)
+            stored[written] = matrix
+            self._added(written)
+            self._dirty = True
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Remove vectors from the index; unknown ids are ignored.
+
+        Args:
+            ids (Sequence[str]): The ids of the vectors to remove.
+
+        Returns:
+            int: The number of vectors removed.
+        """
+        removed: int = 0
+        with self._lock:
+            for id_ in ids:
+                position: int | None = self._positions.pop(id_, None)
+                if position is None or self._vectors is None:
+                    continue
+                last: int = len(self._ids) - 1
+                if position != last:
+                    moved: str = self._ids[last]
+                    self._vectors[position] = self._vectors[last]
+                    self._ids[position] = moved
+                    self._positions[moved] = position
+                    self._moved(last, position)
+                self._ids.pop()
+                removed += 1
+            self._dirty = self._dirty or removed > 0
+        return removed
+
+    def search(self, query: Sequence[float], k: int) -> list[tuple[str, float]]:
+        """Find the vectors most similar to a query.
+
+        Args:
+            query (Sequence[float]): The query vector.
+            k (int): The number of matches to return at most.
+
+        Returns:
+            list[tuple[str, float]]: The ids of the best matches with their
+                cosine similarity to the query, best first.
+
+        Raises:
+            ValueError: If the query's dimensions differ from the index's.
+        """
+        vector: Matrix = _normalize(np.asarray(query, dtype=np.float32))
+        with self._lock:
+            if self._vectors is None or not self._ids or k <= 0:
+                return []
+            self._check_dimensions(len(vector))
+            candidates: Positions | None = self._candidates(vector)
+            if candidates is None:
+                scores: Matrix = self._vectors[: len(self._ids)] @ vector
+                best: Positions = _top_k(scores, k)
+                return [(self._ids[i], float(scores[i])) for i in best]
+            scores = self._vectors[candidates] @ vector
+            best = _top_k(scores, k)
+            return [(self._ids[candidates[i]], float(scores[i])) for i in best]
+
+    def save(self) -> None:
+        """Write the index to its directory, if it has one and has changed."""
+        if self._directory is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self._directory.mkdir(parents=True, exist_ok=True)
+            count: int = len(self._ids)
+            vectors: Matrix = (
+                self._vectors[:count]
+                if self._vectors is not None
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            _save_array(self._directory / "vectors.npy", vectors)
+            for name, array in self._cluster_arrays().items():
+                _save_array(self._directory / f"{name}.npy", array)
+            ids_path: Path = self._directory / "ids.json"
+            temporary: Path = ids_path.with_name("ids.json.tmp")
+            temporary.write_text(json.dumps(self._ids), "utf-8")
+            os.replace(temporary, ids_path)
+            self._dirty = False
+        logger.info(f"Saved {count} vectors to {self._directory}")
+
+    def close(self) -> None:
+        """Save the index to its directory, if it has one."""
+        self.save()
+
+
+class IVFVectorIndex(FlatVectorIndex):
+    """Approximate vector index: an inverted file over k-means clusters.
+
+    Each vector is assigned to the nearest of `lists` centroids, and a search
+    only scores the vectors of the `probes` clusters nearest to the query, so
+    its cost grows with `n * probes / lists` rather than `n`, at the price of
+    occasionally missing a match near a cluster boundary. The clusters are
+    trained (spherical k-means over a sample) once `lists * TRAIN_RATIO`
+    vectors are indexed, and retrained each time the index doubles; until
+    then, searches are exact.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        lists: int | None = None,
+        probes: int | None = None,
+        seed: int = 0,
+    ):
+        """Initialize the index; defaults come from the settings.
+
+        Args:
+            directory (str | None): Where the index is saved; None keeps it in
+                memory only.
+            lists (int | None): The number of clusters.
+            probes (int | None): The number of clusters scanned per search.
+            seed (int): Seed of the sampling used to train the clusters.
+        """
+        self._lists: int = settings.VECTOR_INDEX_LISTS if lists is None else lists
+        self._probes: int = min(
+            settings.VECTOR_INDEX_PROBES if probes is None else probes, self._lists
+        )
+        self._rng: np.random.Generator = np.random.default_rng(seed)
+        self._centroids: Matrix | None = None
+        self._assignments: NDArray[np.int32] = np.empty(0, dtype=np.int32)
+        self._trained_size: int = 0
+        super().__init__(directory)
+
+    @property
+    def trained(self) -> bool:
+        """Whether searches are approximate, i.e. the clusters are trained."""
+        return self._centroids is not None
+
+    def _load_clusters(self, directory: Path) -> None:
+        """Load the saved clusters, or train them if they were never saved."""
+        centroids_path: Path = directory / "centroids.npy"
+        assignments_path: Path = directory / "assignments.npy"
+        if centroids_path.exists() and assignments_path.exists():
+            assignments: NDArray[np.int32] = np.load(assignments_path)
+            if len(assignments) == len(self._ids):
+                self._centroids = np.load(centroids_path)
+                self._assignments = assignments
+                self._trained_size = len(self._ids)
+                return
+        self._train_if_due()
+
+    def _cluster_arrays(self) -> dict[str, NDArray[np.generic]]:
+        """The centroids and the cluster of every vector, once trained."""
+        if self._centroids is None:
+            return {}
+        return {
+            "centroids": self._centroids,
+            "assignments": self._assignments[: len(self._ids)],
+        }
+
+    def _assign(self, vectors: Matrix) -> NDArray[np.int32]:
+        """The nearest cluster of each vector."""
+        assert self._centroids is not None
+        labels: NDArray[np.int32] = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_CHUNK):
+            chunk: Matrix = vectors[start : start + ASSIGN_CHUNK]
+            labels[start : start + len(chunk)] = np.argmax(
+                chunk @ self._centroids.T, axis=1
+            )
+        return labels
+
+    def _train_if_due(self) -> None:
+        """Train the clusters if the index is (again) large enough."""
+        count: int = len(self._ids)
+        if self._vectors is None or count < max(
+            self._lists * TRAIN_RATIO, 2 * self._trained_size
+        ):
+            return
+        vectors: Matrix = self._vectors[:count]
+        sample: Matrix = vectors[
+            np.sort(
+                self._rng.choice(
+                    count, min(count, self._lists * SAMPLE_RATIO), replace=False
+                )
+            )
+        ]
+        centroids: Matrix = sample[
+            self._rng.choice(len(sample), self._lists, replace=False)
+        ].copy()
+        for _ in range(TRAIN_ITERATIONS):
+            labels: NDArray[np.intp] = np.argmax(sample @ centroids.T, axis=1)
+            sums: Matrix = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty: NDArray[np.bool_] = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]  # Empty clusters stay where they are
+            centroids = _normalize(sums)
+
+        self._centroids = centroids
+        self._assignments = self._assign(vectors)
+        self._trained_size = count
+        self._dirty = True
+        logger.info(f"Trained {self._lists} clusters over {count} vectors")
+
+    def _added(self, positions: Positions) -> None:
+        """Assign new vectors to their cluster, training the clusters if due."""
+        if self._vectors is None:
+            return
+        if len(self._assignments) < len(self._vectors):
+            grown: NDArray[np.int32] = np.zeros(len(self._vectors), dtype=np.int32)
+            grown[: len(self._assignments)] = self._assignments
+            self._assignments = grown
+        if self._centroids is not None:
+            self._assignments[positions] = self._assign(self._vectors[positions])
+        self._train_if_due()
+
+    def _moved(self, source: int, target: int) -> None:
+        """Move a vector's cluster assignment along with it."""
+        if self._centroids is not None:
+            self._assignments[target] = self._assignments[source]
+
+    def _candidates(self, query: Matrix) -> Positions | None:
+        """The vectors of the clusters nearest to the query, once trained."""
+        if self._centroids is None:
+            return None
+        probed: NDArray[np.bool_] = np.zeros(self._lists, dtype=np.bool_)
+        probed[_top_k(self._centroids @ query, self._probes)] = True
+        return np.flatnonzero(probed[self._assignments[: len(self._ids)]])
+
+
+def create_vector_index(
+    kind: str | None = None, directory: str | None = None
+) -> VectorIndex:
+    """Build the vector index selected in the settings.
+
+    Args:
+        kind (str | None): "flat" for exact search, or "ivf" for approximate
+            search over large corpora. Defaults to `settings.VECTOR_INDEX_TYPE`.
+        directory (str | None): Where the index is saved; empty for memory
+            only. Defaults to `settings.VECTOR_INDEX_DIR`.
+
+    Returns:
+        VectorIndex: The index, loaded from its directory if saved there.
+
+    Raises:
+        ValueError: If the kind of index is unknown.
+    """
+    kind = settings.VECTOR_INDEX_TYPE if kind is None else kind
+    directory = settings.VECTOR_INDEX_DIR if directory is None else directory
+    match kind:
+        case "flat":
+            return FlatVectorIndex(directory or None)
+        case "ivf":
+            return IVFVectorIndex(directory or None)
+        case _:
+            raise ValueError(f"Unknown vector index type '{kind}'.")
@@ -1,9 +1,43 @@
+from src.utils.batching import MicroBatcher
 from src.utils.environment import load_env_var
-from src.utils.logger import setup_logger
-from src.utils.requests import http_request
+from src.utils.logger import bind_log_context, log_pipeline, setup_logger
+from src.utils.metrics import MetricsRegistry, metrics_registry
+from src.utils.rate_limit import RateLimiter, RateLimitExceededError, measure_pacing
+from src.utils.requests import (
+    HTTPClient,
+    async_http_probe,
+    async_http_request,
+    async_sse_request,
+    http_client,
+    http_request,
+)
+from src.utils.resilience import CircuitOpenError, provider_resilience
+from src.utils.singleflight import SingleFlight
+from src.utils.tokens import clip_tokens, estimate_tokens
+from src.utils.tracing import Tracer, tracer
 
 __all__ = [
+    "CircuitOpenError",
+    "HTTPClient",
+    "MetricsRegistry",
+    "MicroBatcher",
+    "RateLimitExceededError",
+    "RateLimiter",
+    "SingleFlight",
+    "Tracer",
+    "async_http_probe",
+    "async_http_request",
+    "async_sse_request",
+    "bind_log_context",
+    "clip_tokens",
+    "estimate_tokens",
+    "http_client",
     "http_request",
     "load_env_var",
+    "log_pipeline",
+    "measure_pacing",
+    "metrics_registry",
+    "provider_resilience",
     "setup_logger",
+    "tracer",
 ]
@@ -0,0 +1,112 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from weakref import WeakKeyDictionary
+
+
+@dataclass
+class _Batch[T, R]:
+    """Items waiting to be flushed together, with their callers' futures."""
+
+    items: list[T] = field(default_factory=list[T])
+    futures: list[asyncio.Future[R]] = field(default_factory=list[asyncio.Future[R]])
+    timer: asyncio.TimerHandle | None = None
+
+
+def _fail[R](futures: list[asyncio.Future[R]], error: Exception) -> None:
+    """Fail the futures of the callers still waiting for a batch."""
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
+
+
+class MicroBatcher[K: Hashable, T, R]:
+    """Coalesces concurrent single-item calls sharing a key into batched calls.
+
+    Items submitted for a key are collected until `max_batch` are waiting or
+    `max_wait` seconds have passed since the first one, then flushed in a
+    single call; each caller gets the result at its item's position. A
+    failed flush fails every caller of the batch.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[K, list[T]], Awaitable[list[R]]],
+        max_batch: int,
+        max_wait: float,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            flush (Callable[[K, list[T]], Awaitable[list[R]]]): Processes the
+                items of a key, returning one result per item, in order.
+            max_batch (int): Items flushed together at most.
+            max_wait (float): Seconds the first item of a batch may wait for
+                others to join it.
+        """
+        self._flush: Callable[[K, list[T]], Awaitable[list[R]]] = flush
+        self._max_batch: int = max(max_batch, 1)
+        self._max_wait: float = max_wait
+        # Futures are bound to their event loop, so batches are tracked per loop
+        self._pending: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[K, _Batch[T, R]]
+        ] = WeakKeyDictionary()
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    async def submit(self, key: K, item: T) -> R:
+        """Process an item as part of the next batch of its key.
+
+        Args:
+            key (K): Identifies items that may be flushed together.
+            item (T): The item to process.
+
+        Returns:
+            R: The item's result.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        pending: dict[K, _Batch[T, R]] = self._pending.setdefault(loop, {})
+        batch: _Batch[T, R] | None = pending.get(key)
+        if batch is None:
+            batch = _Batch()
+            pending[key] = batch
+            batch.timer = loop.call_later(
+                self._max_wait, self._dispatch, pending, key, batch
+            )
+
+        future: asyncio.Future[R] = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self._max_batch:
+            self._dispatch(pending, key, batch)
+        return await future
+
+    def _dispatch(
+        self, pending: dict[K, _Batch[T, R]], key: K, batch: _Batch[T, R]
+    ) -> None:
+        """Close a batch to new items and start flushing it."""
+        if pending.get(key) is batch:
+            del pending[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task: asyncio.Task[None] = asyncio.ensure_future(self._run(key, batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, key: K, batch: _Batch[T, R]) -> None:
+        """Flush a batch and hand each caller its result."""
+        try:
+            results: list[R] = await self._flush(key, batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(
+                    f"Expected {len(batch.items)} results, got {len(results)}."
+                )
+        except asyncio.CancelledError:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            _fail(batch.futures, e)
+            return
+        for future, result in zip(batch.futures, results, strict=True):
+            if not future.done():  # Unless the caller gave up
+                future.set_result(result)
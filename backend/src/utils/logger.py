@@ -1,20 +1,240 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 from src.config import settings
 
-# Create logs directory if it doesn't exist
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
-
 # Configure logging format
-log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+log_format = settings.LOG_FORMAT
 date_format = "%Y-%m-%d %H:%M:%S"
 
+# Record attributes copied into JSON lines when set, e.g. through `extra`
+CONTEXT_FIELDS: tuple[str, ...] = ("request_id", "provider", "model", "error")
+
+# Fields describing the current request, attached to every record logged in it
+_log_context: ContextVar[dict[str, str]] = ContextVar("log_context", default={})  # noqa: B039
+
+
+@contextmanager
+def bind_log_context(**fields: str) -> Generator[None]:
+    """Attach fields (e.g. a request id or provider) to the records logged in the block.
+
+    Args:
+        **fields (str): The fields to attach, on top of those already bound.
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record, with its context fields and any exception."""
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            value: Any = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:  # Rendered before the record was queued
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a share of high-volume records, by message prefix.
+
+    Records at INFO or below whose message starts with a configured prefix
+    are kept once every `1 / rate` records; warnings and errors are never
+    dropped. Counting (rather than drawing at random) keeps the sampled
+    lines evenly spread.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        """Initialize the filter.
+
+        Args:
+            rates (dict[str, float]): Share of records kept, in (0, 1], by
+                message prefix.
+        """
+        super().__init__()
+        self._every: dict[str, int] = {
+            prefix: max(round(1 / rate), 1)
+            for prefix, rate in rates.items()
+            if rate > 0
+        }
+        self._seen: dict[str, int] = dict.fromkeys(self._every, 0)
+        self._lock: threading.Lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Whether the record is kept."""
+        if record.levelno > logging.INFO or not isinstance(record.msg, str):
+            return True
+        for prefix, every in self._every.items():
+            if record.msg.startswith(prefix):
+                with self._lock:
+                    self._seen[prefix] += 1
+                    return self._seen[prefix] % every == 1 % every
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the pipeline's queue.
+
+    The message's arguments are merged (and any traceback rendered) before
+    queueing, since they may change before the listener thread gets to the
+    record; laying out the line is left to the listener. A full queue drops
+    the record rather than blocking the caller.
+    """
+
+    def __init__(self, pipeline: "LogPipeline"):
+        """Initialize a handler feeding the pipeline's queue."""
+        super().__init__(pipeline.queue)
+        self._pipeline: LogPipeline = pipeline
+
+    def format(self, record: logging.LogRecord) -> str:
+        """The record's message, without the traceback kept in `exc_text`."""
+        return record.getMessage()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message, then attach the bound context fields.
+
+        Fields passed in `extra` win over bound ones.
+        """
+        exc_text: str | None = (
+            logging.Formatter().formatException(record.exc_info)
+            if record.exc_info
+            else record.exc_text
+        )
+        prepared: logging.LogRecord = super().prepare(record)
+        prepared.exc_text = exc_text
+        for name, value in _log_context.get().items():
+            if not hasattr(prepared, name):
+                setattr(prepared, name, value)
+        return prepared
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue the record, dropping it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._pipeline.dropped += 1
+
+
+class LogPipeline:
+    """Writes log records from a background thread.
+
+    Loggers only put records on a bounded queue; a listener thread formats
+    them and writes them to stdout and to a rotating file, so slow disks
+    (or fsync stalls) never add latency to requests.
+    """
+
+    def __init__(self, path: str | Path | None = None, json_lines: bool | None = None):
+        """Initialize the pipeline; defaults come from the settings.
+
+        Args:
+            path (str | Path | None): The log file.
+            json_lines (bool | None): Whether records are written as JSON
+                lines rather than plain text.
+        """
+        self._path: Path = Path(settings.LOG_FILE if path is None else path)
+        self._json_lines: bool = settings.LOG_JSON if json_lines is None else json_lines
+        self.queue: queue.Queue[logging.LogRecord] = queue.Queue(
+            maxsize=settings.LOG_QUEUE_SIZE
+        )
+        self.filter: SamplingFilter = SamplingFilter(settings.LOG_SAMPLE_RATES)
+        self.dropped: int = 0
+        self._listener: logging.handlers.QueueListener | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _file_handler(self) -> logging.Handler:
+        """A handler writing to the log file, rotated by size or by time."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if settings.LOG_ROTATION == "time":
+            return logging.handlers.TimedRotatingFileHandler(
+                self._path,
+                when=settings.LOG_ROTATE_WHEN,
+                backupCount=settings.LOG_BACKUP_COUNT,
+                encoding="utf-8",
+            )
+        return logging.handlers.RotatingFileHandler(
+            self._path,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+
+    def start(self) -> None:
+        """Start the listener thread, if not already running."""
+        with self._lock:
+            if self._listener is not None:
+                return
+            formatter: logging.Formatter = (
+                JsonFormatter()
+                if self._json_lines
+                else logging.Formatter(log_format, date_format)
+            )
+
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+            file_handler: logging.Handler = self._file_handler()
+            file_handler.setLevel(logging.INFO)
+            for handler in (console_handler, file_handler):
+                handler.setFormatter(formatter)
+
+            self._listener = logging.handlers.QueueListener(
+                self.queue, console_handler, file_handler, respect_handler_level=True
+            )
+            self._listener.start()
+
+    def handler(self) -> logging.Handler:
+        """A handler feeding the pipeline, starting its listener if needed."""
+        self.start()
+        queue_handler = _QueueHandler(self)
+        queue_handler.addFilter(self.filter)
+        return queue_handler
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written."""
+        if self._listener is not None:
+            self.queue.join()
+
+    def stop(self) -> None:
+        """Write the queued records, then stop the listener and close its files."""
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+
+log_pipeline = LogPipeline()
+atexit.register(log_pipeline.stop)
+
 
 def setup_logger(name: str) -> logging.Logger:
-    """Set up a logger with both file and console handlers.
+    """Set up a logger writing through the shared, non-blocking log pipeline.
 
     Args:
         name: The name of the logger, typically __name__ from the calling module
@@ -29,21 +249,8 @@ def setup_logger(name: str) -> logging.Logger:
     if logger.handlers:
         return logger
 
-    # Create formatters
-    formatter = logging.Formatter(log_format, date_format)
-
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    console_handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
-
-    # File handler
-    file_handler = logging.FileHandler(log_dir / "app.log")
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
-
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    handler: logging.Handler = log_pipeline.handler()
+    handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+    logger.addHandler(handler)
 
     return logger
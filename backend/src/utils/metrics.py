@@ -0,0 +1,409 @@
+import bisect
+import math
+import threading
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from time import perf_counter
+
+# Upper bounds, in seconds, of the default latency histogram buckets
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for the Prometheus text format."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    """Format label pairs as `{name="value",...}`, or nothing if there are none."""
+    text: str = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{text}}}" if text else ""
+
+
+class _Metric:
+    """A named family of samples, one per combination of label values.
+
+    Updates take a lock, since the sync request path runs in worker threads;
+    it is held for a dictionary update only, which keeps updates cheap.
+    """
+
+    kind: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        """Initialize the metric.
+
+        Args:
+            name (str): The metric's name, e.g. "altron_errors_total".
+            documentation (str): What the metric measures, for `# HELP`.
+            labels (Iterable[str]): The names of the metric's labels.
+        """
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labels: tuple[str, ...] = tuple(labels)
+        self._lock: threading.Lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """The label values of a sample, in the metric's label order.
+
+        Raises:
+            ValueError: If the labels do not match the metric's label names.
+        """
+        if labels.keys() != set(self.labels):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels {self.labels}, "
+                f"got {tuple(labels)}."
+            )
+        return tuple(labels[name] for name in self.labels)
+
+    def _header(self) -> list[str]:
+        """The `# HELP` and `# TYPE` lines of the metric."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> list[str]:
+        """Render the metric in the Prometheus text format, line by line."""
+        raise NotImplementedError("Subclasses of _Metric must implement render.")
+
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. requests served or errors raised."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        """Initialize a counter; see `_Metric`."""
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter of a label combination.
+
+        Args:
+            amount (float): How much to add; must not be negative.
+            **labels (str): The sample's label values.
+
+        Raises:
+            ValueError: If the amount is negative or the labels do not match.
+        """
+        if amount < 0:
+            raise ValueError(f"Counter '{self.name}' cannot decrease.")
+        key: tuple[str, ...] = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """The current value of a label combination (0 if never increased)."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        """Render the counter in the Prometheus text format, line by line."""
+        with self._lock:
+            values: list[tuple[tuple[str, ...], float]] = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(zip(self.labels, key, strict=True))} "
+            f"{_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, e.g. queue depth or requests in flight."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        """Initialize a gauge; see `_Metric`."""
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge of a label combination."""
+        key: tuple[str, ...] = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the gauge of a label combination."""
+        key: tuple[str, ...] = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the gauge of a label combination."""
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: str) -> Generator[None]:
+        """Count the block as in progress while it runs."""
+        self.inc(1.0, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1.0, **labels)
+
+    def value(self, **labels: str) -> float:
+        """The current value of a label combination (0 if never set)."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        """Render the gauge in the Prometheus text format, line by line."""
+        with self._lock:
+            values: list[tuple[tuple[str, ...], float]] = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(zip(self.labels, key, strict=True))} "
+            f"{_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """The distribution of observed values, e.g. latencies, in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        """Initialize a histogram; see `_Metric`.
+
+        Args:
+            name (str): The metric's name, e.g. "altron_request_seconds".
+            documentation (str): What the metric measures, for `# HELP`.
+            labels (Iterable[str]): The names of the metric's labels.
+            buckets (Iterable[float]): The buckets' upper bounds; a `+Inf`
+                bucket is always added.
+        """
+        super().__init__(name, documentation, labels)
+        self.buckets: tuple[float, ...] = tuple(sorted(set(buckets)))
+        # Per label combination: the count of each bucket (plus +Inf) and the sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation for a label combination."""
+        key: tuple[str, ...] = self._key(labels)
+        index: int = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            counts, total = self._values[key]
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Generator[None]:
+        """Observe how long the block takes, in seconds, even if it raises."""
+        start: float = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """The number of observations of a label combination."""
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry is not None else 0
+
+    def sum(self, **labels: str) -> float:
+        """The sum of the observations of a label combination."""
+        entry = self._values.get(self._key(labels))
+        return entry[1][0] if entry is not None else 0.0
+
+    def render(self) -> list[str]:
+        """Render the histogram in the Prometheus text format, line by line."""
+        with self._lock:
+            values: list[tuple[tuple[str, ...], list[int], float]] = [
+                (key, list(counts), total[0])
+                for key, (counts, total) in sorted(self._values.items())
+            ]
+        lines: list[str] = self._header()
+        for key, counts, total in values:
+            pairs: list[tuple[str, str]] = list(zip(self.labels, key, strict=True))
+            cumulative: int = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                bucket_labels: str = _format_labels(
+                    [*pairs, ("le", _format_value(bound))]
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(pairs)} {_format_value(total)}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Creates metrics and renders them all for a scrape."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register[M: _Metric](self, metric: M) -> M:
+        """Add a metric to the registry.
+
+        Raises:
+            ValueError: If a metric with the same name is already registered.
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labels: Iterable[str] = ()
+    ) -> Counter:
+        """Create and register a counter; see `Counter`."""
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Gauge:
+        """Create and register a gauge; see `Gauge`."""
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram; see `Histogram`."""
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, in registration order, ending with a newline.
+        """
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+# The request path's metrics, shared by the modules that record them
+http_request_seconds: Histogram = metrics_registry.histogram(
+    "altron_http_request_seconds",
+    "Latency of HTTP requests, by route template and status code.",
+    ("method", "route", "status"),
+)
+provider_call_seconds: Histogram = metrics_registry.histogram(
+    "altron_provider_call_seconds",
+    "Latency of calls to a provider's model, including failures but not pacing.",
+    ("provider", "model", "operation"),
+)
+rate_limit_wait_seconds: Histogram = metrics_registry.histogram(
+    "altron_rate_limit_wait_seconds",
+    "Time calls were paced to stay within a provider's rate limits.",
+    ("limiter", "key"),
+)
+time_to_first_token_seconds: Histogram = metrics_registry.histogram(
+    "altron_time_to_first_token_seconds",
+    "Time from the start of a streamed reply to its first delta.",
+    ("provider", "model"),
+)
+catalog_query_seconds: Histogram = metrics_registry.histogram(
+    "altron_catalog_query_seconds",
+    "Latency of model catalog lookups, cached or not, by outcome.",
+    ("provider", "state"),
+)
+vector_search_seconds: Histogram = metrics_registry.histogram(
+    "altron_vector_search_seconds",
+    "Latency of vector index searches, excluding the query's embedding.",
+    ("index",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+tool_call_seconds: Histogram = metrics_registry.histogram(
+    "altron_tool_call_seconds",
+    "Latency of server-side tool calls, by outcome (ok, error or timeout).",
+    ("tool", "outcome"),
+)
+provider_tokens: Counter = metrics_registry.counter(
+    "altron_provider_tokens_total",
+    "Tokens sent to (in) and generated by (out) a provider's model.",
+    ("provider", "model", "direction"),
+)
+cache_requests: Counter = metrics_registry.counter(
+    "altron_cache_requests_total",
+    "Cache lookups, by cache and result (hit, stale or miss).",
+    ("cache", "result"),
+)
+errors: Counter = metrics_registry.counter(
+    "altron_errors_total",
+    "Errors raised, by component and error class.",
+    ("component", "error"),
+)
+generations_in_flight: Gauge = metrics_registry.gauge(
+    "altron_generations_in_flight",
+    "Generations currently running on a provider.",
+    ("provider",),
+)
+scheduler_queue_depth: Gauge = metrics_registry.gauge(
+    "altron_scheduler_queue_depth",
+    "Requests waiting for a slot, by scheduler lane.",
+    ("lane",),
+)
+
+
+@contextmanager
+def track_provider_call(provider: str, model: str, operation: str) -> Generator[None]:
+    """Time a call to a provider's model, counting its errors by class.
+
+    Args:
+        provider (str): The name of the provider.
+        model (str): The id of the model.
+        operation (str): The kind of call, e.g. "converse" or "stream".
+    """
+    start: float = perf_counter()
+    try:
+        yield
+    except Exception as e:
+        errors.inc(component=provider, error=type(e).__name__)
+        raise
+    finally:
+        provider_call_seconds.observe(
+            perf_counter() - start, provider=provider, model=model, operation=operation
+        )
+
+
+def record_tokens(provider: str, model: str, prompt: int, completion: int) -> None:
+    """Count the tokens of a completed call to a provider's model.
+
+    Args:
+        provider (str): The name of the provider.
+        model (str): The id of the model.
+        prompt (int): Tokens sent to the model.
+        completion (int): Tokens generated by the model.
+    """
+    provider_tokens.inc(prompt, provider=provider, model=model, direction="in")
+    provider_tokens.inc(completion, provider=provider, model=model, direction="out")
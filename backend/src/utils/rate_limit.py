@@ -0,0 +1,270 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Generator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from src.config import settings
+from src.utils.logger import setup_logger
+from src.utils.metrics import rate_limit_wait_seconds
+
+logger = setup_logger(__name__)
+
+SECONDS_PER_MINUTE: float = 60.0
+
+# Pacing totals of the enclosing `measure_pacing` blocks, innermost last
+_pacing: ContextVar[tuple[list[float], ...]] = ContextVar("pacing", default=())
+
+
+@contextmanager
+def measure_pacing() -> Generator[Callable[[], float]]:
+    """Measure how long the calls made within the block are paced.
+
+    Latencies timed around a provider call include its wait for the rate
+    limits; subtracting it keeps a provider that is throttled by this
+    service, not slow, from looking slow. Tasks started within the block
+    add to its total too.
+
+    Yields:
+        Callable[[], float]: Returns the seconds paced so far.
+    """
+    paced: list[float] = [0.0]
+    token = _pacing.set((*_pacing.get(), paced))
+    try:
+        yield lambda: paced[0]
+    finally:
+        _pacing.reset(token)
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a call would have to wait too long for its rate limit."""
+
+    def __init__(self, name: str, retry_after: float):
+        """Initialize the error.
+
+        Args:
+            name (str): The rate limited target, e.g. a provider's model.
+            retry_after (float): Seconds until the call would be allowed.
+        """
+        self.name: str = name
+        self.retry_after: float = retry_after
+        super().__init__(
+            f"'{name}' is rate limited (quota exhausted); retry in {retry_after:.0f}s."
+        )
+
+
+class TokenBucket:
+    """Token bucket refilling continuously up to its capacity.
+
+    Takes may overdraw the bucket: a negative level is the backlog of
+    reserved calls, so callers queue in order of their reservations.
+    Callers serialize access through `RateLimiter`'s lock.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            capacity (float): The most tokens the bucket holds.
+            per_second (float): Tokens added per second.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self._capacity: float = capacity
+        self._per_second: float = per_second
+        self._clock: Callable[[], float] = clock
+        self._level: float = capacity
+        self._updated: float = clock()
+
+    @property
+    def level(self) -> float:
+        """The tokens currently available; negative while calls are queued."""
+        self._refill()
+        return self._level
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update."""
+        now: float = self._clock()
+        self._level = min(
+            self._capacity, self._level + (now - self._updated) * self._per_second
+        )
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available, without taking them."""
+        self._refill()
+        # A single call larger than the bucket waits for a full bucket at most
+        deficit: float = min(amount, self._capacity) - self._level
+        return max(deficit / self._per_second, 0.0)
+
+    def take(self, amount: float) -> None:
+        """Take tokens, overdrawing the bucket if needed."""
+        self._refill()
+        self._level -= min(amount, self._capacity)
+
+    def configure(
+        self, capacity: float, per_second: float, remaining: float | None = None
+    ) -> None:
+        """Resize the bucket, e.g. once the server has reported its quota.
+
+        Args:
+            capacity (float): The most tokens the bucket holds.
+            per_second (float): Tokens added per second.
+            remaining (float | None): Tokens the server says are left; the
+                bucket never claims more than that.
+        """
+        self._refill()
+        self._capacity = capacity
+        self._per_second = per_second
+        self._level = min(self._level, capacity)
+        if remaining is not None:
+            self._level = min(self._level, remaining)
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute limits, by key.
+
+    Each key (e.g. a model id) gets a request bucket and a token bucket,
+    sized from the defaults until the server reports its quotas through
+    `x-ratelimit-*` response headers. Calls are paced until both buckets
+    allow them, so they are shaped locally instead of rejected with 429s.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        max_wait: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the rate limiter; defaults come from the settings.
+
+        Args:
+            name (str): The name of the rate limited target, for errors and logs.
+            requests_per_minute (int | None): Requests allowed per minute and key.
+            tokens_per_minute (int | None): Tokens allowed per minute and key.
+            max_wait (float | None): Longest a call is paced before failing.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self.name: str = name
+        self._requests_per_minute: int = (
+            settings.RATE_LIMIT_DEFAULT_RPM
+            if requests_per_minute is None
+            else requests_per_minute
+        )
+        self._tokens_per_minute: int = (
+            settings.RATE_LIMIT_DEFAULT_TPM
+            if tokens_per_minute is None
+            else tokens_per_minute
+        )
+        self._max_wait: float = (
+            settings.RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+        )
+        self._clock: Callable[[], float] = clock
+        self._buckets: dict[str, tuple[TokenBucket, TokenBucket]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _buckets_for(self, key: str) -> tuple[TokenBucket, TokenBucket]:
+        """Retrieve (creating on first use) the request and token buckets of a key.
+
+        Caller holds the lock.
+        """
+        if key not in self._buckets:
+            self._buckets[key] = (
+                TokenBucket(
+                    self._requests_per_minute,
+                    self._requests_per_minute / SECONDS_PER_MINUTE,
+                    self._clock,
+                ),
+                TokenBucket(
+                    self._tokens_per_minute,
+                    self._tokens_per_minute / SECONDS_PER_MINUTE,
+                    self._clock,
+                ),
+            )
+        return self._buckets[key]
+
+    def reserve(self, key: str, tokens: int) -> float:
+        """Reserve one request and an estimated number of tokens.
+
+        Args:
+            key (str): The rate limited key, e.g. a model id.
+            tokens (int): The estimated tokens the call consumes.
+
+        Returns:
+            float: Seconds the caller must wait before making the call.
+
+        Raises:
+            RateLimitExceededError: If the wait would exceed the maximum;
+                nothing is reserved then.
+        """
+        with self._lock:
+            requests, token_bucket = self._buckets_for(key)
+            delay: float = max(requests.delay(1), token_bucket.delay(tokens))
+            if delay > self._max_wait:
+                raise RateLimitExceededError(f"{self.name}/{key}", delay)
+            requests.take(1)
+            token_bucket.take(tokens)
+        if delay > 0:
+            logger.info(f"Pacing a call to '{self.name}/{key}' by {delay:.2f}s")
+        return delay
+
+    def acquire(self, key: str, tokens: int) -> None:
+        """Wait until a call is allowed by the rate limits.
+
+        Raises:
+            RateLimitExceededError: If the wait would exceed the maximum.
+        """
+        delay: float = self.reserve(key, tokens)
+        self._record_wait(key, delay)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, key: str, tokens: int) -> None:
+        """Asynchronously wait until a call is allowed by the rate limits.
+
+        Raises:
+            RateLimitExceededError: If the wait would exceed the maximum.
+        """
+        delay: float = self.reserve(key, tokens)
+        self._record_wait(key, delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _record_wait(self, key: str, delay: float) -> None:
+        """Record a call's pacing, in the metrics and the measured blocks."""
+        rate_limit_wait_seconds.observe(delay, limiter=self.name, key=key)
+        for paced in _pacing.get():
+            paced[0] += delay
+
+    def update(self, key: str, headers: Mapping[str, str]) -> None:
+        """Align a key's buckets with the quotas reported by the server.
+
+        Reads the `x-ratelimit-limit-*` and `x-ratelimit-remaining-*` headers
+        for requests and tokens; absent or malformed headers are ignored.
+
+        Args:
+            key (str): The rate limited key, e.g. a model id.
+            headers (Mapping[str, str]): The response headers.
+        """
+        with self._lock:
+            for kind, bucket in zip(
+                ("requests", "tokens"), self._buckets_for(key), strict=True
+            ):
+                try:
+                    limit: float = float(headers[f"x-ratelimit-limit-{kind}"])
+                    remaining: float | None = (
+                        float(headers[f"x-ratelimit-remaining-{kind}"])
+                        if f"x-ratelimit-remaining-{kind}" in headers
+                        else None
+                    )
+                except (KeyError, ValueError):
+                    continue
+                if limit > 0:
+                    bucket.configure(limit, limit / SECONDS_PER_MINUTE, remaining)
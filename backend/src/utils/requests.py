@@ -1,18 +1,306 @@
+import asyncio
+import threading
+import time
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
 from typing import Any, Literal
+from weakref import WeakKeyDictionary
 
-from requests import Response, request
+from aiohttp import (
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionCreateStartParams,
+)
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+
+from src.config import settings
+from src.utils.tracing import tracer
+
+type HTTPMethod = Literal["GET", "POST", "PATCH", "DELETE"]
+
+DEFAULT_HEADERS: dict[str, str] = {"Content-Type": "application/json"}
+
+
+def _validate_url(url: str) -> None:
+    """Ensure the URL uses an HTTP(S) scheme.
+
+    Raises:
+        ValueError: If the URL does not start with 'http://' or 'https://'.
+    """
+    if not url.startswith(("http://", "https://")):
+        raise ValueError("URL must start with 'http://' or 'https://'\nGot: " + url)
+
+
+def _headers(headers: dict[str, str] | None) -> dict[str, str]:
+    """The headers of an outgoing request, carrying the current trace context."""
+    return tracer.inject(dict(headers or DEFAULT_HEADERS))
+
+
+async def _on_connection_create_start(
+    _: ClientSession, context: SimpleNamespace, __: TraceConnectionCreateStartParams
+) -> None:
+    """Note when the async session starts opening a connection."""
+    context.connect_start_ns = time.time_ns()
+
+
+async def _on_connection_create_end(
+    _: ClientSession, context: SimpleNamespace, __: TraceConnectionCreateEndParams
+) -> None:
+    """Record the connection setup (DNS, TCP and TLS) as a span."""
+    tracer.record("http.connect", context.connect_start_ns)
+
+
+def _trace_config() -> TraceConfig:
+    """Hooks tracing the connection setup of the async sessions."""
+    trace_config = TraceConfig()
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    return trace_config
+
+
+class HTTPClient:
+    """Shared HTTP client with pooled keep-alive connections.
+
+    The sync face is a `requests.Session` whose adapter keeps a bounded pool of
+    connections per host; the async face is an `aiohttp.ClientSession` (one per
+    event loop, since aiohttp sessions are bound to the loop that created
+    them) with the same per-host bound. Both apply the configured connect and
+    read timeouts.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        pool_size: int | None = None,
+        pool_hosts: int | None = None,
+        keepalive_timeout: float | None = None,
+    ):
+        """Initialize the client; sessions are created lazily on first use.
+
+        Args:
+            connect_timeout (float | None): Seconds to wait for a connection.
+                Defaults to `settings.HTTP_CONNECT_TIMEOUT`.
+            read_timeout (float | None): Seconds to wait between bytes received.
+                Defaults to `settings.HTTP_READ_TIMEOUT`.
+            pool_size (int | None): Maximum connections kept per host.
+                Defaults to `settings.HTTP_POOL_SIZE`.
+            pool_hosts (int | None): Number of per-host pools to keep.
+                Defaults to `settings.HTTP_POOL_HOSTS`.
+            keepalive_timeout (float | None): Seconds an idle async connection
+                is kept open. Defaults to `settings.HTTP_KEEPALIVE_TIMEOUT`.
+        """
+        self._connect_timeout: float = (
+            settings.HTTP_CONNECT_TIMEOUT
+            if connect_timeout is None
+            else connect_timeout
+        )
+        self._read_timeout: float = (
+            settings.HTTP_READ_TIMEOUT if read_timeout is None else read_timeout
+        )
+        self._pool_size: int = (
+            settings.HTTP_POOL_SIZE if pool_size is None else pool_size
+        )
+        self._pool_hosts: int = (
+            settings.HTTP_POOL_HOSTS if pool_hosts is None else pool_hosts
+        )
+        self._keepalive_timeout: float = (
+            settings.HTTP_KEEPALIVE_TIMEOUT
+            if keepalive_timeout is None
+            else keepalive_timeout
+        )
+        self._session: Session | None = None
+        self._async_sessions: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, ClientSession
+        ] = WeakKeyDictionary()
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def session(self) -> Session:
+        """The pooled sync session, created on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self._pool_hosts,
+                        pool_maxsize=self._pool_size,
+                        pool_block=True,  # Wait for a free connection
+                        max_retries=0,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def async_session(self) -> ClientSession:
+        """The pooled async session for the running event loop."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        session: ClientSession | None = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            session = ClientSession(
+                connector=TCPConnector(
+                    limit=self._pool_size * self._pool_hosts,
+                    limit_per_host=self._pool_size,
+                    keepalive_timeout=self._keepalive_timeout,
+                ),
+                timeout=ClientTimeout(
+                    sock_connect=self._connect_timeout,
+                    sock_read=self._read_timeout,
+                ),
+                trace_configs=[_trace_config()],
+            )
+            self._async_sessions[loop] = session
+        return session
+
+    def request(
+        self,
+        method: HTTPMethod,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> Response:
+        """Make an HTTP request over the pooled sync session.
+
+        Args:
+            method (HTTPMethod): The HTTP method to use
+            url (str): The URL to send the request to
+            headers (dict[str, str] | None): Optional headers to include
+            json (dict[str, Any] | None): Optional JSON data to include
+
+        Returns:
+            Response: The response object from the request
+
+        Raises:
+            requests.HTTPError: If the response has an error status code
+        """
+        _validate_url(url)
+
+        response = self.session.request(
+            method=method,
+            url=url,
+            headers=_headers(headers),
+            json=json,
+            timeout=(self._connect_timeout, self._read_timeout),
+        )
+        response.raise_for_status()
+        return response
+
+    async def arequest(
+        self,
+        method: HTTPMethod,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> Any:
+        """Make an HTTP request over the pooled async session.
+
+        Args:
+            method (HTTPMethod): The HTTP method to use
+            url (str): The URL to send the request to
+            headers (dict[str, str] | None): Optional headers to include
+            json (dict[str, Any] | None): Optional JSON data to include
+
+        Returns:
+            Any: The JSON-decoded response body
+
+        Raises:
+            aiohttp.ClientResponseError: If the response has an error status code
+        """
+        _validate_url(url)
+
+        async with self.async_session().request(
+            method, url, headers=_headers(headers), json=json
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def aprobe(self, url: str, headers: dict[str, str] | None = None) -> None:
+        """Check that a URL answers a GET successfully, without reading the body.
+
+        Args:
+            url (str): The URL to probe
+            headers (dict[str, str] | None): Optional headers to include
+
+        Raises:
+            aiohttp.ClientResponseError: If the response has an error status code
+        """
+        _validate_url(url)
+
+        async with self.async_session().get(url, headers=_headers(headers)) as response:
+            response.raise_for_status()
+
+    async def astream_sse(
+        self,
+        method: HTTPMethod,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str]:
+        """Make an HTTP request and stream its Server-Sent Events.
+
+        Args:
+            method (HTTPMethod): The HTTP method to use
+            url (str): The URL to send the request to
+            headers (dict[str, str] | None): Optional headers to include
+            json (dict[str, Any] | None): Optional JSON data to include
+
+        Yields:
+            str: The `data` payload of each event, until the `[DONE]` sentinel
+
+        Raises:
+            aiohttp.ClientResponseError: If the response has an error status code
+        """
+        _validate_url(url)
+
+        async with self.async_session().request(
+            method, url, headers=_headers(headers), json=json
+        ) as response:
+            response.raise_for_status()
+            async for raw_line in response.content:
+                line: str = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue  # Skip blank separators, comments and other fields
+                data: str = line.removeprefix("data:").strip()
+                if data == "[DONE]":
+                    return
+                yield data
+
+    def close(self) -> None:
+        """Close the sync session and forget every async session."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+        self._async_sessions.clear()
+
+    async def aclose(self) -> None:
+        """Close the sync session and the running loop's async session."""
+        session: ClientSession | None = self._async_sessions.get(
+            asyncio.get_running_loop()
+        )
+        if session is not None:
+            await session.close()
+        self.close()
+
+
+http_client = HTTPClient()
 
 
 def http_request(
-    method: Literal["GET", "POST", "PATCH", "DELETE"],
+    method: HTTPMethod,
     url: str,
     headers: dict[str, str] | None = None,
     json: dict[str, Any] | None = None,
 ) -> Response:
-    """Make an HTTP request and return the response.
+    """Make an HTTP request over the shared connection pool.
 
     Args:
-        method (Literal["GET", "POST", "PATCH", "DELETE"]): The HTTP method to use
+        method (HTTPMethod): The HTTP method to use
         url (str): The URL to send the request to
         headers (dict[str, str] | None): Optional headers to include in the request
         json (dict[str, Any] | None): Optional JSON data to include in the request
@@ -20,10 +308,55 @@ def http_request(
     Returns:
         Response: The response object from the request
     """
-    if not url.startswith(("http://", "https://")):
-        raise ValueError("URL must start with 'http://' or 'https://'\nGot: " + url)
+    return http_client.request(method, url, headers=headers, json=json)
+
+
+async def async_http_request(
+    method: HTTPMethod,
+    url: str,
+    headers: dict[str, str] | None = None,
+    json: dict[str, Any] | None = None,
+) -> Any:
+    """Make an asynchronous HTTP request over the shared connection pool.
+
+    Args:
+        method (HTTPMethod): The HTTP method to use
+        url (str): The URL to send the request to
+        headers (dict[str, str] | None): Optional headers to include in the request
+        json (dict[str, Any] | None): Optional JSON data to include in the request
 
-    headers = headers or {"Content-Type": "application/json"}
-    response = request(method=method, url=url, headers=headers, json=json)
-    response.raise_for_status()
-    return response
+    Returns:
+        Any: The JSON-decoded response body
+    """
+    return await http_client.arequest(method, url, headers=headers, json=json)
+
+
+async def async_http_probe(url: str, headers: dict[str, str] | None = None) -> None:
+    """Check that a URL answers a GET successfully, without reading the body.
+
+    Args:
+        url (str): The URL to probe
+        headers (dict[str, str] | None): Optional headers to include in the request
+    """
+    await http_client.aprobe(url, headers=headers)
+
+
+async def async_sse_request(
+    method: HTTPMethod,
+    url: str,
+    headers: dict[str, str] | None = None,
+    json: dict[str, Any] | None = None,
+) -> AsyncGenerator[str]:
+    """Stream the Server-Sent Events of a request over the shared connection pool.
+
+    Args:
+        method (HTTPMethod): The HTTP method to use
+        url (str): The URL to send the request to
+        headers (dict[str, str] | None): Optional headers to include in the request
+        json (dict[str, Any] | None): Optional JSON data to include in the request
+
+    Yields:
+        str: The `data` payload of each event, until the `[DONE]` sentinel
+    """
+    async for data in http_client.astream_sse(method, url, headers=headers, json=json):
+        yield data
@@ -0,0 +1,487 @@
+import asyncio
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Any
+
+import aiohttp
+import openai
+import requests
+
+from src.config import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+CONNECTION_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    requests.ConnectionError,
+    requests.Timeout,
+    aiohttp.ClientConnectionError,
+    openai.APIConnectionError,  # Includes openai.APITimeoutError
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the target's circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        """Initialize the error.
+
+        Args:
+            name (str): The name of the target whose circuit is open.
+            retry_after (float): Seconds until the circuit will let a probe through.
+        """
+        self.name: str = name
+        self.retry_after: float = retry_after
+        super().__init__(
+            f"'{name}' is unavailable (circuit open); retry in {retry_after:.0f}s."
+        )
+
+
+def _status_code(e: BaseException) -> int | None:
+    """Extract the HTTP status code carried by an error, if any."""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status
+    if isinstance(e, openai.APIStatusError):
+        return e.status_code
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return e.response.status_code
+    return None
+
+
+def _headers(e: BaseException) -> Any:
+    """Extract the HTTP response headers carried by an error, if any."""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.headers
+    if isinstance(e, openai.APIStatusError):
+        return e.response.headers
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return e.response.headers
+    return None
+
+
+def is_retryable(e: BaseException) -> bool:
+    """Whether an error is transient (connection failure, 429 or 5xx)."""
+    if isinstance(e, CONNECTION_ERRORS):
+        return True
+    status: int | None = _status_code(e)
+    return status is not None and status in RETRYABLE_STATUS_CODES
+
+
+def retry_after(e: BaseException) -> float | None:
+    """Read the `Retry-After` header (seconds or HTTP date) carried by an error.
+
+    Returns:
+        float | None: The requested delay in seconds, if the header is present.
+    """
+    headers: Any = _headers(e)
+    value: str | None = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff settings."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, attempt: int, e: BaseException) -> float | None:
+        """Compute the delay before the next attempt.
+
+        Uses "full jitter" (a random delay up to the exponential cap) unless the
+        error carries a `Retry-After`, which is honored as a lower bound.
+
+        Args:
+            attempt (int): The number of the attempt that just failed (1-based).
+            e (BaseException): The error raised by that attempt.
+
+        Returns:
+            float | None: Seconds to wait, or None if the call must not be retried.
+        """
+        if attempt >= self.max_attempts or not is_retryable(e):
+            return None
+        delay: float = random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+        requested: float | None = retry_after(e)
+        if requested is not None:
+            if requested > self.max_delay:
+                return None  # The server asked for longer than we are willing to wait
+            delay = max(delay, requested)
+        return delay
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of overall traffic.
+
+    Every call deposits `ratio` tokens and every retry withdraws one, so
+    retries can never amplify load by more than `ratio` once a backend starts
+    failing across the board.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 3.0):
+        """Initialize the budget.
+
+        Args:
+            ratio (float): Retry tokens earned per call.
+            min_tokens (float): Tokens available up front (and the bucket's
+                floor capacity), so low-traffic targets can still retry.
+        """
+        self._ratio: float = ratio
+        self._capacity: float = max(min_tokens, 10 * ratio * min_tokens)
+        self._tokens: float = min_tokens
+        self._lock: threading.Lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Record a call, earning retry tokens."""
+        with self._lock:
+            self._tokens = min(self._capacity, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        """Try to spend a token on a retry.
+
+        Returns:
+            bool: Whether the retry is allowed.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitState(str, Enum):
+    """Enum for circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-target circuit breaker.
+
+    After `failure_threshold` consecutive transient failures the circuit opens
+    and calls fail fast. Once `reset_timeout` has elapsed, a single probe call
+    is let through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the breaker.
+
+        Args:
+            name (str): The name of the protected target.
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a probe.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self.name: str = name
+        self._failure_threshold: int = failure_threshold
+        self._reset_timeout: float = reset_timeout
+        self._clock: Callable[[], float] = clock
+        self._state: CircuitState = CircuitState.CLOSED
+        self._failures: int = 0
+        self._opened_at: float = 0.0
+        self._probing: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the circuit."""
+        with self._lock:
+            if (
+                self._state is CircuitState.OPEN
+                and self._clock() - self._opened_at >= self._reset_timeout
+            ):
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def _remaining(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        return max(self._reset_timeout - (self._clock() - self._opened_at), 0.0)
+
+    def check(self) -> None:
+        """Fail fast if the circuit is open, without reserving a probe.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        with self._lock:
+            if self._state is CircuitState.OPEN and self._remaining() > 0:
+                raise CircuitOpenError(self.name, self._remaining())
+
+    def acquire(self) -> None:
+        """Ask permission to make a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe
+                already in flight.
+        """
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return
+            if self._state is CircuitState.OPEN:
+                if self._remaining() > 0:
+                    raise CircuitOpenError(self.name, self._remaining())
+                self._state = CircuitState.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                raise CircuitOpenError(self.name, self._reset_timeout)
+            self._probing = True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            if self._state is not CircuitState.CLOSED:
+                logger.info(f"Circuit for '{self.name}' closed")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, e: BaseException) -> None:
+        """Record a failed call; only transient failures count toward opening.
+
+        Args:
+            e (BaseException): The error raised by the call.
+        """
+        with self._lock:
+            self._probing = False
+            if not is_retryable(e):
+                if self._state is CircuitState.HALF_OPEN:
+                    self._state = CircuitState.CLOSED  # The backend did respond
+                return
+            self._failures += 1
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self._failures >= self._failure_threshold
+            ):
+                if self._state is not CircuitState.OPEN:
+                    logger.error(
+                        f"Circuit for '{self.name}' opened after "
+                        f"{self._failures} consecutive failures"
+                    )
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Release a probe slot without recording an outcome (e.g. on cancel)."""
+        with self._lock:
+            self._probing = False
+
+
+class Resilience:
+    """Retries with backoff, retry budgets and circuit breakers, keyed by target.
+
+    Each target (e.g. a provider name) gets its own breaker and retry budget,
+    so a failing backend never consumes another backend's retries.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        budget_ratio: float | None = None,
+        failure_threshold: int | None = None,
+        reset_timeout: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the resilience layer; defaults come from the settings.
+
+        Args:
+            policy (RetryPolicy | None): The backoff settings.
+            budget_ratio (float | None): Retry tokens earned per call.
+            failure_threshold (int | None): Consecutive failures that open a circuit.
+            reset_timeout (float | None): Seconds a circuit stays open.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self._policy: RetryPolicy = policy or RetryPolicy(
+            max_attempts=settings.RETRY_MAX_ATTEMPTS,
+            base_delay=settings.RETRY_BASE_DELAY,
+            max_delay=settings.RETRY_MAX_DELAY,
+        )
+        self._budget_ratio: float = (
+            settings.RETRY_BUDGET_RATIO if budget_ratio is None else budget_ratio
+        )
+        self._failure_threshold: int = (
+            settings.CIRCUIT_FAILURE_THRESHOLD
+            if failure_threshold is None
+            else failure_threshold
+        )
+        self._reset_timeout: float = (
+            settings.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        )
+        self._clock: Callable[[], float] = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._budgets: dict[str, RetryBudget] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Retrieve (creating on first use) the circuit breaker for a target."""
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(
+                    name, self._failure_threshold, self._reset_timeout, self._clock
+                )
+                self._budgets[name] = RetryBudget(self._budget_ratio)
+            return self._breakers[name]
+
+    def _budget(self, name: str) -> RetryBudget:
+        """Retrieve the retry budget for a target."""
+        self.breaker(name)
+        return self._budgets[name]
+
+    def _next_delay(self, name: str, attempt: int, e: BaseException) -> float | None:
+        """Decide whether (and after how long) to retry a failed attempt."""
+        delay: float | None = self._policy.backoff(attempt, e)
+        if delay is None:
+            return None
+        if not self._budget(name).withdraw():
+            logger.error(f"Retry budget exhausted for '{name}'")
+            return None
+        logger.info(
+            f"Retrying '{name}' in {delay:.2f}s after attempt {attempt} failed: {e}"
+        )
+        return delay
+
+    def call[T](self, name: str, fn: Callable[..., T], *args: Any) -> T:
+        """Call a function with retries and circuit breaking.
+
+        Args:
+            name (str): The target the call is made against.
+            fn (Callable[..., T]): The function to call.
+            *args (Any): Positional arguments for the function.
+
+        Returns:
+            T: The function's result.
+
+        Raises:
+            CircuitOpenError: If the target's circuit is open.
+        """
+        breaker: CircuitBreaker = self.breaker(name)
+        self._budget(name).deposit()
+        attempt: int = 0
+        while True:
+            attempt += 1
+            breaker.acquire()
+            try:
+                result: T = fn(*args)
+            except Exception as e:
+                breaker.record_failure(e)
+                delay: float | None = self._next_delay(name, attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    async def acall[T](
+        self, name: str, fn: Callable[[], Awaitable[T]], retry: bool = True
+    ) -> T:
+        """Await a coroutine factory with retries and circuit breaking.
+
+        Args:
+            name (str): The target the call is made against.
+            fn (Callable[[], Awaitable[T]]): Returns a fresh awaitable per attempt.
+            retry (bool): Whether failures are retried; pass False for calls
+                that are not idempotent, whose failure may hide a success.
+
+        Returns:
+            T: The awaited result.
+
+        Raises:
+            CircuitOpenError: If the target's circuit is open.
+        """
+        breaker: CircuitBreaker = self.breaker(name)
+        self._budget(name).deposit()
+        attempt: int = 0
+        while True:
+            attempt += 1
+            breaker.acquire()
+            try:
+                result: T = await fn()
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure(e)
+                delay: float | None = (
+                    self._next_delay(name, attempt, e) if retry else None
+                )
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    async def astream[T](
+        self, name: str, fn: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """Iterate a stream with circuit breaking, retrying until the first item.
+
+        Once an item has been yielded the stream cannot be replayed, so later
+        failures are recorded and re-raised without retrying.
+
+        Args:
+            name (str): The target the call is made against.
+            fn (Callable[[], AsyncIterator[T]]): Returns a fresh stream per attempt.
+
+        Yields:
+            T: The stream's items.
+
+        Raises:
+            CircuitOpenError: If the target's circuit is open.
+        """
+        breaker: CircuitBreaker = self.breaker(name)
+        self._budget(name).deposit()
+        attempt: int = 0
+        while True:
+            attempt += 1
+            breaker.acquire()
+            started: bool = False
+            try:
+                async for item in fn():
+                    started = True
+                    yield item
+            except (asyncio.CancelledError, GeneratorExit):
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure(e)
+                delay: float | None = (
+                    None if started else self._next_delay(name, attempt, e)
+                )
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return
+
+
+provider_resilience = Resilience()
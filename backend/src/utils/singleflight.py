@@ -0,0 +1,55 @@
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any
+from weakref import WeakKeyDictionary
+
+
+class SingleFlight[K: Hashable, T]:
+    """Coalesces concurrent calls sharing a key into a single in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same result (or exception). Nothing is kept once the
+    call completes, so results are never stale. A caller giving up (e.g. on a
+    timeout) does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty set of in-flight calls."""
+        # Tasks are bound to their event loop, so calls are tracked per loop
+        self._calls: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[K, asyncio.Task[T]]
+        ] = WeakKeyDictionary()
+
+    def in_flight(self, key: K) -> bool:
+        """Check whether a call for the key is in flight on the running loop."""
+        calls: dict[K, asyncio.Task[T]] = self._calls.get(
+            asyncio.get_running_loop(), {}
+        )
+        return key in calls
+
+    async def do(self, key: K, fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Run a call, or join the identical call already in flight.
+
+        Args:
+            key (K): Identifies calls that may share a result.
+            fn (Callable[[], Coroutine[Any, Any, T]]): Starts the call.
+
+        Returns:
+            T: The call's result.
+        """
+        calls: dict[K, asyncio.Task[T]] = self._calls.setdefault(
+            asyncio.get_running_loop(), {}
+        )
+        task: asyncio.Task[T] | None = calls.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            calls[key] = task
+
+            def forget(done: asyncio.Task[T]) -> None:
+                if calls.get(key) is done:
+                    del calls[key]
+                if not done.cancelled():
+                    done.exception()  # Retrieved even if every caller gave up
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
@@ -0,0 +1,39 @@
+from functools import lru_cache
+
+# Rough average for BPE tokenizers; counting UTF-8 bytes rather than
+# characters keeps the estimate on the safe side for non-Latin scripts.
+BYTES_PER_TOKEN: int = 4
+
+
+@lru_cache(maxsize=8192)
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens a text encodes to.
+
+    The estimate avoids running a tokenizer, so it is cheap enough to call on
+    every message of every request; results are cached, since the same
+    history is counted again on each turn.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return -(-len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+
+
+def clip_tokens(text: str, tokens: int) -> str:
+    """Clip a text to about the given number of tokens, keeping its start.
+
+    Args:
+        text (str): The text to clip.
+        tokens (int): The token budget.
+
+    Returns:
+        str: The text, shortened if it exceeds the budget.
+    """
+    encoded: bytes = text.encode("utf-8")
+    limit: int = max(tokens, 0) * BYTES_PER_TOKEN
+    if len(encoded) <= limit:
+        return text
+    return encoded[:limit].decode("utf-8", errors="ignore")
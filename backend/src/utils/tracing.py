@@ -0,0 +1,384 @@
+import json
+import random
+import re
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Generator, Mapping, MutableMapping
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, TextIO
+
+from src.config import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# W3C Trace Context header carrying the trace and parent span ids
+TRACEPARENT_HEADER: str = "traceparent"
+TRACEPARENT_PATTERN: re.Pattern[str] = re.compile(
+    r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$"
+)
+
+type AttributeValue = str | int | float | bool
+
+
+class SpanStatus(str, Enum):
+    """Outcome of a span, as in OpenTelemetry.
+
+    - UNSET: The span ended without an error.
+    - ERROR: The span's block raised an exception.
+    """
+
+    UNSET = "unset"
+    ERROR = "error"
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifies a span within its trace."""
+
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        """The context as a W3C `traceparent` header value (always sampled)."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, header: str | None) -> "SpanContext | None":
+        """Parse a W3C `traceparent` header value.
+
+        Args:
+            header (str | None): The header value, if any.
+
+        Returns:
+            SpanContext | None: The remote span's context, or None if the
+                header is missing or malformed.
+        """
+        match: re.Match[str] | None = TRACEPARENT_PATTERN.match(
+            (header or "").strip().lower()
+        )
+        if match is None or set(match[1]) == {"0"} or set(match[2]) == {"0"}:
+            return None
+        return cls(trace_id=match[1], span_id=match[2])
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace, with OpenTelemetry semantics."""
+
+    name: str
+    context: SpanContext
+    parent_id: str | None = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, AttributeValue] = field(
+        default_factory=dict[str, AttributeValue]
+    )
+    status: SpanStatus = SpanStatus.UNSET
+    error: str | None = None
+    recording: bool = True
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Attach an attribute to the span, if it is recorded."""
+        if self.recording:
+            self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float | None:
+        """How long the span lasted, in milliseconds, once it has ended."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the span to a JSON-serializable, OTLP-like dictionary."""
+        return {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": self.duration_ms,
+            "attributes": self.attributes,
+            "status": {"code": self.status.value, "message": self.error},
+        }
+
+
+class SpanExporter(ABC):
+    """Receives every finished span, e.g. to write it out or forward it."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Export a finished span.
+
+        Args:
+            span (Span): The span, after it has ended.
+        """
+        raise NotImplementedError(
+            "This method should be implemented by subclasses of SpanExporter."
+        )
+
+    def shutdown(self) -> None:  # noqa: B027
+        """Flush and release any resources held by the exporter."""
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Writes each finished span as a JSON line to a stream (stdout by default)."""
+
+    def __init__(self, stream: TextIO | None = None):
+        """Initialize the exporter.
+
+        Args:
+            stream (TextIO | None): Where to write spans; defaults to stdout.
+        """
+        self._stream: TextIO = stream or sys.stdout
+        self._lock: threading.Lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Write the span as a JSON line."""
+        line: str = json.dumps(span.to_dict())
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends each finished span as a JSON line to a file, for offline use."""
+
+    def __init__(self, path: str | Path):
+        """Initialize the exporter; the file is opened on the first span.
+
+        Args:
+            path (str | Path): The JSON lines file to append spans to.
+        """
+        self._path: Path = Path(path)
+        self._file: TextIO | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Append the span as a JSON line."""
+        line: str = json.dumps(span.to_dict())
+        with self._lock:
+            if self._file is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self._path.open("a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        """Close the file."""
+        with self._lock:
+            file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps finished spans in a list, e.g. for tests or a debug endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize an empty exporter."""
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        """Keep the span."""
+        self.spans.append(span)
+
+    def names(self) -> list[str]:
+        """The names of the finished spans, in the order they ended."""
+        return [span.name for span in self.spans]
+
+
+def _random_id(bits: int) -> str:
+    """A random, non-zero hex id of the given size."""
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+# The span of the code running in this context (task or thread), if any
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+# Yielded by disabled tracers, so call sites never need to check for None
+_NON_RECORDING_SPAN: Span = Span(
+    name="", context=SpanContext(trace_id="0" * 32, span_id="0" * 16), recording=False
+)
+
+
+class Tracer:
+    """Records nested spans and hands them to exporters as they end.
+
+    The current span follows the code through `contextvars`, so spans nest
+    across awaits, tasks and worker threads without being passed around.
+    Trace context crosses process boundaries in W3C `traceparent` headers.
+    A disabled tracer yields a shared non-recording span and exports nothing.
+    """
+
+    def __init__(
+        self,
+        enabled: bool | None = None,
+        exporters: list[SpanExporter] | None = None,
+    ):
+        """Initialize the tracer; defaults come from the settings.
+
+        Args:
+            enabled (bool | None): Whether spans are recorded.
+            exporters (list[SpanExporter] | None): Where finished spans go.
+                Defaults to the exporters named in `settings.TRACING_EXPORTERS`.
+        """
+        self._enabled: bool = settings.TRACING_ENABLED if enabled is None else enabled
+        self._exporters: list[SpanExporter] = (
+            self._default_exporters() if exporters is None else list(exporters)
+        )
+
+    @staticmethod
+    def _default_exporters() -> list[SpanExporter]:
+        """Build the exporters named in the settings."""
+        exporters: list[SpanExporter] = []
+        for name in settings.TRACING_EXPORTERS:
+            match name:
+                case "console":
+                    exporters.append(ConsoleSpanExporter())
+                case "file":
+                    exporters.append(FileSpanExporter(settings.TRACING_FILE))
+                case _:
+                    logger.error(f"Unknown span exporter '{name}', ignoring it")
+        return exporters
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self._enabled
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        """Send finished spans to another exporter as well.
+
+        Args:
+            exporter (SpanExporter): The exporter to add.
+        """
+        self._exporters.append(exporter)
+
+    def current_span(self) -> Span | None:
+        """The recording span of the running code, if any."""
+        return _current_span.get()
+
+    def _start(self, name: str, parent: SpanContext | None, start_ns: int) -> Span:
+        """Create a span, as a child of `parent` or else of the current span."""
+        if parent is None:
+            current: Span | None = _current_span.get()
+            parent = current.context if current is not None else None
+        return Span(
+            name=name,
+            context=SpanContext(
+                trace_id=parent.trace_id if parent is not None else _random_id(128),
+                span_id=_random_id(64),
+            ),
+            parent_id=parent.span_id if parent is not None else None,
+            start_ns=start_ns,
+        )
+
+    def _end(self, span: Span) -> None:
+        """End a span and export it; exporter failures are logged, not raised."""
+        span.end_ns = time.time_ns()
+        for exporter in self._exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.error(
+                    f"Error exporting span '{span.name}'", extra={"error": str(e)}
+                )
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: SpanContext | None = None,
+        **attributes: AttributeValue,
+    ) -> Generator[Span]:
+        """Record the block as a span, current for the code it runs.
+
+        Args:
+            name (str): The operation, e.g. "provider.call".
+            parent (SpanContext | None): A remote parent, e.g. from an incoming
+                `traceparent` header; defaults to the current span.
+            **attributes (AttributeValue): Initial attributes of the span.
+
+        Yields:
+            Span: The span, to attach attributes to; a non-recording span if
+                the tracer is disabled.
+        """
+        if not self._enabled:
+            yield _NON_RECORDING_SPAN
+            return
+
+        span: Span = self._start(name, parent, time.time_ns())
+        span.attributes.update(attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = SpanStatus.ERROR
+            span.error = str(e) or type(e).__name__
+            span.attributes["exception.type"] = type(e).__name__
+            raise
+        finally:
+            # A generator's span may end in another context, e.g. when finalized
+            with suppress(ValueError):
+                _current_span.reset(token)
+            self._end(span)
+
+    def record(self, name: str, start_ns: int, **attributes: AttributeValue) -> None:
+        """Record an operation that has already happened as a child span.
+
+        Useful for stages whose start is known but that cannot be wrapped,
+        e.g. the request parsing done by the framework before a handler runs.
+
+        Args:
+            name (str): The operation, e.g. "request.parse".
+            start_ns (int): When the operation started, in Unix nanoseconds.
+            **attributes (AttributeValue): Attributes of the span.
+        """
+        if not self._enabled:
+            return
+        span: Span = self._start(name, None, start_ns)
+        span.attributes.update(attributes)
+        self._end(span)
+
+    def inject[H: MutableMapping[str, str]](self, headers: H) -> H:
+        """Propagate the current span's context into outgoing HTTP headers.
+
+        Args:
+            headers (H): The headers to add `traceparent` to.
+
+        Returns:
+            H: The same headers, for chaining.
+        """
+        current: Span | None = _current_span.get()
+        if current is not None:
+            headers[TRACEPARENT_HEADER] = current.context.traceparent
+        return headers
+
+    def extract(self, headers: Mapping[str, str]) -> SpanContext | None:
+        """Read a remote parent's context from incoming HTTP headers.
+
+        Args:
+            headers (Mapping[str, str]): The headers, with lower-case names.
+
+        Returns:
+            SpanContext | None: The parent's context, if a valid one was sent.
+        """
+        return SpanContext.from_traceparent(headers.get(TRACEPARENT_HEADER))
+
+    def shutdown(self) -> None:
+        """Flush and release every exporter."""
+        for exporter in self._exporters:
+            exporter.shutdown()
+
+
+tracer = Tracer()
@@ -0,0 +1,50 @@
+import base64
+import sys
+from array import array
+from collections.abc import Sequence
+
+# Vectors are exchanged as little-endian float32, NumPy's "<f4"
+FLOAT32: str = "f"
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    """Encode a vector as little-endian float32 bytes.
+
+    Args:
+        vector (Sequence[float]): The vector to encode.
+
+    Returns:
+        bytes: 4 bytes per component, readable with
+            `numpy.frombuffer(data, dtype="<f4")`.
+    """
+    values: array[float] = array(FLOAT32, vector)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpack_vector(data: bytes) -> list[float]:
+    """Decode a vector encoded by `pack_vector`.
+
+    Args:
+        data (bytes): Little-endian float32 bytes.
+
+    Returns:
+        list[float]: The vector's components.
+
+    Raises:
+        ValueError: If the data is not a whole number of float32 values.
+    """
+    values: array[float] = array(FLOAT32)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
+
+def pack_vector_base64(vector: Sequence[float]) -> str:
+    """Encode a vector as base64 of its little-endian float32 bytes.
+
+    This is the layout of OpenAI's `encoding_format="base64"` embeddings.
+    """
+    return base64.b64encode(pack_vector(vector)).decode("ascii")
@@ -0,0 +1,21 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+def test_submit_bulk_job_requires_batch_provider(client: TestClient):
+    response = client.post(
+        "/api/v1/bulk/",
+        json={
+            "model": {"id": "lmstudio-model", "provider": "LM Studio", "type": "chat"},
+            "message_threads": [{"messages": [{"role": "user", "content": "Hi"}]}],
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "does not support bulk jobs" in response.json()["detail"]
+
+
+def test_get_bulk_job_unknown_provider(client: TestClient):
+    response = client.get("/api/v1/bulk/Unknown/batch_1")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
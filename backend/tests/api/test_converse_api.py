@@ -1,10 +1,18 @@
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
+from unittest.mock import AsyncMock
 from fastapi import Response, status
 from fastapi.testclient import TestClient
-from requests_mock import Mocker
 from src.models.ai_models import AIModel, AIModelType
+from src.models import ToolOptions
 from src.models.messages import Message, MessageRole, MessageThread
 from src.api.converse_api import ConverseRequest
+from src.config import settings
+from src.services.scheduler import ProviderScheduler, QueueFullError
+from src.utils import RateLimitExceededError
+from src.utils.resilience import Resilience
 import pytest
 
 
@@ -16,42 +24,30 @@ import pytest
     ],
 )
 def test_converse_endpoint(
-    client: TestClient, requests_mock: Mocker, provider_name: str, model_id: str
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    provider_name: str,
+    model_id: str,
 ):
     from src.models.messages import UserMessage
 
     if provider_name == "LM Studio":
-        from src.providers.lmstudio import LMStudio
-
-        lmstudio = LMStudio()
-        # Mock both possible LM Studio addresses
-        requests_mock.post(
-            url=lmstudio.base_url + lmstudio.CONVERSE_ENDPOINT,
-            json={
-                "choices": [
-                    {
-                        "message": {
-                            "role": "assistant",
-                            "content": "Hello! How can I assist you today?",
-                        },
-                        "finish_reason": "stop",
-                    }
-                ]
-            },
-        )
-        requests_mock.post(
-            url="http://192.168.1.143:1234/v1/chat/completions",
-            json={
-                "choices": [
-                    {
-                        "message": {
-                            "role": "assistant",
-                            "content": "Hello! How can I assist you today?",
-                        },
-                        "finish_reason": "stop",
-                    }
-                ]
-            },
+        # The API dispatches through the provider's async HTTP path
+        monkeypatch.setattr(
+            "src.providers.lmstudio.async_http_request",
+            AsyncMock(
+                return_value={
+                    "choices": [
+                        {
+                            "message": {
+                                "role": "assistant",
+                                "content": "Hello! How can I assist you today?",
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ]
+                }
+            ),
         )
         messages = [Message(role=MessageRole.USER, content="Hello, AI!")]
     elif provider_name == "OpenAI":
@@ -101,3 +97,173 @@ def test_converse_endpoint_wrong_method(client: TestClient):
         status.HTTP_405_METHOD_NOT_ALLOWED,
         status.HTTP_400_BAD_REQUEST,
     )
+
+
+def test_converse_stream_endpoint(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    chunks = [
+        {"choices": [{"delta": {"role": "assistant", "content": "Hel"}}]},
+        {"choices": [{"delta": {"content": "lo!"}}]},
+        {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+    ]
+
+    async def fake_sse_request(**_: Any):
+        for chunk in chunks:
+            yield json.dumps(chunk)
+
+    monkeypatch.setattr("src.providers.lmstudio.async_sse_request", fake_sse_request)
+    con_req = ConverseRequest(
+        model=AIModel(id="lmstudio-model", provider="LM Studio", type=AIModelType.CHAT),
+        message_thread=MessageThread(
+            messages=[Message(role=MessageRole.USER, content="Hello, AI!")]
+        ),
+    ).model_dump()
+
+    response = client.post("/api/v1/converse/stream", json=con_req)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        line.removeprefix("data: ")
+        for line in response.text.split("\n\n")
+        if line.startswith("data: ")
+    ]
+    assert events[-1] == "[DONE]"
+    deltas = [json.loads(event) for event in events[:-1]]
+    assert "".join(delta["content"] or "" for delta in deltas) == "Hello!"
+    assert deltas[-1]["finish_reason"] == "stop"
+
+
+def test_converse_stream_endpoint_empty_thread(client: TestClient):
+    con_req = ConverseRequest(
+        model=AIModel(id="lmstudio-model", provider="LM Studio", type=AIModelType.CHAT),
+        message_thread=MessageThread(messages=[]),
+    ).model_dump()
+    response = client.post("/api/v1/converse/stream", json=con_req)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_converse_stream_endpoint_rejects_tools(client: TestClient):
+    con_req = ConverseRequest(
+        model=AIModel(id="lmstudio-model", provider="LM Studio", type=AIModelType.CHAT),
+        message_thread=MessageThread(
+            messages=[Message(role=MessageRole.USER, content="Hello, AI!")]
+        ),
+        tools=ToolOptions(names=["clock"]),
+    ).model_dump()
+    response = client.post("/api/v1/converse/stream", json=con_req)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_converse_endpoint_circuit_open(
+    client: TestClient, provider_resilience: Resilience
+):
+    breaker = provider_resilience.breaker("LM Studio")
+    for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD):
+        breaker.acquire()
+        breaker.record_failure(ConnectionError("backend down"))
+
+    con_req = ConverseRequest(
+        model=AIModel(id="lmstudio-model", provider="LM Studio", type=AIModelType.CHAT),
+        message_thread=MessageThread(
+            messages=[Message(role=MessageRole.USER, content="Hello, AI!")]
+        ),
+    ).model_dump()
+    response = client.post("/api/v1/converse/", json=con_req)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_converse_batch_endpoint(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "src.providers.lmstudio.async_http_request",
+        AsyncMock(
+            return_value={
+                "choices": [
+                    {
+                        "message": {"role": "assistant", "content": "Batched!"},
+                        "finish_reason": "stop",
+                    }
+                ]
+            }
+        ),
+    )
+    thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hello, AI!")]
+    )
+    jobs = [
+        {
+            "id": "ok",
+            "model": AIModel(
+                id="lmstudio-model", provider="LM Studio", type=AIModelType.CHAT
+            ).model_dump(),
+            "message_thread": thread.model_dump(),
+        },
+        {
+            "id": "embedding",
+            "model": AIModel(
+                id="embed-model", provider="LM Studio", type=AIModelType.EMBEDDING
+            ).model_dump(),
+            "message_thread": thread.model_dump(),
+        },
+    ]
+
+    response = client.post("/api/v1/converse/batch", json={"jobs": jobs})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = {
+        result["id"]: result
+        for result in map(json.loads, response.text.strip().splitlines())
+    }
+    assert results["ok"]["status_code"] == 200
+    assert results["ok"]["message"]["content"] == "Batched!"
+    assert results["embedding"]["status_code"] == 422
+    assert results["embedding"]["message"] is None
+
+
+def test_converse_batch_rejects_empty_batch(client: TestClient):
+    response = client.post("/api/v1/converse/batch", json={"jobs": []})
+    assert response.status_code == 422
+
+
+def test_converse_endpoint_queue_full(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    provider_scheduler: ProviderScheduler,
+):
+    @asynccontextmanager
+    async def overloaded(*args: Any, **kwargs: Any) -> AsyncIterator[None]:
+        raise QueueFullError("LM Studio", 2.5)
+        yield
+
+    monkeypatch.setattr(provider_scheduler, "slot", overloaded)
+    con_req = ConverseRequest(
+        model=AIModel(id="lmstudio-model", provider="LM Studio", type=AIModelType.CHAT),
+        message_thread=MessageThread(
+            messages=[Message(role=MessageRole.USER, content="Hello, AI!")]
+        ),
+    ).model_dump()
+    response = client.post("/api/v1/converse/", json=con_req)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "3"
+
+
+def test_converse_endpoint_rate_limited(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(
+        "src.services.converse_service.aconverse",
+        AsyncMock(side_effect=RateLimitExceededError("OpenAI/gpt-4o", 12.2)),
+    )
+    con_req = ConverseRequest(
+        model=AIModel(id="gpt-4o", provider="OpenAI", type=AIModelType.CHAT),
+        message_thread=MessageThread(
+            messages=[Message(role=MessageRole.USER, content="Hello, AI!")]
+        ),
+    ).model_dump()
+    response = client.post("/api/v1/converse/", json=con_req)
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "13"
@@ -0,0 +1,47 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.models import AlreadyExistsError, Document, DocumentInfo, NotFoundError
+from src.services import retrieval_service
+
+
+@pytest.fixture(autouse=True)
+def fake_documents(monkeypatch: pytest.MonkeyPatch) -> dict[str, Document]:
+    stored: dict[str, Document] = {}
+
+    async def aadd_document(document: Document) -> DocumentInfo:
+        if document.id in stored:
+            raise AlreadyExistsError(f"Document '{document.id}' already exists.")
+        stored[document.id] = document
+        return DocumentInfo(id=document.id, title=document.title, chunks=1)
+
+    async def adelete_document(document_id: str) -> None:
+        if stored.pop(document_id, None) is None:
+            raise NotFoundError(f"Document '{document_id}' not found.")
+
+    monkeypatch.setattr(retrieval_service, "aadd_document", aadd_document)
+    monkeypatch.setattr(retrieval_service, "adelete_document", adelete_document)
+    return stored
+
+
+def test_add_and_delete_document(client: TestClient):
+    response = client.post(
+        "/api/v1/documents/", json={"id": "doc", "title": "Notes", "text": "Hi."}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["chunks"] == 1
+    response = client.post("/api/v1/documents/", json={"id": "doc", "text": "Hi."})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = client.delete("/api/v1/documents/doc")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = client.delete("/api/v1/documents/doc")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_add_document_requires_text(client: TestClient):
+    response = client.post("/api/v1/documents/", json={"text": ""})
+
+    assert response.status_code == 422  # noqa: PLR2004
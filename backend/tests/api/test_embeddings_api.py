@@ -0,0 +1,81 @@
+import base64
+import struct
+from collections.abc import Sequence
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.config import settings
+from src.models import AIModel
+from src.services import embedding_service
+
+MODEL: dict[str, str] = {"id": "embed-small", "provider": "OpenAI", "type": "embedding"}
+
+
+@pytest.fixture(autouse=True)
+def fake_aembed(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def aembed(model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        if model.type != "embedding":
+            raise TypeError(f"Model '{model.id}' is not an embedding model.")
+        return [[float(len(text)), 0.5] for text in texts]
+
+    monkeypatch.setattr(embedding_service, "aembed", aembed)
+
+
+def test_embed_returns_float_vectors(client: TestClient):
+    response = client.post("/api/v1/embed", json={"model": MODEL, "input": "hello"})
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["dimensions"] == 2
+    assert body["encoding"] == "float"
+    assert body["embeddings"] == [[5.0, 0.5]]
+
+
+def test_embed_limits_the_number_of_texts_not_their_length(client: TestClient):
+    text = "a" * (settings.EMBEDDING_MAX_TEXTS + 1)
+
+    response = client.post("/api/v1/embed", json={"model": MODEL, "input": text})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["embeddings"] == [[float(len(text)), 0.5]]
+
+    response = client.post(
+        "/api/v1/embed",
+        json={"model": MODEL, "input": ["a"] * (settings.EMBEDDING_MAX_TEXTS + 1)},
+    )
+    assert response.status_code == 422  # noqa: PLR2004
+
+
+def test_embed_returns_base64_float32_vectors(client: TestClient):
+    response = client.post(
+        "/api/v1/embed",
+        json={"model": MODEL, "input": ["a", "bb"], "encoding": "base64"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    vectors = [base64.b64decode(vector) for vector in response.json()["embeddings"]]
+    assert vectors == [struct.pack("<2f", 1.0, 0.5), struct.pack("<2f", 2.0, 0.5)]
+
+
+def test_embed_returns_a_binary_matrix(client: TestClient):
+    response = client.post(
+        "/api/v1/embed",
+        json={"model": MODEL, "input": ["a", "bb"]},
+        headers={"Accept": "application/octet-stream"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["x-embedding-count"] == "2"
+    assert response.headers["x-embedding-dimensions"] == "2"
+    assert response.content == struct.pack("<4f", 1.0, 0.5, 2.0, 0.5)
+
+
+def test_embed_rejects_chat_models(client: TestClient):
+    response = client.post(
+        "/api/v1/embed",
+        json={"model": {**MODEL, "type": "chat"}, "input": "hello"},
+    )
+
+    assert response.status_code == 422
@@ -8,3 +8,11 @@ def test_health_check(client: TestClient) -> None:
     response: Response = client.get("/api/v1/health")
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == {"status": "healthy"}
+
+
+def test_provider_health(client: TestClient) -> None:
+    """Test the provider health endpoint reports every provider."""
+    response: Response = client.get("/api/v1/health/providers")
+    assert response.status_code == status.HTTP_200_OK
+    names = client.get("/api/v1/providers/").json()
+    assert sorted(item["name"] for item in response.json()) == sorted(names)
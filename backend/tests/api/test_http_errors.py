@@ -0,0 +1,44 @@
+from math import ceil
+
+import pytest
+from fastapi import status
+
+from src.api.http_errors import to_http_exception
+from src.models import AlreadyExistsError, NotFoundError
+from src.services.scheduler import QueueFullError
+from src.utils import CircuitOpenError, RateLimitExceededError
+
+
+@pytest.mark.parametrize(
+    ("error", "status_code"),
+    [
+        (NotFoundError("Thread 'a' not found."), status.HTTP_404_NOT_FOUND),
+        (AlreadyExistsError("Document 'a' exists."), status.HTTP_409_CONFLICT),
+        (ValueError("Thread 'a' not found."), status.HTTP_400_BAD_REQUEST),
+        (TypeError("Unsupported model type."), 422),
+        (RuntimeError("Boom."), status.HTTP_500_INTERNAL_SERVER_ERROR),
+    ],
+)
+def test_errors_map_to_their_status_code(error: Exception, status_code: int):
+    exception = to_http_exception(error, "testing")
+
+    assert exception.status_code == status_code
+    assert exception.detail == str(error)
+    assert exception.headers is None
+
+
+@pytest.mark.parametrize(
+    ("error", "status_code"),
+    [
+        (CircuitOpenError("openai", 2.5), status.HTTP_503_SERVICE_UNAVAILABLE),
+        (QueueFullError("openai", 0.2), status.HTTP_503_SERVICE_UNAVAILABLE),
+        (RateLimitExceededError("openai", 4.0), status.HTTP_429_TOO_MANY_REQUESTS),
+    ],
+)
+def test_retryable_errors_say_when_to_retry(
+    error: CircuitOpenError | QueueFullError | RateLimitExceededError, status_code: int
+):
+    exception = to_http_exception(error, "testing")
+
+    assert exception.status_code == status_code
+    assert exception.headers == {"Retry-After": str(ceil(error.retry_after))}
@@ -0,0 +1,55 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from requests import Response
+
+from src.api.middleware import _route_template
+from src.utils.metrics import http_request_seconds
+
+
+def test_requests_are_timed_by_route_template(client: TestClient) -> None:
+    """Test that requests are labelled by route template, not raw path."""
+    before: int = http_request_seconds.count(
+        method="GET", route="/api/v1/threads/{thread_id}", status="404"
+    )
+
+    client.get("/api/v1/threads/does-not-exist")
+    client.get("/api/v1/no-such-route")
+
+    assert (
+        http_request_seconds.count(
+            method="GET", route="/api/v1/threads/{thread_id}", status="404"
+        )
+        == before + 1
+    )
+    assert http_request_seconds.count(method="GET", route="unmatched", status="404")
+
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    """Test the metrics endpoint serves the Prometheus text format."""
+    client.get("/api/v1/health")
+
+    response: Response = client.get("/api/v1/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE altron_http_request_seconds histogram" in response.text
+    assert 'route="/api/v1/health",status="200"' in response.text
+
+
+def test_route_templates_replace_whole_segments_from_the_end() -> None:
+    """Test that path parameters equal to a prefix segment are templated."""
+    scope = {
+        "route": object(),
+        "path": "/api/v1/providers/v1/models/org/v1",
+        "path_params": {"provider_name": "v1", "model_id": "org/v1"},
+    }
+    assert (
+        _route_template(scope) == "/api/v1/providers/{provider_name}/models/{model_id}"
+    )
+
+    scope = {
+        "route": object(),
+        "path": "/api/v1/threads/a",
+        "path_params": {"thread_id": "a"},
+    }
+    assert _route_template(scope) == "/api/v1/threads/{thread_id}"
@@ -2,7 +2,9 @@ from typing import Any
 
 from fastapi import Response, status
 from fastapi.testclient import TestClient
+from src.config import settings
 from src.models.ai_models import AIModel
+from src.utils.resilience import Resilience
 import pytest
 
 
@@ -53,6 +55,21 @@ def test_provider_models_invalid(client: TestClient):
     )
 
 
+def test_provider_model_circuit_open(
+    client: TestClient, provider_resilience: Resilience
+):
+    """Test that an open circuit answers 503 with a Retry-After header."""
+    breaker = provider_resilience.breaker("LM Studio")
+    for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD):
+        breaker.acquire()
+        breaker.record_failure(ConnectionError("backend down"))
+
+    response: Response = client.get("/api/v1/providers/LM Studio/models/some-model")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert int(response.headers["Retry-After"]) > 0
+
+
 def test_all_models_endpoint(client: TestClient):
     """Test the all models endpoint."""
     # Send request
@@ -80,3 +97,43 @@ def test_wrong_method_provider_models(client: TestClient):
         status.HTTP_405_METHOD_NOT_ALLOWED,
         status.HTTP_400_BAD_REQUEST,
     )
+
+
+def test_model_catalog_endpoint(client: TestClient):
+    """Test the model catalog endpoint reports a status for every provider."""
+    response: Response = client.get("/api/v1/providers/catalog")
+
+    assert response.status_code == status.HTTP_200_OK
+    data: dict[str, Any] = response.json()
+    assert all(AIModel(**model) for model in data["models"])
+    valid_providers = client.get("/api/v1/providers/").json()
+    assert sorted(item["name"] for item in data["providers"]) == sorted(valid_providers)
+    assert all(
+        item["state"] in ("ok", "timed_out", "error") for item in data["providers"]
+    )
+
+
+def test_invalidate_model_cache_endpoint(client: TestClient):
+    """Test the model cache invalidation endpoint."""
+    response: Response = client.delete("/api/v1/providers/models/cache")
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json(), list)
+
+    response = client.delete(
+        "/api/v1/providers/models/cache", params={"provider_name": "NonExistent"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_scheduler_stats_endpoint(client: TestClient, provider_scheduler):
+    """Test the scheduler endpoint reports each lane used so far."""
+    async with provider_scheduler.slot("LM Studio"):
+        pass
+
+    response: Response = client.get("/api/v1/providers/scheduler")
+
+    assert response.status_code == status.HTTP_200_OK
+    [lane] = response.json()
+    assert lane["name"] == "LM Studio"
+    assert lane["admitted"] == 1
+    assert lane["active"] == 0
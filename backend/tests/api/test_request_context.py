@@ -0,0 +1,25 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from requests import Response
+
+
+def test_requests_echo_the_callers_request_id(client: TestClient) -> None:
+    """Test that the caller's X-Request-ID is echoed back."""
+    response: Response = client.get(
+        "/api/v1/health", headers={"X-Request-ID": "req-42"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["x-request-id"] == "req-42"
+
+
+def test_requests_get_a_generated_request_id(client: TestClient) -> None:
+    """Test that requests without an id, or with an oversized one, get a new one."""
+    generated: str = client.get("/api/v1/health").headers["x-request-id"]
+    replaced: str = client.get(
+        "/api/v1/health", headers={"X-Request-ID": "x" * 500}
+    ).headers["x-request-id"]
+
+    assert len(generated) == 32
+    assert len(replaced) == 32
+    assert generated != replaced
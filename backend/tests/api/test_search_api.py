@@ -0,0 +1,41 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.models import SearchHit, UserMessage
+from src.services import conversation_service
+
+
+@pytest.fixture(autouse=True)
+def fake_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def asearch_messages(query: str, k: int = 10) -> list[SearchHit]:
+        if query == "broken":
+            raise ValueError("The search query is empty.")
+        return [
+            SearchHit(
+                thread_id="thread",
+                index=index,
+                score=1.0 - index / 10,
+                message=UserMessage(content=f"{query} {index}"),
+            )
+            for index in range(k)
+        ]
+
+    monkeypatch.setattr(conversation_service, "asearch_messages", asearch_messages)
+
+
+def test_search_returns_hits_with_messages(client: TestClient):
+    response = client.get("/api/v1/search", params={"q": "cats", "k": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    hits = response.json()
+    assert [hit["index"] for hit in hits] == [0, 1]
+    assert hits[0]["message"]["content"] == "cats 0"
+
+
+def test_search_validates_its_parameters(client: TestClient):
+    assert client.get("/api/v1/search").status_code == 422  # noqa: PLR2004
+    response = client.get("/api/v1/search", params={"q": "cats", "k": 0})
+    assert response.status_code == 422  # noqa: PLR2004
+    response = client.get("/api/v1/search", params={"q": "broken"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
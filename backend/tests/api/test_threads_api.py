@@ -0,0 +1,134 @@
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.api import tools_api
+from src.models import ToolDefinition
+from src.services import conversation_service, converse_service
+from src.services.tool_registry import ToolRegistry
+from src.stores import SQLiteConversationStore
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch):
+    store = SQLiteConversationStore(":memory:")
+    monkeypatch.setattr(conversation_service, "conversation_store", store)
+    yield store
+    store.close()
+
+
+def test_thread_lifecycle(client: TestClient, store: SQLiteConversationStore):
+    response = client.post(
+        "/api/v1/threads/",
+        json={"title": "Chat", "messages": [{"role": "user", "content": "Hi"}]},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    thread_id = response.json()["id"]
+
+    response = client.get(f"/api/v1/threads/{thread_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["messages"][0]["content"] == "Hi"
+
+    response = client.delete(f"/api/v1/threads/{thread_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = client.get(f"/api/v1/threads/{thread_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_converse_turn_endpoint(
+    client: TestClient, store: SQLiteConversationStore, monkeypatch: pytest.MonkeyPatch
+):
+    thread_id = client.post("/api/v1/threads/", json={"title": "Chat"}).json()["id"]
+    completion: dict[str, Any] = {
+        "choices": [
+            {
+                "message": {"role": "assistant", "content": "Hello!"},
+                "finish_reason": "stop",
+            }
+        ]
+    }
+    monkeypatch.setattr(
+        "src.providers.lmstudio.async_http_request",
+        AsyncMock(return_value=completion),
+    )
+    turn = {
+        "model": {"id": "lmstudio-model", "provider": "LM Studio", "type": "chat"},
+        "message": {"content": "Hi"},
+    }
+
+    response = client.post(f"/api/v1/converse/{thread_id}", json=turn)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["content"] == "Hello!"
+    messages = client.get(f"/api/v1/threads/{thread_id}").json()["messages"]
+    assert [message["role"] for message in messages] == ["user", "assistant"]
+
+    response = client.post("/api/v1/converse/missing", json=turn)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_converse_turn_endpoint_stores_tool_steps(
+    client: TestClient, store: SQLiteConversationStore, monkeypatch: pytest.MonkeyPatch
+):
+    thread_id = client.post("/api/v1/threads/", json={"title": "Chat"}).json()["id"]
+    tool_call: dict[str, Any] = {
+        "id": "call-1",
+        "type": "function",
+        "function": {"name": "clock", "arguments": "{}"},
+    }
+    completions: list[dict[str, Any]] = [
+        {
+            "choices": [
+                {
+                    "message": {
+                        "role": "assistant",
+                        "content": "",
+                        "tool_calls": [tool_call],
+                    },
+                    "finish_reason": "tool_calls",
+                }
+            ]
+        },
+        {
+            "choices": [
+                {
+                    "message": {"role": "assistant", "content": "It is noon."},
+                    "finish_reason": "stop",
+                }
+            ]
+        },
+    ]
+    monkeypatch.setattr(
+        "src.providers.lmstudio.async_http_request",
+        AsyncMock(side_effect=completions),
+    )
+    registry = ToolRegistry()
+    registry.register(ToolDefinition(name="clock"), lambda arguments: "12:00")
+    monkeypatch.setattr(converse_service, "tool_registry", registry)
+    monkeypatch.setattr(tools_api, "tool_registry", registry)
+    turn = {
+        "model": {"id": "lmstudio-model", "provider": "LM Studio", "type": "chat"},
+        "message": {"content": "What time is it?"},
+        "tools": {"names": ["clock"]},
+    }
+
+    assert [tool["name"] for tool in client.get("/api/v1/tools/").json()] == ["clock"]
+    response = client.post(f"/api/v1/converse/{thread_id}", json=turn)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["content"] == "It is noon."
+    messages = client.get(f"/api/v1/threads/{thread_id}").json()["messages"]
+    assert [message["role"] for message in messages] == [
+        "user",
+        "assistant",
+        "user",
+        "assistant",
+    ]
+    assert messages[2]["tool_response"]["content"] == "12:00"
+
+    turn["tools"] = {"names": ["missing"]}
+    response = client.post(f"/api/v1/converse/{thread_id}", json=turn)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
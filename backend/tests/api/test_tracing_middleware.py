@@ -0,0 +1,53 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from requests import Response
+
+from src.utils import tracer
+from src.utils.tracing import InMemorySpanExporter
+
+TRACEPARENT: str = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def spans(monkeypatch: pytest.MonkeyPatch) -> InMemorySpanExporter:
+    """Enable the tracer, collecting its spans in memory."""
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracer, "_enabled", True)
+    monkeypatch.setattr(tracer, "_exporters", [exporter])
+    return exporter
+
+
+def test_requests_continue_the_callers_trace(
+    client: TestClient, spans: InMemorySpanExporter
+) -> None:
+    """Test that a request span is a child of the caller's traceparent."""
+    response: Response = client.get(
+        "/api/v1/health", headers={"traceparent": TRACEPARENT}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    (span,) = spans.spans
+    assert span.name == "HTTP GET /api/v1/health"
+    assert span.context.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert span.parent_id == "00f067aa0ba902b7"
+    assert span.attributes["http.status_code"] == status.HTTP_200_OK
+    assert response.headers["traceparent"] == span.context.traceparent
+
+
+def test_converse_records_the_parse_stage(
+    client: TestClient, spans: InMemorySpanExporter
+) -> None:
+    """Test that the request parsing stage is recorded under the request span."""
+    client.post(
+        "/api/v1/converse/",
+        json={
+            "model": {"id": "m1", "provider": "Unknown", "type": "chat"},
+            "message_thread": {"messages": [{"role": "user", "content": "Hi"}]},
+        },
+    )
+
+    root = spans.spans[-1]
+    assert root.name == "HTTP POST /api/v1/converse/"
+    parse = next(span for span in spans.spans if span.name == "request.parse")
+    assert parse.parent_id == root.context.span_id
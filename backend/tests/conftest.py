@@ -2,6 +2,11 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
+from src.services.embedding_cache import EmbeddingCache
+from src.services.router import ModelRouter
+from src.services.scheduler import ProviderScheduler
+from src.stores import FlatVectorIndex
+from src.utils.resilience import Resilience, RetryPolicy
 
 
 @pytest.fixture
@@ -10,3 +15,58 @@ def client() -> TestClient:
     Test client fixture for FastAPI application.
     """
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def provider_resilience(monkeypatch: pytest.MonkeyPatch) -> Resilience:
+    """
+    Fresh circuit breakers for every test, with retries that do not sleep.
+    """
+    layer = Resilience(RetryPolicy(max_attempts=2, base_delay=0, max_delay=0))
+    monkeypatch.setattr("src.services.converse_service.provider_resilience", layer)
+    monkeypatch.setattr("src.services.model_cache.provider_resilience", layer)
+    monkeypatch.setattr("src.services.embedding_service.provider_resilience", layer)
+    return layer
+
+
+@pytest.fixture(autouse=True)
+def provider_scheduler(monkeypatch: pytest.MonkeyPatch) -> ProviderScheduler:
+    """
+    A fresh, empty request scheduler for every test.
+    """
+    scheduler = ProviderScheduler()
+    monkeypatch.setattr("src.services.converse_service.provider_scheduler", scheduler)
+    monkeypatch.setattr("src.api.providers_api.provider_scheduler", scheduler)
+    monkeypatch.setattr("src.services.embedding_service.provider_scheduler", scheduler)
+    return scheduler
+
+
+@pytest.fixture(autouse=True)
+def model_router(monkeypatch: pytest.MonkeyPatch) -> ModelRouter:
+    """
+    A model router without aliases or observations for every test.
+    """
+    router = ModelRouter(routes={})
+    monkeypatch.setattr("src.services.converse_service.model_router", router)
+    monkeypatch.setattr("src.api.providers_api.model_router", router)
+    return router
+
+
+@pytest.fixture(autouse=True)
+def embedding_cache(monkeypatch: pytest.MonkeyPatch) -> EmbeddingCache:
+    """
+    An empty, memory-only embedding cache for every test.
+    """
+    cache = EmbeddingCache(path="")
+    monkeypatch.setattr("src.services.embedding_service.embedding_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def vector_index(monkeypatch: pytest.MonkeyPatch) -> FlatVectorIndex:
+    """
+    An empty, memory-only vector index for every test.
+    """
+    index = FlatVectorIndex()
+    monkeypatch.setattr("src.services.search_service.vector_index", index)
+    return index
@@ -1,7 +1,22 @@
-from src.models import AIModel, MessageThread, Message, MessageRole
+import json
+from src.models import (
+    AgentMessage,
+    AIModel,
+    MessageThread,
+    Message,
+    MessageRole,
+    ToolDefinition,
+    ToolRequest,
+    ToolResponse,
+    UserMessage,
+)
 from src.models.ai_models import AIModelType
 from src.providers import LMStudio
+from src.utils.metrics import provider_call_seconds, provider_tokens
+from src.utils import tracer
+from src.utils.tracing import InMemorySpanExporter
 from requests_mock import Mocker
+from unittest.mock import AsyncMock
 import pytest
 
 _lmstudio: LMStudio = LMStudio()
@@ -153,3 +168,265 @@ def test_converse_invalid_message_content():
     )
     with pytest.raises(Exception):
         lmstudio.converse(model, message_thread)
+
+
+async def test_aget_models(monkeypatch: pytest.MonkeyPatch):
+    lmstudio = LMStudio()
+    mock_request = AsyncMock(
+        return_value={"data": [{"id": "lmstudio-chat-model"}, {"id": "embed-v1"}]}
+    )
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", mock_request)
+
+    models = await lmstudio.aget_models(type_filter=AIModelType.CHAT)
+
+    assert [model.id for model in models] == ["lmstudio-chat-model"]
+    assert mock_request.await_args.kwargs["url"] == MOCK_MODELS_ENDPOINT
+
+
+async def test_aget_model_not_found(monkeypatch: pytest.MonkeyPatch):
+    lmstudio = LMStudio()
+    monkeypatch.setattr(
+        "src.providers.lmstudio.async_http_request",
+        AsyncMock(return_value={"data": [{"id": "lmstudio-chat-model"}]}),
+    )
+    assert (
+        await lmstudio.aget_model("lmstudio-chat-model")
+    ).id == "lmstudio-chat-model"
+    with pytest.raises(ValueError):
+        await lmstudio.aget_model("missing-model")
+
+
+async def test_aconverse(monkeypatch: pytest.MonkeyPatch):
+    lmstudio = LMStudio()
+    mock_request = AsyncMock(
+        return_value={
+            "choices": [
+                {
+                    "message": {"role": "assistant", "content": "Hi there!"},
+                    "finish_reason": "stop",
+                }
+            ]
+        }
+    )
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", mock_request)
+    model = AIModel(
+        id="lmstudio-chat-model", provider=lmstudio.name, type=AIModelType.CHAT
+    )
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hello, how are you?")]
+    )
+
+    response = await lmstudio.aconverse(model, message_thread)
+
+    assert response.content == "Hi there!"
+    assert response.role == MessageRole.AGENT
+    payload = mock_request.await_args.kwargs["json"]
+    assert payload["model"] == "lmstudio-chat-model"
+    assert payload["messages"] == [{"role": "user", "content": "Hello, how are you?"}]
+
+
+async def test_aconverse_tool_calls(monkeypatch: pytest.MonkeyPatch):
+    lmstudio = LMStudio()
+    tool_call = {
+        "id": "call-1",
+        "type": "function",
+        "function": {"name": "lookup", "arguments": '{"word": "altron"}'},
+    }
+    mock_request = AsyncMock(
+        return_value={
+            "choices": [
+                {
+                    "message": {
+                        "role": "assistant",
+                        "content": "",
+                        "tool_calls": [tool_call],
+                    },
+                    "finish_reason": "tool_calls",
+                }
+            ]
+        }
+    )
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", mock_request)
+    model = AIModel(
+        id="lmstudio-chat-model", provider=lmstudio.name, type=AIModelType.CHAT
+    )
+    message_thread = MessageThread(
+        messages=[
+            Message(role=MessageRole.USER, content="Define altron."),
+            AgentMessage(
+                content=None,
+                tool_requests=[ToolRequest(id="call-0", name="lookup", arguments={})],
+            ),
+            UserMessage(
+                tool_response=ToolResponse(
+                    id="call-0", name="lookup", content={"error": "No word."}
+                )
+            ),
+        ],
+        tools=[ToolDefinition(name="lookup")],
+    )
+
+    response = await lmstudio.aconverse(model, message_thread)
+
+    assert response.tool_requests == [
+        ToolRequest(id="call-1", name="lookup", arguments={"word": "altron"})
+    ]
+    payload = mock_request.await_args.kwargs["json"]
+    assert payload["tools"][0]["function"]["name"] == "lookup"
+    assert payload["messages"][1]["tool_calls"][0]["function"]["arguments"] == "{}"
+    assert payload["messages"][2] == {
+        "role": "tool",
+        "content": '{"error": "No word."}',
+        "tool_call_id": "call-0",
+    }
+
+
+async def test_aping_does_not_download_the_models(monkeypatch: pytest.MonkeyPatch):
+    lmstudio = LMStudio()
+    probe = AsyncMock()
+    request = AsyncMock()
+    monkeypatch.setattr("src.providers.lmstudio.async_http_probe", probe)
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", request)
+
+    await lmstudio.aping()
+
+    assert probe.await_args.kwargs["url"].endswith("/v1/models")
+    request.assert_not_awaited()
+
+
+async def test_aconverse_empty_thread():
+    lmstudio = LMStudio()
+    model = AIModel(
+        id="lmstudio-chat-model", provider=lmstudio.name, type=AIModelType.CHAT
+    )
+    with pytest.raises(ValueError):
+        await lmstudio.aconverse(model, MessageThread(messages=[]))
+
+
+async def test_converse_stream(monkeypatch: pytest.MonkeyPatch):
+    lmstudio = LMStudio()
+    chunks = [
+        {"choices": [{"delta": {"reasoning_content": "Thinking"}}]},
+        {"choices": [{"delta": {"content": "Hi"}}]},
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": "call-1",
+                                "function": {"name": "lookup", "arguments": '{"q"'},
+                            }
+                        ]
+                    }
+                }
+            ]
+        },
+        {"choices": [{"delta": {}, "finish_reason": "tool_calls"}]},
+    ]
+    requests_made: list[dict] = []
+
+    async def fake_sse_request(**kwargs):
+        requests_made.append(kwargs)
+        for chunk in chunks:
+            yield json.dumps(chunk)
+
+    monkeypatch.setattr("src.providers.lmstudio.async_sse_request", fake_sse_request)
+    model = AIModel(
+        id="lmstudio-chat-model", provider=lmstudio.name, type=AIModelType.CHAT
+    )
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hello")]
+    )
+
+    deltas = [delta async for delta in lmstudio.converse_stream(model, message_thread)]
+
+    assert requests_made[0]["json"]["stream"] is True
+    assert deltas[0].reasoning_content == "Thinking"
+    assert deltas[1].content == "Hi"
+    assert deltas[2].tool_requests[0].id == "call-1"
+    assert deltas[2].tool_requests[0].name == "lookup"
+    assert deltas[2].tool_requests[0].arguments == '{"q"'
+    assert deltas[3].finish_reason == "tool_calls"
+
+
+def test_converse_records_latency_and_usage(requests_mock: Mocker):
+    lmstudio = LMStudio()
+    requests_mock.post(
+        url=MOCK_CONVERSE_ENDPOINT,
+        json={
+            "choices": [
+                {"message": {"content": "Hi!"}, "finish_reason": "stop"},
+            ],
+            "usage": {"prompt_tokens": 12, "completion_tokens": 3},
+        },
+    )
+    model = AIModel(id="usage-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hello")]
+    )
+
+    lmstudio.converse(model, message_thread)
+
+    labels = {"provider": "LM Studio", "model": "usage-model"}
+    assert provider_call_seconds.count(**labels, operation="converse") == 1
+    assert provider_tokens.value(**labels, direction="in") == 12
+    assert provider_tokens.value(**labels, direction="out") == 3
+
+
+def test_converse_traces_each_stage(
+    requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch
+):
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracer, "_enabled", True)
+    monkeypatch.setattr(tracer, "_exporters", [exporter])
+    lmstudio = LMStudio()
+    requests_mock.post(
+        url=MOCK_CONVERSE_ENDPOINT,
+        json={"choices": [{"message": {"content": "Hi!"}, "finish_reason": "stop"}]},
+    )
+    model = AIModel(id="traced-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hello")]
+    )
+
+    with tracer.span("request") as request:
+        lmstudio.converse(model, message_thread)
+
+    assert exporter.names() == [
+        "provider.payload",
+        "provider.call",
+        "provider.parse",
+        "request",
+    ]
+    call = exporter.spans[1]
+    assert call.parent_id == request.context.span_id
+    assert call.attributes == {"provider": "LM Studio", "model": "traced-model"}
+    traceparent = requests_mock.last_request.headers["traceparent"]
+    assert traceparent == call.context.traceparent
+
+
+def test_embed(requests_mock: Mocker):
+    lmstudio = LMStudio()
+    requests_mock.post(
+        url="http://" + lmstudio.base_url + lmstudio.EMBEDDINGS_ENDPOINT,
+        json={
+            "data": [
+                {"index": 1, "embedding": [0.3, 0.4]},
+                {"index": 0, "embedding": [0.1, 0.2]},
+            ],
+            "usage": {"prompt_tokens": 4, "total_tokens": 4},
+        },
+    )
+    model = AIModel(
+        id="lmstudio-embed-model", provider="LM Studio", type=AIModelType.EMBEDDING
+    )
+
+    vectors = lmstudio.embed(model, ["first", "second"])
+
+    assert vectors == [[0.1, 0.2], [0.3, 0.4]]
+    assert requests_mock.last_request.json() == {
+        "model": "lmstudio-embed-model",
+        "input": ["first", "second"],
+    }
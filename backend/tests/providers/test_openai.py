@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 from src.providers import OpenAI
 from src.models.ai_models import AIModelType
 
@@ -86,7 +86,15 @@ def test_get_model_returns_single_model(mock_client_class):
 
 
 # --- Private message dict function tests ---
-from src.models import ToolResponse, UserMessage, AgentMessage, MessageRole, ToolRequest
+from src.models import (
+    ToolResponse,
+    UserMessage,
+    AgentMessage,
+    MessageRole,
+    MessageThread,
+    ToolDefinition,
+    ToolRequest,
+)
 
 
 def test_create_tool_message_dict():
@@ -137,6 +145,25 @@ def test_create_agent_message_dict():
     assert isinstance(result["tool_calls"], list)
     assert result["tool_calls"][0]["id"] == "id1"
     assert result["tool_calls"][1]["function"]["name"] == "func2"
+    assert result["tool_calls"][1]["function"]["arguments"] == '{"x": 1}'
+
+
+def test_tool_options_offers_thread_tools():
+    provider = OpenAI.__new__(OpenAI)
+    tool = ToolDefinition(name="lookup", description="Look a word up.")
+    thread = MessageThread(messages=[], tools=[tool])
+
+    (offered,) = provider._tool_options(thread)
+
+    assert offered == {
+        "type": "function",
+        "function": {
+            "name": "lookup",
+            "description": "Look a word up.",
+            "parameters": {"type": "object", "properties": {}},
+        },
+    }
+    assert not provider._tool_options(MessageThread(messages=[]))
 
 
 def test_converse_returns_agent_message(monkeypatch):
@@ -209,3 +236,178 @@ def test_converse_no_tool_calls(monkeypatch):
     assert result.content == "response content"
     assert result.role == MessageRole.AGENT
     assert result.tool_requests == []
+
+
+async def test_aconverse_returns_agent_message():
+    provider = OpenAI.__new__(OpenAI)
+    provider._async_client = MagicMock()
+    model = MagicMock()
+    model.id = "gpt-4o"
+    from src.models import MessageThread, UserMessage, AgentMessage
+
+    message_thread = MessageThread(
+        messages=[UserMessage(content="Hello", tool_response=None)]
+    )
+
+    mock_response_message = MagicMock()
+    mock_response_message.content = "async response"
+    mock_response_message.tool_calls = None
+    mock_choice = MagicMock()
+    mock_choice.message = mock_response_message
+    mock_completion = MagicMock()
+    mock_completion.choices = [mock_choice]
+    provider._async_client.chat.completions.create = AsyncMock(
+        return_value=mock_completion
+    )
+
+    result = await provider.aconverse(model, message_thread)
+    assert isinstance(result, AgentMessage)
+    assert result.content == "async response"
+    provider._async_client.chat.completions.create.assert_awaited_once()
+
+
+async def test_aget_models_filters_allowed_models():
+    mock_model1 = MagicMock()
+    mock_model1.id = "gpt-4o"
+    mock_model2 = MagicMock()
+    mock_model2.id = "gpt-3.5-turbo"
+    mock_model3 = MagicMock()
+    mock_model3.id = "embed-ada"
+
+    async def list_models():
+        for model in (mock_model1, mock_model2, mock_model3):
+            yield model
+
+    provider = OpenAI.__new__(OpenAI)
+    provider._name = "OpenAI"
+    provider._async_client = MagicMock()
+    provider._async_client.models.list = MagicMock(return_value=list_models())
+
+    models = await provider.aget_models()
+    assert [model.id for model in models] == ["gpt-4o", "embed-ada"]
+
+
+async def test_converse_stream_yields_deltas():
+    provider = OpenAI.__new__(OpenAI)
+    provider._async_client = MagicMock()
+    model = MagicMock()
+    model.id = "gpt-4o"
+    from src.models import MessageThread, UserMessage
+
+    def make_chunk(content, tool_calls=None, finish_reason=None):
+        choice = MagicMock()
+        choice.delta.content = content
+        choice.delta.tool_calls = tool_calls
+        choice.finish_reason = finish_reason
+        chunk = MagicMock()
+        chunk.choices = [choice]
+        return chunk
+
+    tool_call = MagicMock()
+    tool_call.index = 0
+    tool_call.id = "call-1"
+    tool_call.function.name = "lookup"
+    tool_call.function.arguments = "{}"
+    usage_chunk = MagicMock()
+    usage_chunk.choices = []
+
+    async def stream():
+        yield make_chunk("Hel")
+        yield make_chunk("lo", tool_calls=[tool_call])
+        yield make_chunk(None, finish_reason="stop")
+        yield usage_chunk
+
+    provider._async_client.chat.completions.create = AsyncMock(return_value=stream())
+    message_thread = MessageThread(messages=[UserMessage(content="Hello")])
+
+    deltas = [delta async for delta in provider.converse_stream(model, message_thread)]
+
+    assert [delta.content for delta in deltas] == ["Hel", "lo", None]
+    assert deltas[1].tool_requests[0].name == "lookup"
+    assert deltas[-1].finish_reason == "stop"
+    assert (
+        provider._async_client.chat.completions.create.await_args.kwargs["stream"]
+        is True
+    )
+
+
+def test_response_hook_updates_rate_limits(monkeypatch):
+    import httpx
+    from src.providers import openai as openai_provider
+    from src.utils import RateLimiter
+
+    limiter = RateLimiter("OpenAI", 500, 200_000, max_wait=60)
+    monkeypatch.setattr(openai_provider, "rate_limiter", limiter)
+    request = httpx.Request(
+        "POST",
+        "https://api.openai.com/v1/chat/completions",
+        json={"model": "gpt-4o", "messages": []},
+    )
+    response = httpx.Response(
+        429,
+        request=request,
+        headers={
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "0",
+        },
+    )
+
+    openai_provider._record_rate_limits(response)
+
+    assert limiter.reserve("gpt-4o", 10) == pytest.approx(1, abs=0.1)
+    assert limiter.reserve("gpt-4o-mini", 10) == 0
+
+
+async def test_aconverse_rejects_calls_past_the_rate_limit(monkeypatch):
+    from src.providers import openai as openai_provider
+    from src.models import MessageThread, UserMessage
+    from src.utils import RateLimiter, RateLimitExceededError
+
+    limiter = RateLimiter("OpenAI", 1, 200_000, max_wait=1)
+    monkeypatch.setattr(openai_provider, "rate_limiter", limiter)
+    provider = OpenAI.__new__(OpenAI)
+    provider._async_client = MagicMock()
+    provider._async_client.chat.completions.create = AsyncMock()
+    model = MagicMock()
+    model.id = "gpt-4o"
+    limiter.reserve("gpt-4o", 10)  # The minute's only request is spent
+
+    with pytest.raises(RateLimitExceededError):
+        await provider.aconverse(
+            model, MessageThread(messages=[UserMessage(content="Hello")])
+        )
+    provider._async_client.chat.completions.create.assert_not_awaited()
+
+
+async def test_aembed_returns_vectors_in_input_order():
+    from openai.types.create_embedding_response import CreateEmbeddingResponse
+
+    from src.models import AIModel
+
+    provider = OpenAI.__new__(OpenAI)
+    provider._async_client = MagicMock()
+    provider._async_client.embeddings.create = AsyncMock(
+        return_value=CreateEmbeddingResponse.model_validate(
+            {
+                "object": "list",
+                "model": "text-embedding-3-small",
+                "data": [
+                    {"object": "embedding", "index": 1, "embedding": [0.3, 0.4]},
+                    {"object": "embedding", "index": 0, "embedding": [0.1, 0.2]},
+                ],
+                "usage": {"prompt_tokens": 4, "total_tokens": 4},
+            }
+        )
+    )
+    model = AIModel(
+        id="text-embedding-3-small", provider="OpenAI", type=AIModelType.EMBEDDING
+    )
+
+    vectors = await provider.aembed(model, ["first", "second"])
+
+    assert vectors == [[0.1, 0.2], [0.3, 0.4]]
+    provider._async_client.embeddings.create.assert_awaited_once_with(
+        model="text-embedding-3-small",
+        input=["first", "second"],
+        encoding_format="float",
+    )
@@ -0,0 +1,224 @@
+import json
+from collections import OrderedDict
+from typing import Any
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.models import (
+    AIModel,
+    AIModelType,
+    BulkJobState,
+    MessageThread,
+    UserMessage,
+)
+from src.config import settings
+from src.providers import LMStudio, OpenAI
+from src.services import bulk_service, provider_service
+from src.services.provider_registry import ProviderRegistry
+
+MODEL = AIModel(id="gpt-4o-mini", provider="OpenAI", type=AIModelType.CHAT)
+
+
+def completion(content: str) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+class BatchStub:
+    """A local stand-in for OpenAI's files and batches endpoints."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, str] = {}
+        self.polls = 0
+        self.batches_created = 0
+        self.fail_batch_creation = False
+
+    def batch(self, status: str, **extra: Any) -> dict[str, Any]:
+        lines = self.files["file-in"].splitlines()
+        return {
+            "id": "batch_1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-in",
+            "completion_window": "24h",
+            "created_at": 0,
+            "status": status,
+            "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+            **extra,
+        }
+
+    async def create_file(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        upload = form["file"]
+        assert isinstance(upload, web.FileField)
+        self.files["file-in"] = upload.file.read().decode()
+        return web.json_response(
+            {
+                "id": "file-in",
+                "object": "file",
+                "bytes": len(self.files["file-in"]),
+                "created_at": 0,
+                "filename": "batch.jsonl",
+                "purpose": form["purpose"],
+                "status": "processed",
+            }
+        )
+
+    async def create_batch(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        assert body["input_file_id"] == "file-in"
+        self.batches_created += 1
+        if self.fail_batch_creation:
+            return web.json_response(
+                {"error": {"message": "Upstream error", "type": "server_error"}},
+                status=500,
+            )
+        return web.json_response(self.batch("validating"))
+
+    async def get_batch(self, request: web.Request) -> web.Response:
+        if request.match_info["batch_id"] != "batch_1":
+            return web.json_response(
+                {"error": {"message": "No batch found", "type": "invalid_request"}},
+                status=404,
+            )
+        self.polls += 1
+        if self.polls == 1:
+            return web.json_response(self.batch("in_progress"))
+
+        requests = [json.loads(line) for line in self.files["file-in"].splitlines()]
+        succeeded, failed = requests[:-1], requests[-1]
+        self.files["file-out"] = "\n".join(
+            json.dumps(
+                {
+                    "id": f"req-{index}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": completion(request["body"]["messages"][-1]["content"]),
+                    },
+                    "error": None,
+                }
+            )
+            for index, request in enumerate(succeeded)
+        )
+        self.files["file-err"] = json.dumps(
+            {
+                "id": "req-err",
+                "custom_id": failed["custom_id"],
+                "response": None,
+                "error": {"code": "invalid", "message": "Invalid request."},
+            }
+        )
+        return web.json_response(
+            self.batch("completed", output_file_id="file-out", error_file_id="file-err")
+        )
+
+    async def file_content(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.files[request.match_info["file_id"]])
+
+
+@pytest.fixture
+async def batch_stub(monkeypatch: pytest.MonkeyPatch):
+    stub = BatchStub()
+    app = web.Application()
+    app.router.add_post("/v1/files", stub.create_file)
+    app.router.add_post("/v1/batches", stub.create_batch)
+    app.router.add_get("/v1/batches/{batch_id}", stub.get_batch)
+    app.router.add_get("/v1/files/{file_id}/content", stub.file_content)
+    server = TestServer(app)
+    await server.start_server()
+
+    monkeypatch.setenv("OPENAI_BASE_URL", str(server.make_url("/v1")))
+    registry = ProviderRegistry(factories=[OpenAI, LMStudio])
+    monkeypatch.setattr(provider_service, "provider_registry", registry)
+    monkeypatch.setattr(bulk_service, "finished_jobs", OrderedDict())
+    yield stub
+    await registry.aclose()
+    await server.close()
+
+
+def thread(content: str) -> MessageThread:
+    return MessageThread(messages=[UserMessage(content=content)])
+
+
+async def test_bulk_job_round_trip(batch_stub: BatchStub):
+    threads = [thread("one"), thread("two"), thread("three")]
+
+    job = await bulk_service.asubmit_bulk_job(MODEL, threads)
+    assert job.state is BulkJobState.VALIDATING
+    assert job.total == 3
+    submitted = [json.loads(line) for line in batch_stub.files["file-in"].splitlines()]
+    assert [line["custom_id"] for line in submitted] == [t.id for t in threads]
+    assert submitted[0]["body"] == {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": "one"}],
+    }
+
+    running = await bulk_service.aget_bulk_job("OpenAI", job.id)
+    assert running.state is BulkJobState.IN_PROGRESS
+    assert running.results == []
+
+    finished = await bulk_service.aget_bulk_job("OpenAI", job.id)
+    results = {result.thread_id: result for result in finished.results}
+    assert finished.state is BulkJobState.COMPLETED
+    assert results[threads[0].id].message is not None
+    assert results[threads[0].id].message.content == "one"
+    assert results[threads[2].id].error == "Invalid request."
+
+    # Finished jobs are served without polling the provider again
+    assert await bulk_service.aget_bulk_job("OpenAI", job.id) is finished
+    assert batch_stub.polls == 2
+
+
+async def test_bulk_job_keeps_only_recent_finished_jobs(
+    batch_stub: BatchStub, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "BULK_FINISHED_JOBS", 1)
+    job = await bulk_service.asubmit_bulk_job(MODEL, [thread("one"), thread("two")])
+    bulk_service.finished_jobs[("OpenAI", "batch_old")] = job
+
+    await bulk_service.aget_bulk_job("OpenAI", job.id)
+    await bulk_service.aget_bulk_job("OpenAI", job.id)
+
+    assert list(bulk_service.finished_jobs) == [("OpenAI", job.id)]
+
+
+async def test_bulk_job_submission_is_not_retried(batch_stub: BatchStub):
+    batch_stub.fail_batch_creation = True
+
+    with pytest.raises(Exception, match="Upstream error"):
+        await bulk_service.asubmit_bulk_job(MODEL, [thread("one")])
+    assert batch_stub.batches_created == 1
+
+
+async def test_bulk_job_not_found(batch_stub: BatchStub):
+    with pytest.raises(ValueError, match="not found"):
+        await bulk_service.aget_bulk_job("OpenAI", "batch_missing")
+
+
+async def test_bulk_job_validation(batch_stub: BatchStub):
+    duplicate = thread("same")
+    with pytest.raises(ValueError, match="unique"):
+        await bulk_service.asubmit_bulk_job(MODEL, [duplicate, duplicate])
+    with pytest.raises(TypeError):
+        await bulk_service.asubmit_bulk_job(
+            MODEL.model_copy(update={"type": AIModelType.EMBEDDING}), [thread("hi")]
+        )
+    with pytest.raises(ValueError, match="does not support bulk jobs"):
+        await bulk_service.asubmit_bulk_job(
+            AIModel(id="local", provider="LM Studio", type=AIModelType.CHAT),
+            [thread("hi")],
+        )
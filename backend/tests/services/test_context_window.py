@@ -0,0 +1,149 @@
+import pytest
+
+from src.models import (
+    AgentMessage,
+    AIModel,
+    AIModelType,
+    Message,
+    MessageThread,
+    ToolRequest,
+    ToolResponse,
+    UserMessage,
+)
+from src.services.context_window import (
+    MESSAGE_OVERHEAD_TOKENS,
+    REPLY_PRIMING_TOKENS,
+    ContextStrategy,
+    ContextWindow,
+    count_message_tokens,
+)
+
+# Every message below costs 10 tokens: 24 bytes of content plus overhead
+TEN_TOKENS = "x" * 24
+MODEL = AIModel(
+    id="small-model",
+    provider="LM Studio",
+    type=AIModelType.CHAT,
+    context_length=45 + REPLY_PRIMING_TOKENS,
+)
+
+
+def thread_of(count: int) -> MessageThread:
+    return MessageThread(
+        messages=[
+            (UserMessage if index % 2 == 0 else AgentMessage)(
+                content=f"{index:02d}" + TEN_TOKENS[2:]
+            )
+            for index in range(count)
+        ]
+    )
+
+
+def contents(messages: list[Message]) -> list[str]:
+    return [(message.content or "")[:2] for message in messages]
+
+
+def test_count_message_tokens():
+    assert count_message_tokens(UserMessage(content=TEN_TOKENS)) == 10
+    assert count_message_tokens(AgentMessage()) == MESSAGE_OVERHEAD_TOKENS
+
+
+def test_limit_resolution():
+    window = ContextWindow(default_limit=1000, limits={"gpt-4": 8, "gpt-4o": 128})
+
+    assert window.limit(MODEL) == MODEL.context_length
+    assert window.limit(AIModel(id="gpt-4o-mini", provider="OpenAI")) == 128
+    assert window.limit(AIModel(id="gpt-4-0613", provider="OpenAI")) == 8
+    assert window.limit(AIModel(id="unknown", provider="OpenAI")) == 1000
+
+
+def test_thread_that_fits_is_untouched():
+    window = ContextWindow(response_reserve=5)
+    thread = thread_of(4)
+
+    fitted = window.fit(MODEL, thread)
+
+    assert fitted.thread is thread
+    assert fitted.tokens == 40
+    assert fitted.dropped == []
+
+
+def test_sliding_window_drops_oldest_turns():
+    window = ContextWindow(ContextStrategy.SLIDING_WINDOW, response_reserve=5)
+
+    fitted = window.fit(MODEL, thread_of(6))
+
+    assert contents(fitted.thread.messages) == ["02", "03", "04", "05"]
+    assert contents(fitted.dropped) == ["00", "01"]
+    assert fitted.tokens == 40
+
+
+def test_keep_first_pins_opening_turn():
+    window = ContextWindow(ContextStrategy.KEEP_FIRST, response_reserve=5)
+
+    fitted = window.fit(MODEL, thread_of(6))
+
+    assert contents(fitted.thread.messages) == ["00", "03", "04", "05"]
+
+
+def test_tool_responses_stay_with_their_request():
+    window = ContextWindow(response_reserve=5)
+    thread = MessageThread(
+        messages=[
+            UserMessage(content=TEN_TOKENS),
+            AgentMessage(
+                tool_requests=[ToolRequest(id="call-1", name="t", arguments={})]
+            ),
+            UserMessage(
+                tool_response=ToolResponse(id="call-1", name="t", content="x" * 100)
+            ),
+            AgentMessage(content=TEN_TOKENS),
+        ]
+    )
+
+    fitted = window.fit(MODEL, thread)
+
+    # The tool response alone would fit, but not along with its request
+    assert fitted.thread.messages == thread.messages[3:]
+
+
+def test_oversized_latest_message_raises():
+    window = ContextWindow(response_reserve=5)
+    thread = MessageThread(messages=[UserMessage(content="x" * 400)])
+
+    with pytest.raises(ValueError, match="exceeds the context window"):
+        window.fit(MODEL, thread)
+
+
+async def test_summarize_prepends_cached_summary():
+    window = ContextWindow(
+        ContextStrategy.SUMMARIZE, response_reserve=-15, summary_tokens=30
+    )
+    calls: list[list[Message]] = []
+
+    async def summarizer(messages: list[Message]) -> str:
+        calls.append(messages)
+        return "Earlier chat."
+
+    first = await window.afit(MODEL, thread_of(7), summarizer)
+    second = await window.afit(MODEL, thread_of(7), summarizer)
+
+    assert contents(first.messages) == ["Su", "04", "05", "06"]
+    assert first.messages[0].content is not None
+    assert first.messages[0].content.endswith("Earlier chat.")
+    assert contents(calls[0]) == ["00", "01", "02", "03"]
+    assert len(calls) == 1
+    assert second.messages[0].content == first.messages[0].content
+
+
+async def test_failed_summary_falls_back_to_truncation():
+    window = ContextWindow(
+        ContextStrategy.SUMMARIZE, response_reserve=-15, summary_tokens=30
+    )
+
+    async def summarizer(_: list[Message]) -> str:
+        raise RuntimeError("model unavailable")
+
+    thread = await window.afit(MODEL, thread_of(7), summarizer)
+
+    assert contents(thread.messages) == ["04", "05", "06"]
@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.models import (
+    AgentMessage,
+    AIModel,
+    AIModelType,
+    MessageThread,
+    UserMessage,
+)
+from src.services import conversation_service, converse_service
+from src.stores import SQLiteConversationStore
+
+MODEL = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch):
+    store = SQLiteConversationStore(":memory:")
+    monkeypatch.setattr(conversation_service, "conversation_store", store)
+    yield store
+    store.close()
+
+
+async def test_aconverse_turn_loads_history_and_persists_reply(
+    store: SQLiteConversationStore, monkeypatch: pytest.MonkeyPatch
+):
+    thread = store.create(MessageThread(messages=[UserMessage(content="Hi")]))
+    store.append(thread.id, [AgentMessage(content="Hello!")])
+    aconverse = AsyncMock(return_value=AgentMessage(content="Fine, thanks."))
+    monkeypatch.setattr(converse_service, "aconverse", aconverse)
+
+    reply = await conversation_service.aconverse_turn(
+        thread.id, MODEL, UserMessage(content="How are you?")
+    )
+
+    sent: MessageThread = aconverse.call_args.args[1]
+    assert [message.content for message in sent.messages] == [
+        "Hi",
+        "Hello!",
+        "How are you?",
+    ]
+    assert reply.content == "Fine, thanks."
+    stored = store.get(thread.id)
+    assert [message.content for message in stored.messages] == [
+        "Hi",
+        "Hello!",
+        "How are you?",
+        "Fine, thanks.",
+    ]
+
+
+async def test_failed_turn_leaves_thread_untouched(
+    store: SQLiteConversationStore, monkeypatch: pytest.MonkeyPatch
+):
+    thread = store.create(MessageThread(messages=[UserMessage(content="Hi")]))
+    monkeypatch.setattr(
+        converse_service, "aconverse", AsyncMock(side_effect=RuntimeError("down"))
+    )
+
+    with pytest.raises(RuntimeError):
+        await conversation_service.aconverse_turn(
+            thread.id, MODEL, UserMessage(content="Still there?")
+        )
+
+    assert len(store.get(thread.id).messages) == 1
+
+
+async def test_aconverse_turn_unknown_thread(store: SQLiteConversationStore):
+    with pytest.raises(ValueError, match="not found"):
+        await conversation_service.aconverse_turn(
+            "missing", MODEL, UserMessage(content="Hello?")
+        )
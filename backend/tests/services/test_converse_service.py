@@ -1,9 +1,28 @@
+import asyncio
 import pytest
+from unittest.mock import AsyncMock
 from requests_mock import Mocker
 from src.models.ai_models import AIModelType
+from src.config import settings
 from src.services import converse_service
-from src.models import AIModel, MessageThread, Message, MessageRole
+from src.models import (
+    AgentMessage,
+    AIModel,
+    MessageThread,
+    Message,
+    MessageRole,
+    Priority,
+    Provider,
+    RetrievalOptions,
+    ToolDefinition,
+    ToolOptions,
+)
 from src.providers import LMStudio
+from src.services.hedging import HedgePolicy
+from src.services.router import ModelRouter
+from src.services.tool_registry import ToolRegistry
+from src.utils import RateLimiter
+from src.utils.resilience import Resilience, RetryPolicy
 
 
 @pytest.mark.parametrize(
@@ -62,3 +81,421 @@ def test_converse_invalid_message_content():
     )
     with pytest.raises(Exception):
         converse_service.converse(model, message_thread)
+
+
+async def test_aconverse_uses_async_provider(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "src.providers.lmstudio.async_http_request",
+        AsyncMock(
+            return_value={
+                "choices": [
+                    {
+                        "message": {"role": "assistant", "content": "Async hello!"},
+                        "finish_reason": "stop",
+                    }
+                ]
+            }
+        ),
+    )
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hello?")]
+    )
+
+    response_message = await converse_service.aconverse(model, message_thread)
+    assert response_message.role == MessageRole.AGENT
+    assert response_message.content == "Async hello!"
+
+
+async def test_aconverse_rejects_non_chat_model():
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.EMBEDDING)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hello?")]
+    )
+    with pytest.raises(TypeError):
+        await converse_service.aconverse(model, message_thread)
+
+
+async def test_aconverse_coalesces_identical_requests(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    async def slow_completion(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return {
+            "choices": [
+                {
+                    "message": {"role": "assistant", "content": "Shared hello!"},
+                    "finish_reason": "stop",
+                }
+            ]
+        }
+
+    provider_call = AsyncMock(side_effect=slow_completion)
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", provider_call)
+    monkeypatch.setattr(settings, "COALESCE_GENERATIONS", True)
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+
+    def thread() -> MessageThread:
+        return MessageThread(
+            messages=[Message(role=MessageRole.USER, content="Hello?")]
+        )
+
+    replies = await asyncio.gather(
+        *(converse_service.aconverse(model, thread()) for _ in range(5))
+    )
+
+    assert provider_call.await_count == 1
+    assert all(reply.content == "Shared hello!" for reply in replies)
+
+
+async def test_aconverse_batch_bounds_concurrency_and_isolates_errors(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    running = 0
+    peak = 0
+    priorities = set()
+
+    async def fake_aconverse(model, message_thread, cache_mode=None, priority=None):
+        nonlocal running, peak
+        priorities.add(priority)
+        running += 1
+        peak = max(peak, running)
+        content = message_thread.messages[0].content
+        await asyncio.sleep(0.01 * int(content))
+        running -= 1
+        if content == "3":
+            raise ValueError("Message thread must contain at least one message.")
+        return Message(role=MessageRole.AGENT, content=content)
+
+    monkeypatch.setattr(converse_service, "aconverse", fake_aconverse)
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+    jobs = [
+        (
+            model,
+            MessageThread(messages=[Message(role=MessageRole.USER, content=delay)]),
+        )
+        for delay in ("5", "1", "3", "2")
+    ]
+
+    results = [
+        outcome
+        async for outcome in converse_service.aconverse_batch(jobs, concurrency=2)
+    ]
+
+    assert peak == 2
+    assert priorities == {Priority.BATCH}
+    assert sorted(index for index, _ in results) == [0, 1, 2, 3]
+    assert results[0][0] == 1  # Completion order, not submission order
+    outcomes = dict(results)
+    assert isinstance(outcomes[2], ValueError)
+    assert outcomes[0].content == "5"
+
+
+class _RoutedProvider(Provider):
+    def __init__(
+        self, name: str, error: Exception | None = None, delay: float = 0.0
+    ) -> None:
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+        super().__init__(name=name)
+
+    async def aconverse(self, model, message_thread):
+        await asyncio.sleep(self.delay)
+        return self.converse(model, message_thread)
+
+    def get_models(self, limit=None, type_filter=None):
+        raise NotImplementedError
+
+    def get_model(self, model_id):
+        raise NotImplementedError
+
+    def converse(self, model, message_thread):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return AgentMessage(content=f"{self.name}/{model.id}")
+
+
+@pytest.fixture
+def routed_providers(monkeypatch: pytest.MonkeyPatch) -> dict[str, _RoutedProvider]:
+    providers = {
+        "Broken": _RoutedProvider("Broken", ConnectionError("backend unreachable")),
+        "Rejecting": _RoutedProvider("Rejecting", ValueError("Bad request.")),
+        "Healthy": _RoutedProvider("Healthy"),
+        "Slow": _RoutedProvider("Slow", delay=5),
+    }
+    monkeypatch.setattr(converse_service, "get_provider", providers.__getitem__)
+    return providers
+
+
+def _alias_thread() -> MessageThread:
+    return MessageThread(messages=[Message(role=MessageRole.USER, content="Hello?")])
+
+
+async def test_aconverse_fails_over_across_routing_targets(
+    monkeypatch: pytest.MonkeyPatch, routed_providers
+):
+    router = ModelRouter(
+        routes={"chat": {"Broken/m1": 1.0, "Healthy/m2": 1.0}}, strategy="ordered"
+    )
+    monkeypatch.setattr(converse_service, "model_router", router)
+    alias = AIModel(id="chat", provider="router", type=AIModelType.CHAT)
+
+    reply = await converse_service.aconverse(alias, _alias_thread())
+    stream = converse_service.converse_stream(alias, _alias_thread())
+    deltas = [delta async for delta in stream]
+
+    assert reply.content == "Healthy/m2"
+    assert deltas[0].content == "Healthy/m2"
+    assert converse_service.converse(alias, _alias_thread()).content == "Healthy/m2"
+    stats = {item.provider: item for item in router.stats()}
+    assert stats["Broken"].failures == 3
+    assert stats["Healthy"].successes == 3
+
+
+async def test_route_latency_leaves_out_rate_limit_pacing(
+    monkeypatch: pytest.MonkeyPatch, routed_providers
+):
+    limiter = RateLimiter("Healthy", 100, 600, max_wait=5)
+    limiter.reserve("m1", 600)  # Empties the token bucket
+    healthy = routed_providers["Healthy"]
+
+    async def paced_aconverse(model, message_thread):
+        await limiter.aacquire(model.id, 1)  # Paced by 0.1s
+        return healthy.converse(model, message_thread)
+
+    monkeypatch.setattr(healthy, "aconverse", paced_aconverse)
+    router = ModelRouter(routes={"chat": {"Healthy/m1": 1.0}}, strategy="ordered")
+    monkeypatch.setattr(converse_service, "model_router", router)
+    alias = AIModel(id="chat", provider="router", type=AIModelType.CHAT)
+
+    await converse_service.aconverse(alias, _alias_thread())
+
+    (stats,) = router.stats()
+    assert stats.latency_ms is not None and stats.latency_ms < 50
+
+
+async def test_aconverse_does_not_fail_over_request_errors(
+    monkeypatch: pytest.MonkeyPatch, routed_providers
+):
+    router = ModelRouter(
+        routes={"chat": {"Rejecting/m1": 1.0, "Healthy/m2": 1.0}}, strategy="ordered"
+    )
+    monkeypatch.setattr(converse_service, "model_router", router)
+    alias = AIModel(id="chat", provider="router", type=AIModelType.CHAT)
+
+    with pytest.raises(ValueError):
+        await converse_service.aconverse(alias, _alias_thread())
+    assert routed_providers["Healthy"].calls == 0
+
+
+async def test_aconverse_hedges_slow_interactive_calls(
+    monkeypatch: pytest.MonkeyPatch, routed_providers
+):
+    router = ModelRouter(
+        routes={"chat": {"Slow/m1": 1.0, "Healthy/m2": 1.0}}, strategy="ordered"
+    )
+    monkeypatch.setattr(converse_service, "model_router", router)
+    monkeypatch.setattr(
+        converse_service, "hedge_policy", HedgePolicy(default_delay=0.02)
+    )
+    monkeypatch.setattr(settings, "HEDGE_ENABLED", True)
+    alias = AIModel(id="chat", provider="router", type=AIModelType.CHAT)
+
+    reply = await asyncio.wait_for(
+        converse_service.aconverse(alias, _alias_thread()), timeout=1
+    )
+
+    assert reply.content == "Healthy/m2"
+    assert routed_providers["Slow"].calls == 0  # Cancelled before answering
+
+
+async def test_aconverse_hedges_each_target_at_most_once(
+    monkeypatch: pytest.MonkeyPatch, routed_providers
+):
+    router = ModelRouter(routes={"chat": {"Slow/m1": 1.0}}, strategy="ordered")
+    monkeypatch.setattr(converse_service, "model_router", router)
+    policy = HedgePolicy(default_delay=0.01)
+    monkeypatch.setattr(converse_service, "hedge_policy", policy)
+    monkeypatch.setattr(settings, "HEDGE_ENABLED", True)
+    routed_providers["Slow"].delay = 0.05
+    alias = AIModel(id="chat", provider="router", type=AIModelType.CHAT)
+
+    reply = await converse_service.aconverse(alias, _alias_thread())
+
+    assert reply.content == "Slow/m1"
+    assert routed_providers["Slow"].calls == 1  # Not hedged to itself
+
+    router = ModelRouter(
+        routes={"chat": {"Broken/m1": 1.0, "Broken/m2": 1.0}}, strategy="ordered"
+    )
+    monkeypatch.setattr(converse_service, "model_router", router)
+    monkeypatch.setattr(
+        converse_service,
+        "provider_resilience",
+        Resilience(RetryPolicy(max_attempts=1), failure_threshold=10),
+    )
+    routed_providers["Broken"].delay = 0.05
+
+    with pytest.raises(ConnectionError):
+        await converse_service.aconverse(alias, _alias_thread())
+    assert routed_providers["Broken"].calls == 2  # The backup is not retried
+
+
+async def test_aconverse_injects_retrieved_context(monkeypatch: pytest.MonkeyPatch):
+    sent = AsyncMock(
+        return_value={
+            "choices": [
+                {
+                    "message": {"role": "assistant", "content": "Paris."},
+                    "finish_reason": "stop",
+                }
+            ]
+        }
+    )
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", sent)
+
+    async def aaugment(thread: MessageThread, options: RetrievalOptions):
+        context = Message(role=MessageRole.USER, content="France's capital is Paris.")
+        return thread.model_copy(update={"messages": [context, *thread.messages]})
+
+    monkeypatch.setattr(converse_service.retrieval_service, "aaugment", aaugment)
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Capital of France?")]
+    )
+
+    await converse_service.aconverse(
+        model, message_thread, retrieval=RetrievalOptions(top_k=3)
+    )
+
+    prompt = sent.call_args.kwargs["json"]["messages"]
+    assert [message["content"] for message in prompt] == [
+        "France's capital is Paris.",
+        "Capital of France?",
+    ]
+    assert len(message_thread.messages) == 1
+
+
+def _lmstudio_reply(finish_reason: str, content: str = "", **message) -> dict:
+    return {
+        "choices": [
+            {
+                "message": {"role": "assistant", "content": content, **message},
+                "finish_reason": finish_reason,
+            }
+        ]
+    }
+
+
+async def test_aconverse_with_tools_runs_tool_calls(monkeypatch: pytest.MonkeyPatch):
+    tool_call = {
+        "id": "call-1",
+        "type": "function",
+        "function": {"name": "add", "arguments": '{"a": 2, "b": 3}'},
+    }
+    sent = AsyncMock(
+        side_effect=[
+            _lmstudio_reply("tool_calls", tool_calls=[tool_call]),
+            _lmstudio_reply("stop", "5"),
+        ]
+    )
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", sent)
+    registry = ToolRegistry()
+
+    @registry.tool(description="Add two numbers.")
+    def add(arguments):
+        return arguments["a"] + arguments["b"]
+
+    monkeypatch.setattr(converse_service, "tool_registry", registry)
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="2 + 3?")]
+    )
+
+    steps = await converse_service.aconverse_with_tools(
+        model, message_thread, ToolOptions(names=["add"])
+    )
+
+    assert [step.tool_requests[0].name for step in steps[:1]] == ["add"]
+    assert steps[1].tool_response.content == 5
+    assert steps[-1].content == "5"
+    first, second = (call.kwargs["json"] for call in sent.call_args_list)
+    assert first["tools"][0]["function"]["name"] == "add"
+    assert second["messages"][-1] == {
+        "role": "tool",
+        "content": "5",
+        "tool_call_id": "call-1",
+    }
+    assert len(message_thread.messages) == 1
+
+
+async def test_aconverse_with_tools_stops_at_step_limit(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    tool_call = {
+        "id": "call-1",
+        "type": "function",
+        "function": {"name": "loop", "arguments": "{}"},
+    }
+    sent = AsyncMock(return_value=_lmstudio_reply("tool_calls", tool_calls=[tool_call]))
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", sent)
+    registry = ToolRegistry()
+    registry.register(ToolDefinition(name="loop"), lambda arguments: "again")
+    monkeypatch.setattr(converse_service, "tool_registry", registry)
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Loop.")]
+    )
+
+    steps = await converse_service.aconverse_with_tools(
+        model, message_thread, ToolOptions(names=["loop"], max_steps=2)
+    )
+
+    assert sent.await_count == 2
+    assert len(steps) == 4  # Call, result, call answered by an error, error
+    assert steps[1].tool_response.content == "again"
+    assert steps[2].tool_requests
+    assert steps[3].tool_response.content == {
+        "error": "The tool step limit was reached."
+    }
+    assert converse_service.last_reply(steps) is steps[2]
+
+
+async def test_aconverse_with_tools_caps_requested_steps(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    tool_call = {
+        "id": "call-1",
+        "type": "function",
+        "function": {"name": "loop", "arguments": "{}"},
+    }
+    sent = AsyncMock(return_value=_lmstudio_reply("tool_calls", tool_calls=[tool_call]))
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", sent)
+    monkeypatch.setattr(settings, "TOOL_MAX_STEPS", 3)
+    registry = ToolRegistry()
+    registry.register(ToolDefinition(name="loop"), lambda arguments: "again")
+    monkeypatch.setattr(converse_service, "tool_registry", registry)
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Loop.")]
+    )
+
+    await converse_service.aconverse_with_tools(
+        model, message_thread, ToolOptions(names=["loop"], max_steps=1000)
+    )
+
+    assert sent.await_count == 3
+
+
+async def test_aconverse_with_tools_rejects_unknown_tools():
+    model = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+    message_thread = MessageThread(
+        messages=[Message(role=MessageRole.USER, content="Hi")]
+    )
+
+    with pytest.raises(ValueError, match="not found"):
+        await converse_service.aconverse_with_tools(
+            model, message_thread, ToolOptions(names=["missing"])
+        )
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from src.models import AIModel, AIModelType
+from src.services.embedding_cache import EmbeddingCache, embedding_cache_key
+
+MODEL = AIModel(id="embed-small", provider="OpenAI", type=AIModelType.EMBEDDING)
+
+
+def test_keys_depend_on_the_model_and_text_only():
+    other_model = AIModel(id="embed-large", provider="OpenAI")
+
+    assert embedding_cache_key(MODEL, "hello") == embedding_cache_key(
+        MODEL.model_copy(update={"alias": "small"}), "hello"
+    )
+    assert embedding_cache_key(MODEL, "hello") != embedding_cache_key(MODEL, "hello!")
+    assert embedding_cache_key(MODEL, "hello") != embedding_cache_key(
+        other_model, "hello"
+    )
+
+
+def test_vectors_round_trip_as_float32():
+    cache = EmbeddingCache(path="")
+    cache.put_many({"a": [0.5, 1.0], "b": [0.1, 0.2]})
+
+    found = cache.get_many(["a", "b", "missing"])
+
+    assert found["a"] == [0.5, 1.0]
+    assert found["b"] == [
+        0.10000000149011612,
+        0.20000000298023224,
+    ]  # Stored as float32
+    assert "missing" not in found
+
+
+def test_evicted_vectors_are_read_back_from_disk(tmp_path: Path):
+    path = str(tmp_path / "embeddings.db")
+    cache = EmbeddingCache(max_entries=1, path=path)
+    cache.put_many({"a": [1.0], "b": [2.0]})  # "a" is evicted from memory
+
+    assert cache.get_many(["a", "b"]) == {"a": [1.0], "b": [2.0]}
+    cache.close()
+
+    reopened = EmbeddingCache(path=path)  # Vectors survive restarts
+    assert reopened.get_many(["a"]) == {"a": [1.0]}
+    reopened.clear()
+    assert reopened.get_many(["a"]) == {}
+    reopened.close()
+
+
+async def test_async_lookups_serve_memory_hits():
+    cache = EmbeddingCache(path="")
+    await cache.aput_many({"a": [1.0]})
+
+    assert await cache.aget_many(["a"]) == {"a": [1.0]}
+    assert await cache.aget_many(["a", "b"]) == {"a": [1.0]}
@@ -0,0 +1,93 @@
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from src.models import AIModel, AIModelType, NotFoundError, Provider
+from src.services import embedding_service
+
+MODEL = AIModel(id="embed-small", provider="Embedder", type=AIModelType.EMBEDDING)
+
+
+class _EmbeddingProvider(Provider):
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        super().__init__(name="Embedder")
+
+    async def aembed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        await asyncio.sleep(0.01)
+        return self.embed(model, texts)
+
+    def embed(self, model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def get_models(self, limit=None, type_filter=None):
+        raise NotImplementedError
+
+    def get_model(self, model_id):
+        raise NotImplementedError
+
+    def converse(self, model, message_thread):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch) -> _EmbeddingProvider:
+    provider = _EmbeddingProvider()
+
+    def get_provider(provider_name: str) -> Provider:
+        if provider_name != provider.name:
+            raise NotFoundError(f"Provider '{provider_name}' not found.")
+        return provider
+
+    monkeypatch.setattr(embedding_service, "get_provider", get_provider)
+    return provider
+
+
+async def test_concurrent_single_texts_share_one_upstream_call(
+    provider: _EmbeddingProvider,
+):
+    texts = ["a", "bb", "ccc", "dddd"]
+    results = await asyncio.gather(
+        *(embedding_service.aembed(MODEL, [text]) for text in texts)
+    )
+
+    assert results == [[[1.0, 1.0]], [[2.0, 1.0]], [[3.0, 1.0]], [[4.0, 1.0]]]
+    assert provider.batches == [texts]
+
+
+async def test_unchanged_texts_are_served_from_the_cache(
+    provider: _EmbeddingProvider,
+):
+    first = await embedding_service.aembed(MODEL, ["doc one", "doc two"])
+    second = await embedding_service.aembed(MODEL, ["doc two", "doc 3", "doc two"])
+
+    assert second == [first[1], [5.0, 1.0], first[1]]
+    assert provider.batches == [["doc one", "doc two"], ["doc 3"]]
+
+
+async def test_aembed_validates_the_request(provider: _EmbeddingProvider):
+    with pytest.raises(TypeError, match="not an embedding model"):
+        await embedding_service.aembed(
+            MODEL.model_copy(update={"type": AIModelType.CHAT}), ["hi"]
+        )
+    with pytest.raises(ValueError, match="At least one text"):
+        await embedding_service.aembed(MODEL, [])
+    with pytest.raises(ValueError, match="not found"):
+        await embedding_service.aembed(
+            MODEL.model_copy(update={"provider": "Unknown"}), ["hi"]
+        )
+    assert provider.batches == []
+
+
+async def test_providers_without_embeddings_are_rejected(
+    provider: _EmbeddingProvider, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(
+        _EmbeddingProvider, "aembed", Provider.aembed
+    )  # Falls back to the base class, which does not embed
+    monkeypatch.setattr(_EmbeddingProvider, "embed", Provider.embed)
+
+    with pytest.raises(ValueError, match="does not support embeddings"):
+        await embedding_service.aembed(MODEL, ["hi"])
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.models import AIModel, HealthState, Provider
+from src.services.health_monitor import HealthMonitor
+
+
+class _ProbedProvider(Provider):
+    def __init__(self, name: str, delay: float = 0.0, up: bool = True) -> None:
+        self.delay = delay
+        self.up = up
+        self.probes = 0
+        super().__init__(name=name)
+
+    async def aping(self) -> None:
+        self.probes += 1
+        await asyncio.sleep(self.delay)
+        if not self.up:
+            raise ConnectionError("backend unreachable")
+
+    def get_models(self, limit=None, type_filter=None) -> list[AIModel]:
+        raise NotImplementedError
+
+    def get_model(self, model_id: str) -> AIModel:
+        raise NotImplementedError
+
+    def converse(self, model, message_thread):
+        raise NotImplementedError
+
+
+def _monitor(*providers: Provider, **kwargs) -> HealthMonitor:
+    return HealthMonitor(
+        providers=lambda: {provider.name: provider for provider in providers},
+        **kwargs,
+    )
+
+
+async def test_provider_goes_down_after_consecutive_failures():
+    provider = _ProbedProvider("Flaky", up=False)
+    monitor = _monitor(provider, failure_threshold=2)
+
+    [health] = await monitor.aprobe_all()
+    assert health.state is HealthState.UNKNOWN
+    assert not monitor.is_down("Flaky")
+
+    [health] = await monitor.aprobe_all()
+    assert health.state is HealthState.DOWN
+    assert health.consecutive_failures == 2
+    assert health.error == "backend unreachable"
+    assert monitor.is_down("Flaky")
+
+    provider.up = True
+    [health] = await monitor.aprobe_all()
+    assert health.state is HealthState.UP
+    assert health.error is None
+    assert not monitor.is_down("Flaky")
+
+
+async def test_slow_probes_time_out():
+    provider = _ProbedProvider("Hung", delay=5)
+    monitor = _monitor(provider, timeout=0.05)
+
+    health = await monitor.aprobe(provider)
+
+    assert health.consecutive_failures == 1
+    assert health.error == "TimeoutError"
+
+
+async def test_report_tracks_latency_percentiles():
+    provider = _ProbedProvider("Fast", delay=0.01)
+    monitor = _monitor(provider, _ProbedProvider("Idle"), window=3)
+
+    for _ in range(5):
+        await monitor.aprobe(provider)
+    report = {health.name: health for health in monitor.report()}
+
+    assert report["Fast"].state is HealthState.UP
+    assert report["Fast"].samples == 3  # Bounded by the window
+    assert 10 <= report["Fast"].latency_p50_ms <= report["Fast"].latency_p99_ms
+    assert report["Idle"].state is HealthState.UNKNOWN
+    assert report["Idle"].latency_p50_ms is None
+
+
+async def test_background_probes_run_until_stopped():
+    provider = _ProbedProvider("Fast")
+    monitor = _monitor(provider, interval=0.01)
+
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.astop()
+    probes = provider.probes
+    await asyncio.sleep(0.03)
+
+    assert probes >= 2
+    assert provider.probes == probes
+
+
+def test_unprobed_providers_are_not_down():
+    assert not _monitor().is_down("Anything")
+
+
+@pytest.mark.parametrize("up", [True, False])
+async def test_default_ping_lists_models(up: bool):
+    class _ListingProvider(_ProbedProvider):
+        def get_models(self, limit=None, type_filter=None) -> list[AIModel]:
+            if not self.up:
+                raise ConnectionError("backend unreachable")
+            return [AIModel(id="model", provider=self.name)]
+
+    provider = _ListingProvider("Listing", up=up)
+    assert provider.connected is up
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from src.services.hedging import HedgePolicy
+from src.utils import RateLimiter
+
+
+def _call(result: str, delay: float, calls: list[str], error: bool = False):
+    async def call() -> str:
+        calls.append(result)
+        await asyncio.sleep(delay)
+        if error:
+            raise ConnectionError(f"{result} failed")
+        return result
+
+    return call
+
+
+async def test_fast_calls_are_not_hedged():
+    policy = HedgePolicy(default_delay=0.1, min_samples=100)
+    calls: list[str] = []
+
+    result = await policy.arun(
+        "OpenAI/gpt-4o", _call("primary", 0, calls), _call("hedge", 0, calls)
+    )
+
+    assert result == "primary"
+    assert calls == ["primary"]
+
+
+async def test_slow_calls_are_hedged_and_the_loser_cancelled():
+    policy = HedgePolicy(default_delay=0.02, min_samples=100)
+    calls: list[str] = []
+    primary_cancelled = asyncio.Event()
+
+    async def slow_primary() -> str:
+        calls.append("primary")
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+        return "primary"
+
+    result = await policy.arun(
+        "OpenAI/gpt-4o", slow_primary, _call("hedge", 0.01, calls)
+    )
+
+    assert result == "hedge"
+    assert calls == ["primary", "hedge"]
+    assert primary_cancelled.is_set()
+
+
+async def test_hedge_wins_count_as_a_lower_bound_of_primary_latency():
+    policy = HedgePolicy(default_delay=0.01, min_samples=1)
+    calls: list[str] = []
+
+    await policy.arun(
+        "OpenAI/gpt-4o", _call("primary", 5, calls), _call("hedge", 0.02, calls)
+    )
+
+    # The primary's elapsed time when the hedge won, not its 5s nor the hedge's
+    assert 0.03 <= policy.delay("OpenAI/gpt-4o") < 1
+
+
+async def test_delay_does_not_shrink_when_hedges_keep_winning():
+    policy = HedgePolicy(
+        percentile=0.9, default_delay=0.03, min_samples=4, budget_ratio=1
+    )
+    calls: list[str] = []
+
+    for primary_delay in (0.005, 5) * 4:
+        await policy.arun(
+            "OpenAI/gpt-4o",
+            _call("primary", primary_delay, calls),
+            _call("hedge", 0.005, calls),
+        )
+
+    assert policy.delay("OpenAI/gpt-4o") >= 0.03
+
+
+async def test_a_failed_hedge_falls_back_to_the_primary():
+    policy = HedgePolicy(default_delay=0.01, min_samples=100)
+    calls: list[str] = []
+
+    result = await policy.arun(
+        "OpenAI/gpt-4o",
+        _call("primary", 0.05, calls),
+        _call("hedge", 0, calls, error=True),
+    )
+
+    assert result == "primary"
+
+
+async def test_the_primary_error_is_raised_when_every_call_fails():
+    policy = HedgePolicy(default_delay=0.01, min_samples=100)
+    calls: list[str] = []
+
+    with pytest.raises(ConnectionError, match="primary failed"):
+        await policy.arun(
+            "OpenAI/gpt-4o",
+            _call("primary", 0.03, calls, error=True),
+            _call("hedge", 0, calls, error=True),
+        )
+
+
+async def test_hedges_are_bounded_by_the_budget():
+    policy = HedgePolicy(default_delay=0, min_samples=100, budget_ratio=0)
+    calls: list[str] = []
+
+    for _ in range(5):
+        await policy.arun(
+            "OpenAI/gpt-4o",
+            _call("primary", 0.01, calls),
+            _call("hedge", 0.05, calls),
+        )
+
+    assert calls.count("hedge") == 3  # The budget's initial tokens
+
+
+async def test_delay_follows_the_latency_percentile():
+    policy = HedgePolicy(percentile=0.5, default_delay=9, min_samples=3)
+    calls: list[str] = []
+
+    assert policy.delay("OpenAI/gpt-4o") == 9
+    for delay in (0.01, 0.02, 0.04):
+        await policy.arun(
+            "OpenAI/gpt-4o", _call("primary", delay, calls), _call("hedge", 0, calls)
+        )
+
+    assert 0.02 <= policy.delay("OpenAI/gpt-4o") < 0.04
+    assert policy.delay("LM Studio/qwen") == 9  # Latencies are per key
+
+
+async def test_pacing_is_not_part_of_the_observed_latency():
+    policy = HedgePolicy(default_delay=1, min_samples=1)
+    limiter = RateLimiter("OpenAI", 100, 600, max_wait=5)
+    limiter.reserve("gpt-4o", 600)  # Empties the token bucket
+    calls: list[str] = []
+
+    async def paced_primary() -> str:
+        await limiter.aacquire("gpt-4o", 1)  # Paced by 0.1s
+        return await _call("primary", 0.01, calls)()
+
+    await policy.arun("OpenAI/gpt-4o", paced_primary, _call("hedge", 0, calls))
+
+    assert policy.delay("OpenAI/gpt-4o") < 0.05
+    assert calls == ["primary"]
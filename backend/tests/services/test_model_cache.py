@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from src.models import AgentMessage, AIModel, AIModelType, MessageThread, Provider
+from src.services import provider_service
+from src.services.model_cache import ModelCatalogCache
+from src.services.provider_registry import ProviderRegistry
+
+
+class CountingProvider(Provider):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.fail = False
+        super().__init__(name="Counting")
+
+    def get_models(
+        self, limit: int | None = None, type_filter: AIModelType | None = None
+    ) -> list[AIModel]:
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("backend unreachable")
+        return [
+            AIModel(id=f"chat-{self.calls}", provider=self.name, type=AIModelType.CHAT),
+            AIModel(id="embed", provider=self.name, type=AIModelType.EMBEDDING),
+        ]
+
+    async def aget_models(
+        self, limit: int | None = None, type_filter: AIModelType | None = None
+    ) -> list[AIModel]:
+        return self.get_models(limit, type_filter)
+
+    def get_model(self, model_id: str) -> AIModel:
+        raise NotImplementedError
+
+    def converse(self, model: AIModel, message_thread: MessageThread) -> AgentMessage:
+        raise NotImplementedError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_fresh_catalog_is_served_from_cache():
+    provider = CountingProvider()
+    cache = ModelCatalogCache(ttl=60, stale_ttl=60, clock=FakeClock())
+
+    first = await cache.aget_entry(provider)
+    second = await cache.aget_entry(provider)
+
+    assert provider.calls == 1
+    assert first is second
+    assert first.index["embed"].type == AIModelType.EMBEDDING
+
+
+async def test_stale_catalog_is_served_while_revalidating():
+    provider = CountingProvider()
+    clock = FakeClock()
+    cache = ModelCatalogCache(ttl=60, stale_ttl=60, clock=clock)
+    await cache.aget_entry(provider)
+
+    clock.now = 90  # Past the TTL, within the stale window
+    stale = await cache.aget_entry(provider)
+    assert "chat-1" in stale.index
+
+    await asyncio.sleep(0)  # Let the background refresh run
+    await asyncio.sleep(0)
+    refreshed = await cache.aget_entry(provider)
+    assert provider.calls == 2
+    assert "chat-2" in refreshed.index
+
+
+async def test_expired_catalog_is_fetched_inline():
+    provider = CountingProvider()
+    clock = FakeClock()
+    cache = ModelCatalogCache(ttl=60, stale_ttl=60, clock=clock)
+    await cache.aget_entry(provider)
+
+    clock.now = 500
+    entry = await cache.aget_entry(provider)
+    assert provider.calls == 2
+    assert "chat-2" in entry.index
+
+
+async def test_failed_refresh_keeps_stale_catalog():
+    provider = CountingProvider()
+    clock = FakeClock()
+    cache = ModelCatalogCache(ttl=60, stale_ttl=60, clock=clock)
+    await cache.aget_entry(provider)
+
+    provider.fail = True
+    clock.now = 90
+    await cache.aget_entry(provider)
+    await asyncio.sleep(0)
+    entry = await cache.aget_entry(provider)
+    assert "chat-1" in entry.index
+
+
+def test_sync_lookup_and_invalidate():
+    provider = CountingProvider()
+    cache = ModelCatalogCache(ttl=60, stale_ttl=60, clock=FakeClock())
+
+    cache.get_entry(provider)
+    cache.get_entry(provider)
+    assert provider.calls == 1
+
+    assert cache.invalidate("Counting") == ("Counting",)
+    assert cache.invalidate("Counting") == ()
+    cache.get_entry(provider)
+    assert provider.calls == 2
+
+
+@pytest.fixture
+def counting_provider(monkeypatch: pytest.MonkeyPatch) -> CountingProvider:
+    provider = CountingProvider()
+    monkeypatch.setattr(
+        provider_service, "provider_registry", ProviderRegistry([lambda: provider])
+    )
+    monkeypatch.setattr(
+        provider_service,
+        "model_catalog_cache",
+        ModelCatalogCache(ttl=60, stale_ttl=60, clock=FakeClock()),
+    )
+    return provider
+
+
+async def test_service_get_model_uses_index(counting_provider: CountingProvider):
+    model = await provider_service.aget_model("Counting", "embed")
+    assert model.type == AIModelType.EMBEDDING
+
+    with pytest.raises(ValueError):
+        await provider_service.aget_model("Counting", "missing")
+
+    chat = await provider_service.aget_provider_models(
+        "Counting", type_filter=AIModelType.CHAT
+    )
+    assert [m.id for m in chat] == ["chat-1"]
+    assert counting_provider.calls == 1
+
+
+def test_service_invalidate_unknown_provider(counting_provider: CountingProvider):
+    with pytest.raises(ValueError):
+        provider_service.invalidate_model_cache("NonExistent")
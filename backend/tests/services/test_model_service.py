@@ -1,5 +1,12 @@
+import asyncio
+import time
+
+from src.models import Provider, ProviderState
 from src.models.ai_models import AIModel
 from src.services import provider_service
+from src.services.health_monitor import HealthMonitor
+from src.services.model_cache import ModelCatalogCache
+from src.services.provider_registry import ProviderRegistry
 import pytest
 
 
@@ -43,3 +50,118 @@ def test_get_available_models_empty(monkeypatch):
 
     # Assertions
     assert models == []
+
+
+class _CatalogProvider(Provider):
+    def __init__(self, name: str, delay: float = 0.0, error: bool = False) -> None:
+        self.delay = delay
+        self.error = error
+        super().__init__(name=name)
+
+    def get_models(self, limit=None, type_filter=None) -> list[AIModel]:
+        raise NotImplementedError
+
+    async def aping(self) -> None:
+        if self.error:
+            raise ConnectionError("backend unreachable")
+
+    async def aget_models(self, limit=None, type_filter=None) -> list[AIModel]:
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise ConnectionError("backend unreachable")
+        return [AIModel(id=f"{self.name}-model", provider=self.name)]
+
+    def get_model(self, model_id: str) -> AIModel:
+        raise NotImplementedError
+
+    def converse(self, model, message_thread):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def catalog_registry(monkeypatch: pytest.MonkeyPatch) -> ProviderRegistry:
+    registry = ProviderRegistry(
+        factories=[
+            lambda: _CatalogProvider("Fast"),
+            lambda: _CatalogProvider("Hung", delay=5),
+            lambda: _CatalogProvider("Broken", error=True),
+        ]
+    )
+    monkeypatch.setattr(provider_service, "provider_registry", registry)
+    monkeypatch.setattr(provider_service, "model_catalog_cache", ModelCatalogCache())
+    return registry
+
+
+async def test_aget_model_catalog_partial_results(catalog_registry):
+    """One hung and one broken provider must not stall or fail the listing."""
+    start = time.perf_counter()
+    catalog = await provider_service.aget_model_catalog(timeout=0.2)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1
+    assert [model.id for model in catalog.models] == ["Fast-model"]
+    states = {status.name: status.state for status in catalog.providers}
+    assert states == {
+        "Fast": ProviderState.OK,
+        "Hung": ProviderState.TIMED_OUT,
+        "Broken": ProviderState.ERROR,
+    }
+
+
+async def test_aget_model_catalog_runs_concurrently(monkeypatch: pytest.MonkeyPatch):
+    registry = ProviderRegistry(
+        factories=[
+            lambda: _CatalogProvider("A", delay=0.3),
+            lambda: _CatalogProvider("B", delay=0.3),
+            lambda: _CatalogProvider("C", delay=0.3),
+        ]
+    )
+    monkeypatch.setattr(provider_service, "provider_registry", registry)
+    monkeypatch.setattr(provider_service, "model_catalog_cache", ModelCatalogCache())
+
+    start = time.perf_counter()
+    models = await provider_service.aget_available_models()
+    elapsed = time.perf_counter() - start
+
+    assert [model.id for model in models] == ["A-model", "B-model", "C-model"]
+    assert elapsed < 0.8
+
+
+async def test_concurrent_model_listings_share_one_fetch(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    provider = _CatalogProvider("Shared", delay=0.05)
+    fetches = 0
+    original = provider.aget_models
+
+    async def counting_aget_models(limit=None, type_filter=None):
+        nonlocal fetches
+        fetches += 1
+        return await original(limit, type_filter)
+
+    monkeypatch.setattr(provider, "aget_models", counting_aget_models)
+    registry = ProviderRegistry(factories=[lambda: provider])
+    monkeypatch.setattr(provider_service, "provider_registry", registry)
+    monkeypatch.setattr(provider_service, "model_catalog_cache", ModelCatalogCache())
+
+    results = await asyncio.gather(
+        *(provider_service.aget_provider_models("Shared") for _ in range(20))
+    )
+
+    assert fetches == 1
+    assert all(models == results[0] for models in results)
+
+
+async def test_aget_model_catalog_skips_down_providers(
+    catalog_registry, monkeypatch: pytest.MonkeyPatch
+):
+    """Providers the health monitor reports down are not queried."""
+    monitor = HealthMonitor(providers=catalog_registry.providers, failure_threshold=1)
+    await monitor.aprobe(catalog_registry.get("Broken"))
+    monkeypatch.setattr(provider_service, "health_monitor", monitor)
+
+    catalog = await provider_service.aget_model_catalog(timeout=0.2)
+
+    states = {status.name: status.state for status in catalog.providers}
+    assert states["Broken"] == ProviderState.DOWN
+    assert states["Fast"] == ProviderState.OK
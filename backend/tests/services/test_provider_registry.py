@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from src.models import AgentMessage, AIModel, AIModelType, MessageThread, Provider
+from src.services.provider_registry import ProviderRegistry
+
+
+class FakeProvider(Provider):
+    instances: int = 0
+
+    def __init__(self, name: str = "Fake") -> None:
+        FakeProvider.instances += 1
+        self.closed = False
+        super().__init__(name=name)
+
+    def close(self) -> None:
+        self.closed = True
+
+    def get_models(
+        self, limit: int | None = None, type_filter: AIModelType | None = None
+    ) -> list[AIModel]:
+        return [AIModel(id="fake-model", provider=self.name, type=AIModelType.CHAT)]
+
+    def get_model(self, model_id: str) -> AIModel:
+        return self.get_models()[0]
+
+    def converse(self, model: AIModel, message_thread: MessageThread) -> AgentMessage:
+        return AgentMessage(content="fake")
+
+
+@pytest.fixture(autouse=True)
+def reset_instances() -> None:
+    FakeProvider.instances = 0
+
+
+def test_registry_builds_providers_once():
+    registry = ProviderRegistry(factories=[FakeProvider])
+    assert not registry.loaded
+
+    first = registry.get("Fake")
+    second = registry.get("Fake")
+
+    assert registry.loaded
+    assert first is second
+    assert FakeProvider.instances == 1
+    assert registry.names() == ("Fake",)
+
+
+def test_registry_get_unknown_provider():
+    registry = ProviderRegistry(factories=[FakeProvider])
+    with pytest.raises(ValueError):
+        registry.get("NonExistent")
+
+
+def test_registry_skips_failing_factory():
+    def broken() -> Provider:
+        raise ValueError("Environment variable 'MISSING' not found.")
+
+    registry = ProviderRegistry(factories=[broken, FakeProvider])
+    assert registry.names() == ("Fake",)
+
+
+def test_registry_reload_replaces_and_later_closes_providers():
+    registry = ProviderRegistry(factories=[FakeProvider])
+    old = registry.get("Fake")
+
+    names = registry.reload()
+    new = registry.get("Fake")
+
+    assert names == ("Fake",)
+    assert new is not old
+    assert isinstance(old, FakeProvider) and not old.closed  # Retired, not closed
+    assert isinstance(new, FakeProvider) and not new.closed
+
+    registry.reload()
+
+    assert old.closed
+    assert not new.closed
+
+
+async def test_registry_reload_lets_in_flight_calls_finish(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    registry = ProviderRegistry(factories=[FakeProvider])
+    provider = registry.get("Fake")
+    answering = asyncio.Event()
+
+    async def aconverse(model: AIModel, message_thread: MessageThread) -> AgentMessage:
+        await answering.wait()
+        assert isinstance(provider, FakeProvider) and not provider.closed
+        return AgentMessage(content="fake")
+
+    monkeypatch.setattr(provider, "aconverse", aconverse)
+    call = asyncio.create_task(
+        provider.aconverse(provider.get_model("fake-model"), MessageThread())
+    )
+    await asyncio.sleep(0)
+
+    await registry.areload()
+    answering.set()
+
+    assert (await call).content == "fake"
+
+
+def test_registry_close_resets():
+    registry = ProviderRegistry(factories=[FakeProvider])
+    provider = registry.get("Fake")
+    registry.close()
+
+    assert not registry.loaded
+    assert isinstance(provider, FakeProvider) and provider.closed
+
+
+def test_registry_close_releases_retired_providers():
+    registry = ProviderRegistry(factories=[FakeProvider])
+    retired = registry.get("Fake")
+    registry.reload()
+    current = registry.get("Fake")
+
+    registry.close()
+
+    assert isinstance(retired, FakeProvider) and retired.closed
+    assert isinstance(current, FakeProvider) and current.closed
@@ -0,0 +1,131 @@
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.config import settings
+from src.models import AgentMessage, AIModel, AIModelType, MessageThread, UserMessage
+from src.services import converse_service
+from src.services.response_cache import (
+    CacheMode,
+    ResponseCache,
+    response_cache_key,
+)
+
+MODEL = AIModel(id="test-model", provider="LM Studio", type=AIModelType.CHAT)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def thread(content: str = "Hello?", title: str = "New Thread") -> MessageThread:
+    return MessageThread(title=title, messages=[UserMessage(content=content)])
+
+
+def test_cache_key_is_canonical():
+    key = response_cache_key(MODEL, thread())
+
+    assert response_cache_key(MODEL, thread(title="Replay")) == key
+    assert response_cache_key(MODEL, thread("Hi?")) != key
+    assert response_cache_key(MODEL.model_copy(update={"id": "other"}), thread()) != key
+
+
+@pytest.mark.parametrize(
+    "header,mode",
+    [
+        (None, CacheMode.USE),
+        ("max-age=0", CacheMode.USE),
+        ("no-cache", CacheMode.REFRESH),
+        ("No-Store, no-cache", CacheMode.BYPASS),
+    ],
+)
+def test_cache_mode_from_header(header: str | None, mode: CacheMode):
+    assert CacheMode.from_cache_control(header) is mode
+
+
+def test_memory_tier_lru_and_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(ttl=60, max_entries=2, directory="", clock=clock)
+    for key in ("a", "b"):
+        cache.put(key, AgentMessage(content=key))
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", AgentMessage(content="c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    clock.now += 60
+    assert cache.get("a") is None
+
+
+def test_disk_tier_survives_restart(tmp_path: Path):
+    clock = FakeClock()
+    ResponseCache(ttl=60, directory=str(tmp_path), clock=clock).put(
+        "key", AgentMessage(content="From disk")
+    )
+
+    restarted = ResponseCache(ttl=60, directory=str(tmp_path), clock=clock)
+    cached = restarted.get("key")
+    clock.now += 60
+
+    assert cached is not None and cached.content == "From disk"
+    assert (
+        ResponseCache(ttl=60, directory=str(tmp_path), clock=clock).get("key") is None
+    )
+
+
+def test_disk_tier_size_bound(tmp_path: Path):
+    cache = ResponseCache(max_entries=1, directory=str(tmp_path), max_bytes=1000)
+    for index in range(10):
+        cache.put(f"key-{index}", AgentMessage(content="x" * 200))
+
+    total = sum(file.stat().st_size for file in tmp_path.rglob("*.json"))
+    assert total <= 1000
+    assert cache.get("key-9") is not None
+    assert cache.get("key-0") is None
+
+
+async def test_aconverse_serves_identical_requests_from_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(
+        converse_service, "response_cache", ResponseCache(directory=str(tmp_path))
+    )
+    provider_call = AsyncMock(
+        return_value={
+            "choices": [
+                {"message": {"content": "Cached hello!"}, "finish_reason": "stop"}
+            ]
+        }
+    )
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", provider_call)
+
+    first = await converse_service.aconverse(MODEL, thread())
+    second = await converse_service.aconverse(MODEL, thread())
+    assert second.content == first.content == "Cached hello!"
+    assert provider_call.await_count == 1
+
+    await converse_service.aconverse(MODEL, thread(), CacheMode.REFRESH)
+    await converse_service.aconverse(MODEL, thread(), CacheMode.BYPASS)
+    assert provider_call.await_count == 3
+
+
+async def test_aconverse_cache_is_opt_in(monkeypatch: pytest.MonkeyPatch):
+    cache = ResponseCache(directory="")
+    monkeypatch.setattr(converse_service, "response_cache", cache)
+    provider_call = AsyncMock(
+        return_value={
+            "choices": [{"message": {"content": "Hello!"}, "finish_reason": "stop"}]
+        }
+    )
+    monkeypatch.setattr("src.providers.lmstudio.async_http_request", provider_call)
+
+    await converse_service.aconverse(MODEL, thread())
+    await converse_service.aconverse(MODEL, thread())
+
+    assert provider_call.await_count == 2
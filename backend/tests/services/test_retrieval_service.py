@@ -0,0 +1,163 @@
+from collections.abc import Sequence
+
+import pytest
+
+from src.config import settings
+from src.models import (
+    AIModel,
+    AgentMessage,
+    Document,
+    MessageThread,
+    NotFoundError,
+    RetrievalOptions,
+    RetrievalSource,
+    Snippet,
+    UserMessage,
+)
+from src.services import embedding_service, retrieval_service, search_service
+from src.stores import FlatVectorIndex, SQLiteConversationStore, SQLiteDocumentStore
+
+TOPICS: tuple[str, ...] = ("paris", "tides", "bread")
+
+
+def _embed(text: str) -> list[float]:
+    """A vector per topic, so texts on the same topic are similar."""
+    lowered = text.casefold()
+    return [float(topic in lowered) for topic in TOPICS] + [0.1]
+
+
+@pytest.fixture(autouse=True)
+def fake_aembed(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def aembed(model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        return [_embed(text) for text in texts]
+
+    monkeypatch.setattr(embedding_service, "aembed", aembed)
+
+
+@pytest.fixture(autouse=True)
+def documents(monkeypatch: pytest.MonkeyPatch):
+    store = SQLiteDocumentStore(":memory:")
+    monkeypatch.setattr(retrieval_service, "document_store", store)
+    monkeypatch.setattr(retrieval_service, "document_index", FlatVectorIndex())
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def threads(monkeypatch: pytest.MonkeyPatch):
+    store = SQLiteConversationStore(":memory:")
+    monkeypatch.setattr(retrieval_service, "conversation_store", store)
+    yield store
+    store.close()
+
+
+def _snippet(text: str, score: float) -> Snippet:
+    return Snippet(source=RetrievalSource.DOCUMENTS, id=text, text=text, score=score)
+
+
+def test_chunk_text_packs_sentences_with_overlap():
+    text = " ".join(f"Sentence number {i:02} is here." for i in range(12))
+
+    chunks = retrieval_service.chunk_text(text, chunk_tokens=24, overlap_tokens=8)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 24 * 4 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:], strict=False):
+        assert chunk.split(". ")[0] in previous  # Overlap of one sentence
+    assert "Sentence number 11 is here." in chunks[-1]
+    assert retrieval_service.chunk_text(" \n\n ") == []
+
+
+def test_chunk_text_splits_long_sentences_at_words():
+    chunks = retrieval_service.chunk_text("word " * 100, chunk_tokens=10)
+
+    assert len(chunks) > 1
+    assert " ".join(chunks).split() == ["word"] * 100
+
+
+def test_assemble_context_dedupes_and_respects_the_budget():
+    snippets = [
+        _snippet("The Eiffel Tower is in Paris.", 0.9),
+        _snippet("the eiffel tower   is in paris.", 0.8),
+        _snippet("Paris", 0.7),
+        _snippet("Already in the prompt.", 0.6),
+        _snippet("x" * 400, 0.5),
+        _snippet("Bread needs flour.", 0.4),
+    ]
+
+    selected = retrieval_service.assemble_context(
+        snippets, max_tokens=40, exclude=["Already in the prompt."]
+    )
+
+    assert [snippet.text for snippet in selected] == [
+        "The Eiffel Tower is in Paris.",
+        "Bread needs flour.",
+    ]
+
+
+async def test_aaugment_injects_documents_and_messages_before_the_latest_message(
+    threads: SQLiteConversationStore, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "RAG_CHUNK_TOKENS", 8)
+    monkeypatch.setattr(settings, "RAG_CHUNK_OVERLAP", 0)
+    await retrieval_service.aadd_document(
+        Document(
+            id="guide",
+            text="Paris has many museums. Tides follow the moon. Bread needs flour.",
+        )
+    )
+    past = threads.create(
+        MessageThread(messages=[AgentMessage(content="I loved Paris in spring.")])
+    )
+    await search_service.aindex_messages(past.id, past.messages)
+    thread = MessageThread(
+        messages=[
+            UserMessage(content="Hello"),
+            AgentMessage(content="Hi!"),
+            UserMessage(content="What to do in Paris?"),
+        ]
+    )
+
+    augmented = await retrieval_service.aaugment(
+        thread, RetrievalOptions(top_k=2, min_score=0.5)
+    )
+
+    assert len(augmented.messages) == 4
+    assert augmented.messages[-1] == thread.messages[-1]
+    context = augmented.messages[2].content
+    assert context.startswith(retrieval_service.CONTEXT_PREFIX)
+    assert "Paris has many museums." in context
+    assert "I loved Paris in spring." in context
+    assert "Tides" not in context
+    assert len(thread.messages) == 3
+
+
+async def test_aaugment_honours_sources_and_skips_on_failure(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    await retrieval_service.aadd_document(Document(text="Paris is in France."))
+    thread = MessageThread(messages=[UserMessage(content="Paris?")])
+
+    only_messages = await retrieval_service.aaugment(
+        thread, RetrievalOptions(sources=[RetrievalSource.MESSAGES])
+    )
+    assert only_messages == thread
+
+    async def failing_aembed(model: AIModel, texts: Sequence[str]):
+        raise NotFoundError("Provider 'OpenAI' not found.")
+
+    monkeypatch.setattr(embedding_service, "aembed", failing_aembed)
+    assert await retrieval_service.aaugment(thread, RetrievalOptions()) == thread
+
+
+async def test_deleted_documents_are_no_longer_retrieved(
+    documents: SQLiteDocumentStore,
+):
+    info = await retrieval_service.aadd_document(Document(text="Tides rise."))
+    assert info.chunks == 1
+
+    await retrieval_service.adelete_document(info.id)
+
+    assert await retrieval_service.aretrieve("tides", RetrievalOptions()) == []
+    with pytest.raises(ValueError, match="not found"):
+        await retrieval_service.adelete_document(info.id)
@@ -0,0 +1,91 @@
+import pytest
+
+from src.models import AIModel, AIModelType
+from src.services import router as router_module
+from src.services.health_monitor import HealthMonitor
+from src.services.router import ModelRouter, is_failover_error
+from src.utils import CircuitOpenError
+
+ROUTES = {"chat": {"OpenAI/gpt-4o-mini": 1.0, "LM Studio/qwen": 1.0}}
+ALIAS = AIModel(id="chat", provider="router", type=AIModelType.CHAT)
+
+
+def _route(router: ModelRouter) -> list[tuple[str, str]]:
+    return [(target.provider, target.id) for target in router.route(ALIAS)]
+
+
+def test_models_without_routes_route_to_themselves():
+    model = AIModel(id="gpt-4o", provider="OpenAI", type=AIModelType.CHAT)
+
+    assert ModelRouter(routes=ROUTES).route(model) == [model]
+
+
+def test_ordered_strategy_keeps_the_configured_order():
+    router = ModelRouter(routes=ROUTES, strategy="ordered")
+    router.record_success(AIModel(id="qwen", provider="LM Studio"), 0.1)
+    router.record_success(AIModel(id="gpt-4o-mini", provider="OpenAI"), 2.0)
+
+    assert _route(router) == [("OpenAI", "gpt-4o-mini"), ("LM Studio", "qwen")]
+    assert all(target.alias == "chat" for target in router.route(ALIAS))
+    assert all(target.type is AIModelType.CHAT for target in router.route(ALIAS))
+
+
+def test_latency_strategy_prefers_fast_and_healthy_targets():
+    router = ModelRouter(routes=ROUTES, strategy="latency")
+    openai = AIModel(id="gpt-4o-mini", provider="OpenAI")
+    lmstudio = AIModel(id="qwen", provider="LM Studio")
+
+    router.record_success(openai, 0.5)
+    assert _route(router)[0] == ("LM Studio", "qwen")  # Untried goes first
+
+    router.record_success(lmstudio, 0.2)
+    assert _route(router)[0] == ("LM Studio", "qwen")
+
+    for _ in range(3):
+        router.record_failure(lmstudio)
+    assert _route(router)[0] == ("OpenAI", "gpt-4o-mini")
+    stats = {(item.provider, item.model): item for item in router.stats()}
+    assert stats[("LM Studio", "qwen")].failures == 3
+    assert stats[("OpenAI", "gpt-4o-mini")].latency_ms == pytest.approx(500)
+
+
+def test_weights_scale_the_latency_score():
+    router = ModelRouter(
+        routes={"chat": {"OpenAI/gpt-4o-mini": 1.0, "LM Studio/qwen": 4.0}},
+        strategy="latency",
+    )
+    router.record_success(AIModel(id="gpt-4o-mini", provider="OpenAI"), 0.2)
+    router.record_success(AIModel(id="qwen", provider="LM Studio"), 0.4)
+
+    assert _route(router)[0] == ("LM Studio", "qwen")
+
+
+async def test_down_providers_go_last(monkeypatch: pytest.MonkeyPatch):
+    class _Down:
+        name = "OpenAI"
+
+        async def aping(self) -> None:
+            raise ConnectionError("backend unreachable")
+
+    monitor = HealthMonitor(providers=dict, failure_threshold=1)
+    await monitor.aprobe(_Down())
+    monkeypatch.setattr(router_module, "health_monitor", monitor)
+
+    router = ModelRouter(routes=ROUTES, strategy="ordered")
+
+    assert _route(router) == [("LM Studio", "qwen"), ("OpenAI", "gpt-4o-mini")]
+
+
+@pytest.mark.parametrize(
+    "routes",
+    [{"chat": {"no-model-id": 1.0}}, {"chat": {"OpenAI/gpt-4o": 0.0}}],
+)
+def test_invalid_routes_are_rejected(routes):
+    with pytest.raises(ValueError):
+        ModelRouter(routes=routes)
+
+
+def test_failover_errors():
+    assert is_failover_error(ConnectionError("reset"))
+    assert is_failover_error(CircuitOpenError("OpenAI", 10))
+    assert not is_failover_error(ValueError("The latest message is too long."))
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from src.models import Priority
+from src.services.scheduler import ProviderScheduler, QueueFullError
+
+
+async def test_limits_concurrent_requests_per_provider():
+    scheduler = ProviderScheduler(provider_limits={"LM Studio": 2})
+    running = 0
+    peak = 0
+
+    async def generate() -> None:
+        nonlocal running, peak
+        async with scheduler.slot("LM Studio"):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(generate() for _ in range(6)))
+
+    assert peak == 2
+    [lane] = scheduler.stats()
+    assert lane.name == "LM Studio"
+    assert lane.admitted == 6
+    assert lane.active == 0
+    assert lane.max_queue_ms > 0
+
+
+async def test_interactive_requests_jump_the_batch_queue():
+    scheduler = ProviderScheduler(provider_limits={"LM Studio": 1})
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("LM Studio"):
+            await release.wait()
+
+    async def generate(name: str, priority: Priority) -> None:
+        async with scheduler.slot("LM Studio", priority=priority):
+            order.append(name)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(generate("batch-1", Priority.BATCH)),
+        asyncio.create_task(generate("batch-2", Priority.BATCH)),
+        asyncio.create_task(generate("interactive", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder, *waiting)
+
+    assert order == ["interactive", "batch-1", "batch-2"]
+
+
+async def test_rejects_requests_when_the_queue_is_full():
+    scheduler = ProviderScheduler(provider_limits={"LM Studio": 1}, max_queue=1)
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("LM Studio"):
+            await release.wait()
+
+    tasks = [asyncio.create_task(hold()) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(QueueFullError) as error:
+        scheduler.check("LM Studio")
+    assert error.value.retry_after >= 1
+    with pytest.raises(QueueFullError):
+        async with scheduler.slot("LM Studio"):
+            pass
+
+    release.set()
+    await asyncio.gather(*tasks)
+    [lane] = scheduler.stats()
+    assert lane.rejected == 2
+    assert lane.admitted == 2
+
+
+async def test_cancelled_waiters_leave_the_queue():
+    scheduler = ProviderScheduler(provider_limits={"LM Studio": 1})
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("LM Studio"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert scheduler.stats()[0].queued == 0
+    release.set()
+    await holder
+    async with scheduler.slot("LM Studio"):  # The slot was freed
+        assert scheduler.stats()[0].active == 1
+
+
+async def test_waiters_cancelled_during_a_handoff_stay_cancelled():
+    scheduler = ProviderScheduler(provider_limits={"LM Studio": 1})
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("LM Studio"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    cancelled = asyncio.create_task(hold())
+    next_in_line = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    release.set()
+    cancelled.cancel()  # Before the release skips its future
+
+    results = await asyncio.gather(
+        holder, cancelled, next_in_line, return_exceptions=True
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[2] is None
+    assert scheduler.stats()[0].active == 0
+    assert scheduler.stats()[0].queued == 0
+
+
+async def test_model_limits_apply_on_top_of_the_provider_limit():
+    scheduler = ProviderScheduler(
+        provider_limits={"LM Studio": 4}, model_limits={"LM Studio/big-model": 1}
+    )
+    release = asyncio.Event()
+
+    async def hold(model_id: str) -> None:
+        async with scheduler.slot("LM Studio", model_id):
+            await release.wait()
+
+    tasks = [
+        asyncio.create_task(hold("big-model")),
+        asyncio.create_task(hold("big-model")),
+        asyncio.create_task(hold("small-model")),
+    ]
+    await asyncio.sleep(0)
+
+    stats = {lane.name: lane for lane in scheduler.stats()}
+    assert stats["LM Studio/big-model"].active == 1
+    assert stats["LM Studio/big-model"].queued == 1
+    assert stats["LM Studio"].active == 2  # The small model is not held back
+
+    release.set()
+    await asyncio.gather(*tasks)
@@ -0,0 +1,151 @@
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from src.config import settings
+from src.models import AgentMessage, AIModel, MessageThread, UserMessage
+from src.services import (
+    conversation_service,
+    converse_service,
+    embedding_service,
+    search_service,
+)
+from src.stores import FlatVectorIndex, SQLiteConversationStore
+
+VECTORS: dict[str, list[float]] = {
+    "cats": [1.0, 0.0, 0.0],
+    "dogs": [0.0, 1.0, 0.0],
+    "kittens": [0.9, 0.1, 0.0],
+}
+
+
+@pytest.fixture(autouse=True)
+def fake_aembed(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def aembed(model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        return [VECTORS.get(text, [0.0, 0.0, 1.0]) for text in texts]
+
+    monkeypatch.setattr(embedding_service, "aembed", aembed)
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch):
+    store = SQLiteConversationStore(":memory:")
+    monkeypatch.setattr(conversation_service, "conversation_store", store)
+    yield store
+    store.close()
+
+
+async def test_indexed_messages_are_found_by_meaning(vector_index: FlatVectorIndex):
+    indexed = await search_service.aindex_messages(
+        "thread", [UserMessage(content="cats"), AgentMessage(content="  ")], start=4
+    )
+    await search_service.aindex_messages("other", [UserMessage(content="dogs")])
+
+    hits = await search_service.asearch("kittens", k=2)
+
+    assert indexed == 1
+    assert len(vector_index) == 2
+    assert [(hit.thread_id, hit.index) for hit in hits] == [("thread", 4), ("other", 0)]
+    assert hits[0].score > hits[1].score
+
+
+async def test_search_validates_its_input():
+    with pytest.raises(ValueError, match="empty"):
+        await search_service.asearch("  ")
+    with pytest.raises(ValueError, match="between"):
+        await search_service.asearch("cats", k=0)
+
+
+async def test_search_messages_attaches_stored_messages(
+    store: SQLiteConversationStore,
+):
+    thread = store.create(
+        MessageThread(
+            messages=[UserMessage(content="dogs"), AgentMessage(content="cats")]
+        )
+    )
+    await search_service.aindex_messages(thread.id, thread.messages)
+    await search_service.aindex_messages("deleted", [UserMessage(content="kittens")])
+
+    hits = await conversation_service.asearch_messages("cats", k=2)
+
+    assert hits[0].message == thread.messages[1]
+    assert hits[1].thread_id == "deleted"
+    assert hits[1].message is None
+
+
+async def test_deleting_a_thread_forgets_its_messages(
+    store: SQLiteConversationStore, vector_index: FlatVectorIndex
+):
+    thread = store.create(MessageThread(messages=[UserMessage(content="cats")]))
+    await search_service.aindex_messages(thread.id, thread.messages)
+
+    await conversation_service.adelete_thread(thread.id)
+
+    assert len(vector_index) == 0
+
+
+async def test_deleting_a_thread_waits_for_its_indexing(
+    monkeypatch: pytest.MonkeyPatch,
+    store: SQLiteConversationStore,
+    vector_index: FlatVectorIndex,
+):
+    monkeypatch.setattr(settings, "SEARCH_INDEX_MESSAGES", True)
+    embedding = asyncio.Event()
+
+    async def aembed(model: AIModel, texts: Sequence[str]) -> list[list[float]]:
+        await embedding.wait()
+        return [VECTORS["cats"] for _ in texts]
+
+    monkeypatch.setattr(embedding_service, "aembed", aembed)
+    thread = await conversation_service.acreate_thread(
+        MessageThread(messages=[UserMessage(content="cats")])
+    )
+
+    deletion = asyncio.create_task(conversation_service.adelete_thread(thread.id))
+    await asyncio.sleep(0.01)
+    embedding.set()
+    await deletion
+    await asyncio.sleep(0.05)  # Let any indexing left running finish
+
+    assert len(vector_index) == 0
+
+
+async def test_concurrent_turns_index_messages_at_their_stored_positions(
+    monkeypatch: pytest.MonkeyPatch,
+    store: SQLiteConversationStore,
+    vector_index: FlatVectorIndex,
+):
+    monkeypatch.setattr(settings, "SEARCH_INDEX_MESSAGES", True)
+    answering = asyncio.Event()
+
+    async def aconverse(model: AIModel, thread: MessageThread, **_) -> AgentMessage:
+        await answering.wait()
+        return AgentMessage(content=f"re: {thread.messages[-1].content}")
+
+    monkeypatch.setattr(converse_service, "aconverse", aconverse)
+    thread = await conversation_service.acreate_thread(
+        MessageThread(messages=[UserMessage(content="cats")])
+    )
+    model = search_service.search_model()
+
+    turns = [
+        asyncio.create_task(
+            conversation_service.aconverse_turn(
+                thread.id, model, UserMessage(content=content)
+            )
+        )
+        for content in ("dogs", "kittens")
+    ]
+    await asyncio.sleep(0.01)
+    answering.set()
+    await asyncio.gather(*turns)
+    await search_service.await_indexing(thread.id)
+
+    assert len(vector_index) == 5  # noqa: PLR2004
+    for index, message in enumerate(store.get(thread.id).messages):
+        hits = await conversation_service.asearch_messages(message.content, k=5)
+        assert any(hit.index == index and hit.message == message for hit in hits), (
+            message.content
+        )
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from src.models import AlreadyExistsError, NotFoundError, ToolDefinition, ToolRequest
+from src.services.tool_registry import ToolRegistry
+
+
+def test_tool_decorator_registers_definition():
+    registry = ToolRegistry()
+
+    @registry.tool(parameters={"type": "object", "properties": {"x": {}}})
+    def double(arguments):
+        """Double a number."""
+        return arguments["x"] * 2
+
+    (definition,) = registry.definitions()
+    assert definition.name == "double"
+    assert definition.description == "Double a number."
+    assert definition.parameters["properties"] == {"x": {}}
+
+    with pytest.raises(AlreadyExistsError, match="already exists"):
+        registry.register(ToolDefinition(name="double"), double)
+
+
+def test_definitions_rejects_unknown_tools():
+    registry = ToolRegistry()
+    registry.register(ToolDefinition(name="a"), lambda arguments: None)
+
+    assert [tool.name for tool in registry.definitions(["a", "a"])] == ["a"]
+    with pytest.raises(ValueError, match="Tool 'b' not found"):
+        registry.definitions(["a", "b"])
+
+    registry.unregister("a")
+    with pytest.raises(NotFoundError, match="not found"):
+        registry.unregister("a")
+
+
+async def test_aexecute_reports_failures_as_results():
+    registry = ToolRegistry(timeout=0.05)
+
+    @registry.tool()
+    async def slow(arguments):
+        await asyncio.sleep(1)
+
+    @registry.tool()
+    def broken(arguments):
+        raise RuntimeError("boom")
+
+    results = [
+        await registry.aexecute(ToolRequest(id=name, name=name, arguments={}))
+        for name in ("slow", "broken", "missing")
+    ]
+
+    assert [result.id for result in results] == ["slow", "broken", "missing"]
+    assert "timed out" in results[0].content["error"]
+    assert results[1].content == {"error": "boom"}
+    assert results[2].content == {"error": "Tool 'missing' not found."}
+
+
+async def test_aexecute_all_runs_calls_concurrently():
+    registry = ToolRegistry(max_parallel=4)
+
+    @registry.tool()
+    def wait(arguments):
+        time.sleep(0.2)  # A blocking tool runs in a worker thread
+        return arguments["n"]
+
+    @registry.tool()
+    async def echo(arguments):
+        await asyncio.sleep(0.2)
+        return arguments["n"]
+
+    requests = [
+        ToolRequest(id=str(n), name="wait" if n % 2 else "echo", arguments={"n": n})
+        for n in range(4)
+    ]
+    start = time.perf_counter()
+    results = await registry.aexecute_all(requests)
+
+    assert time.perf_counter() - start < 0.6
+    assert [result.content for result in results] == [0, 1, 2, 3]
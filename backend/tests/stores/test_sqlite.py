@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import pytest
+
+from src.models import (
+    AgentMessage,
+    AlreadyExistsError,
+    Document,
+    MessageThread,
+    NotFoundError,
+    ToolRequest,
+    UserMessage,
+)
+from src.stores import SQLiteConversationStore, SQLiteDocumentStore
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    store = SQLiteConversationStore(str(tmp_path / "db" / "conversations.db"))
+    yield store
+    store.close()
+
+
+def test_create_and_get_round_trip(store: SQLiteConversationStore):
+    thread = MessageThread(
+        title="Greetings",
+        messages=[
+            UserMessage(content="Hello?"),
+            AgentMessage(
+                content="Hi!",
+                reasoning_content="Be polite.",
+                tool_requests=[
+                    ToolRequest(id="call-1", name="wave", arguments={"hand": "left"})
+                ],
+            ),
+        ],
+    )
+    store.create(thread)
+
+    stored = store.get(thread.id)
+
+    assert stored == thread
+    assert isinstance(stored.messages[1], AgentMessage)
+    assert stored.messages[1].tool_requests[0].arguments == {"hand": "left"}
+
+
+def test_append_preserves_order(store: SQLiteConversationStore):
+    thread = store.create(MessageThread(messages=[UserMessage(content="1")]))
+
+    first = store.append(
+        thread.id, [AgentMessage(content="2"), UserMessage(content="3")]
+    )
+    second = store.append(thread.id, [AgentMessage(content="4")])
+
+    stored = store.get(thread.id)
+    assert [message.content for message in stored.messages] == ["1", "2", "3", "4"]
+    assert stored.modified_at > thread.modified_at
+    assert (first, second) == (1, 3)
+
+
+def test_missing_thread_raises(store: SQLiteConversationStore):
+    with pytest.raises(NotFoundError, match="not found"):
+        store.get("missing")
+    with pytest.raises(NotFoundError, match="not found"):
+        store.append("missing", [UserMessage(content="Hello?")])
+    with pytest.raises(NotFoundError, match="not found"):
+        store.delete("missing")
+
+
+def test_duplicate_and_delete(store: SQLiteConversationStore):
+    thread = store.create(MessageThread(messages=[UserMessage(content="Hello?")]))
+    with pytest.raises(AlreadyExistsError, match="already exists"):
+        store.create(thread)
+
+    store.delete(thread.id)
+
+    with pytest.raises(NotFoundError, match="not found"):
+        store.get(thread.id)
+
+
+def test_persists_across_connections(tmp_path: Path):
+    path = str(tmp_path / "conversations.db")
+    thread = MessageThread(messages=[UserMessage(content="Remember me")])
+    first = SQLiteConversationStore(path)
+    first.create(thread)
+    first.close()
+
+    second = SQLiteConversationStore(path)
+    assert second.get(thread.id).messages[0].content == "Remember me"
+    second.close()
+
+
+def test_get_message_reads_one_message(store: SQLiteConversationStore):
+    thread = store.create(
+        MessageThread(messages=[UserMessage(content="1"), AgentMessage(content="2")])
+    )
+
+    message = store.get_message(thread.id, 1)
+
+    assert isinstance(message, AgentMessage)
+    assert message.content == "2"
+    with pytest.raises(NotFoundError, match="not found"):
+        store.get_message(thread.id, 2)
+
+
+def test_document_store_reads_chunks_and_deletes(tmp_path: Path):
+    store = SQLiteDocumentStore(str(tmp_path / "db" / "documents.db"))
+    document = Document(id="doc", title="Notes", text="One. Two.")
+
+    info = store.create(document, ["One.", "Two."])
+
+    assert info.chunks == 2
+    assert store.get_chunks([("doc", 1), ("doc", 5), ("other", 0)]) == {
+        ("doc", 1): "Two."
+    }
+    with pytest.raises(AlreadyExistsError, match="already exists"):
+        store.create(document, ["One."])
+    assert store.delete("doc") == 2
+    assert store.get_chunks([("doc", 0)]) == {}
+    with pytest.raises(NotFoundError, match="not found"):
+        store.delete("doc")
+    store.close()
@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.stores import FlatVectorIndex, IVFVectorIndex, create_vector_index
+
+
+def test_search_ranks_by_cosine_similarity():
+    index = FlatVectorIndex()
+    index.upsert(["x", "y", "xy"], [[2.0, 0.0], [0.0, 3.0], [1.0, 1.0]])
+
+    results = index.search([1.0, 0.1], k=2)
+
+    assert [id_ for id_, _ in results] == ["x", "xy"]
+    assert results[0][1] == pytest.approx(0.995, abs=1e-3)
+    assert index.dimensions == 2
+    assert len(index) == 3
+
+
+def test_upsert_replaces_and_delete_keeps_rows_packed():
+    index = FlatVectorIndex()
+    index.upsert(["a", "b", "c"], [[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]])
+    index.upsert(["a"], [[0.0, -1.0]])
+
+    assert index.delete(["b", "missing"]) == 1
+
+    assert len(index) == 2
+    assert index.search([0.0, -1.0], k=1) == [("a", pytest.approx(1.0))]
+    assert index.search([-1.0, 0.0], k=1) == [("c", pytest.approx(1.0))]
+
+
+def test_mismatched_vectors_raise():
+    index = FlatVectorIndex()
+    index.upsert(["a"], [[1.0, 0.0]])
+
+    with pytest.raises(ValueError, match="dimensions"):
+        index.upsert(["b"], [[1.0, 0.0, 0.0]])
+    with pytest.raises(ValueError, match="dimensions"):
+        index.search([1.0, 0.0, 0.0], k=1)
+    with pytest.raises(ValueError, match="one vector per id"):
+        index.upsert(["b", "c"], [[1.0, 0.0]])
+
+
+def test_index_grows_past_its_initial_capacity():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(3000, 8)).astype(np.float32)
+    index = FlatVectorIndex()
+
+    for start in range(0, len(vectors), 500):
+        ids = [str(i) for i in range(start, start + 500)]
+        index.upsert(ids, vectors[start : start + 500].tolist())
+
+    assert len(index) == 3000
+    assert index.search(vectors[2999].tolist(), k=1)[0][0] == "2999"
+
+
+def test_saved_index_reloads(tmp_path: Path):
+    directory = str(tmp_path / "index")
+    index = FlatVectorIndex(directory)
+    index.upsert(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+    index.close()
+
+    reloaded = FlatVectorIndex(directory)
+    reloaded.upsert(["c"], [[-1.0, 0.0]])
+
+    assert len(reloaded) == 3
+    assert reloaded.search([0.0, 1.0], k=1)[0][0] == "b"
+    assert reloaded.search([-1.0, 0.0], k=1)[0][0] == "c"
+
+
+def test_ivf_index_trains_and_finds_nearest_neighbours(tmp_path: Path):
+    rng = np.random.default_rng(2)
+    centers = rng.normal(size=(8, 16))
+    vectors = (
+        centers[rng.integers(0, 8, size=400)] + 0.05 * rng.normal(size=(400, 16))
+    ).astype(np.float32)
+    ids = [str(i) for i in range(len(vectors))]
+    index = IVFVectorIndex(str(tmp_path / "ivf"), lists=8, probes=2)
+
+    index.upsert(ids[:50], vectors[:50].tolist())
+    assert not index.trained
+    index.upsert(ids[50:], vectors[50:].tolist())
+    assert index.trained
+
+    hits = sum(
+        index.search(vectors[i].tolist(), k=1)[0][0] == str(i)
+        for i in range(0, 400, 10)
+    )
+    assert hits >= 38  # noqa: PLR2004
+
+    index.delete(ids[:10])
+    index.close()
+    reloaded = IVFVectorIndex(str(tmp_path / "ivf"), lists=8, probes=2)
+    assert reloaded.trained
+    assert len(reloaded) == 390
+    assert reloaded.search(vectors[399].tolist(), k=1)[0][0] == "399"
+
+
+def test_create_vector_index_rejects_unknown_kind():
+    assert isinstance(create_vector_index("ivf", ""), IVFVectorIndex)
+    with pytest.raises(ValueError, match="Unknown vector index type"):
+        create_vector_index("hnsw", "")
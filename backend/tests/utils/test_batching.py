@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from src.utils import MicroBatcher
+
+
+async def test_concurrent_items_are_flushed_together():
+    batches: list[list[int]] = []
+
+    async def double(key: str, items: list[int]) -> list[int]:
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    batcher: MicroBatcher[str, int, int] = MicroBatcher(
+        double, max_batch=10, max_wait=0.01
+    )
+    results = await asyncio.gather(*(batcher.submit("key", i) for i in range(5)))
+
+    assert results == [0, 2, 4, 6, 8]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+
+async def test_full_batches_and_keys_are_flushed_separately():
+    batches: list[tuple[str, list[int]]] = []
+
+    async def record(key: str, items: list[int]) -> list[int]:
+        batches.append((key, items))
+        return items
+
+    batcher: MicroBatcher[str, int, int] = MicroBatcher(
+        record, max_batch=2, max_wait=10
+    )
+    results = await asyncio.gather(
+        batcher.submit("a", 1),
+        batcher.submit("b", 2),
+        batcher.submit("a", 3),
+        batcher.submit("b", 4),
+    )
+
+    assert results == [1, 2, 3, 4]
+    assert batches == [("a", [1, 3]), ("b", [2, 4])]  # Full, so no waiting
+
+
+async def test_errors_fan_out_to_every_caller_of_the_batch():
+    async def fail(key: str, items: list[int]) -> list[int]:
+        raise ConnectionError("down")
+
+    batcher: MicroBatcher[str, int, int] = MicroBatcher(fail, max_batch=10, max_wait=0)
+    results = await asyncio.gather(
+        *(batcher.submit("key", i) for i in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+async def test_wrong_result_count_fails_the_batch():
+    async def drop(key: str, items: list[int]) -> list[int]:
+        return items[:1]
+
+    batcher: MicroBatcher[str, int, int] = MicroBatcher(drop, max_batch=2, max_wait=0)
+    with pytest.raises(ValueError, match="Expected 2 results"):
+        await asyncio.gather(batcher.submit("key", 1), batcher.submit("key", 2))
@@ -1,4 +1,6 @@
+import json
 import logging
+import logging.handlers
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
@@ -6,18 +8,16 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.utils import setup_logger
+from src.utils import bind_log_context, setup_logger
+from src.utils.logger import LogPipeline, SamplingFilter, _QueueHandler
 
 
 @pytest.fixture
-def temp_log_dir(tmp_path: Path) -> Generator[Path, Any, None]:
-    """Create a temporary log directory for testing."""
-    temp_dir = tmp_path / "logs"
-    temp_dir.mkdir()
-
-    # Patch the log directory
-    with patch("src.utils.logger.log_dir", temp_dir):
-        yield temp_dir
+def pipeline(tmp_path: Path) -> Generator[LogPipeline, Any, None]:
+    """Create a log pipeline writing JSON lines to a temporary file."""
+    pipeline = LogPipeline(tmp_path / "logs" / "app.log", json_lines=True)
+    yield pipeline
+    pipeline.stop()
 
 
 @pytest.fixture
@@ -27,14 +27,28 @@ def mock_settings() -> Generator[MagicMock, Any, None]:
         yield mock_settings
 
 
-def test_setup_logger_creates_handlers() -> None:
-    """Test that setup_logger creates both console and file handlers."""
+def _pipeline_logger(name: str, pipeline: LogPipeline) -> logging.Logger:
+    """Create a logger writing only through the given pipeline."""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [pipeline.handler()]
+    return logger
+
+
+def _read_records(pipeline: LogPipeline, path: Path) -> list[dict[str, Any]]:
+    """Wait for the pipeline to write its records, then parse them."""
+    pipeline.flush()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_setup_logger_creates_queue_handler() -> None:
+    """Test that setup_logger only hands records to the pipeline's queue."""
     logger = setup_logger("test_logger")
 
     assert isinstance(logger, logging.Logger)
-    assert len(logger.handlers) == 2
-    assert any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
-    assert any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
 
 
 def test_setup_logger_debug_mode(mock_settings: MagicMock) -> None:
@@ -55,17 +69,92 @@ def test_setup_logger_production_mode(mock_settings: MagicMock) -> None:
     assert all(h.level >= logging.INFO for h in logger.handlers)
 
 
-def test_setup_logger_creates_log_file(temp_log_dir: Path) -> None:
-    """Test that setup_logger creates a log file."""
-    logger = setup_logger("test_file_logger")
-    log_file = temp_log_dir / "app.log"
-
-    # Log a test message
-    test_message = "Test log message"
-    logger.info(test_message)
-
-    assert log_file.exists()
-    assert test_message in log_file.read_text()
+def test_pipeline_writes_json_records(tmp_path: Path, pipeline: LogPipeline) -> None:
+    """Test that records reach the log file as JSON lines, with their context."""
+    logger = _pipeline_logger("test_json_logger", pipeline)
+
+    with bind_log_context(request_id="abc123", provider="OpenAI"):
+        logger.info("Test log message", extra={"model": "gpt-4o"})
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.error("Something failed", exc_info=True)
+
+    records = _read_records(pipeline, tmp_path / "logs" / "app.log")
+    assert records[0]["message"] == "Test log message"
+    assert records[0]["level"] == "INFO"
+    assert records[0]["logger"] == "test_json_logger"
+    assert records[0]["request_id"] == "abc123"
+    assert records[0]["provider"] == "OpenAI"
+    assert records[0]["model"] == "gpt-4o"
+    assert "request_id" not in records[1]
+    assert "RuntimeError: boom" in records[1]["exception"]
+
+
+def test_pipeline_merges_arguments_before_queueing(
+    tmp_path: Path, pipeline: LogPipeline
+) -> None:
+    """Test that arguments changed after logging do not change the message."""
+    logger = _pipeline_logger("test_args_logger", pipeline)
+    items: list[int] = [1]
+
+    logger.info("Items: %s", items)
+    items.append(2)
+
+    records = _read_records(pipeline, tmp_path / "logs" / "app.log")
+    assert records[0]["message"] == "Items: [1]"
+
+
+def test_pipeline_restarts_after_stop(tmp_path: Path, pipeline: LogPipeline) -> None:
+    """Test that a stopped pipeline writes records again once restarted."""
+    logger = _pipeline_logger("test_restart_logger", pipeline)
+    pipeline.stop()
+
+    logger.info("After shutdown")
+    pipeline.start()
+
+    records = _read_records(pipeline, tmp_path / "logs" / "app.log")
+    assert [record["message"] for record in records] == ["After shutdown"]
+
+
+def test_pipeline_samples_high_volume_lines(
+    tmp_path: Path, pipeline: LogPipeline
+) -> None:
+    """Test that only a share of sampled INFO lines is written."""
+    pipeline.filter = SamplingFilter({"Retrieving models": 0.25})
+    logger = _pipeline_logger("test_sampled_logger", pipeline)
+
+    for i in range(8):
+        logger.info(f"Retrieving models from provider: {i}")
+    logger.warning("Retrieving models took too long")
+    logger.info("Unrelated message")
+
+    messages = [
+        record["message"]
+        for record in _read_records(pipeline, tmp_path / "logs" / "app.log")
+    ]
+    assert messages == [
+        "Retrieving models from provider: 0",
+        "Retrieving models from provider: 4",
+        "Retrieving models took too long",
+        "Unrelated message",
+    ]
+
+
+def test_pipeline_drops_records_when_full(mock_settings: MagicMock) -> None:
+    """Test that a full queue drops records instead of blocking the caller."""
+    mock_settings.LOG_QUEUE_SIZE = 2
+    mock_settings.LOG_SAMPLE_RATES = {}
+    pipeline = LogPipeline("unused.log")  # Never started, so the queue fills up
+    logger = logging.getLogger("test_full_logger")
+    logger.propagate = False
+    logger.handlers = [_QueueHandler(pipeline)]
+
+    for i in range(5):
+        logger.warning(f"Message {i}")
+
+    assert pipeline.queue.qsize() == 2
+    assert pipeline.dropped == 3
 
 
 def test_setup_logger_reuses_existing_logger() -> None:
@@ -0,0 +1,72 @@
+import pytest
+
+from src.utils import MetricsRegistry
+
+
+def test_counters_render_per_label_combination():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests served.", ("route",))
+
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    requests.inc(route='/b"c')
+
+    assert requests.value(route="/a") == 3
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests served.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 3.0',
+        'requests_total{route="/b\\"c"} 1.0',
+    ]
+
+
+def test_counters_reject_decreases_and_unknown_labels():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests served.", ("route",))
+
+    with pytest.raises(ValueError, match="cannot decrease"):
+        requests.inc(-1, route="/a")
+    with pytest.raises(ValueError, match="expects labels"):
+        requests.inc(status="200")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.counter("requests_total", "Again.")
+
+
+def test_gauges_track_blocks_in_progress():
+    registry = MetricsRegistry()
+    in_flight = registry.gauge("in_flight", "Calls in flight.", ("provider",))
+
+    with in_flight.track(provider="OpenAI"):
+        assert in_flight.value(provider="OpenAI") == 1
+    in_flight.set(7, provider="LM Studio")
+
+    assert in_flight.value(provider="OpenAI") == 0
+    assert 'in_flight{provider="LM Studio"} 7' in registry.render()
+
+
+def test_histograms_render_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    assert latency.count() == 4
+    assert latency.sum() == pytest.approx(3.65)
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_histograms_time_blocks_that_raise():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",))
+
+    with pytest.raises(RuntimeError), latency.time(route="/a"):
+        raise RuntimeError("boom")
+
+    assert latency.count(route="/a") == 1
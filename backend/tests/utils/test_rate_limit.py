@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from src.utils import RateLimiter, RateLimitExceededError, measure_pacing
+from src.utils.metrics import rate_limit_wait_seconds
+from src.utils.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=10, per_second=1, clock=clock)
+
+    bucket.take(10)
+    assert bucket.delay(5) == 5
+
+    clock.now = 3
+    assert bucket.level == 3
+    clock.now = 100
+    assert bucket.level == 10  # Never above capacity
+
+
+def test_rate_limiter_paces_requests_beyond_the_quota():
+    clock = FakeClock()
+    limiter = RateLimiter("OpenAI", 2, 1_000, max_wait=60, clock=clock)
+
+    assert limiter.reserve("gpt-4o", 10) == 0
+    assert limiter.reserve("gpt-4o", 10) == 0
+    assert limiter.reserve("gpt-4o", 10) == pytest.approx(30)  # 2 RPM
+    assert limiter.reserve("gpt-4o-mini", 10) == 0  # Quotas are per model
+
+
+def test_rate_limiter_paces_tokens_beyond_the_quota():
+    clock = FakeClock()
+    limiter = RateLimiter("OpenAI", 100, 600, max_wait=60, clock=clock)
+
+    assert limiter.reserve("gpt-4o", 500) == 0
+    assert limiter.reserve("gpt-4o", 200) == pytest.approx(10)  # 10 tokens/s
+
+
+def test_rate_limiter_fails_fast_past_the_max_wait():
+    clock = FakeClock()
+    limiter = RateLimiter("OpenAI", 1, 1_000, max_wait=5, clock=clock)
+    limiter.reserve("gpt-4o", 10)
+
+    with pytest.raises(RateLimitExceededError) as error:
+        limiter.reserve("gpt-4o", 10)
+
+    assert error.value.retry_after == pytest.approx(60)
+    clock.now = 60
+    assert limiter.reserve("gpt-4o", 10) == 0  # The rejected call reserved nothing
+
+
+def test_rate_limiter_follows_ratelimit_headers():
+    clock = FakeClock()
+    limiter = RateLimiter("OpenAI", 500, 200_000, max_wait=60, clock=clock)
+
+    limiter.update(
+        "gpt-4o",
+        {
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-limit-tokens": "not-a-number",
+        },
+    )
+
+    assert limiter.reserve("gpt-4o", 10) == pytest.approx(1)  # 60 RPM, none left
+    # The token quota is unchanged, so only the request queue delays this one
+    assert limiter.reserve("gpt-4o", 150_000) == pytest.approx(2)
+
+
+async def test_pacing_is_measured_by_enclosing_blocks_and_their_tasks():
+    limiter = RateLimiter("OpenAI", 100, 600, max_wait=5)
+    before: int = rate_limit_wait_seconds.count(limiter="OpenAI", key="gpt-4o")
+
+    with measure_pacing() as outer:
+        await limiter.aacquire("gpt-4o", 600)  # Within the quota
+        with measure_pacing() as inner:
+            await asyncio.create_task(limiter.aacquire("gpt-4o", 1))  # 10 tokens/s
+    with measure_pacing() as later:
+        pass
+
+    assert inner() == pytest.approx(0.1, abs=0.01)
+    assert outer() == inner()
+    assert later() == 0
+    assert rate_limit_wait_seconds.count(limiter="OpenAI", key="gpt-4o") == before + 2
@@ -0,0 +1,93 @@
+import pytest
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from requests.adapters import HTTPAdapter
+from requests_mock import Mocker
+
+from src.utils.requests import HTTPClient
+
+
+def test_request_reuses_pooled_session(requests_mock: Mocker):
+    client = HTTPClient(connect_timeout=1.5, read_timeout=7, pool_size=4)
+    requests_mock.get("http://lmstudio.local/v1/models", json={"data": []})
+
+    client.request("GET", "http://lmstudio.local/v1/models")
+    first_session = client.session
+    client.request("GET", "http://lmstudio.local/v1/models")
+
+    assert client.session is first_session
+    assert requests_mock.call_count == 2
+    assert requests_mock.last_request.timeout == (1.5, 7)
+    adapter = client.session.get_adapter("http://lmstudio.local")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 4
+    assert adapter._pool_block is True
+
+
+def test_request_rejects_non_http_url():
+    with pytest.raises(ValueError):
+        HTTPClient().request("GET", "ftp://lmstudio.local/v1/models")
+
+
+def test_close_resets_session():
+    client = HTTPClient()
+    session = client.session
+    client.close()
+    assert client.session is not session
+
+
+@pytest.fixture
+async def sse_server():
+    async def models(_: web.Request) -> web.Response:
+        return web.json_response({"data": [{"id": "model-a"}]})
+
+    async def missing(_: web.Request) -> web.Response:
+        raise web.HTTPNotFound()
+
+    async def stream(_: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(_)
+        for payload in ('{"n": 1}', '{"n": 2}', "[DONE]", '{"n": 3}'):
+            await response.write(f": comment\ndata: {payload}\n\n".encode())
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/v1/models", models)
+    app.router.add_get("/v1/missing", missing)
+    app.router.add_post("/v1/chat/completions", stream)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+async def test_async_request_and_sse(sse_server: TestServer):
+    client = HTTPClient(pool_size=2)
+    base_url = str(sse_server.make_url(""))
+
+    data = await client.arequest("GET", f"{base_url}/v1/models")
+    session = client.async_session()
+    events = [
+        event
+        async for event in client.astream_sse(
+            "POST", f"{base_url}/v1/chat/completions", json={"stream": True}
+        )
+    ]
+
+    assert data == {"data": [{"id": "model-a"}]}
+    assert events == ['{"n": 1}', '{"n": 2}']
+    assert client.async_session() is session
+    assert session.connector is not None and session.connector.limit_per_host == 2
+    await client.aclose()
+    assert session.closed
+
+
+async def test_async_probe_checks_the_status(sse_server: TestServer):
+    client = HTTPClient()
+    base_url = str(sse_server.make_url(""))
+
+    await client.aprobe(f"{base_url}/v1/models")
+    with pytest.raises(ClientResponseError):
+        await client.aprobe(f"{base_url}/v1/missing")
+    await client.aclose()
@@ -0,0 +1,191 @@
+import pytest
+import requests
+
+from src.utils import resilience as resilience_module
+from src.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    Resilience,
+    RetryBudget,
+    RetryPolicy,
+    is_retryable,
+    retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def http_error(status_code: int, headers: dict[str, str] | None = None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    delays: list[float] = []
+
+    async def fake_async_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr(resilience_module.time, "sleep", delays.append)
+    monkeypatch.setattr(resilience_module.asyncio, "sleep", fake_async_sleep)
+    return delays
+
+
+def test_is_retryable_classification():
+    assert is_retryable(http_error(429))
+    assert is_retryable(http_error(503))
+    assert is_retryable(requests.ConnectionError())
+    assert not is_retryable(http_error(400))
+    assert not is_retryable(ValueError("bad request"))
+
+
+def test_retry_after_header():
+    assert retry_after(http_error(429, {"Retry-After": "3"})) == 3.0
+    assert retry_after(http_error(429)) is None
+
+
+def test_retry_policy_honors_retry_after():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=10)
+    assert policy.backoff(1, http_error(429, {"Retry-After": "4"})) == 4.0
+    assert policy.backoff(1, http_error(429, {"Retry-After": "60"})) is None
+    assert policy.backoff(3, http_error(503)) is None
+    delay = policy.backoff(2, http_error(503))
+    assert delay is not None and 0 <= delay <= 0.2
+
+
+def test_call_retries_transient_failures(no_sleep: list[float]):
+    layer = Resilience(RetryPolicy(max_attempts=3), failure_threshold=10)
+    outcomes = [requests.ConnectionError(), http_error(502), "ok"]
+
+    def flaky() -> str:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert layer.call("backend", flaky) == "ok"
+    assert len(no_sleep) == 2
+
+
+def test_call_does_not_retry_client_errors(no_sleep: list[float]):
+    layer = Resilience(RetryPolicy(max_attempts=3))
+    calls = 0
+
+    def bad_request() -> None:
+        nonlocal calls
+        calls += 1
+        raise http_error(400)
+
+    with pytest.raises(requests.HTTPError):
+        layer.call("backend", bad_request)
+    assert calls == 1
+    assert no_sleep == []
+
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_tokens=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_circuit_breaker_opens_and_probes_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "backend", failure_threshold=2, reset_timeout=30, clock=clock
+    )
+
+    for _ in range(2):
+        breaker.acquire()
+        breaker.record_failure(requests.ConnectionError())
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.acquire()
+    assert excinfo.value.retry_after == 30
+
+    clock.now = 31
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.acquire()  # The single probe
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()  # No second probe while one is in flight
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "backend", failure_threshold=1, reset_timeout=10, clock=clock
+    )
+    breaker.acquire()
+    breaker.record_failure(http_error(503))
+
+    clock.now = 11
+    breaker.acquire()
+    breaker.record_failure(http_error(503))
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+async def test_acall_fails_fast_when_circuit_open():
+    layer = Resilience(RetryPolicy(max_attempts=1), failure_threshold=1)
+    calls = 0
+
+    async def down() -> None:
+        nonlocal calls
+        calls += 1
+        raise requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        await layer.acall("backend", down)
+    with pytest.raises(CircuitOpenError):
+        await layer.acall("backend", down)
+    assert calls == 1
+
+
+async def test_acall_without_retry_calls_once(no_sleep: list[float]):
+    layer = Resilience(RetryPolicy(max_attempts=3), failure_threshold=10)
+    calls = 0
+
+    async def flaky() -> None:
+        nonlocal calls
+        calls += 1
+        raise requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        await layer.acall("backend", flaky, retry=False)
+    assert calls == 1
+    assert no_sleep == []
+
+
+async def test_astream_retries_only_before_first_item():
+    layer = Resilience(RetryPolicy(max_attempts=3), failure_threshold=10)
+    attempts = 0
+
+    async def stream():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise requests.ConnectionError()
+        yield "first"
+        raise requests.ConnectionError()
+
+    received: list[str] = []
+    with pytest.raises(requests.ConnectionError):
+        async for item in layer.astream("backend", stream):
+            received.append(item)
+    assert received == ["first"]
+    assert attempts == 2
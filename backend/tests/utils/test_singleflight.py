@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from src.utils import SingleFlight
+
+
+async def test_concurrent_calls_share_one_flight():
+    flights: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    results = await asyncio.gather(*(flights.do("key", fetch) for _ in range(10)))
+
+    assert results == [1] * 10
+    assert not flights.in_flight("key")
+    assert await flights.do("key", fetch) == 2  # Completed calls are not reused
+
+
+async def test_distinct_keys_do_not_share():
+    flights: SingleFlight[str, str] = SingleFlight()
+
+    async def echo(value: str) -> str:
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        flights.do("a", lambda: echo("a")), flights.do("b", lambda: echo("b"))
+    )
+
+    assert results == ["a", "b"]
+
+
+async def test_errors_fan_out_to_every_caller():
+    flights: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+
+    async def fail() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ConnectionError("backend unreachable")
+
+    results = await asyncio.gather(
+        *(flights.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+async def test_caller_timeout_does_not_cancel_the_flight():
+    flights: SingleFlight[str, str] = SingleFlight()
+
+    async def slow() -> str:
+        await asyncio.sleep(0.1)
+        return "done"
+
+    patient = asyncio.create_task(flights.do("key", slow))
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(flights.do("key", slow), timeout=0.01)
+
+    assert await patient == "done"
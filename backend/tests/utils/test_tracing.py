@@ -0,0 +1,123 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils import Tracer
+from src.utils.tracing import (
+    ConsoleSpanExporter,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    SpanContext,
+    SpanStatus,
+)
+
+TRACEPARENT: str = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+def test_spans_nest_and_share_the_trace():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=True, exporters=[exporter])
+
+    with tracer.span("outer", route="/a") as outer:
+        with tracer.span("inner") as inner:
+            assert tracer.current_span() is inner
+        assert tracer.current_span() is outer
+
+    assert tracer.current_span() is None
+    assert exporter.names() == ["inner", "outer"]
+    assert inner.context.trace_id == outer.context.trace_id
+    assert inner.parent_id == outer.context.span_id
+    assert outer.parent_id is None
+    assert outer.attributes == {"route": "/a"}
+    assert outer.duration_ms is not None
+
+
+def test_spans_record_errors():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=True, exporters=[exporter])
+
+    with pytest.raises(ConnectionError), tracer.span("call"):
+        raise ConnectionError("refused")
+
+    assert exporter.spans[0].status is SpanStatus.ERROR
+    assert exporter.spans[0].error == "refused"
+    assert exporter.spans[0].attributes["exception.type"] == "ConnectionError"
+
+
+def test_disabled_tracers_record_nothing():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=False, exporters=[exporter])
+
+    with tracer.span("call") as span:
+        span.set_attribute("ignored", True)
+        assert tracer.inject({}) == {}
+    tracer.record("parse", 0)
+
+    assert exporter.spans == []
+    assert span.attributes == {}
+
+
+def test_trace_context_is_propagated_in_headers():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=True, exporters=[exporter])
+    parent = tracer.extract({"traceparent": TRACEPARENT})
+    assert parent is not None
+
+    with tracer.span("request", parent) as span:
+        headers = tracer.inject({"Content-Type": "application/json"})
+
+    assert span.context.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert span.parent_id == "00f067aa0ba902b7"
+    assert headers["traceparent"] == span.context.traceparent
+
+
+@pytest.mark.parametrize(
+    "header",
+    [None, "", "garbage", "00-" + "0" * 32 + "-00f067aa0ba902b7-01"],
+)
+def test_invalid_traceparent_headers_are_ignored(header: str | None):
+    assert SpanContext.from_traceparent(header) is None
+
+
+def test_record_adds_a_finished_child_span():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=True, exporters=[exporter])
+
+    with tracer.span("request") as request:
+        tracer.record("request.parse", request.start_ns)
+
+    parse = exporter.spans[0]
+    assert parse.name == "request.parse"
+    assert parse.parent_id == request.context.span_id
+    assert parse.start_ns == request.start_ns
+
+
+def test_file_and_console_exporters_write_json_lines(tmp_path: Path):
+    stream = io.StringIO()
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracer = Tracer(
+        enabled=True, exporters=[ConsoleSpanExporter(stream), FileSpanExporter(path)]
+    )
+
+    with tracer.span("call", model="m1"):
+        pass
+    tracer.shutdown()
+
+    for text in (stream.getvalue(), path.read_text()):
+        span = json.loads(text)
+        assert span["name"] == "call"
+        assert span["attributes"] == {"model": "m1"}
+        assert span["status"] == {"code": "unset", "message": None}
+
+
+def test_exporter_failures_do_not_fail_the_span():
+    class FailingExporter(InMemorySpanExporter):
+        def export(self, span):
+            raise OSError("disk full")
+
+    tracer = Tracer(enabled=True, exporters=[FailingExporter()])
+
+    with tracer.span("call"):
+        pass
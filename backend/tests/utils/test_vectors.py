@@ -0,0 +1,19 @@
+import base64
+import struct
+
+import pytest
+
+from src.utils.vectors import pack_vector, pack_vector_base64, unpack_vector
+
+
+def test_vectors_are_little_endian_float32():
+    data = pack_vector([1.0, -2.5, 0.25])
+
+    assert data == struct.pack("<3f", 1.0, -2.5, 0.25)
+    assert unpack_vector(data) == [1.0, -2.5, 0.25]
+    assert base64.b64decode(pack_vector_base64([1.0, -2.5, 0.25])) == data
+
+
+def test_unpack_rejects_partial_values():
+    with pytest.raises(ValueError):
+        unpack_vector(b"\x00\x00\x80")